@@ -8,7 +8,7 @@
 """Base classes for streaming dataset files."""
 
 from __future__ import annotations
-from typing import Callable, List
+from typing import Callable, List, Tuple
 
 from histore.archive.base import InputDocument as Datasource  # noqa: F401
 from histore.archive.base import to_document  # noqa: F401
@@ -22,3 +22,10 @@ accept a data frame row as the only argument. They return a Value.
 """
 DataRow = List[Scalar]
 StreamFunction = Callable[[DataRow], Value]
+
+"""Type alias for batch functions. Batch functions process a list of rows and
+their identifiers at once. They return the row identifiers and values for the
+processed rows.
+"""
+RowBatch = Tuple[List[RowIndex], List[DataRow]]
+BatchFunction = Callable[[List[RowIndex], List[DataRow]], RowBatch]
@@ -0,0 +1,351 @@
+# This file is part of the Data Cleaning Library (openclean).
+#
+# Copyright (C) 2018-2021 New York University.
+#
+# openclean is released under the Revised BSD License. See file LICENSE for
+# full license details.
+
+"""Binary file format for persisting the rows of a data stream. In contrast
+to CSV files, the binary format maintains the row identifiers and the types
+of all cell values (e.g., the results of a typecast operator).
+
+Rows are stored in chunks. Each chunk contains the row identifiers and the
+row values for a fixed number of rows. Chunks are serialized using pickle
+and optionally compressed using zlib. The list of
+column names and the position of all chunks are stored in a footer at the end
+of the file. Files are read using a memory map by default.
+
+The file layout is:
+
+    MAGIC | chunk 1 | ... | chunk n | footer | footer length (8 bytes) | MAGIC
+
+Binary files are intended for intermediate results only. Since chunks are
+serialized using pickle, files from untrusted sources should never be read.
+"""
+
+from __future__ import annotations
+from typing import BinaryIO, Iterator, List, Optional, Tuple
+
+import gc
+import mmap
+import os
+import pickle
+import struct
+import zlib
+
+from openclean.data.stream.base import DataRow, DefaultDocument, DocumentIterator, RowIndex
+from openclean.data.types import DatasetSchema
+
+
+"""Marker at the beginning and at the end of binary files."""
+MAGIC = b'OCLNBIN1'
+
+"""Default number of rows in each chunk of a binary file."""
+CHUNKSIZE = 10000
+
+"""Struct format for the footer length."""
+LENGTH = struct.Struct('<Q')
+
+
+class BinaryWriter(object):
+    """Writer for rows in a binary file. Rows are buffered until the buffer
+    contains a full chunk. The footer is written when the writer is closed.
+    """
+    def __init__(
+        self, filename: str, columns: DatasetSchema,
+        compressed: Optional[bool] = False, chunksize: Optional[int] = CHUNKSIZE
+    ):
+        """Open the output file and write the file marker.
+
+        Parameters
+        ----------
+        filename: string
+            Path to the output file.
+        columns: list of string
+            Column names for the rows in the file.
+        compressed: bool, default=False
+            Compress chunks using zlib.
+        chunksize: int, default=10000
+            Number of rows in each chunk.
+
+        Raises
+        ------
+        ValueError
+        """
+        if chunksize < 1:
+            raise ValueError('invalid chunk size {}'.format(chunksize))
+        self.columns = [str(c) for c in columns]
+        self.compressed = compressed
+        self.chunksize = chunksize
+        self.file = open(filename, 'wb')
+        self.file.write(MAGIC)
+        # Buffer for rows in the next chunk and the list of (offset, length,
+        # row count)-triples for all written chunks.
+        self._rowids = list()
+        self._rows = list()
+        self._chunks = list()
+
+    def __enter__(self):
+        """Enter method for the context manager."""
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        """Close the writer when the context manager exits."""
+        self.close()
+        return False
+
+    def close(self):
+        """Write the buffered rows and the file footer. Close the output file."""
+        if self.file is None:
+            return
+        self._flush(final=True)
+        footer = pickle.dumps(
+            {'columns': self.columns, 'compressed': self.compressed, 'chunks': self._chunks},
+            protocol=pickle.HIGHEST_PROTOCOL
+        )
+        self.file.write(footer)
+        self.file.write(LENGTH.pack(len(footer)))
+        self.file.write(MAGIC)
+        self.file.close()
+        self.file = None
+
+    def write(self, rowid: RowIndex, row: DataRow):
+        """Add a row to the output file.
+
+        Parameters
+        ----------
+        rowid: int
+            Unique row identifier.
+        row: list
+            List of values in the row.
+        """
+        self._rowids.append(rowid)
+        self._rows.append(row)
+        if len(self._rows) >= self.chunksize:
+            self._flush()
+
+    def write_batch(self, rowids: List[RowIndex], rows: List[DataRow]):
+        """Add a batch of rows to the output file.
+
+        Parameters
+        ----------
+        rowids: list
+            Unique identifier for each row in the batch.
+        rows: list of list
+            List of values for each row in the batch.
+        """
+        self._rowids.extend(rowids)
+        self._rows.extend(rows)
+        if len(self._rows) >= self.chunksize:
+            self._flush()
+
+    def _flush(self, final: Optional[bool] = False):
+        """Write full chunks of buffered rows to the output file. Rows in an
+        incomplete chunk are only written if the final flag is True.
+
+        Parameters
+        ----------
+        final: bool, default=False
+            Write all buffered rows.
+        """
+        size = self.chunksize
+        while len(self._rows) >= size or (final and self._rows):
+            rowids, self._rowids = self._rowids[:size], self._rowids[size:]
+            rows, self._rows = self._rows[:size], self._rows[size:]
+            data = pickle.dumps((rowids, rows), protocol=pickle.HIGHEST_PROTOCOL)
+            if self.compressed:
+                data = zlib.compress(data)
+            self._chunks.append((self.file.tell(), len(data), len(rows)))
+            self.file.write(data)
+
+
+class BinaryReader(DocumentIterator):
+    """Iterator over the rows in a binary file. Chunks are read and
+    deserialized one at a time.
+    """
+    def __init__(self, file: BinaryFile):
+        """Open the binary file.
+
+        Parameters
+        ----------
+        file: openclean.data.stream.binary.BinaryFile
+            Binary file that is being read.
+        """
+        self.chunks = file.chunks
+        self.compressed = file.compressed
+        self._file = open(file.filename, 'rb')
+        self._buffer = None
+        if file.memory_map:
+            self._buffer = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        self._rows = self._iterrows()
+
+    def __iter__(self) -> Iterator[Tuple[int, RowIndex, DataRow]]:
+        """Return the row generator directly to avoid the overhead of calling
+        the next method for each row.
+
+        Returns
+        -------
+        iterator
+        """
+        return self._rows
+
+    def close(self):
+        """Release the memory map and close the file."""
+        if self._file is None:
+            return
+        if self._buffer is not None:
+            self._buffer.close()
+            self._buffer = None
+        self._file.close()
+        self._file = None
+
+    def next(self) -> Tuple[int, RowIndex, DataRow]:
+        """Read the next row in the file.
+
+        Returns
+        -------
+        tuple of int, histore.document.base.RowIndex, histore.document.base.DataRow
+        """
+        return next(self._rows)
+
+    def _iterrows(self) -> Iterator[Tuple[int, RowIndex, DataRow]]:
+        """Generator for all rows in the file.
+
+        Returns
+        -------
+        iterator
+        """
+        pos = 0
+        for offset, length, _ in self.chunks:
+            rowids, rows = self._read_chunk(offset, length)
+            yield from zip(range(pos, pos + len(rows)), rowids, rows)
+            pos += len(rows)
+
+    def _read_chunk(self, offset: int, length: int) -> Tuple[List[RowIndex], List[DataRow]]:
+        """Read the row identifiers and the rows in a chunk.
+
+        Parameters
+        ----------
+        offset: int
+            Position of the chunk in the file.
+        length: int
+            Length of the chunk in bytes.
+
+        Returns
+        -------
+        tuple of list and list
+        """
+        if self._buffer is not None:
+            data = self._buffer[offset:offset + length]
+        else:
+            self._file.seek(offset)
+            data = self._file.read(length)
+        if self.compressed:
+            data = zlib.decompress(data)
+        # Disable the garbage collector while the chunk is deserialized. The
+        # large number of row lists that are created otherwise triggers
+        # repeated (and unnecessary) garbage collection runs.
+        enabled = gc.isenabled()
+        gc.disable()
+        try:
+            return pickle.loads(data)
+        finally:
+            if enabled:
+                gc.enable()
+
+
+class BinaryFile(DefaultDocument):
+    """Document for the rows in a binary file. The column names and the chunk
+    positions are read from the file footer when the document is created.
+    """
+    def __init__(self, filename: str, memory_map: Optional[bool] = True):
+        """Read the file footer.
+
+        Parameters
+        ----------
+        filename: string
+            Path to the binary file.
+        memory_map: bool, default=True
+            Read the file using a memory map.
+
+        Raises
+        ------
+        ValueError
+        """
+        with open(filename, 'rb') as f:
+            footer = read_footer(f)
+        super(BinaryFile, self).__init__(columns=footer['columns'])
+        self.filename = filename
+        self.memory_map = memory_map
+        self.compressed = footer['compressed']
+        self.chunks = footer['chunks']
+
+    def close(self):
+        """The binary file does not hold any resources."""
+        pass
+
+    def open(self) -> BinaryReader:
+        """Get a row iterator for the binary file.
+
+        Returns
+        -------
+        openclean.data.stream.binary.BinaryReader
+        """
+        return BinaryReader(file=self)
+
+    def rowcount(self) -> int:
+        """Get the number of rows in the file.
+
+        Returns
+        -------
+        int
+        """
+        return sum(rows for _, _, rows in self.chunks)
+
+
+# -- Helper functions ---------------------------------------------------------
+
+def is_binary(filename: str) -> bool:
+    """Test if the given file is a binary file, i.e., if the file starts with
+    the marker for binary files.
+
+    Parameters
+    ----------
+    filename: string
+        Path to a file.
+
+    Returns
+    -------
+    bool
+    """
+    if not os.path.isfile(filename):
+        return False
+    with open(filename, 'rb') as f:
+        return f.read(len(MAGIC)) == MAGIC
+
+
+def read_footer(f: BinaryIO) -> dict:
+    """Read the footer of a binary file. Raises a ValueError if the file is
+    not a valid binary file.
+
+    Parameters
+    ----------
+    f: file object
+        Binary file that is open for reading.
+
+    Returns
+    -------
+    dict
+    """
+    trailer = len(MAGIC) + LENGTH.size
+    f.seek(0, os.SEEK_END)
+    size = f.tell()
+    f.seek(0)
+    if size < len(MAGIC) + trailer or f.read(len(MAGIC)) != MAGIC:
+        raise ValueError('not a valid binary file')
+    f.seek(size - trailer)
+    length, = LENGTH.unpack(f.read(LENGTH.size))
+    if f.read(len(MAGIC)) != MAGIC or length > size - len(MAGIC) - trailer:
+        raise ValueError('incomplete binary file')
+    f.seek(size - trailer - length)
+    return pickle.loads(f.read(length))
@@ -7,4 +7,537 @@
 
 """Collection of helper classes to read data frames from CSV files."""
 
+from typing import BinaryIO, Callable, List, Optional, Tuple
+
+import csv
+import io
+import locale
+import os
+
+from histore.document.base import DefaultDocument, DocumentIterator
 from histore.document.csv.base import CSVFile, CSVWriter  # noqa: F401
+from histore.document.csv.reader import CSVReader
+
+from openclean.data.stream.base import DataRow, RowIndex
+from openclean.data.types import DatasetSchema, Value
+
+
+"""Size (in bytes) of blocks that are read when scanning a CSV file for
+record boundaries.
+"""
+BLOCKSIZE = 1024 * 1024
+
+
+"""Type alias for predicates on single cell values that are evaluated by a CSV
+scan. The first element is the index position of the column in the CSV file.
+"""
+ValuePredicate = Tuple[int, Callable[[Value], bool]]
+
+
+# -- Partitioned CSV files ----------------------------------------------------
+
+class ByteRange(io.RawIOBase):
+    """Readable binary stream for a byte range of an open file. The file is
+    expected to be positioned at the start of the range.
+    """
+    def __init__(self, file: BinaryIO, size: int):
+        """Initialize the file and the number of bytes in the range.
+
+        Parameters
+        ----------
+        file: file object
+            Binary file that is positioned at the start of the range.
+        size: int
+            Number of bytes in the range.
+        """
+        self.file = file
+        self.remaining = size
+
+    def close(self):
+        """Close the underlying file."""
+        if not self.closed:
+            self.file.close()
+        super(ByteRange, self).close()
+
+    def readable(self) -> bool:
+        """The stream is readable.
+
+        Returns
+        -------
+        bool
+        """
+        return True
+
+    def readinto(self, buffer: bytearray) -> int:
+        """Read bytes from the range into the given buffer.
+
+        Parameters
+        ----------
+        buffer: bytearray
+            Pre-allocated buffer.
+
+        Returns
+        -------
+        int
+        """
+        size = min(len(buffer), self.remaining)
+        if size <= 0:
+            return 0
+        data = self.file.read(size)
+        buffer[:len(data)] = data
+        self.remaining -= len(data)
+        return len(data)
+
+
+class CSVPartitionIterator(DocumentIterator):
+    """Iterator over the rows in a byte range of a CSV file. The byte range is
+    expected to start and end at record boundaries. Row positions and row
+    identifiers start at zero for each partition.
+    """
+    def __init__(
+        self, filename: str, start: int, end: int, delim: Optional[str] = None,
+        quotechar: Optional[str] = '"', encoding: Optional[str] = None,
+        none_is: Optional[str] = None, skip_header: Optional[bool] = False
+    ):
+        """Initialize the input file and the byte range of the partition.
+
+        Parameters
+        ----------
+        filename: string
+            Path to the input file.
+        start: int
+            Byte offset of the first record in the partition.
+        end: int
+            Byte offset of the first record after the partition.
+        delim: string, default=None
+            The column delimiter used in the CSV file.
+        quotechar: string, default='"'
+            CSV quote char.
+        encoding: string, default=None
+            The csv file encoding e.g. utf-8, utf-16 etc.
+        none_is: string, default=None
+            String that was used to encode None values in the input file. If
+            given, all cell values that match the given string are substituted
+            by None.
+        skip_header: bool, default=False
+            Skip first row if the partition contains the header information.
+        """
+        # Decode the byte range with the same newline handling as the text
+        # mode file in the histore CSV reader (i.e., universal newlines).
+        f = open(filename, 'rb')
+        f.seek(start)
+        self.start = start
+        self.end = end
+        self.encoding = encoding if encoding else locale.getpreferredencoding(False)
+        self.file = io.TextIOWrapper(
+            io.BufferedReader(ByteRange(f, end - start)),
+            encoding=self.encoding
+        )
+        self.reader = csv.reader(
+            self.file,
+            delimiter=delim if delim is not None else ',',
+            quotechar=quotechar
+        )
+        self.none_is = none_is
+        # Skip the column name row.
+        if skip_header:
+            next(self.reader)
+        # Initialize the row index.
+        self._rowindex = 0
+
+    def close(self):
+        """Close the associated file handle."""
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+
+    def next(self) -> Tuple[int, RowIndex, DataRow]:
+        """Read the next row in the partition.
+
+        Returns
+        -------
+        tuple of int, histore.document.base.RowIndex, histore.document.base.DataRow
+        """
+        try:
+            values = next(self.reader)
+        except StopIteration:
+            self.close()
+            raise StopIteration()
+        if self.none_is is not None:
+            values = [v if v != self.none_is else None for v in values]
+        rowidx = self._rowindex
+        self._rowindex += 1
+        return rowidx, rowidx, values
+
+
+class CSVPartition(DefaultDocument):
+    """Document for a byte range of an uncompressed CSV file. Partitions of a
+    CSV file are created by the :func:`openclean.data.stream.csv.partition`
+    function.
+    """
+    def __init__(
+        self, columns: DatasetSchema, filename: str, start: int, end: int,
+        delim: Optional[str] = None, quotechar: Optional[str] = '"',
+        encoding: Optional[str] = None, none_is: Optional[str] = None,
+        skip_header: Optional[bool] = False
+    ):
+        """Initialize the schema, the input file and the byte range.
+
+        Parameters
+        ----------
+        columns: list of string
+            Column names for the rows in the CSV file.
+        filename: string
+            Path to the input file.
+        start: int
+            Byte offset of the first record in the partition.
+        end: int
+            Byte offset of the first record after the partition.
+        delim: string, default=None
+            The column delimiter used in the CSV file.
+        quotechar: string, default='"'
+            CSV quote char.
+        encoding: string, default=None
+            The csv file encoding e.g. utf-8, utf-16 etc.
+        none_is: string, default=None
+            String that was used to encode None values in the input file.
+        skip_header: bool, default=False
+            Skip first row if the partition contains the header information.
+        """
+        super(CSVPartition, self).__init__(columns=columns)
+        self.filename = filename
+        self.start = start
+        self.end = end
+        self.delim = delim
+        self.quotechar = quotechar
+        self.encoding = encoding
+        self.none_is = none_is
+        self.skip_header = skip_header
+
+    def close(self):
+        """The partition does not hold any resources."""
+        pass
+
+    def open(self) -> CSVPartitionIterator:
+        """Get a row iterator for the byte range of the CSV file.
+
+        Returns
+        -------
+        openclean.data.stream.csv.CSVPartitionIterator
+        """
+        return CSVPartitionIterator(
+            filename=self.filename,
+            start=self.start,
+            end=self.end,
+            delim=self.delim,
+            quotechar=self.quotechar,
+            encoding=self.encoding,
+            none_is=self.none_is,
+            skip_header=self.skip_header
+        )
+
+
+# -- Scans with pushed-down operators -----------------------------------------
+
+class CSVScanIterator(DocumentIterator):
+    """Iterator over the rows in a CSV file that satisfy a list of predicates
+    on single cell values. The predicates are evaluated on the parsed records
+    before any row is created. Rows only contain the values of the projected
+    columns.
+
+    Row positions and row identifiers refer to the position of the record in
+    the CSV file, i.e., they are the same as for a full scan of the file.
+    """
+    def __init__(
+        self, file: CSVFile, colidxs: Optional[List[int]] = None,
+        predicates: Optional[List[ValuePredicate]] = None
+    ):
+        """Initialize the reader for the CSV file, the projected columns, and
+        the predicates.
+
+        Parameters
+        ----------
+        file: openclean.data.stream.csv.CSVFile
+            CSV file that is being scanned.
+        colidxs: list of int, default=None
+            Index positions of the projected columns. All columns are included
+            if the list is None.
+        predicates: list of tuple of int and callable, default=None
+            Predicates on cell values in the CSV file.
+        """
+        # Read records without replacing None values. Values are only replaced
+        # for cells that are included in the projection or that are evaluated
+        # by predicates.
+        self.reader = CSVReader(
+            filename=file.filename,
+            delim=file.delim,
+            compressed=file.compressed,
+            quotechar=file.quotechar,
+            encoding=file.encoding
+        )
+        if file._has_header:
+            next(self.reader)
+        self.none_is = file.none_is
+        self.colidxs = colidxs
+        self.predicates = predicates if predicates is not None else list()
+        self._rowindex = -1
+
+    def close(self):
+        """Close the associated CSV reader."""
+        self.reader.close()
+
+    def next(self) -> Tuple[int, RowIndex, DataRow]:
+        """Read the next row that satisfies all the predicates.
+
+        Returns
+        -------
+        tuple of int, histore.document.base.RowIndex, histore.document.base.DataRow
+        """
+        none_is, predicates = self.none_is, self.predicates
+        for record in self.reader:
+            self._rowindex += 1
+            if none_is is None:
+                if not all(pred(record[i]) for i, pred in predicates):
+                    continue
+                if self.colidxs is not None:
+                    values = [record[i] for i in self.colidxs]
+                else:
+                    values = record
+            else:
+                if not all(pred(null(record[i], none_is)) for i, pred in predicates):
+                    continue
+                if self.colidxs is not None:
+                    values = [null(record[i], none_is) for i in self.colidxs]
+                else:
+                    values = [null(v, none_is) for v in record]
+            return self._rowindex, self._rowindex, values
+        raise StopIteration()
+
+
+class CSVScan(DefaultDocument):
+    """Document for the rows in a CSV file that satisfy a list of predicates
+    on single cell values. Contains only the values for a subset of the
+    columns in the file. Scans are used to push projections and filters in a
+    data pipeline down into the data source.
+    """
+    def __init__(
+        self, file: CSVFile, columns: DatasetSchema,
+        colidxs: Optional[List[int]] = None,
+        predicates: Optional[List[ValuePredicate]] = None
+    ):
+        """Initialize the scanned file, the document schema, the projected
+        columns and the predicates.
+
+        Parameters
+        ----------
+        file: openclean.data.stream.csv.CSVFile
+            CSV file that is being scanned.
+        columns: list of string
+            Column names for the rows in the document.
+        colidxs: list of int, default=None
+            Index positions of the projected columns. All columns are included
+            if the list is None.
+        predicates: list of tuple of int and callable, default=None
+            Predicates on cell values in the CSV file.
+        """
+        super(CSVScan, self).__init__(columns=columns)
+        self.file = file
+        self.colidxs = colidxs
+        self.predicates = predicates if predicates is not None else list()
+
+    def close(self):
+        """Close the scanned file."""
+        self.file.close()
+
+    def open(self) -> CSVScanIterator:
+        """Get a row iterator for the scanned CSV file.
+
+        Returns
+        -------
+        openclean.data.stream.csv.CSVScanIterator
+        """
+        return CSVScanIterator(
+            file=self.file,
+            colidxs=self.colidxs,
+            predicates=self.predicates
+        )
+
+
+class CSVAppendWriter(CSVWriter):
+    """CSV writer that continues writing an existing (uncompressed) output
+    file at a given byte position. All content after the position is removed
+    from the file. The writer is used to resume writing an output file after
+    a data pipeline was restored from a checkpoint.
+    """
+    def __init__(self, file: CSVFile, pos: int):
+        """Open the output file and truncate it at the given position.
+
+        Parameters
+        ----------
+        file: openclean.data.stream.csv.CSVFile
+            Reference to the output CSV file.
+        pos: int
+            Byte position in the output file where writing is continued.
+
+        Raises
+        ------
+        ValueError
+        """
+        if file.compressed:
+            raise ValueError('cannot append to compressed file {}'.format(file.filename))
+        self.file = open(file.filename, 'r+', newline='', encoding=file.encoding)
+        self.file.truncate(pos)
+        self.file.seek(pos)
+        delim = file.delim if file.delim is not None else ','
+        self.writer = csv.writer(self.file, delimiter=delim)
+        self.none_as = file.none_is
+
+
+# -- Helper functions ---------------------------------------------------------
+
+def null(value: str, none_is: str) -> Optional[str]:
+    """Replace values that represent None in a CSV file.
+
+    Parameters
+    ----------
+    value: string
+        Cell value in the CSV file.
+    none_is: string
+        String that is used to encode None values in the file.
+
+    Returns
+    -------
+    string
+    """
+    return value if value != none_is else None
+
+
+def partition(file: CSVFile, n: int) -> List[CSVPartition]:
+    """Split an uncompressed CSV file into (at most) n partitions of roughly
+    equal size. Partition boundaries are aligned to record boundaries, i.e.,
+    each boundary is placed after a line break that is not part of a quoted
+    cell value.
+
+    Raises a ValueError if the file is compressed.
+
+    Parameters
+    ----------
+    file: openclean.data.stream.csv.CSVFile
+        CSV file that is being partitioned.
+    n: int
+        Number of partitions.
+
+    Returns
+    -------
+    list of openclean.data.stream.csv.CSVPartition
+
+    Raises
+    ------
+    ValueError
+    """
+    if file.compressed:
+        raise ValueError('cannot partition compressed file {}'.format(file.filename))
+    boundaries = record_boundaries(
+        filename=file.filename,
+        n=n,
+        quotechar=file.quotechar
+    )
+    partitions = list()
+    for i in range(len(boundaries) - 1):
+        partitions.append(
+            CSVPartition(
+                columns=file.columns,
+                filename=file.filename,
+                start=boundaries[i],
+                end=boundaries[i + 1],
+                delim=file.delim,
+                quotechar=file.quotechar,
+                encoding=file.encoding,
+                none_is=file.none_is,
+                skip_header=file._has_header and i == 0
+            )
+        )
+    return partitions
+
+
+def record_boundaries(filename: str, n: int, quotechar: Optional[str] = '"') -> List[int]:
+    """Get byte offsets that split a CSV file into n parts of roughly equal
+    size. The first offset is zero and the last offset is the file size.
+
+    The file is scanned once to keep track of whether a given offset is inside
+    a quoted cell value. Since escaped quotes are represented by two quote
+    characters, the number of quote characters before a record boundary is
+    always even.
+
+    Parameters
+    ----------
+    filename: string
+        Path to the CSV file.
+    n: int
+        Number of parts.
+    quotechar: string, default='"'
+        CSV quote char.
+
+    Returns
+    -------
+    list of int
+    """
+    size = os.path.getsize(filename)
+    quote = quotechar.encode()
+    boundaries = [0]
+    with open(filename, 'rb') as f:
+        pos, quoted = 0, False
+        for target in [size * i // n for i in range(1, n)]:
+            # Skip targets that are before the last record boundary.
+            if target <= pos:
+                continue
+            # Count quote characters up to the target position.
+            while pos < target:
+                block = f.read(min(BLOCKSIZE, target - pos))
+                quoted ^= block.count(quote) % 2 == 1
+                pos += len(block)
+            boundary = next_boundary(f=f, pos=pos, quoted=quoted, quote=quote)
+            if boundary is None or boundary >= size:
+                break
+            boundaries.append(boundary)
+            # Continue scanning from the record boundary. By definition, the
+            # boundary is not inside a quoted value.
+            f.seek(boundary)
+            pos, quoted = boundary, False
+    boundaries.append(size)
+    return boundaries
+
+
+def next_boundary(f: BinaryIO, pos: int, quoted: bool, quote: bytes) -> Optional[int]:
+    """Find the byte offset after the next line break in an open file that is
+    not inside a quoted value. Returns None if the end of the file is reached.
+
+    Parameters
+    ----------
+    f: file object
+        File handle that is positioned at the given offset.
+    pos: int
+        Current byte offset of the file handle.
+    quoted: bool
+        Flag indicating whether the current offset is inside a quoted value.
+    quote: bytes
+        Encoded CSV quote char.
+
+    Returns
+    -------
+    int
+    """
+    block = f.read(BLOCKSIZE)
+    while block:
+        start = 0
+        end = block.find(b'\n')
+        while end != -1:
+            quoted ^= block.count(quote, start, end) % 2 == 1
+            if not quoted:
+                return pos + end + 1
+            start = end + 1
+            end = block.find(b'\n', start)
+        quoted ^= block.count(quote, start) % 2 == 1
+        pos += len(block)
+        block = f.read(BLOCKSIZE)
+    return None
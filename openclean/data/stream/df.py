@@ -7,4 +7,4 @@
 
 """Collection of helper classes to read data frames as data streams."""
 
-from histore.document.df import DataFrameDocument as DataFrameStream  # noqa: F401
+from histore.document.df import DataFrameDocument as DataFrameStream, rowindex_readorder  # noqa: F401
@@ -0,0 +1,246 @@
+# This file is part of the Data Cleaning Library (openclean).
+#
+# Copyright (C) 2018-2021 New York University.
+#
+# openclean is released under the Revised BSD License. See file LICENSE for
+# full license details.
+
+"""Datasource wrapper that reads rows from a document in a background thread.
+Rows are read in batches and passed to the consumer via a bounded queue. This
+allows reading and decompressing an input file while rows are processed by
+the operators of a data pipeline.
+"""
+
+from __future__ import annotations
+from typing import List, Optional, Tuple
+
+import pandas as pd
+import queue
+import threading
+
+from histore.document.base import Document, DocumentIterator
+
+from openclean.data.stream.base import DataRow, RowIndex
+
+
+"""Default number of row batches in the prefetch queue."""
+DEPTH = 4
+
+"""Default number of rows in each batch that is read by the background
+thread.
+"""
+BATCHSIZE = 1000
+
+
+"""Marker for the end of the prefetched document."""
+END_OF_STREAM = None
+
+
+class PrefetchIterator(DocumentIterator):
+    """Iterator over rows that are read from a document iterator by a
+    background thread. The iterator reads batches of rows from a bounded queue.
+    Errors that are raised by the reader are re-raised by the next method.
+
+    The background thread is stopped when the iterator is closed, e.g., after
+    a consumer raised a StopIteration error.
+    """
+    def __init__(
+        self, reader: DocumentIterator, depth: Optional[int] = DEPTH,
+        batchsize: Optional[int] = BATCHSIZE
+    ):
+        """Initialize the reader and start the background thread.
+
+        Parameters
+        ----------
+        reader: histore.document.base.DocumentIterator
+            Iterator over the rows in the prefetched document.
+        depth: int, default=4
+            Maximum number of row batches in the queue.
+        batchsize: int, default=1000
+            Number of rows in each batch.
+        """
+        self.reader = reader
+        self.batchsize = batchsize
+        self.queue = queue.Queue(maxsize=depth)
+        self._cancelled = threading.Event()
+        self._batch = list()
+        self._readindex = 0
+        self._done = False
+        self._thread = threading.Thread(target=self._prefetch, daemon=True)
+        self._thread.start()
+
+    def close(self):
+        """Stop the background thread and close the document reader."""
+        if self._thread is None:
+            return
+        # The background thread checks the cancel flag while it waits for a
+        # free slot in the queue.
+        self._cancelled.set()
+        self._thread.join()
+        self._thread = None
+        self.reader.close()
+
+    def next(self) -> Tuple[int, RowIndex, DataRow]:
+        """Read the next row from the current batch. Get the next batch from
+        the queue if all rows in the current batch have been read.
+
+        Returns
+        -------
+        tuple of int, histore.document.base.RowIndex, histore.document.base.DataRow
+        """
+        if self._readindex >= len(self._batch):
+            self._batch = self._next_batch()
+            self._readindex = 0
+        row = self._batch[self._readindex]
+        self._readindex += 1
+        return row
+
+    def _next_batch(self) -> List[Tuple[int, RowIndex, DataRow]]:
+        """Get the next batch of rows from the queue. Raises StopIteration if
+        the end of the document was reached.
+
+        Returns
+        -------
+        list of tuple of int, histore.document.base.RowIndex, histore.document.base.DataRow
+        """
+        if self._done:
+            raise StopIteration()
+        batch = self.queue.get()
+        if batch is END_OF_STREAM:
+            self._done = True
+            raise StopIteration()
+        elif isinstance(batch, Exception):
+            self._done = True
+            raise batch
+        return batch
+
+    def _prefetch(self):
+        """Read batches of rows from the document reader and add them to the
+        queue until the end of the document is reached or the iterator is
+        closed.
+        """
+        try:
+            batch = list()
+            for row in self.reader:
+                batch.append(row)
+                if len(batch) == self.batchsize:
+                    if not self._put(batch):
+                        return
+                    batch = list()
+            if batch and not self._put(batch):
+                return
+            self._put(END_OF_STREAM)
+        except Exception as ex:
+            self._put(ex)
+
+    def _put(self, item) -> bool:
+        """Add an item to the queue. Waits until a slot in the queue becomes
+        available. Returns False if the iterator was closed while waiting.
+
+        Parameters
+        ----------
+        item: list, Exception, or None
+            Batch of rows, error, or end of stream marker.
+
+        Returns
+        -------
+        bool
+        """
+        while not self._cancelled.is_set():
+            try:
+                self.queue.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                pass
+        return False
+
+
+class Prefetch(Document):
+    """Datasource wrapper for documents whose rows are read by a background
+    thread.
+    """
+    def __init__(
+        self, source: Document, depth: Optional[int] = DEPTH,
+        batchsize: Optional[int] = BATCHSIZE
+    ):
+        """Initialize the wrapped document and the queue parameters.
+
+        Parameters
+        ----------
+        source: histore.document.base.Document
+            Document that is read in the background.
+        depth: int, default=4
+            Maximum number of row batches in the queue.
+        batchsize: int, default=1000
+            Number of rows in each batch.
+
+        Raises
+        ------
+        ValueError
+        """
+        if depth < 1:
+            raise ValueError('invalid queue depth {}'.format(depth))
+        if batchsize < 1:
+            raise ValueError('invalid batch size {}'.format(batchsize))
+        super(Prefetch, self).__init__(columns=source.columns)
+        self.source = source
+        self.depth = depth
+        self.batchsize = batchsize
+
+    def close(self):
+        """Close the wrapped document."""
+        self.source.close()
+
+    def open(self) -> PrefetchIterator:
+        """Get an iterator that reads the rows of the wrapped document in a
+        background thread.
+
+        Returns
+        -------
+        openclean.data.stream.prefetch.PrefetchIterator
+        """
+        return PrefetchIterator(
+            reader=self.source.open(),
+            depth=self.depth,
+            batchsize=self.batchsize
+        )
+
+    def wrap(self, source: Document) -> Prefetch:
+        """Get a prefetching wrapper for a different document using the same
+        queue parameters.
+
+        Parameters
+        ----------
+        source: histore.document.base.Document
+            Document that is read in the background.
+
+        Returns
+        -------
+        openclean.data.stream.prefetch.Prefetch
+        """
+        return Prefetch(source=source, depth=self.depth, batchsize=self.batchsize)
+
+    def to_df(self) -> pd.DataFrame:
+        """Read the wrapped document into a pandas data frame.
+
+        Returns
+        -------
+        pd.DataFrame
+        """
+        return self.source.to_df()
+
+    def sorted(self, keys: List[int], buffersize: Optional[float] = None) -> Document:
+        """Sort the rows of the wrapped document.
+
+        Parameters
+        ----------
+        keys: list of int
+            Index position of sort columns.
+        buffersize: float, default=None
+            Maximum size (in bytes) of file blocks that are kept in main-memory.
+
+        Returns
+        -------
+        histore.document.base.Document
+        """
+        return self.source.sorted(keys=keys, buffersize=buffersize)
@@ -10,6 +10,7 @@
 
 from collections import Counter
 
+from openclean.function.value.accumulator import ValueCounter
 from openclean.function.value.base import ValueFunction
 from openclean.function.value.normalize import MinMaxScale
 
@@ -71,6 +72,31 @@ class NormalizedFrequency(ValueFunction):
         -------
         openclean.embedding.feature.frequency.NormalizedFrequency
         """
-        mapping = Counter(values)
+        return self.prepare_accumulated(ValueCounter(Counter(values)))
+
+    def accumulator(self) -> ValueCounter:
+        """The function is prepared using the frequency counts for the
+        distinct values in a data stream.
+
+        Returns
+        -------
+        openclean.function.value.accumulator.ValueCounter
+        """
+        return ValueCounter()
+
+    def prepare_accumulated(self, acc: ValueCounter) -> ValueFunction:
+        """Initialize the frequency lookup table and the normalization function
+        using the accumulated frequency counts.
+
+        Parameters
+        ----------
+        acc: openclean.function.value.accumulator.ValueCounter
+            Frequency counts for the values in a data stream.
+
+        Returns
+        -------
+        openclean.embedding.feature.frequency.NormalizedFrequency
+        """
+        mapping = acc.counts
         normalizer = MinMaxScale().prepare(mapping.values())
         return NormalizedFrequency(mapping=mapping, normalizer=normalizer)
@@ -7,9 +7,11 @@
 
 """Collection of helper functions for parallel processing."""
 
-from typing import Callable, Iterable, List
+from typing import Any, Callable, Iterable, List, Tuple
 
+import dill
 import multiprocessing as mp
+import pandas as pd
 
 
 def process_list(func: Callable, values: Iterable, processes: int) -> List:
@@ -34,3 +36,48 @@ def process_list(func: Callable, values: Iterable, processes: int) -> List:
     list
     """
     return mp.Pool(processes=processes).map(func, values)
+
+
+def process_frame(func: Callable[[pd.DataFrame], Any], df: pd.DataFrame, processes: int) -> List:
+    """Apply a given function to chunks of consecutive rows in a data frame in
+    parallel. The data frame is split into (at most) one chunk for each of
+    the parallel processes. Returns the list of function results in the order
+    of the chunks in the data frame.
+
+    The function is serialized using dill to support functions that are (or
+    that reference) lambdas.
+
+    Parameters
+    ----------
+    func: callable
+        Function that is applied to each data frame chunk.
+    df: pd.DataFrame
+        Input data frame.
+    processes: int
+        Number of parallel proceses to use.
+
+    Returns
+    -------
+    list
+    """
+    size = -(-len(df.index) // processes)
+    chunks = [df.iloc[pos:pos + size] for pos in range(0, len(df.index), size)]
+    payload = dill.dumps(func)
+    with mp.Pool(processes=len(chunks)) as pool:
+        return pool.map(process_chunk, [(payload, chunk) for chunk in chunks])
+
+
+def process_chunk(args: Tuple[bytes, pd.DataFrame]) -> Any:
+    """Apply a serialized function to a data frame chunk in a worker process.
+
+    Parameters
+    ----------
+    args: tuple of bytes and pd.DataFrame
+        Function that was serialized using dill and the data frame chunk.
+
+    Returns
+    -------
+    any
+    """
+    payload, df = args
+    return dill.loads(payload)(df)
@@ -9,6 +9,9 @@
 one or more data frame columns for all data frame rows.
 """
 
+from __future__ import annotations
+from abc import abstractmethod
+from functools import partial
 from typing import Callable, List, Optional, Union
 
 import numpy as np
@@ -16,9 +19,144 @@ import numpy as np
 from openclean.data.types import Value
 
 from openclean.function.eval.base import Eval, InputColumn
+from openclean.function.value.accumulator import Accumulator
 from openclean.function.value.base import ConstantValue, ValueFunction
 
 
+# -- Accumulators for aggregates over data streams ----------------------------
+
+class Aggregate(Accumulator):
+    """Abstract base class for accumulators that compute an aggregate value
+    over a stream of values.
+    """
+    @abstractmethod
+    def result(self) -> Value:
+        """Get the aggregate value.
+
+        Returns
+        -------
+        scalar
+        """
+        raise NotImplementedError()  # pragma: no cover
+
+
+class Frequency(Aggregate):
+    """Count the number of occurrences of a given value."""
+    def __init__(self, value: Value):
+        """Initialize the counted value.
+
+        Parameters
+        ----------
+        value: scalar
+            Value whose frequency is counted.
+        """
+        self.value = value
+        self.count = 0
+
+    def add(self, value: Value):
+        """Increment the count if the value matches the counted value."""
+        if value == self.value:
+            self.count += 1
+
+    def merge(self, other: Frequency):
+        """Add the count of another accumulator."""
+        self.count += other.count
+
+    def result(self) -> int:
+        """Get the frequency of the counted value."""
+        return self.count
+
+
+class Maximum(Aggregate):
+    """Maximum over all values. The maximum for an empty stream is None."""
+    def __init__(self):
+        """Initialize the maximum."""
+        self.value = None
+
+    def add(self, value: Value):
+        """Update the maximum."""
+        if self.value is None or value > self.value:
+            self.value = value
+
+    def merge(self, other: Maximum):
+        """Update the maximum with the maximum of another accumulator."""
+        if other.value is not None:
+            self.add(other.value)
+
+    def result(self) -> Value:
+        """Get the maximum value."""
+        return self.value
+
+
+class Mean(Aggregate):
+    """Mean of all values. The mean for an empty stream is NaN. For tuples of
+    values the mean is computed over all values in the tuples (as for the
+    mean over a multi-dimensional array).
+    """
+    def __init__(self):
+        """Initialize the sum and count of values."""
+        self.sum = 0
+        self.count = 0
+
+    def add(self, value: Value):
+        """Add the value(s) to the sum."""
+        if isinstance(value, tuple):
+            self.sum += sum(value)
+            self.count += len(value)
+        else:
+            self.sum += value
+            self.count += 1
+
+    def merge(self, other: Mean):
+        """Add the sum and count of another accumulator."""
+        self.sum += other.sum
+        self.count += other.count
+
+    def result(self) -> float:
+        """Get the mean value."""
+        return self.sum / self.count if self.count else np.nan
+
+
+class Minimum(Aggregate):
+    """Minimum over all values. The minimum for an empty stream is None."""
+    def __init__(self):
+        """Initialize the minimum."""
+        self.value = None
+
+    def add(self, value: Value):
+        """Update the minimum."""
+        if self.value is None or value < self.value:
+            self.value = value
+
+    def merge(self, other: Minimum):
+        """Update the minimum with the minimum of another accumulator."""
+        if other.value is not None:
+            self.add(other.value)
+
+    def result(self) -> Value:
+        """Get the minimum value."""
+        return self.value
+
+
+class Total(Aggregate):
+    """Sum over all values."""
+    def __init__(self):
+        """Initialize the sum."""
+        self.sum = 0
+
+    def add(self, value: Value):
+        """Add the value to the sum."""
+        self.sum += value
+
+    def merge(self, other: Total):
+        """Add the sum of another accumulator."""
+        self.sum += other.sum
+
+    def result(self) -> Value:
+        """Get the sum of all values."""
+        return self.sum
+
+
 # -- Generic prepared statistics function -------------------------------------
 
 class ColumnAggregator(ValueFunction):
@@ -27,15 +165,32 @@ class ColumnAggregator(ValueFunction):
     a constant value function that is initialized with the aggregation result,
     i.e., that will return the aggregation result for any input value.
     """
-    def __init__(self, func: Callable):
+    def __init__(self, func: Callable, aggregate: Optional[Callable[[], Aggregate]] = None):
         """Initialize the aggregation function.
 
         Parameters
         ----------
         func: callable
             Function that computes an aggregated value over a list of values.
+        aggregate: callable, default=None
+            Factory for accumulators that compute the aggregated value over a
+            stream of values. If not given, the aggregated value for a stream
+            is computed over the list of all values.
         """
         self.func = func
+        self.aggregate = aggregate
+
+    def accumulator(self) -> Accumulator:
+        """Get an accumulator for the aggregated value over a stream of
+        values.
+
+        Returns
+        -------
+        openclean.function.value.accumulator.Accumulator
+        """
+        if self.aggregate is None:
+            return super(ColumnAggregator, self).accumulator()
+        return self.aggregate()
 
     def eval(self, value: Value):
         """Raises an error. The column aggregator can only be used to prepare
@@ -82,6 +237,23 @@ class ColumnAggregator(ValueFunction):
         """
         return ConstantValue(self.func(values))
 
+    def prepare_accumulated(self, acc: Accumulator) -> ConstantValue:
+        """Get a constant value function for the aggregated value over a
+        stream of values.
+
+        Parameters
+        ----------
+        acc: openclean.function.value.accumulator.Accumulator
+            Accumulator that was created by the accumulator method.
+
+        Returns
+        -------
+        openclean.function.value.base.ConstantValue
+        """
+        if self.aggregate is None:
+            return super(ColumnAggregator, self).prepare_accumulated(acc)
+        return ConstantValue(acc.result())
+
 
 # -- Shortcuts for common statistics methods ----------------------------------
 
@@ -100,7 +272,7 @@ class Avg(Eval):
         """
         super(Avg, self).__init__(
             columns=columns,
-            func=ColumnAggregator(np.mean),
+            func=ColumnAggregator(np.mean, aggregate=Mean),
             is_unary=True
         )
 
@@ -133,7 +305,7 @@ class Count(Eval):
 
         super(Count, self).__init__(
             columns=columns,
-            func=ColumnAggregator(count),
+            func=ColumnAggregator(count, aggregate=partial(Frequency, value)),
             is_unary=True
         )
 
@@ -158,7 +330,7 @@ class Max(Eval):
 
         super(Max, self).__init__(
             columns=columns,
-            func=ColumnAggregator(maxval),
+            func=ColumnAggregator(maxval, aggregate=Maximum),
             is_unary=True
         )
 
@@ -183,7 +355,7 @@ class Min(Eval):
 
         super(Min, self).__init__(
             columns=columns,
-            func=ColumnAggregator(minval),
+            func=ColumnAggregator(minval, aggregate=Minimum),
             is_unary=True
         )
 
@@ -203,6 +375,6 @@ class Sum(Eval):
         """
         super(Sum, self).__init__(
             columns=columns,
-            func=ColumnAggregator(sum),
+            func=ColumnAggregator(sum, aggregate=Total),
             is_unary=True
         )
@@ -12,6 +12,8 @@ return either a data series or a list of scalar values.
 
 from __future__ import annotations
 from abc import ABCMeta, abstractmethod
+from copy import deepcopy
+from functools import partial
 from typing import Callable, Dict, List, Union, Optional
 
 import operator
@@ -20,9 +22,24 @@ import pandas as pd
 from openclean.data.stream.base import DataRow, StreamFunction
 from openclean.data.schema import column_ref, select_clause
 from openclean.data.types import Column, Columns, Scalar, DatasetSchema, Value
+from openclean.engine.parallel import process_frame
+from openclean.function.eval.memo import MemoizedFunction, memoized_map
+from openclean.function.value.accumulator import Accumulator, merge_accumulators
 from openclean.function.value.base import ValueFunction
 from openclean.util.core import scalar_pass_through, tenary_pass_through
 
+import openclean.config as config
+
+
+"""Minimum number of rows in each data frame chunk for parallel evaluation."""
+MIN_CHUNKSIZE = 1000
+
+"""Comparison operators that are always applied on vectorized operands."""
+COMPARISON_OPS = (operator.eq, operator.ge, operator.gt, operator.le, operator.lt, operator.ne)
+
+"""Arithmetic operators that are applied on vectorized float operands."""
+ARITHMETIC_OPS = (operator.add, operator.floordiv, operator.mul, operator.sub, operator.truediv)
+
 
 # -- Evaluation Functions -----------------------------------------------------
 
@@ -50,6 +67,14 @@ class EvalFunction(metaclass=ABCMeta):
       as the only argument and that returns a single value or a tuple of values
       depending on whether the evaluation function operators on one or more
       columns.
+
+    In addition, evaluation functions may implement the optional vectorize
+    method. The method receives the full data frame and returns a data series
+    that is computed on whole columns (e.g., using NumPy operators) instead of
+    calling a Python function for each value. Functions that cannot be
+    vectorized (e.g., because they apply an arbitrary callable) return None.
+    Data frame operators use vectorize if possible and fall back to eval
+    otherwise.
     """
     def __add__(self, other: EvalSpec) -> EvalFunction:
         """Return an instance of the Add class to compute the sum of two
@@ -231,6 +256,40 @@ class EvalFunction(metaclass=ABCMeta):
         """
         return Divide(self, other)
 
+    def apply(self, df: pd.DataFrame, threads: Optional[int] = None) -> EvalResult:
+        """Evaluate the function on a given data frame using multiple parallel
+        processes. The data frame is split into chunks of consecutive rows
+        that are evaluated in separate worker processes. The results for all
+        chunks are concatenated in the order of the rows in the data frame.
+
+        Consumers that need to be prepared are prepared over the full data
+        frame before the chunks are evaluated. The function is evaluated in
+        the main process if less than two chunks of at least MIN_CHUNKSIZE
+        rows can be formed.
+
+        Parameters
+        ----------
+        df: pd.DataFrame
+            Pandas data frame.
+        threads: int, default=None
+            Number of parallel threads to use for processing. If None the
+            value from the environment variable 'OPENCLEAN_THREADS' is used as
+            the default.
+
+        Returns
+        -------
+        pd.Series or list
+        """
+        threads = threads if threads is not None else config.THREADS()
+        processes = min(threads, len(df.index) // MIN_CHUNKSIZE)
+        if processes < 2:
+            return self.eval(df)
+        func = prepare_frame(func=self, df=df, processes=processes)
+        results = process_frame(func=func.eval, df=df, processes=processes)
+        if all(isinstance(r, pd.Series) for r in results):
+            return pd.concat(results)
+        return [value for r in results for value in r]
+
     @abstractmethod
     def eval(self, df: pd.DataFrame) -> EvalResult:
         """Evaluate the function on a given data frame. The result is either
@@ -272,12 +331,43 @@ class EvalFunction(metaclass=ABCMeta):
         """
         raise NotImplementedError()
 
+    def unprepared(self) -> List[Eval]:
+        """Get the list of evaluation functions in the expression tree whose
+        consumer needs to be prepared before the function can be evaluated
+        on a data stream. Functions are listed in bottom-up order, i.e.,
+        nested functions are listed before the functions that contain them.
+        The default is an empty list.
+
+        Returns
+        -------
+        list of openclean.function.eval.base.Eval
+        """
+        return list()
+
+    def vectorize(self, df: pd.DataFrame) -> Optional[pd.Series]:
+        """Evaluate the function on whole columns of the given data frame.
+        Returns None if the function does not have a vectorized
+        implementation. This is the default.
+
+        Parameters
+        ----------
+        df: pd.DataFrame
+            Pandas data frame.
+
+        Returns
+        -------
+        pd.Series
+        """
+        return None
+
 
 """Type aliases for parameters and return values of evaluation functions."""
 EvalResult = Union[pd.Series, List[Value]]
 EvalSpec = Union[Scalar, Callable, EvalFunction]
 InputColumn = Union[int, str, Column, EvalFunction]
 ValueExpression = Union[Scalar, EvalFunction]
+VectorOperand = Union[pd.Series, Scalar]
+VectorFunction = Callable[..., Optional[pd.Series]]
 
 
 # -- Factory ------------------------------------------------------------------
@@ -432,11 +522,18 @@ class Eval(EvalFunction):
     A ternary evaluation function with a unary consumer will pass a tuple with
     the extracted values to the consumer. A unary evaluation function with a
     ternary consumer will raise a TypeError error in the constructor.
+
+    Expensive consumers can be memoized. If memoization is enabled, the
+    consumer is evaluated only once for each distinct (combination of) input
+    value(s) in a data frame. For data streams, the consumer results are kept
+    in a bounded LRU cache. Memoization should only be used for consumers that
+    are deterministic and that do not have side effects.
     """
     def __init__(
         self, columns: Union[InputColumn, List[InputColumn]],
         func: Union[Callable, ValueFunction], args: Optional[Dict] = None,
-        is_unary: Optional[bool] = None
+        is_unary: Optional[bool] = None, vecfunc: Optional[VectorFunction] = None,
+        memoize: Optional[bool] = False
     ):
         """Create an instance of an evaluation function that extracts values
         from the specified columns and applies a given function (consumer) on
@@ -468,12 +565,22 @@ class Eval(EvalFunction):
         args: dict, default=None
             Additional keyword arguments that are passed to the callable together
             with the column values that are extracted from each row.
+        vecfunc: callable, default=None
+            Vectorized implementation of the consumer. The function receives
+            one data series for each producer and returns a data series with
+            the consumer results. It may return None if the values in the
+            given series are not supported. In this case the consumer is
+            applied to each value instead.
         is_unary: bool, default=None
             Determines whether the consumer expects a single value or multiple
             values as argument. The default is None and the flag is ignored for
             unary evaluation functions. For ternary evaluation functions by
             default it is assumed that the consumer is a ternary function as
             well.
+        memoize: bool, default=False
+            Evaluate the consumer only once for each distinct input value. If
+            None, memoization is used if the estimated fraction of repeated
+            input values is high enough.
 
         Raises
         ------
@@ -507,6 +614,8 @@ class Eval(EvalFunction):
         self._is_prepared = func.is_prepared() if isinstance(func, ValueFunction) else True  # noqa: E501
         self.consumer = func
         self.args = args
+        self.vecfunc = vecfunc
+        self.memoize = memoize
 
     def decorate(self, func):
         """Decorate the given function with the optional keyword arguments that
@@ -524,25 +633,9 @@ class Eval(EvalFunction):
         # Return undecorated function if no additional arguments are specified.
         if self.args is None:
             return func
-
-        if len(self.producers) == 1 or self.is_unary:
-            # Decorate a unary function that passes the static arguments as
-            # keyword arguments to the decorated function.
-
-            def decorated_unary_func(value):
-                return func(value, **self.args)
-
-            return decorated_unary_func
-
-        else:
-            # Decorate a ternary function that takes multiple column values as
-            # input together with the static arguments that are passed on as
-            # keyword arguments to the decorated function.
-
-            def decorated_ternary_func(*value):
-                return func(*value, **self.args)
-
-            return decorated_ternary_func
+        # The static arguments are passed as keyword arguments to the decorated
+        # function (together with the column values).
+        return partial(func, **self.args)
 
     def eval(self, df: pd.DataFrame) -> EvalResult:
         """Evaluate the consumer on the lists of values that are generated by
@@ -557,6 +650,12 @@ class Eval(EvalFunction):
         -------
         pd.Series or list
         """
+        # Use the vectorized implementation of the consumer if possible. The
+        # result is returned as a list for consistency with the evaluation of
+        # the consumer on individual values.
+        result = self.vectorize(df)
+        if result is not None:
+            return result.tolist()
         # We distinguish three main cases based on the number of producers and
         # the arity of the consumer.
         if len(self.producers) == 1:
@@ -568,6 +667,10 @@ class Eval(EvalFunction):
             else:
                 prep_consumer = self.consumer
             func = self.decorate(prep_consumer)
+            if self.memoize is not False:
+                result = memoized_map(func, [data], adaptive=self.memoize is None)
+                if result is not None:
+                    return result
             return [func(v) for v in data]
         else:
             # Inputs for the consumer come from multiple producers. Start with a
@@ -579,6 +682,10 @@ class Eval(EvalFunction):
             else:
                 prep_consumer = self.consumer
             func = self.decorate(prep_consumer)
+            if self.memoize is not False:
+                result = memoized_map(func, data, packed=self.is_unary, adaptive=self.memoize is None)
+                if result is not None:
+                    return result
             # Iterate over all result tuples and pass them to the consumer. The
             # implementation differes depending on the arity of the consumer.
             # A unary consumer receives a tuple of values. For a n-ary consumer
@@ -588,6 +695,89 @@ class Eval(EvalFunction):
             else:
                 return [func(*t) for t in zip(*data)]
 
+    def prepare_accumulated(self, acc: Accumulator):
+        """Prepare the consumer using statistics that were accumulated over
+        the consumer inputs in a data stream (see
+        :meth:`openclean.function.eval.base.Eval.prepare_input`).
+
+        Parameters
+        ----------
+        acc: openclean.function.value.accumulator.Accumulator
+            Accumulated statistics for the consumer inputs.
+        """
+        self.consumer = self.consumer.prepare_accumulated(acc)
+        self._is_prepared = True
+
+    def prepare_input(self, columns: DatasetSchema) -> StreamFunction:
+        """Create a stream function that returns the input value for the
+        consumer, i.e., a single value for a single producer or a tuple of
+        values for multiple producers. All producers are expected to be
+        prepared.
+
+        Parameters
+        ----------
+        columns: list of string
+            Schema for data stream rows.
+
+        Returns
+        -------
+        openclean.data.stream.base.StreamFunction
+        """
+        prep_prods = [f.prepare(columns) for f in self.producers]
+        if len(prep_prods) == 1:
+            return prep_prods[0]
+        return TernaryStreamFunction(
+            producers=prep_prods,
+            consumer=tenary_pass_through,
+            is_unary=False
+        )
+
+    def unprepared(self) -> List[Eval]:
+        """Get the list of nested evaluation functions for the producers that
+        need to be prepared. The function itself is added if the consumer
+        needs to be prepared.
+
+        Returns
+        -------
+        list of openclean.function.eval.base.Eval
+        """
+        result = [e for f in self.producers for e in f.unprepared()]
+        if not self._is_prepared:
+            result.append(self)
+        return result
+
+    def vectorize(self, df: pd.DataFrame) -> Optional[pd.Series]:
+        """Evaluate the vectorized implementation of the consumer (if given)
+        on the vectorized results of the producers. Returns None if the
+        consumer has no vectorized implementation, if the consumer needs to be
+        prepared, takes additional arguments, or receives tuples of values from
+        multiple producers, if any of the producers cannot
+        be vectorized, or if the vectorized implementation does not support
+        the values in the data frame.
+
+        Parameters
+        ----------
+        df: pd.DataFrame
+            Pandas data frame.
+
+        Returns
+        -------
+        pd.Series
+        """
+        if self.vecfunc is None or self.args is not None or not self._is_prepared:
+            return None
+        # A unary consumer with multiple producers receives tuples of values.
+        # These cannot be represented as a data series.
+        if self.is_unary and len(self.producers) > 1:
+            return None
+        data = list()
+        for f in self.producers:
+            values = f.vectorize(df)
+            if values is None:
+                return None
+            data.append(values)
+        return self.vecfunc(*data)
+
     def prepare(self, columns: DatasetSchema) -> StreamFunction:
         """Create a stream function that applies the consumer on the results
         from one or more stream functions for the producers.
@@ -602,8 +792,9 @@ class Eval(EvalFunction):
         openclean.function.eval.base.EvalFunction
         """
         # Raises an error if the consumer needs to be prepared. Value function
-        # preparation is not supported for data streams since we do not have
-        # access to the full list of values at this point.
+        # preparation requires access to the full list of values. In data
+        # pipelines the consumer is prepared in a separate pass over the data
+        # stream before streaming starts (see DataPipeline.prepare).
         if not self._is_prepared:
             raise RuntimeError('cannot prepare value function for stream')
         # Create stream functions for all producers.
@@ -611,6 +802,12 @@ class Eval(EvalFunction):
         # Distinguish between unary and ternary stream functions based on the
         # number of producers.
         func = self.decorate(self.consumer)
+        if self.memoize is not False:
+            func = MemoizedFunction(
+                func=func,
+                packed=len(prep_prods) > 1 and self.is_unary,
+                adaptive=self.memoize is None
+            )
         if len(prep_prods) == 1:
             return UnaryStreamFunction(
                 producer=prep_prods[0],
@@ -663,6 +860,9 @@ class Const(EvalFunction):
         """Execute method for the evaluation function. Returns a list in the
         length of the data frame (row count) with the defined constant value.
 
+        Binary operators use the constant value directly (instead of the
+        list) if it is a scalar (see :meth:`is_scalar`).
+
         Parameters
         ----------
         df: pd.DataFrame
@@ -674,6 +874,17 @@ class Const(EvalFunction):
         """
         return [self.value] * df.shape[0]
 
+    def is_scalar(self) -> bool:
+        """Test if the constant value is a scalar that can be combined with a
+        data series in vectorized operations. None is not a scalar in this
+        sense since pandas operators treat None as a missing value.
+
+        Returns
+        -------
+        bool
+        """
+        return isinstance(self.value, (str, int, float))
+
     def prepare(self, columns: DatasetSchema) -> StreamFunction:
         """The prepare method returns a callable that returns the constant
         value for evary input row.
@@ -750,6 +961,20 @@ class Col(EvalFunction):
         _, colidx = column_ref(schema=df.columns, column=self.column)
         return df.iloc[:, colidx]
 
+    def vectorize(self, df: pd.DataFrame) -> pd.Series:
+        """Get the data series for the referenced column.
+
+        Parameters
+        ----------
+        df: pd.DataFrame
+            Pandas data frame.
+
+        Returns
+        -------
+        pd.Series
+        """
+        return self.eval(df)
+
     def prepare(self, columns: DatasetSchema) -> StreamFunction:
         """Return a Col function that is prepared, i.e., that has the column
         index for the column that it operates on initialized.
@@ -823,7 +1048,7 @@ class Cols(EvalFunction):
         # whether one or multiple columns are referenced.
         if len(colidxs) == 1:
             # For a single column we iterate over a data series.
-            return [(v, ) for v in df.iloc[:, colidxs][0]]
+            return [(v, ) for v in df.iloc[:, colidxs[0]]]
         else:
             # For multiple columns we iterate over a data frame.
             data = df.iloc[:, colidxs]
@@ -885,12 +1110,19 @@ class BinaryOperator(EvalFunction):
         -------
         pd.Series or list
         """
+        # Use vectorized evaluation if possible. For consistency with the
+        # evaluation on individual values, the result is a list if one of the
+        # operands is a constant value.
+        result = self.vectorize(df)
+        if result is not None:
+            return result.tolist() if is_scalar(self.lhs) or is_scalar(self.rhs) else result
         # Extract values for lhs and rhs of the comparison from the data frame.
         lhs_data = self.lhs.eval(df)
         rhs_data = self.rhs.eval(df)
         # Evaluation of the comparison depends on whether the lhs and rhs are
         # both data series or not.
-        if isinstance(lhs_data, pd.Series) and isinstance(rhs_data, pd.Series):
+        is_series = isinstance(lhs_data, pd.Series) and isinstance(rhs_data, pd.Series)
+        if is_series and is_vectorizable(self.op, lhs_data, rhs_data):
             # We can apply the operator directly on the two data series.
             return self.op(lhs_data, rhs_data)
         else:
@@ -917,6 +1149,45 @@ class BinaryOperator(EvalFunction):
             op=self.op
         )
 
+    def unprepared(self) -> List[Eval]:
+        """Get the list of nested evaluation functions for both operands that
+        need to be prepared.
+
+        Returns
+        -------
+        list of openclean.function.eval.base.Eval
+        """
+        return self.lhs.unprepared() + self.rhs.unprepared()
+
+    def vectorize(self, df: pd.DataFrame) -> Optional[pd.Series]:
+        """Apply the operator on the vectorized results of the lhs and rhs
+        expressions. Scalar constants are combined with the data series of
+        the other operand. Returns None if either of the operands cannot be
+        vectorized, if both operands are constants, or if the vectorized
+        operator may return a different result than the operator on
+        individual values (see :func:`is_vectorizable`).
+
+        Parameters
+        ----------
+        df: pd.DataFrame
+            Pandas data frame.
+
+        Returns
+        -------
+        pd.Series
+        """
+        if is_scalar(self.lhs) and is_scalar(self.rhs):
+            return None
+        lhs_data = self.lhs.value if is_scalar(self.lhs) else self.lhs.vectorize(df)
+        if lhs_data is None:
+            return None
+        rhs_data = self.rhs.value if is_scalar(self.rhs) else self.rhs.vectorize(df)
+        if rhs_data is None:
+            return None
+        if not is_vectorizable(self.op, lhs_data, rhs_data):
+            return None
+        return self.op(lhs_data, rhs_data)
+
 
 # -- Comparison predicates ----------------------------------------------------
 
@@ -1108,6 +1379,102 @@ class Subtract(BinaryOperator):
 
 # -- Helper Functions ---------------------------------------------------------
 
+def is_scalar(func: EvalFunction) -> bool:
+    """Test if the given evaluation function is a constant function with a
+    scalar value.
+
+    Parameters
+    ----------
+    func: openclean.function.eval.base.EvalFunction
+        Evaluation function.
+
+    Returns
+    -------
+    bool
+    """
+    return isinstance(func, Const) and func.is_scalar()
+
+
+def is_vectorizable(op: Callable, lhs: VectorOperand, rhs: VectorOperand) -> bool:
+    """Test if applying a binary operator on the vectorized operands returns
+    the same result as applying the operator on individual values. Operators
+    are not vectorized for data series with missing values. Otherwise,
+    comparisons are always vectorized. Arithmetic on integer data series may
+    overflow and division by zero returns inf or NaN instead of raising an
+    error. Arithmetic operators (except pow) are therefore only vectorized if
+    at least one of the operands is a float and all divisors are non-zero.
+
+    Parameters
+    ----------
+    op: callable
+        Binary operator.
+    lhs: pd.Series or scalar
+        Left operand.
+    rhs: pd.Series or scalar
+        Right operand.
+
+    Returns
+    -------
+    bool
+    """
+    # Pandas operators treat None as a missing value instead of raising an
+    # error (e.g., for None > 1) like the operator on individual values.
+    for value in (lhs, rhs):
+        if isinstance(value, pd.Series) and value.isna().any():
+            return False
+    if op in COMPARISON_OPS:
+        return True
+    if op not in ARITHMETIC_OPS:
+        return False
+    kinds = [numeric_kind(lhs), numeric_kind(rhs)]
+    if None in kinds or 'f' not in kinds:
+        return False
+    if op in (operator.truediv, operator.floordiv):
+        return bool((rhs != 0).all()) if isinstance(rhs, pd.Series) else rhs != 0
+    return True
+
+
+def is_string_series(data: pd.Series) -> bool:
+    """Test if all values in the given data series are strings. Missing values
+    are not strings.
+
+    Parameters
+    ----------
+    data: pd.Series
+        Data series.
+
+    Returns
+    -------
+    bool
+    """
+    return pd.api.types.infer_dtype(data, skipna=False) == 'string'
+
+
+def accumulate(functions: List[Eval], df: pd.DataFrame) -> List[Accumulator]:
+    """Add the consumer inputs for all rows in a data frame to accumulators
+    for the consumers of the given evaluation functions. Returns one
+    accumulator for each function.
+
+    Parameters
+    ----------
+    functions: list of openclean.function.eval.base.Eval
+        Evaluation functions with prepared producers.
+    df: pd.DataFrame
+        Pandas data frame.
+
+    Returns
+    -------
+    list of openclean.function.value.accumulator.Accumulator
+    """
+    accumulators = list()
+    for f in functions:
+        acc = f.consumer.accumulator()
+        for value in evaluate(df=df, producers=f.producers):
+            acc.add(value)
+        accumulators.append(acc)
+    return accumulators
+
+
 def evaluate(df: pd.DataFrame, producers: List[EvalFunction]) -> EvalResult:
     """Helper method to extract a list of values (i.e., an evaluation result)
     from a data frame using one or more producers (evaluation functions).
@@ -1136,6 +1503,68 @@ def evaluate(df: pd.DataFrame, producers: List[EvalFunction]) -> EvalResult:
         return [t for t in zip(*[f.eval(df) for f in producers])]
 
 
+def numeric_kind(value: VectorOperand) -> Optional[str]:
+    """Get the numpy kind character for a numeric data series or scalar
+    ('b' for Boolean, 'i' or 'u' for integer, and 'f' for float values).
+    Returns None for values that are not numeric.
+
+    Parameters
+    ----------
+    value: pd.Series or scalar
+        Operand of a vectorized operator.
+
+    Returns
+    -------
+    string
+    """
+    if isinstance(value, pd.Series):
+        kind = value.dtype.kind
+        return kind if kind in ('b', 'i', 'u', 'f') else None
+    if isinstance(value, float):
+        return 'f'
+    if isinstance(value, int):
+        return 'i'
+    return None
+
+
+def prepare_frame(func: EvalFunction, df: pd.DataFrame, processes: int) -> EvalFunction:
+    """Get a copy of an evaluation function where all consumers are prepared
+    over the given data frame. The statistics for preparing the consumers are
+    accumulated for chunks of the data frame in parallel. Nested consumers
+    that need to be prepared require one pass over the data frame for each
+    level of nesting. Returns the given function if none of the consumers
+    needs to be prepared.
+
+    Parameters
+    ----------
+    func: openclean.function.eval.base.EvalFunction
+        Evaluation function.
+    df: pd.DataFrame
+        Pandas data frame.
+    processes: int
+        Number of parallel processes.
+
+    Returns
+    -------
+    openclean.function.eval.base.EvalFunction
+    """
+    if not func.unprepared():
+        return func
+    func = deepcopy(func)
+    while True:
+        # Prepare all functions whose producers are prepared in a single pass.
+        ready = dict()
+        for f in func.unprepared():
+            if not any(p.unprepared() for p in f.producers):
+                ready[id(f)] = f
+        if not ready:
+            return func
+        functions = list(ready.values())
+        results = process_frame(func=partial(accumulate, functions), df=df, processes=processes)
+        for f, acc in zip(functions, merge_accumulators(results)):
+            f.prepare_accumulated(acc)
+
+
 def to_const_eval(value):
     """Ensure that the value is an evaluation function. If the given argument
     is not an evaluation function the value is wrapped as a constant value.
@@ -0,0 +1,294 @@
+# This file is part of the Data Cleaning Library (openclean).
+#
+# Copyright (C) 2018-2021 New York University.
+#
+# openclean is released under the Revised BSD License. See file LICENSE for
+# full license details.
+
+"""Compiler for prepared evaluation functions. The prepare method of an
+evaluation function returns a tree of nested stream functions (e.g., binary
+operators whose operands are column references and constants). Evaluating
+the tree for a data stream row requires a call for each node in the tree.
+
+The compiler translates the tree into the source code for a single Python
+function that accesses row values by their index, inlines constant values and
+standard operators, and calls the consumers of evaluation functions directly.
+Common subexpressions are evaluated only once for each row. This assumes that
+consumers are deterministic, i.e., that they return the same result when
+called on the same arguments.
+
+Stream functions that are not part of the expression tree (e.g., user-defined
+stream functions) are called with the row as their argument.
+"""
+
+from functools import partial
+from typing import Any, Callable, Dict, List
+
+import math
+import operator
+
+from openclean.data.stream.base import StreamFunction
+from openclean.function.eval.base import BinaryStreamFunction, Col, Cols, Const
+from openclean.function.eval.base import TernaryStreamFunction, UnaryStreamFunction
+
+
+"""Infix notation for standard operators."""
+OPERATORS = {
+    operator.add: '+',
+    operator.and_: '&',
+    operator.eq: '==',
+    operator.floordiv: '//',
+    operator.ge: '>=',
+    operator.gt: '>',
+    operator.le: '<=',
+    operator.lt: '<',
+    operator.mod: '%',
+    operator.mul: '*',
+    operator.ne: '!=',
+    operator.or_: '|',
+    operator.pow: '**',
+    operator.sub: '-',
+    operator.truediv: '/'
+}
+
+
+class FunctionCompiler(object):
+    """Compiler for a single prepared expression tree. The compiler generates
+    an expression for each node in the tree in a first pass. Expressions for
+    operators and consumers that occur more than once are assigned to local
+    variables in the second pass.
+    """
+    def __init__(self):
+        """Initialize the global names for objects that are referenced by the
+        generated code and the expression counts.
+        """
+        self.namespace = dict()
+        self.names = dict()
+        self.counts = dict()
+        self.exprs = dict()
+
+    def compile(self, func: StreamFunction) -> StreamFunction:
+        """Generate a Python function that is equivalent to the given stream
+        function.
+
+        Parameters
+        ----------
+        func: callable
+            Prepared evaluation function.
+
+        Returns
+        -------
+        callable
+        """
+        self.visit(func)
+        lines, temps = list(), dict()
+        result = self.emit(func, lines, temps)
+        source = 'def compiled_func(row):\n'
+        for line in lines:
+            source += '    {}\n'.format(line)
+        source += '    return {}\n'.format(result)
+        exec(source, self.namespace)
+        compiled_func = self.namespace['compiled_func']
+        compiled_func.source = source
+        return compiled_func
+
+    def constant(self, value: Any) -> str:
+        """Get the expression for a constant value. Values of the built-in
+        scalar types are inlined as literals. All other values (including
+        instances of subclasses of the scalar types) are referenced by a
+        global name.
+
+        Parameters
+        ----------
+        value: any
+            Constant value.
+
+        Returns
+        -------
+        string
+        """
+        # Subclasses of the scalar types (e.g., enums) may have a string
+        # representation that is not a valid literal.
+        if value is None or type(value) in (bool, int, str):
+            return repr(value)
+        if type(value) is float and math.isfinite(value):
+            return repr(value)
+        return self.name(value)
+
+    def call(self, func: Callable, args: List[str]) -> str:
+        """Get the expression for calling a function with the given argument
+        expressions. Keyword arguments of partial functions are passed on
+        directly.
+
+        Parameters
+        ----------
+        func: callable
+            Called function.
+        args: list of string
+            Expressions for the positional arguments.
+
+        Returns
+        -------
+        string
+        """
+        if isinstance(func, partial) and not func.args and all(k.isidentifier() for k in func.keywords):
+            kwargs = ['{}={}'.format(k, self.name(v)) for k, v in func.keywords.items()]
+            return '{}({})'.format(self.name(func.func), ', '.join(args + kwargs))
+        return '{}({})'.format(self.name(func), ', '.join(args))
+
+    def emit(self, func: StreamFunction, lines: List[str], temps: Dict[str, str]) -> str:
+        """Get the code for a node in the expression tree. Expressions that
+        occur more than once are assigned to a local variable when they are
+        evaluated for the first time.
+
+        Parameters
+        ----------
+        func: callable
+            Node in the expression tree.
+        lines: list of string
+            Statements that are executed before the result is returned.
+        temps: dict
+            Mapping of expressions to the local variables that hold their
+            value.
+
+        Returns
+        -------
+        string
+        """
+        expr = self.exprs[id(func)]
+        if expr in temps:
+            return temps[expr]
+        if isinstance(func, BinaryStreamFunction):
+            lhs = self.emit(func.lhs, lines, temps)
+            rhs = self.emit(func.rhs, lines, temps)
+            code = self.operator(func.op, lhs, rhs)
+        elif isinstance(func, UnaryStreamFunction):
+            code = self.call(func.consumer, [self.emit(func.producer, lines, temps)])
+        elif isinstance(func, TernaryStreamFunction):
+            code = self.consumer(func, [self.emit(f, lines, temps) for f in func.producers])
+        else:
+            return expr
+        if self.counts[expr] < 2:
+            return code
+        var = '_t{}'.format(len(temps))
+        temps[expr] = var
+        lines.append('{} = {}'.format(var, code))
+        return var
+
+    def consumer(self, func: TernaryStreamFunction, args: List[str]) -> str:
+        """Get the expression for calling the consumer of a ternary stream
+        function. A unary consumer receives a tuple of argument values.
+
+        Parameters
+        ----------
+        func: openclean.function.eval.base.TernaryStreamFunction
+            Ternary stream function.
+        args: list of string
+            Expressions for the producer values.
+
+        Returns
+        -------
+        string
+        """
+        if func.is_unary:
+            return self.call(func.consumer, ['({},)'.format(', '.join(args))])
+        return self.call(func.consumer, args)
+
+    def name(self, obj: Any) -> str:
+        """Get the global name for an object that is referenced by the
+        generated code.
+
+        Parameters
+        ----------
+        obj: any
+            Referenced object.
+
+        Returns
+        -------
+        string
+        """
+        name = self.names.get(id(obj))
+        if name is None:
+            name = '_g{}'.format(len(self.names))
+            self.names[id(obj)] = name
+            self.namespace[name] = obj
+        return name
+
+    def operator(self, op: Callable, lhs: str, rhs: str) -> str:
+        """Get the expression for a binary operator.
+
+        Parameters
+        ----------
+        op: callable
+            Binary operator.
+        lhs: string
+            Expression for the left-hand side operand.
+        rhs: string
+            Expression for the right-hand side operand.
+
+        Returns
+        -------
+        string
+        """
+        symbol = OPERATORS.get(op)
+        if symbol is not None:
+            return '({} {} {})'.format(lhs, symbol, rhs)
+        return self.call(op, [lhs, rhs])
+
+    def visit(self, func: StreamFunction) -> str:
+        """Get the expression for a node in the expression tree and count the
+        number of occurrences for expressions of operators and consumers.
+
+        Parameters
+        ----------
+        func: callable
+            Node in the expression tree.
+
+        Returns
+        -------
+        string
+        """
+        if isinstance(func, BinaryStreamFunction):
+            expr = self.operator(func.op, self.visit(func.lhs), self.visit(func.rhs))
+        elif isinstance(func, UnaryStreamFunction):
+            expr = self.call(func.consumer, [self.visit(func.producer)])
+        elif isinstance(func, TernaryStreamFunction):
+            expr = self.consumer(func, [self.visit(f) for f in func.producers])
+        else:
+            # Leaf nodes and stream functions that are not part of the
+            # expression tree are not considered for common subexpressions.
+            if type(func) is Col:
+                expr = 'row[{}]'.format(func._colidx)
+            elif type(func) is Cols and len(func._colidxs) == 1:
+                expr = 'row[{}]'.format(func._colidxs[0])
+            elif type(func) is Cols:
+                expr = '({},)'.format(', '.join('row[{}]'.format(i) for i in func._colidxs))
+            elif type(func) is Const:
+                expr = self.constant(func.value)
+            else:
+                expr = '{}(row)'.format(self.name(func))
+            self.exprs[id(func)] = expr
+            return expr
+        self.counts[expr] = self.counts.get(expr, 0) + 1
+        self.exprs[id(func)] = expr
+        return expr
+
+
+# -- Helper functions ---------------------------------------------------------
+
+def compile_function(func: StreamFunction) -> StreamFunction:
+    """Compile a prepared evaluation function into a single Python function.
+    Returns the given function if it is not an expression tree.
+
+    Parameters
+    ----------
+    func: callable
+        Prepared evaluation function.
+
+    Returns
+    -------
+    callable
+    """
+    if not isinstance(func, (BinaryStreamFunction, TernaryStreamFunction, UnaryStreamFunction)):
+        return func
+    return FunctionCompiler().compile(func)
@@ -9,7 +9,11 @@
 given data type constraint.
 """
 
-from openclean.function.eval.base import Eval
+from typing import Optional
+
+import pandas as pd
+
+from openclean.function.eval.base import Eval, is_string_series
 from openclean.function.value.datatype import (
     is_datetime, is_float, is_int, is_nan, to_datetime, to_int, to_float
 )
@@ -42,7 +46,7 @@ class IsDatetime(Eval):
         def func(value):
             return is_datetime(value, formats=formats, typecast=typecast)
 
-        super(IsDatetime, self).__init__(func=func, columns=columns, is_unary=True)
+        super(IsDatetime, self).__init__(func=func, columns=columns, is_unary=True, memoize=None)
 
 
 class IsInt(Eval):
@@ -68,7 +72,13 @@ class IsInt(Eval):
         def func(value):
             return is_int(value, typecast=typecast)
 
-        super(IsInt, self).__init__(func=func, columns=columns, is_unary=True)
+        def vecfunc(data):
+            if is_integer_series(data):
+                return pd.Series(True, index=data.index)
+            elif pd.api.types.is_float_dtype(data):
+                return pd.Series(False, index=data.index)
+
+        super(IsInt, self).__init__(func=func, columns=columns, is_unary=True, vecfunc=vecfunc)
 
 
 class IsFloat(Eval):
@@ -93,7 +103,13 @@ class IsFloat(Eval):
         def func(value):
             return is_float(value, typecast=typecast)
 
-        super(IsFloat, self).__init__(func=func, columns=columns, is_unary=True)
+        def vecfunc(data):
+            if pd.api.types.is_float_dtype(data):
+                return pd.Series(True, index=data.index)
+            elif is_integer_series(data):
+                return pd.Series(False, index=data.index)
+
+        super(IsFloat, self).__init__(func=func, columns=columns, is_unary=True, vecfunc=vecfunc)
 
 
 class IsNaN(Eval):
@@ -111,7 +127,13 @@ class IsNaN(Eval):
             This can also be a single evalaution function or a list of
             functions.
         """
-        super(IsNaN, self).__init__(func=is_nan, columns=columns, is_unary=True)
+        def vecfunc(data):
+            if pd.api.types.is_float_dtype(data):
+                return data.isna()
+            elif is_integer_series(data):
+                return pd.Series(False, index=data.index)
+
+        super(IsNaN, self).__init__(func=is_nan, columns=columns, is_unary=True, vecfunc=vecfunc)
 
 
 # -- Type converters ----------------------------------------------------------
@@ -137,7 +159,11 @@ class Bool(Eval):
         def cast(value):
             return True if value else False
 
-        super(Bool, self).__init__(func=cast, columns=columns, is_unary=True)
+        def vecfunc(data):
+            if is_integer_series(data) or pd.api.types.is_float_dtype(data):
+                return data.astype(bool)
+
+        super(Bool, self).__init__(func=cast, columns=columns, is_unary=True, vecfunc=vecfunc)
 
 
 class Datetime(Eval):
@@ -169,7 +195,7 @@ class Datetime(Eval):
                 raise_error=raise_error
             )
 
-        super(Datetime, self).__init__(func=cast, columns=columns, is_unary=True)
+        super(Datetime, self).__init__(func=cast, columns=columns, is_unary=True, memoize=None)
 
 
 class Float(Eval):
@@ -201,7 +227,11 @@ class Float(Eval):
                 raise_error=raise_error
             )
 
-        super(Float, self).__init__(func=cast, columns=columns, is_unary=True)
+        def vecfunc(data):
+            if is_integer_series(data) or pd.api.types.is_float_dtype(data):
+                return data.astype(float)
+
+        super(Float, self).__init__(func=cast, columns=columns, is_unary=True, vecfunc=vecfunc)
 
 
 class Int(Eval):
@@ -233,7 +263,14 @@ class Int(Eval):
                 raise_error=raise_error
             )
 
-        super(Int, self).__init__(func=cast, columns=columns, is_unary=True)
+        def vecfunc(data):
+            if is_integer_series(data):
+                return data.astype(int)
+            # Missing and infinite values cannot be cast to integer.
+            elif pd.api.types.is_float_dtype(data) and data.abs().lt(float('inf')).all():
+                return data.astype(int)
+
+        super(Int, self).__init__(func=cast, columns=columns, is_unary=True, vecfunc=vecfunc)
 
 
 class Str(Eval):
@@ -248,4 +285,27 @@ class Str(Eval):
             This can also be a single evalaution function or a list of
             functions.
         """
-        super(Str, self).__init__(func=str, columns=columns, is_unary=True)
+        def vecfunc(data):
+            if is_string_series(data):
+                return data
+            elif is_integer_series(data):
+                return data.astype(str)
+
+        super(Str, self).__init__(func=str, columns=columns, is_unary=True, vecfunc=vecfunc)
+
+
+# -- Helper functions ---------------------------------------------------------
+
+def is_integer_series(data: pd.Series) -> Optional[bool]:
+    """Test if the given data series has an integer (or Boolean) data type.
+
+    Parameters
+    ----------
+    data: pd.Series
+        Data series.
+
+    Returns
+    -------
+    bool
+    """
+    return pd.api.types.is_integer_dtype(data) or pd.api.types.is_bool_dtype(data)
@@ -14,7 +14,7 @@ import pandas as pd
 from openclean.data.stream.base import DataRow, StreamFunction
 from openclean.data.types import DatasetSchema, Value
 from openclean.data.util import to_set
-from openclean.function.eval.base import InputColumn, Eval, EvalFunction, EvalResult
+from openclean.function.eval.base import InputColumn, Eval, EvalFunction, EvalResult, is_string_series
 from openclean.function.eval.base import evaluate, to_eval
 from openclean.function.value.domain import IsInDomain, IsNotInDomain
 
@@ -44,10 +44,12 @@ class IsIn(Eval):
         # Convert pandas data frames or series into a set of values.
         if type(domain) in [pd.DataFrame, pd.Series]:
             domain = to_set(domain)
+        func = IsInDomain(domain, ignore_case=ignore_case)
         super(IsIn, self).__init__(
-            func=IsInDomain(domain, ignore_case=ignore_case),
+            func=func,
             columns=columns,
-            is_unary=True
+            is_unary=True,
+            vecfunc=lambda data: vectorized_isin(data, func)
         )
 
 
@@ -74,13 +76,40 @@ class IsNotIn(Eval):
         # Convert pandas data frames or series into a set of values.
         if type(domain) in [pd.DataFrame, pd.Series]:
             domain = to_set(domain)
+        func = IsNotInDomain(domain, ignore_case=ignore_case)
         super(IsNotIn, self).__init__(
-            func=IsNotInDomain(domain, ignore_case=ignore_case),
+            func=func,
             columns=columns,
-            is_unary=True
+            is_unary=True,
+            vecfunc=lambda data: vectorized_isin(data, func)
         )
 
 
+def vectorized_isin(data: pd.Series, func: IsInDomain) -> Optional[pd.Series]:
+    """Vectorized domain membership test for series of string values. Returns
+    None if the series contains values that are not strings or if the domain
+    is not a collection of values (e.g., an object that implements a custom
+    __contains__ method).
+
+    Parameters
+    ----------
+    data: pd.Series
+        Data series of argument values.
+    func: openclean.function.value.domain.IsInDomain
+        Domain membership function.
+
+    Returns
+    -------
+    pd.Series
+    """
+    if not isinstance(func.domain, (set, frozenset, list, tuple)) or not is_string_series(data):
+        return None
+    if func.ignore_case:
+        data = data.str.lower()
+    is_in = data.isin(func.domain)
+    return ~is_in if func.negated else is_in
+
+
 # -- Lookup tables ------------------------------------------------------------
 
 class Lookup(EvalFunction):
@@ -200,3 +229,14 @@ class Lookup(EvalFunction):
             return value
 
         return lookup
+
+    def unprepared(self) -> List[Eval]:
+        """Get the list of nested evaluation functions for the lookup values
+        and the defaults that need to be prepared.
+
+        Returns
+        -------
+        list of openclean.function.eval.base.Eval
+        """
+        funcs = self.producers + (self.default if self.default is not None else [])
+        return [e for f in funcs for e in f.unprepared()]
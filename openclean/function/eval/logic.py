@@ -9,27 +9,287 @@
 for data frame rows.
 """
 
-from openclean.function.eval.base import Eval
+from functools import reduce
+from typing import Callable, Iterable, List, Optional
 
+import numpy as np
+import operator
+import pandas as pd
+import time
 
-class And(Eval):
-    """Logical conjunction of predicates."""
-    def __init__(self, *args):
-        """Initialize the list of predicates in the conjunction.
+from openclean.data.stream.base import DataRow, StreamFunction
+from openclean.data.types import DatasetSchema
+from openclean.function.eval.base import Eval, EvalFunction, EvalResult
+from openclean.function.eval.compiler import compile_function
+from openclean.util.order import ORDER_SAMPLESIZE, PredicateOrder
+
+
+class ShortCircuitOperator(Eval):
+    """Base class for logic operators that combine a list of predicates and
+    whose result is decided by the first predicate that returns a given
+    result value (the stop value). This is False for conjunctions and True for
+    disjunctions.
+
+    Predicates are evaluated in an adaptive order. Statistics about the cost
+    of each predicate and the fraction of rows for which the predicate decided
+    the result are collected for the first `samplesize` rows. The remaining
+    rows are evaluated with the predicates in the order of increasing expected
+    cost (see :class:`openclean.util.order.PredicateOrder`). The order is
+    determined separately for each evaluated data frame and each prepared
+    data stream. The statistics of the most recent data frame or data stream
+    are available via the `ordering` attribute. Predicates are expected to be
+    deterministic and free of side effects.
+    """
+    def __init__(
+        self, predicates: List[EvalFunction], stop_value: bool,
+        samplesize: Optional[int] = ORDER_SAMPLESIZE
+    ):
+        """Initialize the list of predicates and the stop value.
 
         Parameters
         ----------
-        args: list of openclean.function.eval.base.EvalFunction
+        predicates: list of openclean.function.eval.base.EvalFunction
             List of predicates (evaluation functions).
+        stop_value: bool
+            Predicate result that decides the operator result.
+        samplesize: int, default=1000
+            Number of rows for which statistics are collected before the
+            predicates are reordered. If zero, the predicates are evaluated
+            in their given order.
         """
 
-        def eval(values):
+        def eval(*values):
             for v in values:
-                if not v:
-                    return False
-            return True
+                if bool(v) == stop_value:
+                    return stop_value
+            return not stop_value
+
+        op = operator.or_ if stop_value else operator.and_
+        super(ShortCircuitOperator, self).__init__(
+            columns=list(predicates),
+            func=eval,
+            is_unary=False,
+            vecfunc=lambda *data: reduce_bool(data, op)
+        )
+        self.stop_value = stop_value
+        self.samplesize = samplesize
+        self.ordering = self._new_ordering()
+
+    def eval(self, df: pd.DataFrame) -> EvalResult:
+        """Evaluate the operator on a given data frame. Uses the vectorized
+        implementation if all predicates return Boolean data series.
+        Otherwise, the predicates are evaluated one after the other, each on
+        the rows for which the result has not been decided yet. The order of
+        the predicates is determined separately for each data frame.
+
+        Parameters
+        ----------
+        df: pd.DataFrame
+            Pandas data frame.
+
+        Returns
+        -------
+        list
+        """
+        result = self.vectorize(df)
+        if result is not None:
+            return result.tolist()
+        # Predicates that need to be prepared have to be evaluated on all
+        # rows of the data frame.
+        if len(self.producers) < 2 or any(f.unprepared() for f in self.producers):
+            return super(ShortCircuitOperator, self).eval(df)
+        self.ordering = ordering = self._new_ordering()
+        result = [not self.stop_value] * len(df.index)
+        # Split the sample into one part for each predicate. The order of the
+        # predicates is rotated for each part.
+        samplesize = min(ordering.remaining, len(df.index))
+        for part in np.array_split(np.arange(samplesize), len(self.producers)):
+            if len(part) > 0:
+                self._evaluate(df, part, ordering.sample_positions(), result, ordering)
+                ordering.update(len(part))
+        positions = np.arange(samplesize, len(df.index))
+        self._evaluate(df, positions, ordering.positions, result)
+        return result
+
+    def prepare(self, columns: DatasetSchema) -> StreamFunction:
+        """Create a stream function that evaluates the prepared predicates in
+        the adaptive order. The order of the predicates is determined
+        separately for each data stream. Returns the default stream function
+        if the order of the predicates is fixed.
+
+        Parameters
+        ----------
+        columns: list of string
+            Schema for data stream rows.
+
+        Returns
+        -------
+        callable
+        """
+        ordering = self._new_ordering()
+        # Use the default (compilable) stream function if the predicates are
+        # evaluated in their given order.
+        if not ordering.sampling:
+            return super(ShortCircuitOperator, self).prepare(columns)
+        self.ordering = ordering
+        return ShortCircuitFunction(
+            predicates=[compile_function(f.prepare(columns)) for f in self.producers],
+            stop_value=self.stop_value,
+            ordering=ordering
+        )
+
+    def _evaluate(
+        self, df: pd.DataFrame, positions: np.ndarray, order: List[int], result: List[bool],
+        ordering: Optional[PredicateOrder] = None
+    ):
+        """Evaluate the predicates in the given order on the rows at the given
+        positions. Each predicate is only evaluated on the rows for which the
+        result has not been decided by one of the previous predicates. If the
+        ordering is given, the statistics for each predicate are recorded.
+
+        If one of the predicates raises an error, the rows are evaluated again
+        with the predicates in their original order.
+
+        Parameters
+        ----------
+        df: pd.DataFrame
+            Pandas data frame.
+        positions: np.array
+            Positions of the evaluated rows in the data frame.
+        order: list of int
+            Index positions of the predicates in evaluation order.
+        result: list of bool
+            Operator result for all rows in the data frame. Modified in place.
+        ordering: openclean.util.order.PredicateOrder, default=None
+            Statistics for the evaluation order of the predicates.
+        """
+        stop_value = self.stop_value
+        original = list(range(len(self.producers)))
+        undecided = positions
+        try:
+            for i in order:
+                if len(undecided) == 0:
+                    break
+                start = time.perf_counter()
+                stops = is_stop(self.producers[i].eval(df.iloc[undecided]), stop_value)
+                if ordering is not None:
+                    elapsed = time.perf_counter() - start
+                    ordering.record(i, time=elapsed, stops=int(stops.sum()), calls=len(undecided))
+                for pos in undecided[stops]:
+                    result[pos] = stop_value
+                undecided = undecided[~stops]
+        except Exception:
+            if list(order) == original:
+                raise
+            for pos in positions:
+                result[pos] = not stop_value
+            self._evaluate(df, positions, original, result)
+
+    def _new_ordering(self) -> PredicateOrder:
+        """Create the statistics for the evaluation order of the predicates
+        for a new data frame or data stream.
+
+        Returns
+        -------
+        openclean.util.order.PredicateOrder
+        """
+        return PredicateOrder(count=len(self.producers), samplesize=self.samplesize)
+
+
+class ShortCircuitFunction(object):
+    """Stream function for a logic operator that evaluates predicates on data
+    stream rows in an adaptive order. Evaluation stops at the first predicate
+    that returns the stop value.
+    """
+    def __init__(self, predicates: List[StreamFunction], stop_value: bool, ordering: PredicateOrder):
+        """Initialize the prepared predicates, the stop value, and the
+        statistics for the evaluation order.
+
+        Parameters
+        ----------
+        predicates: list of callable
+            Prepared predicates.
+        stop_value: bool
+            Predicate result that decides the operator result.
+        ordering: openclean.util.order.PredicateOrder
+            Statistics for the evaluation order of the predicates.
+        """
+        self.predicates = predicates
+        self.stop_value = stop_value
+        self.ordering = ordering
 
-        super(And, self).__init__(columns=args, func=eval, is_unary=True)
+    def __call__(self, row: DataRow) -> bool:
+        """Evaluate the predicates on the given row. If one of the predicates
+        raises an error when evaluated in the adaptive order, the row is
+        evaluated again with the predicates in their original order.
+
+        Parameters
+        ----------
+        row: list
+            Row in a data stream.
+
+        Returns
+        -------
+        bool
+        """
+        ordering = self.ordering
+        sampling = ordering.sampling
+        order = ordering.sample_positions() if sampling else ordering.positions
+        try:
+            result = self._evaluate(row, order, record=sampling)
+        except Exception:
+            result = self._evaluate(row, range(len(self.predicates)))
+        if sampling:
+            ordering.update()
+        return result
+
+    def _evaluate(self, row: DataRow, order: Iterable[int], record: Optional[bool] = False) -> bool:
+        """Evaluate the predicates in the given order. Stops at the first
+        predicate that returns the stop value. Records the statistics for the
+        evaluated predicates if the record flag is True.
+
+        Parameters
+        ----------
+        row: list
+            Row in a data stream.
+        order: iterable of int
+            Index positions of the predicates in evaluation order.
+        record: bool, default=False
+            Record the statistics for the evaluated predicates.
+
+        Returns
+        -------
+        bool
+        """
+        predicates, stop_value = self.predicates, self.stop_value
+        if not record:
+            for i in order:
+                if bool(predicates[i](row)) == stop_value:
+                    return stop_value
+            return not stop_value
+        for i in order:
+            start = time.perf_counter()
+            stop = bool(predicates[i](row)) == stop_value
+            self.ordering.record(i, time=time.perf_counter() - start, stops=int(stop))
+            if stop:
+                return stop_value
+        return not stop_value
+
+
+class And(ShortCircuitOperator):
+    """Logical conjunction of predicates."""
+    def __init__(self, *args, samplesize: Optional[int] = ORDER_SAMPLESIZE):
+        """Initialize the list of predicates in the conjunction.
+
+        Parameters
+        ----------
+        args: list of openclean.function.eval.base.EvalFunction
+            List of predicates (evaluation functions).
+        samplesize: int, default=1000
+            Number of rows for which statistics are collected before the
+            predicates are reordered.
+        """
+        super(And, self).__init__(predicates=args, stop_value=False, samplesize=samplesize)
 
 
 class Not(Eval):
@@ -47,23 +307,65 @@ class Not(Eval):
         def eval(values):
             return not values
 
-        super(Not, self).__init__(columns=predicate, func=eval, is_unary=True)
+        super(Not, self).__init__(
+            columns=predicate,
+            func=eval,
+            is_unary=True,
+            vecfunc=lambda data: ~data if data.dtype == bool else None
+        )
 
 
-class Or(Eval):
+class Or(ShortCircuitOperator):
     """Logical disjunction of predicates."""
-    def __init__(self, *args):
+    def __init__(self, *args, samplesize: Optional[int] = ORDER_SAMPLESIZE):
         """Initialize the list of predicates in the disjunction.
 
         Parameters
         ----------
         args: list of openclean.function.eval.base.EvalFunction
             List of predicates (evaluation functions).
+        samplesize: int, default=1000
+            Number of rows for which statistics are collected before the
+            predicates are reordered.
         """
-        def eval(values):
-            for v in values:
-                if v:
-                    return True
-            return False
+        super(Or, self).__init__(predicates=args, stop_value=True, samplesize=samplesize)
+
+
+# -- Helper functions ---------------------------------------------------------
+
+def reduce_bool(data: List[pd.Series], op: Callable) -> Optional[pd.Series]:
+    """Combine a list of Boolean data series using the given operator. Returns
+    None if any of the series is not of type bool.
+
+    Parameters
+    ----------
+    data: list of pd.Series
+        Predicate results.
+    op: callable
+        Element-wise logical operator.
+
+    Returns
+    -------
+    pd.Series
+    """
+    if not all(d.dtype == bool for d in data):
+        return None
+    return reduce(op, data)
+
+
+def is_stop(values: EvalResult, stop_value: bool) -> np.ndarray:
+    """Get a Boolean array that indicates for each predicate result whether it
+    is equal to the stop value.
+
+    Parameters
+    ----------
+    values: list or pd.Series
+        Predicate results.
+    stop_value: bool
+        Predicate result that decides the operator result.
 
-        super(Or, self).__init__(columns=args, func=eval, is_unary=True)
+    Returns
+    -------
+    np.array
+    """
+    return np.fromiter((bool(v) == stop_value for v in values), dtype=bool, count=len(values))
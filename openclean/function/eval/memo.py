@@ -0,0 +1,237 @@
+# This file is part of the Data Cleaning Library (openclean).
+#
+# Copyright (C) 2018-2021 New York University.
+#
+# openclean is released under the Revised BSD License. See file LICENSE for
+# full license details.
+
+"""Memoization of consumers for evaluation functions. Data columns often
+contain a small number of distinct values compared to the number of rows.
+For expensive consumers (e.g., normalizers, key generators, or date parsers)
+it is more efficient to evaluate the consumer once for each distinct value
+instead of once for each row.
+
+On data frames, the input columns are dictionary-encoded (factorized), the
+consumer is evaluated on the distinct values, and the results are scattered
+back to the rows. On data streams, consumer results are maintained in a
+bounded LRU cache that is keyed on the input value(s).
+
+Memoization is either enabled explicitly or adaptively. In the adaptive mode
+memoization is only used if the fraction of repeated values (the cache hit
+rate) is above a given threshold. For data frames the hit rate is computed
+from the number of distinct values. For data streams the hit rate of the LRU
+cache is observed after the cache has been filled once.
+
+Values are cached by type and value, i.e., 1, 1.0, and True are different
+keys. Unhashable values (e.g., lists) are not cached.
+"""
+
+from functools import lru_cache
+from typing import Callable, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+
+"""Default maximum number of entries in the LRU cache for data streams."""
+MEMO_CACHESIZE = 65536
+"""Minimum cache hit rate in the adaptive mode."""
+MEMO_MIN_HITRATE = 0.5
+
+
+"""Value types for which pandas factorize does not merge keys of different
+types (e.g., 1 and True).
+"""
+FACTORIZE_TYPES = {'string', 'bytes', 'integer', 'floating', 'boolean'}
+
+
+class MemoizedFunction(object):
+    """Wrapper for a consumer that caches the consumer results for the most
+    recently used argument values. In the adaptive mode, the cache is turned
+    off if the hit rate is below the threshold. The hit rate is observed for
+    the calls after the first maxsize calls (i.e., after the cache has been
+    filled) to avoid counting the misses for the first occurrence of each
+    value.
+    """
+    def __init__(
+        self, func: Callable, packed: Optional[bool] = False,
+        maxsize: Optional[int] = MEMO_CACHESIZE, adaptive: Optional[bool] = False
+    ):
+        """Initialize the consumer and the cache parameters.
+
+        Parameters
+        ----------
+        func: callable
+            Consumer whose results are cached.
+        packed: bool, default=False
+            Flag indicating that the consumer receives a tuple of values as
+            its only argument.
+        maxsize: int, default=65536
+            Maximum number of cached results.
+        adaptive: bool, default=False
+            Turn off caching if the observed hit rate is below the threshold.
+        """
+        self.func = func
+        self.packed = packed
+        self.cached = lru_cache(maxsize=maxsize, typed=True)(self._call)
+        self.maxsize = maxsize
+        self.adaptive = adaptive
+        self.active = True
+        # Number of cache hits after the cache was filled for the first time.
+        self._hits = 0
+
+    def __call__(self, *args):
+        """Get the consumer result for the given argument(s) from the cache.
+        The consumer is evaluated if the result is not cached or if the
+        arguments are not hashable.
+
+        Returns
+        -------
+        any
+        """
+        if self.packed:
+            args = args[0]
+        if not self.active:
+            return self._call(*args)
+        try:
+            hash(args)
+        except TypeError:
+            return self._call(*args)
+        result = self.cached(*args)
+        if self.adaptive:
+            info = self.cached.cache_info()
+            calls = info.hits + info.misses
+            if calls == self.maxsize:
+                self._hits = info.hits
+            elif calls == 2 * self.maxsize:
+                self.adaptive = False
+                if info.hits - self._hits < MEMO_MIN_HITRATE * self.maxsize:
+                    self.active = False
+                    self.cached.cache_clear()
+        return result
+
+    def _call(self, *args):
+        """Evaluate the consumer on the given argument(s).
+
+        Returns
+        -------
+        any
+        """
+        return self.func(args) if self.packed else self.func(*args)
+
+
+# -- Helper functions ---------------------------------------------------------
+
+def dictionary_encode(values: Sequence) -> Optional[Tuple[np.ndarray, List]]:
+    """Get the distinct values for a list or data series together with the
+    index position of the distinct value for each element. Returns None if
+    the sequence contains values that are not hashable.
+
+    Parameters
+    ----------
+    values: list or pd.Series
+        List of values.
+
+    Returns
+    -------
+    tuple of np.array and list
+    """
+    if pd.api.types.infer_dtype(values, skipna=True) in FACTORIZE_TYPES:
+        codes, uniques = pd.factorize(values)
+        uniques = uniques.tolist()
+        # Missing values are encoded as -1. They are replaced by a single
+        # missing value unless there are different types of missing values
+        # (e.g., None and NaN).
+        missing = np.flatnonzero(codes == -1)
+        if len(missing):
+            at = values.iloc if isinstance(values, pd.Series) else values
+            if len(set(type(at[pos]) for pos in missing)) > 1:
+                return encode_objects(values)
+            codes[missing] = len(uniques)
+            uniques.append(at[missing[0]])
+        return codes, uniques
+    return encode_objects(values)
+
+
+def encode_objects(values: Sequence) -> Optional[Tuple[np.ndarray, List]]:
+    """Dictionary-encode a sequence of arbitrary values. Values are keyed by
+    their type and value. Returns None if the sequence contains values that
+    are not hashable.
+
+    Parameters
+    ----------
+    values: list or pd.Series
+        List of values.
+
+    Returns
+    -------
+    tuple of np.array and list
+    """
+    index, uniques = dict(), list()
+    codes = np.empty(len(values), dtype=np.intp)
+    try:
+        for pos, value in enumerate(values):
+            key = (type(value), value)
+            code = index.get(key)
+            if code is None:
+                code = index[key] = len(uniques)
+                uniques.append(value)
+            codes[pos] = code
+    except TypeError:
+        return None
+    return codes, uniques
+
+
+def memoized_map(
+    func: Callable, data: List[Sequence], packed: Optional[bool] = False,
+    adaptive: Optional[bool] = False
+) -> Optional[List]:
+    """Evaluate a consumer once for each distinct combination of values in
+    the given input columns. Returns None if the input values cannot be
+    dictionary-encoded or if the fraction of repeated values is below the
+    threshold in the adaptive mode. The caller is expected to evaluate the
+    consumer on each row in this case.
+
+    Parameters
+    ----------
+    func: callable
+        Consumer that is evaluated on the distinct values.
+    data: list of list or pd.Series
+        Input values for the consumer. Contains one sequence of values for
+        each argument (input column).
+    packed: bool, default=False
+        Flag indicating that the consumer receives a tuple of values as its
+        only argument.
+    adaptive: bool, default=False
+        Only memoize if the fraction of repeated values is above the
+        threshold.
+
+    Returns
+    -------
+    list
+    """
+    encoded = [dictionary_encode(values) for values in data]
+    if any(e is None for e in encoded):
+        return None
+    if len(encoded) == 1:
+        codes, uniques = encoded[0]
+        args = [(v,) for v in uniques]
+    else:
+        # Combine the codes for the individual columns into codes for the
+        # distinct value combinations.
+        codes = np.zeros(len(encoded[0][0]), dtype=np.int64)
+        for col_codes, col_uniques in encoded:
+            codes, _ = pd.factorize(codes * len(col_uniques) + col_codes)
+        # Get the position of the first row for each distinct combination.
+        _, first = np.unique(codes, return_index=True)
+        args = [tuple(u[c[i]] for c, u in encoded) for i in first]
+    if adaptive and len(args) > (1 - MEMO_MIN_HITRATE) * len(codes):
+        return None
+    if packed:
+        results = [func(a) for a in args]
+    else:
+        results = [func(*a) for a in args]
+    values = np.empty(len(results), dtype=object)
+    for i, r in enumerate(results):
+        values[i] = r
+    return values[codes].tolist()
@@ -7,10 +7,12 @@
 
 """Collection of evaluation functions that operate on string values."""
 
-from typing import Optional
+from typing import Callable, Optional
+
+import pandas as pd
 
 from openclean.data.types import Columns
-from openclean.function.eval.base import Eval
+from openclean.function.eval.base import Eval, is_string_series
 
 
 class Capitalize(Eval):
@@ -27,14 +29,17 @@ class Capitalize(Eval):
         as_string: bool, optional
             Use string representation for non-string values.
         """
+        func = StringFunction(
+            func=str.capitalize,
+            as_string=as_string,
+            unpack_list=True,
+            vecfunc=lambda s: s.capitalize()
+        )
         super(Capitalize, self).__init__(
-            func=StringFunction(
-                func=str.capitalize,
-                as_string=as_string,
-                unpack_list=True
-            ),
+            func=func,
             columns=columns,
-            is_unary=True
+            is_unary=True,
+            vecfunc=func.vectorize
         )
 
 
@@ -92,14 +97,17 @@ class EndsWith(Eval):
                 value = value if isinstance(value, str) else str(value)
             return value.endswith(prefix)
 
+        func = StringFunction(
+            func=ends_with,
+            as_string=as_string,
+            unpack_list=True,
+            vecfunc=lambda s: s.endswith(prefix)
+        )
         super(EndsWith, self).__init__(
-            func=StringFunction(
-                func=ends_with,
-                as_string=as_string,
-                unpack_list=True
-            ),
+            func=func,
             columns=columns,
-            is_unary=True
+            is_unary=True,
+            vecfunc=func.vectorize
         )
 
 
@@ -156,13 +164,16 @@ class Length(Eval):
         as_string: bool, optional
             Use string representation for non-string values.
         """
+        func = StringFunction(
+            func=len,
+            as_string=as_string,
+            vecfunc=lambda s: s.len()
+        )
         super(Length, self).__init__(
-            func=StringFunction(
-                func=len,
-                as_string=as_string
-            ),
+            func=func,
             columns=columns,
-            is_unary=True
+            is_unary=True,
+            vecfunc=func.vectorize
         )
 
 
@@ -180,14 +191,17 @@ class Lower(Eval):
         as_string: bool, optional
             Use string representation for non-string values.
         """
+        func = StringFunction(
+            func=str.lower,
+            as_string=as_string,
+            unpack_list=True,
+            vecfunc=lambda s: s.lower()
+        )
         super(Lower, self).__init__(
-            func=StringFunction(
-                func=str.lower,
-                as_string=as_string,
-                unpack_list=True
-            ),
+            func=func,
             columns=columns,
-            is_unary=True
+            is_unary=True,
+            vecfunc=func.vectorize
         )
 
 
@@ -215,14 +229,17 @@ class StartsWith(Eval):
                 value = value if isinstance(value, str) else str(value)
             return value.startswith(prefix)
 
+        func = StringFunction(
+            func=starts_with,
+            as_string=as_string,
+            unpack_list=True,
+            vecfunc=lambda s: s.startswith(prefix)
+        )
         super(StartsWith, self).__init__(
-            func=StringFunction(
-                func=starts_with,
-                as_string=as_string,
-                unpack_list=True
-            ),
+            func=func,
             columns=columns,
-            is_unary=True
+            is_unary=True,
+            vecfunc=func.vectorize
         )
 
 
@@ -240,14 +257,17 @@ class Upper(Eval):
         as_string: bool, optional
             Use string representation for non-string values.
         """
+        func = StringFunction(
+            func=str.upper,
+            as_string=as_string,
+            unpack_list=True,
+            vecfunc=lambda s: s.upper()
+        )
         super(Upper, self).__init__(
-            func=StringFunction(
-                func=str.upper,
-                as_string=as_string,
-                unpack_list=True
-            ),
+            func=func,
             columns=columns,
-            is_unary=True
+            is_unary=True,
+            vecfunc=func.vectorize
         )
 
 
@@ -259,7 +279,10 @@ class StringFunction(object):
     for arguments that are not strings, and (ii) pass the modified value on
     to a wrapped function to compute the final result.
     """
-    def __init__(self, func, as_string=False, unpack_list=False):
+    def __init__(
+        self, func: Callable, as_string: Optional[bool] = False,
+        unpack_list: Optional[bool] = False, vecfunc: Optional[Callable] = None
+    ):
         """Initialize the object properties.
 
         Parameters
@@ -270,10 +293,14 @@ class StringFunction(object):
             Use string representation for non-string values.
         unpack_list: bool, default=False
             Unpack list values if set to True.
+        vecfunc: callable, default=None
+            Vectorized version of the string function. The function receives
+            the string accessor (pd.Series.str) of a data series.
         """
         self.func = func
         self.as_string = as_string
         self.unpack_list = unpack_list
+        self.vecfunc = vecfunc
 
     def __call__(self, value):
         """Apply the string function on a single scalar value. Raises a
@@ -296,3 +323,22 @@ class StringFunction(object):
                 return self.func(str(value))
             raise ValueError('invalid argument {}'.format(value))
         return self.func(value)
+
+    def vectorize(self, data: pd.Series) -> Optional[pd.Series]:
+        """Apply the vectorized string function on all values in a given data
+        series. Returns None if no vectorized function is defined or if the
+        series contains values that are not strings. For these series, the
+        string function has to be applied to each value instead.
+
+        Parameters
+        ----------
+        data: pd.Series
+            Data series of argument values.
+
+        Returns
+        -------
+        pd.Series
+        """
+        if self.vecfunc is None or not is_string_series(data):
+            return None
+        return self.vecfunc(data.str)
@@ -0,0 +1,140 @@
+# This file is part of the Data Cleaning Library (openclean).
+#
+# Copyright (C) 2018-2021 New York University.
+#
+# openclean is released under the Revised BSD License. See file LICENSE for
+# full license details.
+
+"""Accumulators for statistics that are required to prepare value functions
+over a stream of values. Value functions are usually prepared using the full
+list of values (e.g., all values in a data frame column). For data streams,
+the values are added to an accumulator one at a time. The accumulated
+statistics are then used to prepare the function (see
+:meth:`openclean.function.value.base.ValueFunction.prepare_accumulated`).
+
+Accumulators are mergeable, i.e., accumulators for different partitions of a
+data stream can be combined into an accumulator for the full stream.
+"""
+
+from abc import ABCMeta, abstractmethod
+from collections import Counter
+from typing import List, Optional
+
+from openclean.data.types import Value
+
+
+class Accumulator(metaclass=ABCMeta):
+    """Abstract base class for mergeable accumulators of value statistics."""
+    @abstractmethod
+    def add(self, value: Value):
+        """Add a value to the accumulated statistics.
+
+        Parameters
+        ----------
+        value: scalar or tuple
+            Value in the data stream.
+        """
+        raise NotImplementedError()  # pragma: no cover
+
+    @abstractmethod
+    def merge(self, other: 'Accumulator'):
+        """Add the statistics of another accumulator of the same type.
+
+        Parameters
+        ----------
+        other: openclean.function.value.accumulator.Accumulator
+            Accumulator for a different partition of the data stream.
+        """
+        raise NotImplementedError()  # pragma: no cover
+
+
+class ValueCounter(Accumulator):
+    """Accumulator for the frequency of distinct values."""
+    def __init__(self, counts: Optional[Counter] = None):
+        """Initialize the value frequencies.
+
+        Parameters
+        ----------
+        counts: collections.Counter, default=None
+            Frequency counts for distinct values.
+        """
+        self.counts = counts if counts is not None else Counter()
+
+    def add(self, value: Value):
+        """Increment the frequency count for the given value.
+
+        Parameters
+        ----------
+        value: scalar or tuple
+            Value in the data stream.
+        """
+        self.counts[value] += 1
+
+    def merge(self, other: 'ValueCounter'):
+        """Add the frequency counts of another accumulator.
+
+        Parameters
+        ----------
+        other: openclean.function.value.accumulator.ValueCounter
+            Accumulator for a different partition of the data stream.
+        """
+        self.counts.update(other.counts)
+
+
+class ValueList(Accumulator):
+    """Accumulator that maintains the list of all values. This is the default
+    for value functions whose preparation cannot be expressed using a bounded
+    set of statistics.
+    """
+    def __init__(self, values: Optional[List[Value]] = None):
+        """Initialize the list of values.
+
+        Parameters
+        ----------
+        values: list, default=None
+            List of values in the data stream.
+        """
+        self.values = values if values is not None else list()
+
+    def add(self, value: Value):
+        """Append the value to the list of values.
+
+        Parameters
+        ----------
+        value: scalar or tuple
+            Value in the data stream.
+        """
+        self.values.append(value)
+
+    def merge(self, other: 'ValueList'):
+        """Append the values of another accumulator.
+
+        Parameters
+        ----------
+        other: openclean.function.value.accumulator.ValueList
+            Accumulator for a different partition of the data stream.
+        """
+        self.values.extend(other.values)
+
+
+# -- Helper functions ---------------------------------------------------------
+
+def merge_accumulators(results: List[List[Accumulator]]) -> List[Accumulator]:
+    """Merge lists of accumulators for the partitions of a data stream. Each
+    list contains the accumulators for the same functions in the same order.
+    The accumulators of the first partition are modified and returned.
+
+    Parameters
+    ----------
+    results: list of list of openclean.function.value.accumulator.Accumulator
+        Accumulators for each partition of a data stream.
+
+    Returns
+    -------
+    list of openclean.function.value.accumulator.Accumulator
+    """
+    accumulators = results[0]
+    for partition in results[1:]:
+        for acc, other in zip(accumulators, partition):
+            acc.merge(other)
+    return accumulators
@@ -14,6 +14,7 @@ from typing import Callable, Dict, List, Optional, Union
 
 from openclean.data.types import Value
 from openclean.engine.parallel import process_list
+from openclean.function.value.accumulator import Accumulator, ValueList
 
 import openclean.config as config
 
@@ -102,6 +103,22 @@ class ValueFunction(metaclass=ABCMeta):
         """
         raise NotImplementedError()
 
+    def accumulator(self) -> Accumulator:
+        """Get an accumulator for the statistics that are required to prepare
+        the function over a stream of values. The accumulated statistics are
+        passed to the prepare_accumulated method.
+
+        By default, the accumulator maintains the list of all values.
+        Implementations may override this method (together with the
+        prepare_accumulated method) to prepare the function using a bounded
+        set of statistics instead.
+
+        Returns
+        -------
+        openclean.function.value.accumulator.Accumulator
+        """
+        return ValueList()
+
     @abstractmethod
     def is_prepared(self) -> bool:
         """Returns True if the prepare method is ignored by an implementation
@@ -156,6 +173,21 @@ class ValueFunction(metaclass=ABCMeta):
         """
         raise NotImplementedError()
 
+    def prepare_accumulated(self, acc: Accumulator) -> ValueFunction:
+        """Prepare the function using the statistics of an accumulator that
+        was created by the accumulator method of this function.
+
+        Parameters
+        ----------
+        acc: openclean.function.value.accumulator.Accumulator
+            Accumulated statistics for a stream of values.
+
+        Returns
+        -------
+        openclean.function.value.base.ValueFunction
+        """
+        return self.prepare(acc.values)
+
 
 class PreparedFunction(ValueFunction):
     """Abstract base class for value functions that do not make use of the
@@ -10,7 +10,10 @@ frame column).
 """
 
 from abc import abstractmethod
+from typing import Optional
 
+from openclean.data.types import Value
+from openclean.function.value.accumulator import Accumulator
 from openclean.function.value.base import ValueFunction
 from openclean.function.value.datatype import is_numeric_type
 from openclean.function.value.filter import filter
@@ -40,6 +43,16 @@ class NumericNormalizer(ValueFunction):
         self.raise_error = raise_error
         self.default_value = default_value
 
+    def accumulator(self) -> 'NumericStats':
+        """Numeric normalizers are prepared using the count, sum, minimum, and
+        maximum of the numeric values in a data stream.
+
+        Returns
+        -------
+        openclean.function.value.normalize.numeric.NumericStats
+        """
+        return NumericStats()
+
     @abstractmethod
     def compute(self, value):
         """Individual normalization function that is dependent on the
@@ -89,6 +102,70 @@ class NumericNormalizer(ValueFunction):
     __call__ = eval
 
 
+class NumericStats(Accumulator):
+    """Accumulator for the count, sum, minimum, and maximum of the numeric
+    values in a data stream. Values that are not numeric are ignored.
+    """
+    def __init__(
+        self, count: Optional[int] = 0, sum: Optional[float] = 0,
+        minimum: Optional[float] = None, maximum: Optional[float] = None
+    ):
+        """Initialize the statistics.
+
+        Parameters
+        ----------
+        count: int, default=0
+            Number of numeric values.
+        sum: int or float, default=0
+            Sum of numeric values.
+        minimum: int or float, default=None
+            Minimum over all numeric values.
+        maximum: int or float, default=None
+            Maximum over all numeric values.
+        """
+        self.count = count
+        self.sum = sum
+        self.minimum = minimum
+        self.maximum = maximum
+
+    def add(self, value: Value):
+        """Add a value to the statistics if it is numeric.
+
+        Parameters
+        ----------
+        value: scalar
+            Value in the data stream.
+        """
+        if not is_numeric_type(value):
+            return
+        if self.count == 0:
+            self.minimum = self.maximum = value
+        elif value < self.minimum:
+            self.minimum = value
+        elif value > self.maximum:
+            self.maximum = value
+        self.count += 1
+        self.sum += value
+
+    def merge(self, other: 'NumericStats'):
+        """Add the statistics of another accumulator.
+
+        Parameters
+        ----------
+        other: openclean.function.value.normalize.numeric.NumericStats
+            Accumulator for a different partition of the data stream.
+        """
+        if other.count == 0:
+            return
+        if self.count == 0:
+            self.minimum, self.maximum = other.minimum, other.maximum
+        else:
+            self.minimum = min(self.minimum, other.minimum)
+            self.maximum = max(self.maximum, other.maximum)
+        self.count += other.count
+        self.sum += other.sum
+
+
 # -- Divide by total sum ------------------------------------------------------
 
 def divide_by_total(
@@ -185,6 +262,25 @@ class DivideByTotal(NumericNormalizer):
             sum=float(sum(values))
         )
 
+    def prepare_accumulated(self, acc: NumericStats) -> ValueFunction:
+        """Initialize the function using the accumulated sum over all numeric
+        values in a data stream.
+
+        Parameters
+        ----------
+        acc: openclean.function.value.normalize.numeric.NumericStats
+            Statistics for the values in a data stream.
+
+        Returns
+        -------
+        openclean.function.value.normalize.numeric.DivideByTotal
+        """
+        return DivideByTotal(
+            raise_error=self.raise_error,
+            default_value=self.default_value,
+            sum=float(acc.sum)
+        )
+
 
 # -- Divide by absolute maximum -----------------------------------------------
 
@@ -282,6 +378,32 @@ class MaxAbsScale(NumericNormalizer):
             maximum=float(max(values))
         )
 
+    def prepare_accumulated(self, acc: NumericStats) -> ValueFunction:
+        """Initialize the function using the accumulated maximum over all
+        numeric values in a data stream. Raises a ValueError if the stream did
+        not contain any numeric values.
+
+        Parameters
+        ----------
+        acc: openclean.function.value.normalize.numeric.NumericStats
+            Statistics for the values in a data stream.
+
+        Returns
+        -------
+        openclean.function.value.normalize.numeric.MaxAbsScale
+
+        Raises
+        ------
+        ValueError
+        """
+        if acc.count == 0:
+            raise ValueError('no numeric values')
+        return MaxAbsScale(
+            raise_error=self.raise_error,
+            default_value=self.default_value,
+            maximum=float(acc.maximum)
+        )
+
 
 # -- Min/Max scale ------------------------------------------------------------
 
@@ -382,3 +504,23 @@ class MinMaxScale(NumericNormalizer):
             minimum=float(min(values, default=0)),
             maximum=float(max(values, default=0))
         )
+
+    def prepare_accumulated(self, acc: NumericStats) -> ValueFunction:
+        """Initialize the function using the accumulated minimum and maximum
+        over all numeric values in a data stream.
+
+        Parameters
+        ----------
+        acc: openclean.function.value.normalize.numeric.NumericStats
+            Statistics for the values in a data stream.
+
+        Returns
+        -------
+        openclean.function.value.normalize.numeric.MinMaxScale
+        """
+        return MinMaxScale(
+            raise_error=self.raise_error,
+            default_value=self.default_value,
+            minimum=float(acc.minimum if acc.count else 0),
+            maximum=float(acc.maximum if acc.count else 0)
+        )
@@ -13,6 +13,7 @@ from collections import Counter
 from typing import List, Optional
 
 from openclean.data.types import Value
+from openclean.function.value.accumulator import ValueCounter
 from openclean.function.value.base import ConstantValue, UnpreparedFunction, ValueFunction
 
 
@@ -38,6 +39,16 @@ class MajorityVote(UnpreparedFunction):
         """
         self.tiebreaker = tiebreaker
 
+    def accumulator(self) -> ValueCounter:
+        """The majority vote is prepared using the frequency counts for the
+        distinct values in a data stream.
+
+        Returns
+        -------
+        openclean.function.value.accumulator.ValueCounter
+        """
+        return ValueCounter()
+
     def prepare(self, values: List[Value]) -> ValueFunction:
         """Select the most frequent value in the given list of values. A constant
         value function is returned as the result.
@@ -59,7 +70,36 @@ class MajorityVote(UnpreparedFunction):
             # No need to count frequencies if only one value is given.
             return ConstantValue(values[0])
         # Get frequency counts for all values.
-        counts = Counter(values)
+        return self.vote(Counter(values))
+
+    def prepare_accumulated(self, acc: ValueCounter) -> ValueFunction:
+        """Select the most frequent value based on the accumulated frequency
+        counts for the values in a data stream.
+
+        Parameters
+        ----------
+        acc: openclean.function.value.accumulator.ValueCounter
+            Frequency counts for the values in a data stream.
+
+        Returns
+        -------
+        openclean.function.value.base.ConstantValue
+        """
+        return self.vote(acc.counts)
+
+    def vote(self, counts: Counter) -> ValueFunction:
+        """Select the most frequent value given the frequency counts for all
+        distinct values.
+
+        Parameters
+        ----------
+        counts: collections.Counter
+            Frequency counts for distinct values.
+
+        Returns
+        -------
+        openclean.function.value.base.ConstantValue
+        """
         # The first value is the candidate for the voting outcome. We do need to
         # check, however, whether there are multiple values with equal frequency
         # than the most frequent value.
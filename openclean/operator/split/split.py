@@ -83,8 +83,8 @@ class Split(DataFrameSplitter):
         # predicate (false map).
         tmap = [False] * len(df.index)
         fmap = [False] * len(df.index)
-        for i in range(len(smap)):
-            if smap[i]:
+        for i, value in enumerate(smap):
+            if value:
                 tmap[i] = True
             else:
                 fmap[i] = True
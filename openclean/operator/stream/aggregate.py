@@ -0,0 +1,616 @@
+# This file is part of the Data Cleaning Library (openclean).
+#
+# Copyright (C) 2018-2021 New York University.
+#
+# openclean is released under the Revised BSD License. See file LICENSE for
+# full license details.
+
+"""Hash-based group-by and aggregation for data streams. In contrast to the
+:class:`openclean.operator.map.groupby.GroupBy` and
+:class:`openclean.operator.collector.aggregate.Aggregate` operators, the rows
+of a group are never materialized. Instead, the stream operator maintains an
+incremental accumulator state for each aggregate of each group.
+
+If the number of groups in main memory exceeds a given budget, the group
+states are hash-partitioned on the group key and spilled to temporary files.
+The states in each partition are combined when the end of the stream is
+reached. The states for partitions of a data stream that are processed in
+parallel are combined in the same way.
+
+All aggregate functions ignore None values.
+"""
+
+from abc import ABCMeta, abstractmethod
+from collections import Counter
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+import pandas as pd
+
+from openclean.data.schema import as_list, select_clause
+from openclean.data.stream.base import DataRow, RowBatch, RowIndex
+from openclean.data.types import Columns, DatasetSchema, Value
+from openclean.operator.stream.consumer import StreamConsumer
+from openclean.operator.stream.external import MAX_ENTRIES, PARTITIONS, PartitionFiles
+from openclean.operator.stream.processor import MergeableProcessor, StreamProcessor
+
+
+# -- Aggregate functions ------------------------------------------------------
+
+class Aggregator(metaclass=ABCMeta):
+    """Incremental aggregate function. The aggregator does not maintain any
+    state itself. Instead, the state for each group is created by the init
+    method and modified by the update and merge methods. Each of these methods
+    returns the (new) state. States have to be serializable.
+    """
+    @abstractmethod
+    def init(self) -> Any:
+        """Get the initial state for a new group.
+
+        Returns
+        -------
+        any
+        """
+        raise NotImplementedError()  # pragma: no cover
+
+    @abstractmethod
+    def merge(self, state: Any, other: Any) -> Any:
+        """Combine the states for the same group from two disjoint parts of
+        the data stream. The state for the part of the data stream that comes
+        first is given as the first argument.
+
+        Parameters
+        ----------
+        state: any
+            Aggregate state.
+        other: any
+            Aggregate state.
+
+        Returns
+        -------
+        any
+        """
+        raise NotImplementedError()  # pragma: no cover
+
+    def result(self, state: Any) -> Value:
+        """Get the aggregate value for a given state. By default, the state
+        is the result.
+
+        Parameters
+        ----------
+        state: any
+            Aggregate state.
+
+        Returns
+        -------
+        scalar
+        """
+        return state
+
+    @abstractmethod
+    def update(self, state: Any, value: Value) -> Any:
+        """Add a (non-None) value to the state for a group.
+
+        Parameters
+        ----------
+        state: any
+            Aggregate state.
+        value: scalar
+            Value from a row in the group.
+
+        Returns
+        -------
+        any
+        """
+        raise NotImplementedError()  # pragma: no cover
+
+
+class Count(Aggregator):
+    """Count the number of values in a group."""
+    def init(self) -> int:
+        return 0
+
+    def merge(self, state: int, other: int) -> int:
+        return state + other
+
+    def update(self, state: int, value: Value) -> int:
+        return state + 1
+
+
+class Sum(Aggregator):
+    """Sum of the values in a group. Values are expected to be numeric."""
+    def init(self) -> int:
+        return 0
+
+    def merge(self, state: float, other: float) -> float:
+        return state + other
+
+    def update(self, state: float, value: Value) -> float:
+        return state + value
+
+
+class Min(Aggregator):
+    """Minimum value in a group."""
+    def init(self) -> Optional[Value]:
+        return None
+
+    def merge(self, state: Optional[Value], other: Optional[Value]) -> Optional[Value]:
+        if state is None or (other is not None and other < state):
+            return other
+        return state
+
+    def update(self, state: Optional[Value], value: Value) -> Value:
+        return value if state is None or value < state else state
+
+
+class Max(Aggregator):
+    """Maximum value in a group."""
+    def init(self) -> Optional[Value]:
+        return None
+
+    def merge(self, state: Optional[Value], other: Optional[Value]) -> Optional[Value]:
+        if state is None or (other is not None and other > state):
+            return other
+        return state
+
+    def update(self, state: Optional[Value], value: Value) -> Value:
+        return value if state is None or value > state else state
+
+
+class Mean(Aggregator):
+    """Mean of the values in a group. The state is a tuple with the sum and
+    the count of the values.
+    """
+    def init(self) -> Tuple[float, int]:
+        return 0, 0
+
+    def merge(self, state: Tuple[float, int], other: Tuple[float, int]) -> Tuple[float, int]:
+        return state[0] + other[0], state[1] + other[1]
+
+    def result(self, state: Tuple[float, int]) -> Optional[float]:
+        return state[0] / state[1] if state[1] else None
+
+    def update(self, state: Tuple[float, int], value: Value) -> Tuple[float, int]:
+        return state[0] + value, state[1] + 1
+
+
+class NUnique(Aggregator):
+    """Number of distinct values in a group. The state is the set of
+    distinct values.
+    """
+    def init(self) -> set:
+        return set()
+
+    def merge(self, state: set, other: set) -> set:
+        state.update(other)
+        return state
+
+    def result(self, state: set) -> int:
+        return len(state)
+
+    def update(self, state: set, value: Value) -> set:
+        state.add(value)
+        return state
+
+
+class First(Aggregator):
+    """First value in a group. The state is None or a tuple with the value."""
+    def init(self) -> Optional[Tuple[Value]]:
+        return None
+
+    def merge(self, state: Optional[Tuple[Value]], other: Optional[Tuple[Value]]) -> Optional[Tuple[Value]]:
+        return state if state is not None else other
+
+    def result(self, state: Optional[Tuple[Value]]) -> Optional[Value]:
+        return state[0] if state is not None else None
+
+    def update(self, state: Optional[Tuple[Value]], value: Value) -> Tuple[Value]:
+        return state if state is not None else (value,)
+
+
+class Last(Aggregator):
+    """Last value in a group. The state is None or a tuple with the value."""
+    def init(self) -> Optional[Tuple[Value]]:
+        return None
+
+    def merge(self, state: Optional[Tuple[Value]], other: Optional[Tuple[Value]]) -> Optional[Tuple[Value]]:
+        return other if other is not None else state
+
+    def result(self, state: Optional[Tuple[Value]]) -> Optional[Value]:
+        return state[0] if state is not None else None
+
+    def update(self, state: Optional[Tuple[Value]], value: Value) -> Tuple[Value]:
+        return (value,)
+
+
+class Majority(Aggregator):
+    """Most frequent value in a group. Ties are broken by the order in which
+    the values were first seen. The state is a counter for the values.
+    """
+    def init(self) -> Counter:
+        return Counter()
+
+    def merge(self, state: Counter, other: Counter) -> Counter:
+        state.update(other)
+        return state
+
+    def result(self, state: Counter) -> Optional[Value]:
+        return state.most_common(1)[0][0] if state else None
+
+    def update(self, state: Counter, value: Value) -> Counter:
+        state[value] += 1
+        return state
+
+
+"""Aggregate functions that can be referenced by name."""
+AGGREGATORS = {
+    'count': Count,
+    'first': First,
+    'last': Last,
+    'majority': Majority,
+    'max': Max,
+    'mean': Mean,
+    'min': Min,
+    'nunique': NUnique,
+    'sum': Sum
+}
+
+
+"""Type alias for aggregate specifications. Maps column references to the
+name of an aggregate function, an aggregator object, or a list of them.
+"""
+AggSpec = Dict[Union[int, str], Union[str, Aggregator, List[Union[str, Aggregator]]]]
+
+
+# -- Stream operator ----------------------------------------------------------
+
+class GroupAggregate(StreamConsumer, MergeableProcessor):
+    """Collector that groups the rows in a data stream by one or more key
+    columns and computes aggregates over the values in other columns for each
+    group. The result is a data frame with one row per group that is indexed
+    by the group key.
+
+    The aggregates are given as a dictionary that maps column references to
+    one or more aggregate functions. If a single function is given for a
+    column, the result column has the name of the column. Otherwise, the name
+    of each result column is the column name followed by the function name,
+    e.g., 'amount_sum'.
+    """
+    def __init__(
+        self, keys: Columns, aggregates: AggSpec,
+        max_groups: Optional[int] = MAX_ENTRIES, partitions: Optional[int] = PARTITIONS,
+        tmpdir: Optional[str] = None, partial: Optional[bool] = False,
+        keyidx: Optional[List[int]] = None, columns: Optional[List[Tuple[int, Aggregator]]] = None,
+        names: Optional[Tuple[List[str], List[str]]] = None
+    ):
+        """Initialize the group key, the aggregates, and the memory budget.
+
+        Parameters
+        ----------
+        keys: int, string, or list of int or string
+            References to the group key column(s).
+        aggregates: dict
+            Mapping from column references to aggregate functions. Aggregate
+            functions are referenced by their name (i.e., count, sum, min,
+            max, mean, nunique, first, last, or majority) or given as an
+            aggregator object.
+        max_groups: int, default=1000000
+            Maximum number of groups that are kept in main memory.
+        partitions: int, default=16
+            Number of partition files for spilled groups.
+        tmpdir: string, default=None
+            Parent directory for the temporary partition files.
+        partial: bool, default=False
+            Return the group states instead of the final data frame when the
+            consumer is closed (used for partitions of a parallel run).
+        keyidx: list of int, default=None
+            Index positions of the key columns. Only given if the operator is
+            instantiated as a consumer.
+        columns: list of tuple of int and Aggregator, default=None
+            Index position of the aggregated column for each aggregator. Only
+            given if the operator is instantiated as a consumer.
+        names: tuple of list of string and list of string, default=None
+            Names of the key columns and the result columns. Only given if
+            the operator is instantiated as a consumer.
+
+        Raises
+        ------
+        ValueError
+        """
+        if max_groups < 1:
+            raise ValueError('invalid memory budget {}'.format(max_groups))
+        if not aggregates:
+            raise ValueError('no aggregates given')
+        self.keys = keys
+        self.aggregates = aggregates
+        # Resolve aggregate function names to raise an error for unknown names
+        # before the data stream is processed.
+        self._aggregators = [(col, name, get_aggregator(func)) for col, name, func in agg_items(aggregates)]
+        self.max_groups = max_groups
+        self.partitions = partitions
+        self.tmpdir = tmpdir
+        self.partial = partial
+        self.keyidx = keyidx
+        self.columns = columns
+        self.names = names
+        self.groups = dict()
+        self._files = None
+
+    def checkpoint(self) -> Tuple[Dict, Optional[Tuple[str, List[int]]]]:
+        """Get the group states in main memory together with the state of the
+        partition files.
+
+        Returns
+        -------
+        tuple of dict and tuple
+        """
+        files = self._files.checkpoint() if self._files is not None else None
+        return self.groups, files
+
+    def close(self) -> Union[pd.DataFrame, Tuple[Tuple[List[str], List[str]], Dict]]:
+        """Get the data frame with the aggregates for all groups. For partial
+        results, the names of the key and result columns and the group states
+        are returned instead.
+
+        Returns
+        -------
+        pd.DataFrame or tuple
+        """
+        if self._files is None:
+            groups = self.groups.items()
+        else:
+            self._spill()
+            files, self._files = self._files, None
+            groups = files.read(merge=self._merge)
+        if self.partial:
+            return self.names, dict(groups)
+        return self._to_df(groups, names=self.names)
+
+    def consume(self, rowid: int, row: DataRow):
+        """Update the aggregate states for the group of the given row.
+
+        Parameters
+        -----------
+        rowid: int
+            Unique row identifier
+        row: list
+            List of values in the row.
+        """
+        self.consume_batch(rowids=[rowid], rows=[row])
+
+    def consume_batch(self, rowids: List[RowIndex], rows: List[DataRow]) -> RowBatch:
+        """Update the aggregate states for the groups of all rows in a batch.
+        Groups are spilled to disk if the memory budget is exceeded.
+
+        Parameters
+        ----------
+        rowids: list
+            Unique identifier for each row in the batch.
+        rows: list of list
+            List of values for each row in the batch.
+
+        Returns
+        -------
+        tuple of list and list
+        """
+        groups = self.groups
+        keyidx = self.keyidx
+        columns = self.columns
+        for row in rows:
+            key = row[keyidx[0]] if len(keyidx) == 1 else tuple([row[i] for i in keyidx])
+            states = groups.get(key)
+            if states is None:
+                states = [agg.init() for _, agg in columns]
+                groups[key] = states
+            for i, (colidx, agg) in enumerate(columns):
+                value = row[colidx]
+                if value is not None:
+                    states[i] = agg.update(states[i], value)
+        if len(groups) > self.max_groups:
+            self._spill()
+        return [], []
+
+    def for_partition(self, index: int) -> StreamProcessor:
+        """Get the operator for a partition of a parallel run. The operator
+        returns the group states instead of the final data frame.
+
+        Parameters
+        ----------
+        index: int
+            Index position of the partition in the data source.
+
+        Returns
+        -------
+        openclean.operator.stream.aggregate.GroupAggregate
+        """
+        return GroupAggregate(
+            keys=self.keys,
+            aggregates=self.aggregates,
+            max_groups=self.max_groups,
+            partitions=self.partitions,
+            tmpdir=self.tmpdir,
+            partial=True
+        )
+
+    def merge(self, results: List[Tuple[Tuple[List[str], List[str]], Dict]], offsets: List[int]) -> pd.DataFrame:
+        """Combine the group states for all partitions of the data stream.
+
+        Parameters
+        ----------
+        results: list of tuple
+            Names of the key and result columns and group states for each
+            partition of the data stream.
+        offsets: list of int
+            Position of the first row of each partition in the data stream.
+
+        Returns
+        -------
+        pd.DataFrame
+        """
+        names, groups = results[0]
+        for _, other in results[1:]:
+            for key, states in other.items():
+                if key in groups:
+                    groups[key] = self._merge(groups[key], states)
+                else:
+                    groups[key] = states
+        return self._to_df(groups.items(), names=names)
+
+    def open(self, schema: DatasetSchema) -> StreamConsumer:
+        """Factory pattern for stream consumer. Returns an instance of the
+        group-by consumer.
+
+        Parameters
+        ----------
+        schema: list of string
+            List of column names in the data stream schema.
+
+        Returns
+        -------
+        openclean.operator.stream.consumer.StreamConsumer
+        """
+        keynames, keyidx = select_clause(schema, columns=as_list(self.keys))
+        columns, resultnames = list(), list()
+        for col, name, agg in self._aggregators:
+            colnames, colidx = select_clause(schema, columns=[col])
+            columns.append((colidx[0], agg))
+            resultnames.append(name if name is not None else colnames[0])
+        return GroupAggregate(
+            keys=self.keys,
+            aggregates=self.aggregates,
+            max_groups=self.max_groups,
+            partitions=self.partitions,
+            tmpdir=self.tmpdir,
+            partial=self.partial,
+            keyidx=keyidx,
+            columns=columns,
+            names=([str(c) for c in keynames], [str(c) for c in resultnames])
+        )
+
+    def restore(self, state: Tuple[Dict, Optional[Tuple[str, List[int]]]]):
+        """Restore the group states and the partition files.
+
+        Parameters
+        ----------
+        state: tuple of dict and tuple
+            Consumer state that was returned by the checkpoint method.
+        """
+        self.groups, files = state
+        if files is not None:
+            self._files = PartitionFiles.restore(files)
+
+    def _merge(self, states: List[Any], other: List[Any]) -> List[Any]:
+        """Combine the aggregate states for the same group.
+
+        Parameters
+        ----------
+        states: list
+            Aggregate states from the first part of the data stream.
+        other: list
+            Aggregate states from the second part of the data stream.
+
+        Returns
+        -------
+        list
+        """
+        return [agg.merge(s, o) for (_, _, agg), s, o in zip(self._aggregators, states, other)]
+
+    def _spill(self):
+        """Append the group states in main memory to the partition files and
+        clear the groups.
+        """
+        if self._files is None:
+            self._files = PartitionFiles(partitions=self.partitions, tmpdir=self.tmpdir)
+        self._files.write(self.groups.items())
+        self.groups = dict()
+
+    def _to_df(self, groups: Any, names: Tuple[List[str], List[str]]) -> pd.DataFrame:
+        """Get a data frame with the aggregate values for the given groups.
+
+        Parameters
+        ----------
+        groups: iterable of tuple
+            Group keys and aggregate states.
+        names: tuple of list of string and list of string
+            Names of the key columns and the result columns.
+
+        Returns
+        -------
+        pd.DataFrame
+        """
+        keynames, resultnames = names
+        aggregators = [agg for _, _, agg in self._aggregators]
+        index, data = list(), list()
+        for key, states in groups:
+            index.append(key)
+            data.append([agg.result(s) for agg, s in zip(aggregators, states)])
+        if len(keynames) == 1:
+            index = pd.Index(index, name=keynames[0], dtype=object)
+        else:
+            index = pd.MultiIndex.from_tuples(index, names=keynames) if index else None
+        return pd.DataFrame(data=data, index=index, columns=resultnames)
+
+
+# -- Helper functions ---------------------------------------------------------
+
+def agg_items(aggregates: AggSpec) -> List[Tuple[Union[int, str], Optional[str], Union[str, Aggregator]]]:
+    """Get the list of aggregated columns, result column names, and
+    aggregate functions from an aggregate specification. The result column
+    name is None if the result has the name of the aggregated column.
+
+    Parameters
+    ----------
+    aggregates: dict
+        Mapping from column references to aggregate functions.
+
+    Returns
+    -------
+    list of tuple
+    """
+    items = list()
+    for col, funcs in aggregates.items():
+        if isinstance(funcs, list):
+            for func in funcs:
+                items.append((col, '{}_{}'.format(col, agg_name(func)), func))
+        else:
+            items.append((col, None, funcs))
+    return items
+
+
+def agg_name(func: Union[str, Aggregator]) -> str:
+    """Get the name of an aggregate function.
+
+    Parameters
+    ----------
+    func: string or openclean.operator.stream.aggregate.Aggregator
+        Aggregate function name or aggregator object.
+
+    Returns
+    -------
+    string
+    """
+    return func if isinstance(func, str) else type(func).__name__.lower()
+
+
+def get_aggregator(func: Union[str, Aggregator]) -> Aggregator:
+    """Get the aggregator for an aggregate function name. Aggregator objects
+    are returned as they are.
+
+    Parameters
+    ----------
+    func: string or openclean.operator.stream.aggregate.Aggregator
+        Aggregate function name or aggregator object.
+
+    Returns
+    -------
+    openclean.operator.stream.aggregate.Aggregator
+
+    Raises
+    ------
+    ValueError
+    """
+    if isinstance(func, Aggregator):
+        return func
+    try:
+        return AGGREGATORS[func]()
+    except (KeyError, TypeError):
+        raise ValueError('unknown aggregate function {}'.format(func))
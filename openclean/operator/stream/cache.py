@@ -0,0 +1,319 @@
+# This file is part of the Data Cleaning Library (openclean).
+#
+# Copyright (C) 2018-2021 New York University.
+#
+# openclean is released under the Revised BSD License. See file LICENSE for
+# full license details.
+
+"""Cache for the results of terminal operators in data pipelines. Results are
+identified by a key that combines a fingerprint of the data source with the
+serialization of all operators in the pipeline. The source fingerprint for a
+CSV file contains the file path, size, and modification time (or optionally a
+hash of the file content) together with the reader settings.
+
+Results are kept in main memory and (optionally) in a cache directory. Both
+storage levels have a size budget. The least recently used results are
+evicted when a budget is exceeded.
+
+Operators are serialized using dill. Functions that are defined in an
+importable module are serialized by reference. Changes to the code of these
+functions therefore do not invalidate cached results.
+"""
+
+from collections import OrderedDict
+from histore.document.schema import Column
+from typing import Any, List, Optional, Tuple
+
+import copyreg
+import dill
+import hashlib
+import os
+import pickle
+import time
+
+from openclean.data.stream.base import Datasource
+from openclean.data.stream.csv import CSVFile
+from openclean.data.stream.prefetch import Prefetch
+from openclean.operator.stream.processor import StreamProcessor
+
+
+"""Default size budget (in bytes) for cached results in main memory."""
+MEMORY_SIZE = 64 * 1024 * 1024
+
+"""Default size budget (in bytes) for cached results in the cache directory."""
+DISK_SIZE = 1024 * 1024 * 1024
+
+"""Suffix for result files in the cache directory."""
+SUFFIX = '.pkl'
+
+
+class ResultCache(object):
+    """Two-level cache for serialized results of terminal pipeline operators.
+    Results are returned as copies, i.e., modifying a returned result does not
+    modify the cached result.
+    """
+    def __init__(
+        self, basedir: Optional[str] = None, memory_size: Optional[int] = MEMORY_SIZE,
+        disk_size: Optional[int] = DISK_SIZE, content_hash: Optional[bool] = False
+    ):
+        """Initialize the cache directory and the size budgets.
+
+        Parameters
+        ----------
+        basedir: string, default=None
+            Directory for cached result files. Results are only cached in main
+            memory if no directory is given.
+        memory_size: int, default=64MB
+            Size budget (in bytes) for results in main memory.
+        disk_size: int, default=1GB
+            Size budget (in bytes) for result files in the cache directory.
+        content_hash: bool, default=False
+            Use a hash of the file content instead of the modification time to
+            identify CSV files.
+
+        Raises
+        ------
+        ValueError
+        """
+        if memory_size < 0:
+            raise ValueError('invalid memory size {}'.format(memory_size))
+        if disk_size < 0:
+            raise ValueError('invalid disk size {}'.format(disk_size))
+        self.basedir = basedir
+        self.memory_size = memory_size
+        self.disk_size = disk_size
+        self.content_hash = content_hash
+        # Serialized results in main memory in order of their last access.
+        self._entries = OrderedDict()
+        self._size = 0
+        if basedir is not None:
+            os.makedirs(basedir, exist_ok=True)
+
+    def clear(self):
+        """Remove all results from the cache."""
+        self._entries = OrderedDict()
+        self._size = 0
+        if self.basedir is not None:
+            for filename in self._files():
+                os.remove(filename)
+
+    def get(self, key: str) -> Tuple[bool, Any]:
+        """Get the cached result for the given key. Returns a tuple with a flag
+        that indicates whether the result was found and the result (or None).
+
+        Parameters
+        ----------
+        key: string
+            Result key.
+
+        Returns
+        -------
+        tuple of bool and any
+        """
+        data = self._entries.get(key)
+        if data is not None:
+            self._entries.move_to_end(key)
+            return True, dill.loads(data)
+        if self.basedir is not None:
+            filename = self._filename(key)
+            if os.path.isfile(filename):
+                with open(filename, 'rb') as f:
+                    data = f.read()
+                touch(filename)
+                self._add(key, data)
+                return True, dill.loads(data)
+        return False, None
+
+    def key(self, source: Datasource, operators: List[StreamProcessor]) -> Optional[str]:
+        """Get the result key for a data pipeline. Returns None if the data
+        source or the operators cannot be identified. Results for these
+        pipelines are not cached.
+
+        Parameters
+        ----------
+        source: openclean.data.stream.base.Datasource
+            Data source for the pipeline.
+        operators: list of openclean.operator.stream.processor.StreamProcessor
+            Pipeline operators including the terminal operator.
+
+        Returns
+        -------
+        string
+        """
+        fp = fingerprint(source, content_hash=self.content_hash)
+        if fp is None:
+            return None
+        try:
+            ops = dill.dumps(operators)
+        except (AttributeError, TypeError, pickle.PicklingError):
+            return None
+        digest = hashlib.sha256(repr(fp).encode('utf-8'))
+        digest.update(ops)
+        return digest.hexdigest()
+
+    def put(self, key: str, result: Any):
+        """Add the result for the given key to the cache.
+
+        Parameters
+        ----------
+        key: string
+            Result key.
+        result: any
+            Result of a terminal pipeline operator.
+        """
+        data = dill.dumps(result)
+        self._add(key, data)
+        if self.basedir is not None and len(data) <= self.disk_size:
+            filename = self._filename(key)
+            tmpfile = '{}.tmp'.format(filename)
+            with open(tmpfile, 'wb') as f:
+                f.write(data)
+            os.replace(tmpfile, filename)
+            touch(filename)
+            self._evict_files()
+
+    def _add(self, key: str, data: bytes):
+        """Add a serialized result to the main memory cache. Evicts the least
+        recently used results if the size budget is exceeded.
+
+        Parameters
+        ----------
+        key: string
+            Result key.
+        data: bytes
+            Serialized result.
+        """
+        if key in self._entries:
+            self._size -= len(self._entries.pop(key))
+        if len(data) > self.memory_size:
+            return
+        self._entries[key] = data
+        self._size += len(data)
+        while self._size > self.memory_size:
+            _, evicted = self._entries.popitem(last=False)
+            self._size -= len(evicted)
+
+    def _evict_files(self):
+        """Remove the least recently used result files from the cache
+        directory until the total file size is within the size budget.
+        """
+        files = [(os.stat(f), f) for f in self._files()]
+        total = sum(s.st_size for s, _ in files)
+        for stat, filename in sorted(files, key=lambda f: f[0].st_mtime_ns):
+            if total <= self.disk_size:
+                break
+            os.remove(filename)
+            total -= stat.st_size
+
+    def _filename(self, key: str) -> str:
+        """Get the path to the result file for the given key.
+
+        Parameters
+        ----------
+        key: string
+            Result key.
+
+        Returns
+        -------
+        string
+        """
+        return os.path.join(self.basedir, key + SUFFIX)
+
+    def _files(self) -> List[str]:
+        """Get the list of result files in the cache directory.
+
+        Returns
+        -------
+        list of string
+        """
+        return [
+            os.path.join(self.basedir, f) for f in os.listdir(self.basedir) if f.endswith(SUFFIX)
+        ]
+
+
+# -- Helper functions ---------------------------------------------------------
+
+def fingerprint(source: Datasource, content_hash: Optional[bool] = False) -> Optional[Tuple]:
+    """Get a fingerprint for a data source. Fingerprints are only available
+    for CSV files (that are optionally prefetched). Returns None for all other
+    data sources.
+
+    Parameters
+    ----------
+    source: openclean.data.stream.base.Datasource
+        Data source for a pipeline.
+    content_hash: bool, default=False
+        Use a hash of the file content instead of the modification time.
+
+    Returns
+    -------
+    tuple
+    """
+    if isinstance(source, Prefetch):
+        return fingerprint(source.source, content_hash=content_hash)
+    elif not isinstance(source, CSVFile):
+        return None
+    filename = os.path.abspath(source.filename)
+    stat = os.stat(filename)
+    if content_hash:
+        version = filehash(filename)
+    else:
+        version = stat.st_mtime_ns
+    return (
+        filename, stat.st_size, version, source.columns, source._has_header,
+        source.delim, source.compressed, source.encoding, source.none_is
+    )
+
+
+def touch(filename: str):
+    """Set the modification time of a result file to the current time to mark
+    the file as recently used. The time is set explicitly since the timestamp
+    that the file system assigns to modified files may have a coarse
+    resolution.
+
+    Parameters
+    ----------
+    filename: string
+        Path to the result file.
+    """
+    now = time.time_ns()
+    os.utime(filename, ns=(now, now))
+
+
+def reduce_column(column: Column) -> Tuple:
+    """Reduce function for pickling column names. Column names in results
+    (e.g., dataset profiles) are instances of the histore column class that
+    cannot be unpickled using the default reduce function for strings.
+
+    Parameters
+    ----------
+    column: histore.document.schema.Column
+        Column name.
+
+    Returns
+    -------
+    tuple
+    """
+    return Column, (column.colid, str(column), column.colidx)
+
+
+copyreg.pickle(Column, reduce_column)
+
+
+def filehash(filename: str) -> str:
+    """Compute the SHA-256 hash of the content of a file.
+
+    Parameters
+    ----------
+    filename: string
+        Path to the file.
+
+    Returns
+    -------
+    string
+    """
+    digest = hashlib.sha256()
+    with open(filename, 'rb') as f:
+        for block in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(block)
+    return digest.hexdigest()
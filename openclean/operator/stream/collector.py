@@ -14,15 +14,19 @@ interface for various basic collectors.
 """
 
 from collections import Counter
-from typing import List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
+import os
 import pandas as pd
+import shutil
 
 from openclean.data.schema import as_list, select_clause
+from openclean.data.stream.base import DataRow, RowBatch, RowIndex
+from openclean.data.stream.binary import BinaryWriter, CHUNKSIZE
 from openclean.data.types import Columns, DatasetSchema
-from openclean.data.stream.csv import CSVFile, CSVWriter
+from openclean.data.stream.csv import CSVAppendWriter, CSVFile, CSVWriter
 from openclean.operator.stream.consumer import StreamConsumer
-from openclean.operator.stream.processor import StreamProcessor
+from openclean.operator.stream.processor import MergeableProcessor, StreamProcessor
 
 
 # -- Row Collector ------------------------------------------------------------
@@ -35,6 +39,15 @@ class Collector(StreamConsumer, StreamProcessor):
         """Initialize the row schema and the internal buffer."""
         self.rows = list()
 
+    def checkpoint(self) -> List:
+        """Get the list of collected rows.
+
+        Returns
+        -------
+        list
+        """
+        return self.rows
+
     def close(self) -> List:
         """Return the collected row buffer on close.
 
@@ -72,8 +85,18 @@ class Collector(StreamConsumer, StreamProcessor):
         """
         return Collector()
 
+    def restore(self, state: List):
+        """Restore the list of collected rows.
+
+        Parameters
+        ----------
+        state: list
+            List of collected rows.
+        """
+        self.rows = state
+
 
-class DataFrame(StreamConsumer, StreamProcessor):
+class DataFrame(StreamConsumer, MergeableProcessor):
     """Row collector that generates a pandas data frame from the rows in a
     data stream. This consumer will not accept a downstream consumer as it
     would never send any rows to such a consumer.
@@ -94,6 +117,15 @@ class DataFrame(StreamConsumer, StreamProcessor):
         self.index = list()
         self.dtypes = object
 
+    def checkpoint(self) -> Tuple[List, List]:
+        """Get the lists of collected row identifiers and row values.
+
+        Returns
+        -------
+        tuple of list and list
+        """
+        return self.index, self.data
+
     def close(self) -> pd.DataFrame:
         """Closing the consumer yields the data frame with the collected rows.
 
@@ -122,6 +154,47 @@ class DataFrame(StreamConsumer, StreamProcessor):
         self.data.append(row)
         self.index.append(rowid)
 
+    def consume_batch(self, rowids: List[RowIndex], rows: List[DataRow]) -> RowBatch:
+        """Add the row identifiers and row values for a batch of rows to the
+        respective lists.
+
+        Parameters
+        ----------
+        rowids: list
+            Unique identifier for each row in the batch.
+        rows: list of list
+            List of values for each row in the batch.
+
+        Returns
+        -------
+        tuple of list and list
+        """
+        self.data.extend(rows)
+        self.index.extend(rowids)
+        return [], []
+
+    def merge(self, results: List[pd.DataFrame], offsets: List[int]) -> pd.DataFrame:
+        """Concatenate the data frames for all partitions of the data stream.
+        Adjusts the row index of each data frame using the position of the
+        first row in the respective partition.
+
+        Parameters
+        ----------
+        results: list of pd.DataFrame
+            Data frames for each partition of the data stream.
+        offsets: list of int
+            Position of the first row of each partition in the data stream.
+
+        Returns
+        -------
+        pd.DataFrame
+        """
+        frames = list()
+        for df, offset in zip(results, offsets):
+            df.index = [rowid + offset for rowid in df.index]
+            frames.append(df)
+        return pd.concat(frames)
+
     def open(self, schema: DatasetSchema) -> StreamConsumer:
         """Factory pattern for stream consumer. Returns an instance of the
         stream consumer for the data frame generator.
@@ -137,8 +210,18 @@ class DataFrame(StreamConsumer, StreamProcessor):
         """
         return DataFrame(columns=schema)
 
+    def restore(self, state: Tuple[List, List]):
+        """Restore the lists of collected row identifiers and row values.
 
-class Distinct(StreamConsumer, StreamProcessor):
+        Parameters
+        ----------
+        state: tuple of list and list
+            Row identifiers and row values.
+        """
+        self.index, self.data = state
+
+
+class Distinct(StreamConsumer, MergeableProcessor):
     """Consumer that popuates a counter with the frequency counts for distinct
     values (or value combinations) in the processed rows for the data stream.
     """
@@ -149,6 +232,15 @@ class Distinct(StreamConsumer, StreamProcessor):
         self.counter = Counter()
         self.columns = columns
 
+    def checkpoint(self) -> Counter:
+        """Get the counter for the distinct values.
+
+        Returns
+        -------
+        collections.Counter
+        """
+        return self.counter
+
     def close(self) -> Counter:
         """Closing the consumer returns the populated Counter object.
 
@@ -179,6 +271,47 @@ class Distinct(StreamConsumer, StreamProcessor):
         else:
             self.counter[tuple([row[i] for i in self.columns])] += 1
 
+    def consume_batch(self, rowids: List[RowIndex], rows: List[DataRow]) -> RowBatch:
+        """Add the value combinations for a batch of rows to the counter.
+
+        Parameters
+        ----------
+        rowids: list
+            Unique identifier for each row in the batch.
+        rows: list of list
+            List of values for each row in the batch.
+
+        Returns
+        -------
+        tuple of list and list
+        """
+        if len(self.columns) == 1:
+            colidx = self.columns[0]
+            self.counter.update([row[colidx] for row in rows])
+        else:
+            columns = self.columns
+            self.counter.update([tuple([row[i] for i in columns]) for row in rows])
+        return [], []
+
+    def merge(self, results: List[Counter], offsets: List[int]) -> Counter:
+        """Combine the value counts for all partitions of the data stream.
+
+        Parameters
+        ----------
+        results: list of collections.Counter
+            Value counts for each partition of the data stream.
+        offsets: list of int
+            Position of the first row of each partition in the data stream.
+
+        Returns
+        -------
+        collections.Counter
+        """
+        counter = Counter()
+        for c in results:
+            counter.update(c)
+        return counter
+
     def open(self, schema: DatasetSchema) -> StreamConsumer:
         """Factory pattern for stream consumer. Returns an instance of the
         stream consumer for the distinct values collector.
@@ -196,8 +329,18 @@ class Distinct(StreamConsumer, StreamProcessor):
         _, colidx = select_clause(schema, columns=as_list(columns))
         return Distinct(columns=colidx)
 
+    def restore(self, state: Counter):
+        """Restore the counter for distinct values.
+
+        Parameters
+        ----------
+        state: collections.Counter
+            Counts for distinct values.
+        """
+        self.counter = state
+
 
-class RowCount(StreamConsumer, StreamProcessor):
+class RowCount(StreamConsumer, MergeableProcessor):
     """The row counter is a simple counter for the number of (rowid, row) pairs
     that are passed on to consumer.
     """
@@ -205,6 +348,15 @@ class RowCount(StreamConsumer, StreamProcessor):
         """Initialize the internal row counter."""
         self.rows = 0
 
+    def checkpoint(self) -> int:
+        """Get the current counter value.
+
+        Returns
+        -------
+        int
+        """
+        return self.rows
+
     def close(self) -> int:
         """Return the couter value.
 
@@ -226,6 +378,40 @@ class RowCount(StreamConsumer, StreamProcessor):
         """
         self.rows += 1
 
+    def consume_batch(self, rowids: List[RowIndex], rows: List[DataRow]) -> RowBatch:
+        """Increment the counter value by the number of rows in the batch.
+
+        Parameters
+        ----------
+        rowids: list
+            Unique identifier for each row in the batch.
+        rows: list of list
+            List of values for each row in the batch.
+
+        Returns
+        -------
+        tuple of list and list
+        """
+        self.rows += len(rows)
+        return [], []
+
+    def merge(self, results: List[int], offsets: List[int]) -> int:
+        """Get the total number of rows over all partitions of the data
+        stream.
+
+        Parameters
+        ----------
+        results: list of int
+            Row counts for each partition of the data stream.
+        offsets: list of int
+            Position of the first row of each partition in the data stream.
+
+        Returns
+        -------
+        int
+        """
+        return sum(results)
+
     def open(self, schema: DatasetSchema) -> StreamConsumer:
         """Factory pattern for stream consumer. Returns an instance of the
         stream consumer for the row counter.
@@ -241,13 +427,26 @@ class RowCount(StreamConsumer, StreamProcessor):
         """
         return RowCount()
 
+    def restore(self, state: int):
+        """Restore the counter value.
 
-class Write(StreamConsumer, StreamProcessor):
+        Parameters
+        ----------
+        state: int
+            Number of rows that have been consumed.
+        """
+        self.rows = state
+
+
+class Write(StreamConsumer, MergeableProcessor):
     """Write data stream rows to an output file. This class either contains a
     reference to a CSV file (if instantiated as a processor) or a reference to
     a CSV writer (if instantiated as a consumer).
     """
-    def __init__(self, file: Optional[CSVFile] = None, writer: Optional[CSVWriter] = None):
+    def __init__(
+        self, file: Optional[CSVFile] = None, writer: Optional[CSVWriter] = None,
+        header: Optional[bool] = True
+    ):
         """Initialize the CSV file and the CSV writer.
 
         Parameters
@@ -256,9 +455,29 @@ class Write(StreamConsumer, StreamProcessor):
             Reference to the output CSV file.
         writer: openclean.data.stream.csv.CSVWriter
             Writer for the output CSV file.
+        header: bool, default=True
+            Write the column names as the first row of the output file.
         """
         self.file = file
         self.writer = writer
+        self.header = header
+
+    def checkpoint(self) -> int:
+        """Flush the output file and get the current position in the file.
+        Checkpoints are not supported for compressed output files.
+
+        Returns
+        -------
+        int
+
+        Raises
+        ------
+        NotImplementedError
+        """
+        if self.file is None or self.file.compressed:
+            raise NotImplementedError('checkpoints not supported for compressed output')
+        self.writer.file.flush()
+        return self.writer.file.tell()
 
     def close(self):
         """Close the associated CSV writer when the end of the data stream was
@@ -278,6 +497,71 @@ class Write(StreamConsumer, StreamProcessor):
         """
         self.writer.write(row)
 
+    def consume_batch(self, rowids: List[RowIndex], rows: List[DataRow]) -> RowBatch:
+        """Write the values for a batch of rows to the output file.
+
+        Parameters
+        ----------
+        rowids: list
+            Unique identifier for each row in the batch.
+        rows: list of list
+            List of values for each row in the batch.
+
+        Returns
+        -------
+        tuple of list and list
+        """
+        none_as = self.writer.none_as
+        if none_as is not None:
+            rows = [[v if v is not None else none_as for v in row] for row in rows]
+        self.writer.writer.writerows(rows)
+        return [], []
+
+    def for_partition(self, index: int) -> StreamProcessor:
+        """Get a writer for a separate output file for the partition with the
+        given index. Only the output file for the first partition will contain
+        the header row.
+
+        Parameters
+        ----------
+        index: int
+            Index position of the partition in the data source.
+
+        Returns
+        -------
+        openclean.operator.stream.collector.Write
+        """
+        file = CSVFile(
+            filename=partfile(self.file.filename, index),
+            header=self.file.columns,
+            delim=self.file.delim,
+            compressed=self.file.compressed,
+            encoding=self.file.encoding,
+            none_is=self.file.none_is
+        )
+        return Write(file=file, header=index == 0)
+
+    def merge(self, results: List[Any], offsets: List[int]):
+        """Concatenate the output files for all partitions of the data stream
+        into the output file. The partition files are removed afterwards.
+
+        Since compressed files are written as separate gzip members, the
+        partition files can be concatenated without decompressing them.
+
+        Parameters
+        ----------
+        results: list
+            Consumer results for each partition of the data stream.
+        offsets: list of int
+            Position of the first row of each partition in the data stream.
+        """
+        with open(self.file.filename, 'wb') as fout:
+            for index in range(len(results)):
+                filename = partfile(self.file.filename, index)
+                with open(filename, 'rb') as fin:
+                    shutil.copyfileobj(fin, fout)
+                os.remove(filename)
+
     def open(self, schema: DatasetSchema) -> StreamConsumer:
         """Factory pattern for stream consumer. Returns an instance of the
         stream consumer with an open CSV writer.
@@ -292,5 +576,313 @@ class Write(StreamConsumer, StreamProcessor):
         openclean.operator.stream.consumer.StreamConsumer
         """
         f = self.file.writer()
-        f.write(schema)
-        return Write(writer=f)
+        if self.header:
+            f.write(schema)
+        return Write(file=self.file, writer=f)
+
+    def resume(self, schema: DatasetSchema, state: int) -> StreamConsumer:
+        """Create a stream consumer that continues writing the output file at
+        the position that was recorded by a checkpoint. Rows that were written
+        after the checkpoint are removed from the file.
+
+        Parameters
+        ----------
+        schema: list of string
+            List of column names in the data stream schema.
+        state: int
+            Position in the output file.
+
+        Returns
+        -------
+        openclean.operator.stream.consumer.StreamConsumer
+        """
+        return Write(file=self.file, writer=CSVAppendWriter(file=self.file, pos=state))
+
+
+class WriteBinary(StreamConsumer, StreamProcessor):
+    """Write data stream rows and their identifiers to a binary output file.
+    This class either contains the path to the output file (if instantiated as
+    a processor) or a reference to a binary writer (if instantiated as a
+    consumer).
+    """
+    def __init__(
+        self, filename: Optional[str] = None, compressed: Optional[bool] = False,
+        chunksize: Optional[int] = CHUNKSIZE, writer: Optional[BinaryWriter] = None
+    ):
+        """Initialize the output file parameters and the binary writer.
+
+        Parameters
+        ----------
+        filename: string, default=None
+            Path to the output file.
+        compressed: bool, default=False
+            Compress the chunks in the output file.
+        chunksize: int, default=10000
+            Number of rows in each chunk of the output file.
+        writer: openclean.data.stream.binary.BinaryWriter, default=None
+            Writer for the output file.
+        """
+        self.filename = filename
+        self.compressed = compressed
+        self.chunksize = chunksize
+        self.writer = writer
+
+    def close(self):
+        """Close the associated binary writer when the end of the data stream
+        was reached.
+        """
+        self.writer.close()
+
+    def consume(self, rowid: int, row: List):
+        """Write the row to the output file.
+
+        Parameters
+        -----------
+        rowid: int
+            Unique row identifier
+        row: list
+            List of values in the row.
+        """
+        self.writer.write(rowid, row)
+
+    def consume_batch(self, rowids: List[RowIndex], rows: List[DataRow]) -> RowBatch:
+        """Write a batch of rows to the output file.
+
+        Parameters
+        ----------
+        rowids: list
+            Unique identifier for each row in the batch.
+        rows: list of list
+            List of values for each row in the batch.
+
+        Returns
+        -------
+        tuple of list and list
+        """
+        self.writer.write_batch(rowids, rows)
+        return [], []
+
+    def open(self, schema: DatasetSchema) -> StreamConsumer:
+        """Factory pattern for stream consumer. Returns an instance of the
+        stream consumer with an open binary writer.
+
+        Parameters
+        ----------
+        schema: list of string
+            List of column names in the data stream schema.
+
+        Returns
+        -------
+        openclean.operator.stream.consumer.StreamConsumer
+        """
+        writer = BinaryWriter(
+            filename=self.filename,
+            columns=schema,
+            compressed=self.compressed,
+            chunksize=self.chunksize
+        )
+        return WriteBinary(writer=writer)
+
+
+class Tee(StreamConsumer, MergeableProcessor):
+    """Pass all rows in a data stream to multiple collectors. This allows to
+    compute the results of several terminal operators in a single pass over
+    the data stream. The result is a dictionary that contains the result of
+    each collector under its given key.
+
+    This class either contains a dictionary of stream processors (if
+    instantiated as a processor) or a dictionary of stream consumers (if
+    instantiated as a consumer).
+    """
+    def __init__(
+        self, sinks: Optional[Dict[str, StreamProcessor]] = None,
+        consumers: Optional[Dict[str, StreamConsumer]] = None
+    ):
+        """Initialize the collectors.
+
+        Parameters
+        ----------
+        sinks: dict of openclean.operator.stream.processor.StreamProcessor,
+                default=None
+            Terminal stream processors that receive the rows in the stream.
+        consumers: dict of openclean.operator.stream.consumer.StreamConsumer,
+                default=None
+            Stream consumers for the terminal stream processors.
+        """
+        self.sinks = sinks
+        self.consumers = consumers
+        # Consumers that have not raised StopIteration yet.
+        self._active = dict(consumers) if consumers is not None else None
+
+    def checkpoint(self) -> Dict[str, Any]:
+        """Get the states of all consumers.
+
+        Returns
+        -------
+        dict
+        """
+        return {key: consumer.checkpoint() for key, consumer in self.consumers.items()}
+
+    def close(self) -> Dict[str, Any]:
+        """Close all consumers and return a dictionary with their results.
+
+        Returns
+        -------
+        dict
+        """
+        return {key: consumer.close() for key, consumer in self.consumers.items()}
+
+    def consume(self, rowid: int, row: List):
+        """Pass the given row to all active consumers.
+
+        Parameters
+        -----------
+        rowid: int
+            Unique row identifier
+        row: list
+            List of values in the row.
+        """
+        for key, consumer in list(self._active.items()):
+            try:
+                consumer.consume(rowid, row)
+            except StopIteration:
+                self._deactivate(key)
+
+    def consume_batch(self, rowids: List[RowIndex], rows: List[DataRow]) -> RowBatch:
+        """Pass the given batch of rows to all active consumers.
+
+        Parameters
+        ----------
+        rowids: list
+            Unique identifier for each row in the batch.
+        rows: list of list
+            List of values for each row in the batch.
+
+        Returns
+        -------
+        tuple of list and list
+        """
+        for key, consumer in list(self._active.items()):
+            try:
+                consumer.consume_batch(rowids, rows)
+            except StopIteration:
+                self._deactivate(key)
+        return [], []
+
+    def _deactivate(self, key: str):
+        """Stop passing rows to the consumer with the given key. Raises a
+        StopIteration error if no active consumer remains.
+
+        Parameters
+        ----------
+        key: string
+            Key of the consumer.
+        """
+        del self._active[key]
+        if not self._active:
+            raise StopIteration()
+
+    def for_partition(self, index: int) -> StreamProcessor:
+        """Get the processor for the partition with the given index.
+
+        Parameters
+        ----------
+        index: int
+            Index position of the partition in the data source.
+
+        Returns
+        -------
+        openclean.operator.stream.processor.StreamProcessor
+        """
+        sinks = {key: op.for_partition(index) for key, op in self.sinks.items()}
+        return Tee(sinks=sinks)
+
+    def merge(self, results: List[Dict[str, Any]], offsets: List[int]) -> Dict[str, Any]:
+        """Merge the results for all partitions of the data stream separately
+        for each of the collectors.
+
+        Parameters
+        ----------
+        results: list of dict
+            Results for each partition of the data stream.
+        offsets: list of int
+            Position of the first row of each partition in the data stream.
+
+        Returns
+        -------
+        dict
+        """
+        return {
+            key: op.merge(results=[r[key] for r in results], offsets=offsets)
+            for key, op in self.sinks.items()
+        }
+
+    def mergeable(self) -> bool:
+        """The results for the collectors can be merged if all of them are
+        mergeable processors.
+
+        Returns
+        -------
+        bool
+        """
+        for op in self.sinks.values():
+            if not isinstance(op, MergeableProcessor) or not op.mergeable():
+                return False
+        return True
+
+    def open(self, schema: DatasetSchema) -> StreamConsumer:
+        """Factory pattern for stream consumer. Returns an instance of the
+        stream consumer that passes rows to the consumers of all collectors.
+
+        Parameters
+        ----------
+        schema: list of string
+            List of column names in the data stream schema.
+
+        Returns
+        -------
+        openclean.operator.stream.consumer.StreamConsumer
+        """
+        consumers = {key: op.open(schema) for key, op in self.sinks.items()}
+        return Tee(consumers=consumers)
+
+    def resume(self, schema: DatasetSchema, state: Dict[str, Any]) -> StreamConsumer:
+        """Create a stream consumer that passes rows to the consumers of all
+        collectors. The state of each consumer is restored from the given
+        checkpoint.
+
+        Parameters
+        ----------
+        schema: list of string
+            List of column names in the data stream schema.
+        state: dict
+            States of the collector consumers.
+
+        Returns
+        -------
+        openclean.operator.stream.consumer.StreamConsumer
+        """
+        consumers = {
+            key: op.resume(schema=schema, state=state[key])
+            for key, op in self.sinks.items()
+        }
+        return Tee(consumers=consumers)
+
+
+# -- Helper functions ---------------------------------------------------------
+
+def partfile(filename: str, index: int) -> str:
+    """Get the name of the output file for a partition of a data stream.
+
+    Parameters
+    ----------
+    filename: string
+        Path to the output file for the full data stream.
+    index: int
+        Index position of the partition in the data source.
+
+    Returns
+    -------
+    string
+    """
+    return '{}.part{}'.format(filename, index)
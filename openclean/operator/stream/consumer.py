@@ -17,10 +17,10 @@ consumer.
 """
 
 from __future__ import annotations
-from typing import Any, Optional
+from typing import Any, List, Optional
 from abc import ABCMeta, abstractmethod
 
-from openclean.data.stream.base import DataRow, Document, StreamFunction
+from openclean.data.stream.base import BatchFunction, DataRow, Document, RowBatch, RowIndex, StreamFunction
 from openclean.data.types import DatasetSchema
 
 
@@ -45,6 +45,25 @@ class StreamConsumer(metaclass=ABCMeta):
         """
         self.columns = columns
 
+    def checkpoint(self) -> Any:
+        """Get a serializable representation of the internal state of the
+        consumer. The state is used to resume processing a data stream after
+        the rows that have been consumed so far.
+
+        Consumers that maintain state have to implement this method. The
+        default implementation raises a NotImplementedError.
+
+        Returns
+        -------
+        any
+
+        Raises
+        ------
+        NotImplementedError
+        """
+        msg = 'checkpoints not supported for {}'.format(type(self).__name__)
+        raise NotImplementedError(msg)
+
     @abstractmethod
     def close(self) -> Any:
         """Signal that the end of the data stream has reached. The return value
@@ -72,6 +91,43 @@ class StreamConsumer(metaclass=ABCMeta):
         """
         raise NotImplementedError()  # pragma: no cover
 
+    def consume_batch(self, rowids: List[RowIndex], rows: List[DataRow]) -> RowBatch:
+        """Consume a batch of rows. Returns the identifiers and values of the
+        processed rows that were not rejected by the consumer.
+
+        The default implementation is an adapter for consumers that only
+        process one row at a time. It passes each row in the batch to the
+        consume method.
+
+        Parameters
+        ----------
+        rowids: list
+            Unique identifier for each row in the batch.
+        rows: list of list
+            List of values for each row in the batch.
+
+        Returns
+        -------
+        tuple of list and list
+        """
+        result_ids, result_rows = list(), list()
+        for rowid, row in zip(rowids, rows):
+            row = self.consume(rowid, row)
+            if row is not None:
+                result_ids.append(rowid)
+                result_rows.append(row)
+        return result_ids, result_rows
+
+    def restore(self, state: Any):
+        """Restore the internal state of the consumer from a checkpoint.
+
+        Parameters
+        ----------
+        state: any
+            Consumer state that was returned by the checkpoint method.
+        """
+        pass
+
     def process(self, ds: Document) -> Any:
         """Consume a given data stream and return the computed result.
 
@@ -142,6 +198,26 @@ class ProducingConsumer(StreamConsumer):
                 return self.consumer.consume(rowid, values)
         return values
 
+    def consume_batch(self, rowids: List[RowIndex], rows: List[DataRow]) -> RowBatch:
+        """Consume a batch of rows. Passes the processed rows on to the
+        associated downstream consumer as a single batch.
+
+        Parameters
+        ----------
+        rowids: list
+            Unique identifier for each row in the batch.
+        rows: list of list
+            List of values for each row in the batch.
+
+        Returns
+        -------
+        tuple of list and list
+        """
+        rowids, rows = self.handle_batch(rowids=rowids, rows=rows)
+        if rows and self.consumer is not None:
+            return self.consumer.consume_batch(rowids, rows)
+        return rowids, rows
+
     @abstractmethod
     def handle(self, rowid: int, row: DataRow) -> DataRow:
         """Process a given row. Return a modified row or None. In the latter
@@ -161,6 +237,34 @@ class ProducingConsumer(StreamConsumer):
         """
         raise NotImplementedError()  # pragma: no cover
 
+    def handle_batch(self, rowids: List[RowIndex], rows: List[DataRow]) -> RowBatch:
+        """Process a batch of rows. Returns the identifiers and values for all
+        rows that are passed on to the downstream consumer.
+
+        The default implementation calls the handle method for each row in
+        the batch. Consumers that raise StopIteration in the handle method
+        need to override this method to ensure that all rows before the
+        stopping point are passed on to the downstream consumer.
+
+        Parameters
+        ----------
+        rowids: list
+            Unique identifier for each row in the batch.
+        rows: list of list
+            List of values for each row in the batch.
+
+        Returns
+        -------
+        tuple of list and list
+        """
+        result_ids, result_rows = list(), list()
+        for rowid, row in zip(rowids, rows):
+            values = self.handle(rowid=rowid, row=row)
+            if values is not None:
+                result_ids.append(rowid)
+                result_rows.append(values)
+        return result_ids, result_rows
+
     def set_consumer(self, consumer: StreamConsumer) -> ProducingConsumer:
         """Set the downstream consumer.
 
@@ -185,10 +289,13 @@ class StreamFunctionHandler(ProducingConsumer):
     """
     def __init__(
         self, columns: DatasetSchema, func: StreamFunction,
-        consumer: Optional[StreamConsumer] = None
+        consumer: Optional[StreamConsumer] = None,
+        batchfunc: Optional[BatchFunction] = None
     ):
         """Initialize the consumer schema and the stream function that is used
-        be the handle method to process rows.
+        be the handle method to process rows. The optional batch function is
+        used to process batches of rows. If no batch function is given, the
+        stream function is applied to each row in a batch.
 
         Parameters
         ----------
@@ -198,12 +305,26 @@ class StreamFunctionHandler(ProducingConsumer):
             Stream function used to process data rows in the stream.
         consumer: openclean.data.stream.base.StreamConsumer, default=None
             Downstream consumer for processed rows.
+        batchfunc: openclean.data.stream.base.BatchFunction, default=None
+            Function used to process batches of data rows in the stream.
         """
         super(StreamFunctionHandler, self).__init__(
             columns=columns,
             consumer=consumer
         )
         self.func = func
+        self.batchfunc = batchfunc
+
+    def checkpoint(self) -> Any:
+        """The stream function handler has no state. Stream functions are
+        expected to return the same result for a row independently of the
+        rows that were handled before.
+
+        Returns
+        -------
+        any
+        """
+        return None
 
     def handle(self, rowid: int, row: DataRow) -> DataRow:
         """Process a given row using the associated stream function.
@@ -220,3 +341,30 @@ class StreamFunctionHandler(ProducingConsumer):
         list
         """
         return self.func(row)
+
+    def handle_batch(self, rowids: List[RowIndex], rows: List[DataRow]) -> RowBatch:
+        """Process a batch of rows using the associated batch function. If no
+        batch function is defined, the stream function is applied to each of
+        the rows.
+
+        Parameters
+        ----------
+        rowids: list
+            Unique identifier for each row in the batch.
+        rows: list of list
+            List of values for each row in the batch.
+
+        Returns
+        -------
+        tuple of list and list
+        """
+        if self.batchfunc is not None:
+            return self.batchfunc(rowids, rows)
+        func = self.func
+        result_ids, result_rows = list(), list()
+        for rowid, row in zip(rowids, rows):
+            values = func(row)
+            if values is not None:
+                result_ids.append(rowid)
+                result_rows.append(values)
+        return result_ids, result_rows
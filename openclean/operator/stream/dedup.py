@@ -0,0 +1,271 @@
+# This file is part of the Data Cleaning Library (openclean).
+#
+# Copyright (C) 2018-2021 New York University.
+#
+# openclean is released under the Revised BSD License. See file LICENSE for
+# full license details.
+
+"""Stream operator that removes duplicate rows from a data stream. Rows are
+duplicates if they have the same values (or the same keys for the values) in
+a given list of columns. Only the first row for each key is passed on to the
+downstream consumer.
+
+The operator has two modes. In the exact mode the set of keys that have been
+seen is maintained as a set of 128-bit digests, i.e., the memory requirement
+grows with the number of distinct keys but does not depend on the size of
+the key values. In the approximate mode the keys are added to a scalable
+Bloom filter. The memory requirement is bounded by the number of distinct
+keys and the false-positive rate. Rows may be dropped as duplicates with a
+probability that is bounded by the false-positive rate but duplicate rows
+are never passed on.
+"""
+
+from typing import Any, Callable, List, Optional, Set, Union
+
+from openclean.data.schema import select_clause
+from openclean.data.stream.base import DataRow, RowBatch, RowIndex
+from openclean.data.types import Columns, DatasetSchema, Value
+from openclean.function.value.base import CallableWrapper, ValueFunction
+from openclean.operator.stream.consumer import ProducingConsumer, StreamConsumer
+from openclean.operator.stream.processor import StreamProcessor
+from openclean.operator.stream.sketch import BLOOM_CAPACITY, ScalableBloomFilter, valuedigest
+
+
+class Dedup(StreamProcessor):
+    """Stream processor that removes rows with duplicate keys from a data
+    stream.
+    """
+    def __init__(
+        self, columns: Optional[Columns] = None, key: Optional[Union[Callable, ValueFunction]] = None,
+        error: Optional[float] = None, capacity: Optional[int] = BLOOM_CAPACITY
+    ):
+        """Initialize the key columns, the optional key function, and the
+        parameters for the approximate mode.
+
+        Parameters
+        ----------
+        columns: int, string, or list(int or string), default=None
+            Columns that are used to detect duplicates. By default, all
+            columns are used.
+        key: callable or openclean.function.value.base.ValueFunction, default=None
+            Function that is applied to each value in the key columns (e.g.,
+            a fingerprint key generator). Rows whose values have the same keys
+            are considered duplicates.
+        error: float, default=None
+            False-positive rate for the approximate mode. If None, duplicates
+            are detected exactly.
+        capacity: int, default=100000
+            Capacity of the first filter in the scalable Bloom filter that is
+            used by the approximate mode.
+
+        Raises
+        ------
+        ValueError
+        """
+        if key is not None and not isinstance(key, ValueFunction):
+            key = CallableWrapper(key)
+        if key is not None and not key.is_prepared():
+            raise ValueError('key function has to be prepared')
+        if error is not None and (error <= 0 or error >= 1):
+            raise ValueError('invalid error rate {}'.format(error))
+        self.columns = columns
+        self.key = key
+        self.error = error
+        self.capacity = capacity
+
+    def open(self, schema: DatasetSchema) -> StreamConsumer:
+        """Factory pattern for stream consumer. Returns an instance of the
+        consumer that removes duplicate rows.
+
+        Parameters
+        ----------
+        schema: list of string
+            List of column names in the data stream schema.
+
+        Returns
+        -------
+        openclean.operator.stream.dedup.DedupConsumer
+        """
+        if self.columns is None:
+            colidx = list(range(len(schema)))
+        else:
+            _, colidx = select_clause(schema, self.columns)
+        if self.error is None:
+            seen = DigestSet()
+        else:
+            seen = ScalableBloomFilter(capacity=self.capacity, error=self.error)
+        return DedupConsumer(columns=schema, colidx=colidx, seen=seen, key=self.key)
+
+
+class DedupConsumer(ProducingConsumer):
+    """Consumer that passes on the first row for each key. The keys that
+    have been seen are maintained by a set-like object whose add method
+    returns True if the key was (possibly) added before.
+    """
+    def __init__(
+        self, columns: DatasetSchema, colidx: List[int], seen: Any,
+        key: Optional[ValueFunction] = None, consumer: Optional[StreamConsumer] = None
+    ):
+        """Initialize the key columns, the set of seen keys, and the
+        downstream consumer.
+
+        Parameters
+        ----------
+        columns: list of string
+            Names of columns for the rows that the consumer will receive.
+        colidx: list of int
+            Index positions of the key columns.
+        seen: openclean.operator.stream.dedup.DigestSet or
+                openclean.operator.stream.sketch.ScalableBloomFilter
+            Set of keys that have been seen.
+        key: openclean.function.value.base.ValueFunction, default=None
+            Function that is applied to each value in the key columns.
+        consumer: openclean.data.stream.base.StreamConsumer, default=None
+            Downstream consumer.
+        """
+        super(DedupConsumer, self).__init__(columns=columns, consumer=consumer)
+        self.seen = seen
+        self.keyfunc = key_function(colidx=colidx, key=key)
+
+    def checkpoint(self) -> Any:
+        """Get the set of keys that have been seen.
+
+        Returns
+        -------
+        openclean.operator.stream.dedup.DigestSet or
+        openclean.operator.stream.sketch.ScalableBloomFilter
+        """
+        return self.seen
+
+    def handle(self, rowid: int, row: DataRow) -> Optional[DataRow]:
+        """Return the row if its key has not been seen before. Otherwise,
+        the result is None.
+
+        Parameters
+        -----------
+        rowid: int
+            Unique row identifier
+        row: list
+            List of values in the row.
+
+        Returns
+        -------
+        list
+        """
+        return None if self.seen.add(self.keyfunc(row)) else row
+
+    def handle_batch(self, rowids: List[RowIndex], rows: List[DataRow]) -> RowBatch:
+        """Get the rows in the batch whose keys have not been seen before.
+
+        Parameters
+        ----------
+        rowids: list
+            Unique identifier for each row in the batch.
+        rows: list of list
+            List of values for each row in the batch.
+
+        Returns
+        -------
+        tuple of list and list
+        """
+        add, keyfunc = self.seen.add, self.keyfunc
+        result_ids, result_rows = list(), list()
+        for rowid, row in zip(rowids, rows):
+            if not add(keyfunc(row)):
+                result_ids.append(rowid)
+                result_rows.append(row)
+        return result_ids, result_rows
+
+    def restore(self, state: Any):
+        """Restore the set of keys that have been seen.
+
+        Parameters
+        ----------
+        state: openclean.operator.stream.dedup.DigestSet or
+                openclean.operator.stream.sketch.ScalableBloomFilter
+            Key set that was returned by the checkpoint method.
+        """
+        self.seen = state
+
+
+class DigestSet(object):
+    """Exact set of keys. Keys are represented by their 128-bit digests."""
+    def __init__(self, digests: Optional[Set[bytes]] = None):
+        """Initialize the set of digests.
+
+        Parameters
+        ----------
+        digests: set of bytes, default=None
+            Digests for keys that have been seen.
+        """
+        self.digests = digests if digests is not None else set()
+
+    def __contains__(self, value: Value) -> bool:
+        """Test if the key has been added to the set.
+
+        Parameters
+        ----------
+        value: scalar or tuple
+            Key value.
+
+        Returns
+        -------
+        bool
+        """
+        return valuedigest(value) in self.digests
+
+    def __len__(self) -> int:
+        """Get the number of keys in the set.
+
+        Returns
+        -------
+        int
+        """
+        return len(self.digests)
+
+    def add(self, value: Value) -> bool:
+        """Add a key to the set. Returns True if the key had been added
+        before.
+
+        Parameters
+        ----------
+        value: scalar or tuple
+            Key value.
+
+        Returns
+        -------
+        bool
+        """
+        digest = valuedigest(value)
+        if digest in self.digests:
+            return True
+        self.digests.add(digest)
+        return False
+
+
+# -- Helper functions ---------------------------------------------------------
+
+def key_function(colidx: List[int], key: Optional[ValueFunction] = None) -> Callable[[DataRow], Value]:
+    """Get a function that returns the key for a data row. The key is the
+    value of a single key column or the tuple of values for multiple key
+    columns. The optional key function is applied to each value.
+
+    Parameters
+    ----------
+    colidx: list of int
+        Index positions of the key columns.
+    key: openclean.function.value.base.ValueFunction, default=None
+        Function that is applied to each value in the key columns.
+
+    Returns
+    -------
+    callable
+    """
+    if len(colidx) == 1:
+        idx = colidx[0]
+        if key is None:
+            return lambda row: row[idx]
+        return lambda row: key.eval(row[idx])
+    if key is None:
+        return lambda row: tuple(row[i] for i in colidx)
+    return lambda row: tuple(key.eval(row[i]) for i in colidx)
@@ -0,0 +1,656 @@
+# This file is part of the Data Cleaning Library (openclean).
+#
+# Copyright (C) 2018-2021 New York University.
+#
+# openclean is released under the Revised BSD License. See file LICENSE for
+# full license details.
+
+"""Collectors that use temporary files on disk when the data that they
+maintain exceeds a given budget for main memory.
+
+The external distinct collector counts the exact frequencies of distinct
+values (or value combinations) like the :class:`openclean.operator.stream.collector.Distinct`
+collector. When the number of distinct values in main memory exceeds the
+budget, the (value, count)-pairs are hash-partitioned and appended to
+temporary partition files. When the collector is closed, the counts in each
+partition are aggregated separately. Only the values of a single partition
+have to fit into main memory at that point.
+
+The external sort consumer sorts the rows in a data stream using an external
+merge sort. Rows are buffered until the buffer reaches the budget. The
+buffered rows are then sorted and written to a temporary run file. When the
+consumer is closed, the sorted runs are merged. The sort is stable, i.e.,
+rows with equal sort keys remain in the order of the input stream.
+"""
+
+from __future__ import annotations
+from collections import Counter
+from typing import Any, BinaryIO, Callable, Iterable, Iterator, List, Optional, Tuple, Union
+
+import heapq
+import numbers
+import operator
+import os
+import pickle
+import shutil
+import tempfile
+
+from openclean.data.stream.base import DataRow, RowBatch, RowIndex
+from openclean.data.stream.binary import BinaryFile, BinaryWriter
+from openclean.data.types import Columns, DatasetSchema, Value
+from openclean.operator.stream.collector import Distinct
+from openclean.operator.stream.consumer import ProducingConsumer, StreamConsumer
+from openclean.operator.stream.sketch import valuehash
+
+
+"""Default maximum number of distinct values that are kept in main memory."""
+MAX_ENTRIES = 1000000
+
+"""Default number of partition files for spilled values."""
+PARTITIONS = 16
+
+"""Default maximum number of rows that are buffered in main memory by the
+external sort.
+"""
+MAX_ROWS = 1000000
+
+
+class ExternalDistinct(Distinct):
+    """Consumer that counts distinct values (or value combinations) using
+    temporary partition files when the number of distinct values in main
+    memory exceeds a given budget.
+
+    Closing the consumer returns a Counter with all values. Alternatively, the
+    consumer returns an iterator over the (value, count)-pairs that aggregates
+    and yields the values one partition at a time. Results that are returned
+    as iterators cannot be merged for parallel pipeline runs.
+    """
+    def __init__(
+        self, columns: Optional[Columns] = None, max_entries: Optional[int] = MAX_ENTRIES,
+        partitions: Optional[int] = PARTITIONS, tmpdir: Optional[str] = None,
+        iterate: Optional[bool] = False
+    ):
+        """Initialize the memory budget and the settings for temporary files.
+
+        Parameters
+        ----------
+        columns: int, str, or list of int or string, default=None
+            References to the column(s) for which distinct values are counted.
+            The columns are given as a list of index positions if the operator
+            is instantiated as a consumer.
+        max_entries: int, default=1000000
+            Maximum number of distinct values that are kept in main memory.
+        partitions: int, default=16
+            Number of partition files for spilled values.
+        tmpdir: string, default=None
+            Parent directory for the temporary partition files. Uses the
+            default directory for temporary files if not given.
+        iterate: bool, default=False
+            Return an iterator over (value, count)-pairs instead of a Counter
+            when the consumer is closed.
+
+        Raises
+        ------
+        ValueError
+        """
+        if max_entries < 1:
+            raise ValueError('invalid memory budget {}'.format(max_entries))
+        if partitions < 1:
+            raise ValueError('invalid number of partitions {}'.format(partitions))
+        super(ExternalDistinct, self).__init__(columns=columns)
+        self.max_entries = max_entries
+        self.partitions = partitions
+        self.tmpdir = tmpdir
+        self.iterate = iterate
+        # Partition files for spilled values. The files are created when
+        # values are spilled for the first time.
+        self._files = None
+
+    def checkpoint(self) -> Tuple[Counter, Optional[Tuple[str, List[int]]]]:
+        """Get the counter for the values in main memory together with the
+        state of the partition files.
+
+        Returns
+        -------
+        tuple of collections.Counter and tuple
+        """
+        files = self._files.checkpoint() if self._files is not None else None
+        return self.counter, files
+
+    def close(self) -> Union[Counter, Iterator[Tuple[Value, int]]]:
+        """Return the counts for all distinct values. If values were spilled
+        to disk, the counts are aggregated for each partition.
+
+        Returns
+        -------
+        collections.Counter or iterator of tuple
+        """
+        if self._files is None:
+            return iter(self.counter.items()) if self.iterate else self.counter
+        self._spill()
+        files, self._files = self._files, None
+        items = files.read(merge=operator.add)
+        if self.iterate:
+            return items
+        counter = Counter()
+        for key, count in items:
+            counter[key] += count
+        return counter
+
+    def consume(self, rowid: int, row: DataRow):
+        """Add the value combination for a given row to the counter. Values
+        are spilled to disk if the memory budget is exceeded.
+
+        Parameters
+        -----------
+        rowid: int
+            Unique row identifier
+        row: list
+            List of values in the row.
+        """
+        super(ExternalDistinct, self).consume(rowid=rowid, row=row)
+        if len(self.counter) > self.max_entries:
+            self._spill()
+
+    def consume_batch(self, rowids: List[RowIndex], rows: List[DataRow]) -> RowBatch:
+        """Add the value combinations for a batch of rows to the counter.
+        Values are spilled to disk if the memory budget is exceeded.
+
+        Parameters
+        ----------
+        rowids: list
+            Unique identifier for each row in the batch.
+        rows: list of list
+            List of values for each row in the batch.
+
+        Returns
+        -------
+        tuple of list and list
+        """
+        super(ExternalDistinct, self).consume_batch(rowids=rowids, rows=rows)
+        if len(self.counter) > self.max_entries:
+            self._spill()
+        return [], []
+
+    def mergeable(self) -> bool:
+        """Results can only be merged if they are returned as counters.
+
+        Returns
+        -------
+        bool
+        """
+        return not self.iterate
+
+    def open(self, schema: DatasetSchema) -> StreamConsumer:
+        """Factory pattern for stream consumer. Returns an instance of the
+        stream consumer for the external distinct values collector.
+
+        Parameters
+        ----------
+        schema: list of string
+            List of column names in the data stream schema.
+
+        Returns
+        -------
+        openclean.operator.stream.consumer.StreamConsumer
+        """
+        return ExternalDistinct(
+            columns=super(ExternalDistinct, self).open(schema).columns,
+            max_entries=self.max_entries,
+            partitions=self.partitions,
+            tmpdir=self.tmpdir,
+            iterate=self.iterate
+        )
+
+    def restore(self, state: Tuple[Counter, Optional[Tuple[str, List[int]]]]):
+        """Restore the counter and the partition files.
+
+        Parameters
+        ----------
+        state: tuple of collections.Counter and tuple
+            Consumer state that was returned by the checkpoint method.
+        """
+        self.counter, files = state
+        if files is not None:
+            self._files = PartitionFiles.restore(files)
+
+    def _spill(self):
+        """Append the (value, count)-pairs in main memory to the partition
+        files and clear the counter.
+        """
+        if self._files is None:
+            self._files = PartitionFiles(partitions=self.partitions, tmpdir=self.tmpdir)
+        self._files.write(self.counter.items())
+        self.counter = Counter()
+
+
+class ExternalSort(ProducingConsumer):
+    """Consumer that sorts the rows in a data stream using an external merge
+    sort. The sorted rows are passed on to the downstream consumer when the
+    consumer is closed.
+    """
+    def __init__(
+        self, columns: DatasetSchema, colidx: List[int], reversed: List[bool],
+        max_rows: Optional[int] = MAX_ROWS, tmpdir: Optional[str] = None,
+        consumer: Optional[StreamConsumer] = None
+    ):
+        """Initialize the sort key and the memory budget.
+
+        Parameters
+        ----------
+        columns: list of string
+            Names of columns for the rows that the consumer will receive.
+        colidx: list of int
+            Index positions of the sort columns.
+        reversed: list of bool
+            Flag for each sort column indicating whether the sort order is
+            reversed.
+        max_rows: int, default=1000000
+            Maximum number of rows that are buffered in main memory.
+        tmpdir: string, default=None
+            Parent directory for the temporary run files. Uses the default
+            directory for temporary files if not given.
+        consumer: openclean.data.stream.base.StreamConsumer, default=None
+            Downstream consumer.
+
+        Raises
+        ------
+        ValueError
+        """
+        if max_rows < 1:
+            raise ValueError('invalid memory budget {}'.format(max_rows))
+        super(ExternalSort, self).__init__(columns=columns, consumer=consumer)
+        self.sortkey = sort_key(colidx=colidx, reversed=reversed)
+        self.max_rows = max_rows
+        self.tmpdir = tmpdir
+        self._rowids = list()
+        self._rows = list()
+        # Directory and file names for sorted runs. The directory is created
+        # when the first run is written.
+        self._dir = None
+        self._runs = list()
+
+    def checkpoint(self) -> Tuple[List[RowIndex], List[DataRow], Optional[str], List[str]]:
+        """Get the buffered rows and the list of run files that have been
+        written.
+
+        Returns
+        -------
+        tuple of list, list, string, and list
+        """
+        return self._rowids, self._rows, self._dir, self._runs
+
+    def close(self) -> Any:
+        """Merge the sorted runs and pass the rows on to the downstream
+        consumer. Returns the result of the downstream consumer or, if the
+        result is None, the list of rows that were returned by the downstream
+        consumer. Without a downstream consumer an iterator over the sorted
+        rows is returned.
+
+        Returns
+        -------
+        any
+        """
+        rows = self._merge()
+        if self.consumer is None:
+            return rows
+        # Rows are passed on one at a time to collect the rows that are
+        # returned by the downstream consumer (e.g., for a row limit).
+        result = list()
+        try:
+            for rowid, row in rows:
+                row = self.consumer.consume(rowid=rowid, row=row)
+                if row is not None:
+                    result.append((rowid, row))
+        except StopIteration:
+            pass
+        finally:
+            rows.close()
+        consumer_result = self.consumer.close()
+        return result if consumer_result is None else consumer_result
+
+    def handle(self, rowid: int, row: DataRow) -> Optional[DataRow]:
+        """Add the row to the buffer. Returns None since rows are only passed
+        on when the consumer is closed.
+
+        Parameters
+        -----------
+        rowid: int
+            Unique row identifier
+        row: list
+            List of values in the row.
+
+        Returns
+        -------
+        list
+        """
+        self._rowids.append(rowid)
+        self._rows.append(row)
+        if len(self._rows) >= self.max_rows:
+            self._spill()
+
+    def handle_batch(self, rowids: List[RowIndex], rows: List[DataRow]) -> RowBatch:
+        """Add a batch of rows to the buffer.
+
+        Parameters
+        ----------
+        rowids: list
+            Unique identifier for each row in the batch.
+        rows: list of list
+            List of values for each row in the batch.
+
+        Returns
+        -------
+        tuple of list and list
+        """
+        self._rowids.extend(rowids)
+        self._rows.extend(rows)
+        if len(self._rows) >= self.max_rows:
+            self._spill()
+        return [], []
+
+    def restore(self, state: Tuple[List[RowIndex], List[DataRow], Optional[str], List[str]]):
+        """Restore the buffered rows and the list of run files.
+
+        Parameters
+        ----------
+        state: tuple of list, list, string, and list
+            Consumer state that was returned by the checkpoint method.
+        """
+        self._rowids, self._rows, self._dir, self._runs = state
+
+    def _merge(self) -> Iterator[Tuple[RowIndex, DataRow]]:
+        """Generator for the sorted rows in all runs and in the buffer. The
+        run files are removed when all rows have been read (or the generator
+        is closed).
+
+        Returns
+        -------
+        iterator of tuple
+        """
+        buffer = self._sorted()
+        self._rowids, self._rows = list(), list()
+        dirname, runs = self._dir, self._runs
+        self._dir, self._runs = None, list()
+        readers = [BinaryFile(filename).open() for filename in runs]
+        try:
+            if not readers:
+                yield from buffer
+                return
+            # Runs are merged in the order in which they were written to
+            # keep the sort stable. Rows in the buffer were received last.
+            sources = [((rowid, row) for _, rowid, row in reader) for reader in readers]
+            sortkey = self.sortkey
+            yield from heapq.merge(*sources, buffer, key=lambda r: sortkey(r[1]))
+        finally:
+            for reader in readers:
+                reader.close()
+            if dirname is not None:
+                shutil.rmtree(dirname, ignore_errors=True)
+
+    def _sorted(self) -> List[Tuple[RowIndex, DataRow]]:
+        """Sort the buffered rows.
+
+        Returns
+        -------
+        list of tuple
+        """
+        sortkey = self.sortkey
+        return sorted(zip(self._rowids, self._rows), key=lambda r: sortkey(r[1]))
+
+    def _spill(self):
+        """Write the sorted rows in the buffer to a new run file."""
+        if self._dir is None:
+            self._dir = tempfile.mkdtemp(dir=self.tmpdir)
+        filename = os.path.join(self._dir, 'run{}.bin'.format(len(self._runs)))
+        with BinaryWriter(filename, columns=self.columns) as writer:
+            for rowid, row in self._sorted():
+                writer.write(rowid, row)
+        self._runs.append(filename)
+        self._rowids, self._rows = list(), list()
+
+
+class PartitionFiles(object):
+    """Set of temporary files for hash-partitioned (key, value)-pairs that
+    are spilled to disk. Pairs are appended to the partition files in
+    batches. When the files are read, the values for each key are combined
+    one partition at a time.
+
+    Keys are assigned to partitions using a hash function that does not
+    depend on the Python process. Pairs that are spilled after a run was
+    resumed from a checkpoint are therefore assigned to the same partitions
+    as before. Keys that are equal (e.g., 1, 1.0, and True) are assigned to
+    the same partition (see :func:`partition_key`).
+    """
+    def __init__(
+        self, partitions: Optional[int] = PARTITIONS, tmpdir: Optional[str] = None,
+        dirname: Optional[str] = None, files: Optional[List[BinaryIO]] = None
+    ):
+        """Create the directory and the files for all partitions (unless an
+        existing set of files is given).
+
+        Parameters
+        ----------
+        partitions: int, default=16
+            Number of partition files.
+        tmpdir: string, default=None
+            Parent directory for the temporary directory with the partition
+            files. Uses the default directory for temporary files if not given.
+        dirname: string, default=None
+            Directory for existing partition files.
+        files: list of file objects, default=None
+            Existing partition files that are open for writing.
+        """
+        if dirname is None:
+            dirname = tempfile.mkdtemp(dir=tmpdir)
+            files = [open(partition_file(dirname, i), 'wb') for i in range(partitions)]
+        self.dirname = dirname
+        self.files = files
+
+    def checkpoint(self) -> Tuple[str, List[int]]:
+        """Flush all partition files. Returns the directory and the size of
+        all partition files.
+
+        Returns
+        -------
+        tuple of string and list of int
+        """
+        positions = list()
+        for f in self.files:
+            f.flush()
+            positions.append(f.tell())
+        return self.dirname, positions
+
+    def read(self, merge: Callable[[Any, Any], Any]) -> Iterator[Tuple[Any, Any]]:
+        """Generator for the combined (key, value)-pairs in all partition
+        files. The values for each key are combined using the given merge
+        function in the order in which they were spilled. The files are
+        removed when all partitions have been read (or the generator is
+        closed).
+
+        Parameters
+        ----------
+        merge: callable
+            Function that combines two values for the same key.
+
+        Returns
+        -------
+        iterator of tuple
+        """
+        for f in self.files:
+            f.close()
+        return read_partitions(self.dirname, len(self.files), merge=merge)
+
+    @staticmethod
+    def restore(state: Tuple[str, List[int]]) -> PartitionFiles:
+        """Open the partition files in the given directory and truncate them
+        to the size at the time of the checkpoint.
+
+        Parameters
+        ----------
+        state: tuple of string and list of int
+            State that was returned by the checkpoint method.
+
+        Returns
+        -------
+        openclean.operator.stream.external.PartitionFiles
+        """
+        dirname, positions = state
+        files = list()
+        for i, pos in enumerate(positions):
+            f = open(partition_file(dirname, i), 'r+b')
+            f.truncate(pos)
+            f.seek(pos)
+            files.append(f)
+        return PartitionFiles(dirname=dirname, files=files)
+
+    def write(self, items: Iterable[Tuple[Any, Any]]):
+        """Append (key, value)-pairs to the partition files.
+
+        Parameters
+        ----------
+        items: iterable of tuple
+            Key-value pairs.
+        """
+        n = len(self.files)
+        buckets = [list() for _ in range(n)]
+        for key, value in items:
+            buckets[valuehash(partition_key(key)) % n].append((key, value))
+        for f, pairs in zip(self.files, buckets):
+            if pairs:
+                pickle.dump(pairs, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+
+class Descending(object):
+    """Wrapper for values in a sort key that reverses the sort order."""
+    __slots__ = ['value']
+
+    def __init__(self, value: Any):
+        """Initialize the wrapped value.
+
+        Parameters
+        ----------
+        value: any
+            Value in the sort key.
+        """
+        self.value = value
+
+    def __eq__(self, other: Descending) -> bool:
+        return self.value == other.value
+
+    def __lt__(self, other: Descending) -> bool:
+        return other.value < self.value
+
+
+# -- Helper functions ---------------------------------------------------------
+
+def partition_file(dirname: str, index: int) -> str:
+    """Get the path to the partition file with the given index.
+
+    Parameters
+    ----------
+    dirname: string
+        Directory for partition files.
+    index: int
+        Partition index.
+
+    Returns
+    -------
+    string
+    """
+    return os.path.join(dirname, '{}.pkl'.format(index))
+
+
+def partition_key(value: Any) -> Any:
+    """Get the representation of a key that is used to assign the key to a
+    partition. The hash for partitioning is computed from the string
+    representation of the key. Numbers that are equal to an integer (e.g.,
+    True, 1.0, or numpy integers) are converted to int and other real numbers
+    are converted to float. Equal keys that are merged in main memory are
+    therefore always assigned to the same partition.
+
+    Parameters
+    ----------
+    value: any
+        Key value (or tuple of values).
+
+    Returns
+    -------
+    any
+    """
+    if isinstance(value, tuple):
+        return tuple(partition_key(v) for v in value)
+    if isinstance(value, numbers.Integral):
+        return int(value)
+    if isinstance(value, numbers.Real):
+        value = float(value)
+        if value.is_integer():
+            return int(value)
+    return value
+
+
+def sort_key(colidx: List[int], reversed: List[bool]) -> Callable[[DataRow], Tuple]:
+    """Get the function that computes the sort key for a row. None values are
+    sorted last independently of the sort order.
+
+    Parameters
+    ----------
+    colidx: list of int
+        Index positions of the sort columns.
+    reversed: list of bool
+        Flag for each sort column indicating whether the sort order is
+        reversed.
+
+    Returns
+    -------
+    callable
+    """
+    columns = list(zip(colidx, reversed))
+    if not any(reversed):
+        return lambda row: tuple([(row[i] is None, row[i]) for i in colidx])
+
+    def key(row: DataRow) -> Tuple:
+        return tuple([
+            (row[i] is None, Descending(row[i]) if rev else row[i]) for i, rev in columns
+        ])
+
+    return key
+
+
+def read_partitions(
+    dirname: str, partitions: int, merge: Callable[[Any, Any], Any]
+) -> Iterator[Tuple[Any, Any]]:
+    """Generator for the combined (key, value)-pairs in all partition files.
+    Each partition is combined in main memory. The directory is removed when
+    all partitions have been read (or the generator is closed).
+
+    Parameters
+    ----------
+    dirname: string
+        Directory for partition files.
+    partitions: int
+        Number of partition files.
+    merge: callable
+        Function that combines two values for the same key.
+
+    Returns
+    -------
+    iterator of tuple
+    """
+    try:
+        for i in range(partitions):
+            values = dict()
+            with open(partition_file(dirname, i), 'rb') as f:
+                while True:
+                    try:
+                        pairs = pickle.load(f)
+                    except EOFError:
+                        break
+                    for key, value in pairs:
+                        if key in values:
+                            values[key] = merge(values[key], value)
+                        else:
+                            values[key] = value
+            yield from values.items()
+    finally:
+        shutil.rmtree(dirname, ignore_errors=True)
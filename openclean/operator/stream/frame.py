@@ -0,0 +1,277 @@
+# This file is part of the Data Cleaning Library (openclean).
+#
+# Copyright (C) 2018-2021 New York University.
+#
+# openclean is released under the Revised BSD License. See file LICENSE for
+# full license details.
+
+"""Stream operator that executes a data frame transformer on chunks of rows
+in a data stream. Rows are buffered until a chunk of the given size is full.
+The chunk is then converted into a pandas data frame and transformed by the
+wrapped operator. The rows in the transformed data frame are passed on to the
+downstream consumer. The memory requirements are bounded by the chunk size
+while the transformer still operates on data frames (e.g., to make use of
+vectorized evaluation functions).
+
+The wrapped transformer has to be row-local, i.e., the result for each row
+may not depend on other rows in the data frame. Transformers that look at
+the data frame as a whole (e.g., to sort or to group rows) will produce
+results for each chunk independently.
+"""
+
+from typing import Any, List, Optional, Tuple
+
+import pandas as pd
+
+from openclean.data.stream.base import DataRow, RowBatch, RowIndex
+from openclean.data.types import DatasetSchema
+from openclean.operator.base import DataFrameTransformer
+from openclean.operator.stream.consumer import ProducingConsumer, StreamConsumer
+from openclean.operator.stream.processor import StreamProcessor
+
+
+"""Default number of rows in each transformed data frame."""
+CHUNKSIZE = 10000
+
+
+class FrameProcessor(StreamProcessor):
+    """Stream processor that executes a data frame transformer on chunks of
+    rows in a data stream.
+    """
+    def __init__(
+        self, transformer: DataFrameTransformer, chunksize: Optional[int] = CHUNKSIZE,
+        columns: Optional[DatasetSchema] = None
+    ):
+        """Initialize the wrapped transformer and the chunk size.
+
+        Parameters
+        ----------
+        transformer: openclean.operator.base.DataFrameTransformer
+            Row-local data frame transformer.
+        chunksize: int, default=10000
+            Maximum number of rows in each transformed data frame.
+        columns: list of string, default=None
+            Schema of the data frames that are returned by the transformer.
+            If not given, the schema is derived from the stream consumer of
+            the transformer (if it is a stream processor) or the schema of
+            the input stream is used.
+
+        Raises
+        ------
+        ValueError
+        """
+        if chunksize < 1:
+            raise ValueError('invalid chunk size {}'.format(chunksize))
+        self.transformer = transformer
+        self.chunksize = chunksize
+        self.columns = columns
+
+    def open(self, schema: DatasetSchema) -> StreamConsumer:
+        """Factory pattern for stream consumer. Returns an instance of the
+        chunked data frame transformer.
+
+        Parameters
+        ----------
+        schema: list of string
+            List of column names in the data stream schema.
+
+        Returns
+        -------
+        openclean.operator.stream.frame.FrameConsumer
+        """
+        return FrameConsumer(
+            columns=self.outschema(schema),
+            schema=schema,
+            transformer=self.transformer,
+            chunksize=self.chunksize
+        )
+
+    def outschema(self, schema: DatasetSchema) -> DatasetSchema:
+        """Get the schema of the rows that are produced by the wrapped
+        transformer for a given input schema.
+
+        Parameters
+        ----------
+        schema: list of string
+            List of column names in the data stream schema.
+
+        Returns
+        -------
+        list of string
+        """
+        if self.columns is not None:
+            return self.columns
+        elif isinstance(self.transformer, StreamProcessor):
+            return self.transformer.open(schema).columns
+        return schema
+
+
+class FrameConsumer(ProducingConsumer):
+    """Consumer that buffers batches of rows in chunks and executes a data
+    frame transformer on each full chunk. If the consumer has no downstream
+    consumer, or if rows are consumed one at a time, rows are transformed as
+    they are received.
+    """
+    def __init__(
+        self, columns: DatasetSchema, schema: DatasetSchema,
+        transformer: DataFrameTransformer, chunksize: Optional[int] = CHUNKSIZE,
+        consumer: Optional[StreamConsumer] = None
+    ):
+        """Initialize the wrapped transformer and the row buffer.
+
+        Parameters
+        ----------
+        columns: list of string
+            Names of columns for the rows that are produced by the consumer.
+        schema: list of string
+            Names of columns for the rows that the consumer receives.
+        transformer: openclean.operator.base.DataFrameTransformer
+            Row-local data frame transformer.
+        chunksize: int, default=10000
+            Maximum number of rows in each transformed data frame.
+        consumer: openclean.data.stream.base.StreamConsumer, default=None
+            Downstream consumer.
+        """
+        super(FrameConsumer, self).__init__(columns=columns, consumer=consumer)
+        self.schema = schema
+        self.transformer = transformer
+        self.chunksize = chunksize
+        self._rowids = list()
+        self._rows = list()
+
+    def checkpoint(self) -> Tuple[List[RowIndex], List[DataRow]]:
+        """Get the buffered rows that have not been transformed yet.
+
+        Returns
+        -------
+        tuple of list and list
+        """
+        return self._rowids, self._rows
+
+    def close(self) -> Any:
+        """Transform the remaining buffered rows before the downstream
+        consumer is closed.
+
+        Returns
+        -------
+        any
+        """
+        if self._rows and self.consumer is not None:
+            # A downstream consumer may signal that it does not accept any
+            # more rows (e.g., a row limit). It is closed nevertheless.
+            try:
+                self._flush(final=True)
+            except StopIteration:
+                pass
+        return super(FrameConsumer, self).close()
+
+    def consume(self, rowid: int, row: DataRow) -> Optional[DataRow]:
+        """Transform a single row and pass the result on to the downstream
+        consumer. Rows that are consumed one at a time (e.g., by a pipeline
+        iterator) are not buffered since the result has to be returned to the
+        caller immediately.
+
+        Parameters
+        -----------
+        rowid: int
+            Unique row identifier
+        row: list
+            List of values in the row.
+
+        Returns
+        -------
+        list
+        """
+        # Ensure that buffered rows are passed on first to maintain the row
+        # order.
+        if self._rows and self.consumer is not None:
+            self._flush(final=True)
+        return super(FrameConsumer, self).consume(rowid=rowid, row=row)
+
+    def consume_batch(self, rowids: List[RowIndex], rows: List[DataRow]) -> RowBatch:
+        """Add a batch of rows to the buffer. Full chunks are transformed and
+        passed on to the downstream consumer. Without a downstream consumer
+        the batch is transformed immediately and the result is returned.
+
+        Parameters
+        ----------
+        rowids: list
+            Unique identifier for each row in the batch.
+        rows: list of list
+            List of values for each row in the batch.
+
+        Returns
+        -------
+        tuple of list and list
+        """
+        if self.consumer is None:
+            return self.handle_batch(rowids=rowids, rows=rows)
+        self._rowids.extend(rowids)
+        self._rows.extend(rows)
+        if len(self._rows) >= self.chunksize:
+            self._flush()
+        return [], []
+
+    def handle(self, rowid: int, row: DataRow) -> Optional[DataRow]:
+        """Transform a single row. Returns None if the transformer removes
+        the row.
+
+        Parameters
+        -----------
+        rowid: int
+            Unique row identifier
+        row: list
+            List of values in the row.
+
+        Returns
+        -------
+        list
+        """
+        _, rows = self.handle_batch(rowids=[rowid], rows=[row])
+        return rows[0] if rows else None
+
+    def handle_batch(self, rowids: List[RowIndex], rows: List[DataRow]) -> RowBatch:
+        """Transform a batch of rows as a single data frame.
+
+        Parameters
+        ----------
+        rowids: list
+            Unique identifier for each row in the batch.
+        rows: list of list
+            List of values for each row in the batch.
+
+        Returns
+        -------
+        tuple of list and list
+        """
+        df = pd.DataFrame(data=rows, index=rowids, columns=self.schema, dtype=object)
+        df = self.transformer.transform(df)
+        return df.index.tolist(), df.values.tolist()
+
+    def restore(self, state: Tuple[List[RowIndex], List[DataRow]]):
+        """Restore the buffered rows.
+
+        Parameters
+        ----------
+        state: tuple of list and list
+            Buffered rows that were returned by the checkpoint method.
+        """
+        self._rowids, self._rows = state
+
+    def _flush(self, final: Optional[bool] = False):
+        """Transform full chunks of buffered rows and pass the results on to
+        the downstream consumer. Rows in an incomplete chunk are only
+        transformed if the final flag is True.
+
+        Parameters
+        ----------
+        final: bool, default=False
+            Transform all buffered rows.
+        """
+        size = self.chunksize
+        while len(self._rows) >= size or (final and self._rows):
+            rowids, self._rowids = self._rowids[:size], self._rowids[size:]
+            rows, self._rows = self._rows[:size], self._rows[size:]
+            rowids, rows = self.handle_batch(rowids=rowids, rows=rows)
+            if rows:
+                self.consumer.consume_batch(rowids, rows)
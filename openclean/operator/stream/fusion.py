@@ -0,0 +1,411 @@
+# This file is part of the Data Cleaning Library (openclean).
+#
+# Copyright (C) 2018-2021 New York University.
+#
+# openclean is released under the Revised BSD License. See file LICENSE for
+# full license details.
+
+"""Operator fusion for data processing pipelines. Adjacent operators that
+process each row independently of all other rows (e.g., select, update, or
+filter) are combined into a single stream consumer. The fused consumer uses
+one compiled row function that copies the values of each input row at most
+once instead of passing the row through a chain of consumers.
+
+Fusable operators describe their effect on a row as a list of row steps. The
+steps of all operators in a fused group are compiled into a single row
+function by the :class:`openclean.operator.stream.fusion.FusedProcessor`.
+"""
+
+from abc import ABCMeta, abstractmethod
+from typing import Callable, List, Optional, Tuple
+
+from openclean.data.stream.base import DataRow, RowBatch, RowIndex, StreamFunction
+from openclean.data.types import DatasetSchema
+from openclean.operator.stream.consumer import StreamFunctionHandler
+from openclean.operator.stream.processor import StreamProcessor
+
+
+"""Type alias for compiled row steps. A compiled step modifies the given list
+of row values in place. The result is False if the row is rejected.
+"""
+CompiledStep = Callable[[DataRow], bool]
+
+
+# -- Row steps ----------------------------------------------------------------
+
+class RowStep(metaclass=ABCMeta):
+    """Elementary row-level operation in a fused operator plan."""
+    @abstractmethod
+    def compile(self) -> CompiledStep:
+        """Get function that applies the step to a list of row values.
+
+        Returns
+        -------
+        callable
+        """
+        raise NotImplementedError()  # pragma: no cover
+
+
+class ColumnInsert(RowStep):
+    """Insert values that are computed by a function into a row."""
+    def __init__(self, pos: int, func: StreamFunction, count: Optional[int] = 1):
+        """Initialize the insert position and the value function.
+
+        Parameters
+        ----------
+        pos: int
+            Insert position for the new values.
+        func: callable
+            Function that computes the inserted value(s) for a given row. If
+            more than one column is inserted the function is expected to return
+            a list of values.
+        count: int, default=1
+            Number of inserted columns.
+        """
+        self.pos = pos
+        self.func = func
+        self.count = count
+
+    def compile(self) -> CompiledStep:
+        """Get function that inserts values into a list of row values.
+
+        Returns
+        -------
+        callable
+        """
+        pos, func = self.pos, self.func
+        if self.count == 1:
+
+            def insfunc(values: DataRow) -> bool:
+                values.insert(pos, func(values))
+                return True
+
+        else:
+
+            def insfunc(values: DataRow) -> bool:
+                values[pos:pos] = func(values)
+                return True
+
+        return insfunc
+
+
+class ColumnUpdate(RowStep):
+    """Update the values of one or more columns in a row."""
+    def __init__(self, colidxs: List[int], func: StreamFunction):
+        """Initialize the index positions of the updated columns and the
+        update function.
+
+        Parameters
+        ----------
+        colidxs: list of int
+            Index positions of updated columns.
+        func: callable
+            Function that computes the updated value(s) for a given row.
+        """
+        self.colidxs = colidxs
+        self.func = func
+
+    def compile(self) -> CompiledStep:
+        """Get function that updates a list of row values.
+
+        Returns
+        -------
+        callable
+        """
+        func = self.func
+        if len(self.colidxs) == 1:
+            colidx = self.colidxs[0]
+
+            def updfunc(values: DataRow) -> bool:
+                values[colidx] = func(values)
+                return True
+
+        else:
+            colidxs = self.colidxs
+
+            def updfunc(values: DataRow) -> bool:
+                val = func(values)
+                if len(val) != len(colidxs):
+                    msg = 'expected {} values instead of {}'
+                    raise ValueError(msg.format(len(colidxs), len(val)))
+                for col, v in zip(colidxs, val):
+                    values[col] = v
+                return True
+
+        return updfunc
+
+
+class Projection(RowStep):
+    """Re-arrange the values in a row. The projection is represented by the
+    index positions of the input values for each value in the output row.
+    """
+    def __init__(self, colidxs: List[int]):
+        """Initialize the projection index.
+
+        Parameters
+        ----------
+        colidxs: list of int
+            Index positions of input values for the output row.
+        """
+        self.colidxs = colidxs
+
+    def compile(self) -> CompiledStep:
+        """Get function that re-arranges the values in a row in place.
+
+        Returns
+        -------
+        callable
+        """
+        colidxs = self.colidxs
+
+        def projfunc(values: DataRow) -> bool:
+            values[:] = [values[i] for i in colidxs]
+            return True
+
+        return projfunc
+
+    def then(self, colidxs: List[int]) -> List[int]:
+        """Compose this projection with a subsequent projection. Returns the
+        index positions of the input values for the combined projection.
+
+        Parameters
+        ----------
+        colidxs: list of int
+            Index positions for the subsequent projection.
+
+        Returns
+        -------
+        list of int
+        """
+        return [self.colidxs[i] for i in colidxs]
+
+
+class RowFilter(RowStep):
+    """Reject rows that do not satisfy a given predicate."""
+    def __init__(self, func: StreamFunction, negated: Optional[bool] = False):
+        """Initialize the predicate.
+
+        Parameters
+        ----------
+        func: callable
+            Predicate that is evaluated on each row.
+        negated: bool, default=False
+            Negate the predicate value.
+        """
+        self.func = func
+        self.negated = negated
+
+    def compile(self) -> CompiledStep:
+        """Get function that evaluates the predicate on a list of row values.
+
+        Returns
+        -------
+        callable
+        """
+        func = self.func
+        if self.negated:
+            return lambda values: not func(values)
+        return func
+
+
+# -- Fusable operators --------------------------------------------------------
+
+class FusableProcessor(StreamProcessor):
+    """Stream processor for an operator that processes each row independently
+    of all other rows in the data stream. The effect of the operator on each
+    row is described by a list of row steps so that the operator can be fused
+    with adjacent row-local operators in a data pipeline.
+    """
+    @abstractmethod
+    def fuse(self, schema: DatasetSchema) -> Tuple[DatasetSchema, List[RowStep]]:
+        """Get the output schema and the row steps of the operator for rows in
+        the given input schema.
+
+        Parameters
+        ----------
+        schema: list of string
+            List of column names in the data stream schema.
+
+        Returns
+        -------
+        tuple of list of string and list of openclean.operator.stream.fusion.RowStep
+        """
+        raise NotImplementedError()  # pragma: no cover
+
+
+class FusedProcessor(StreamProcessor):
+    """Stream processor for a sequence of fusable operators. The consumer for
+    the fused operators applies a single compiled row function to each row.
+    """
+    def __init__(self, operators: List[FusableProcessor]):
+        """Initialize the sequence of fused operators.
+
+        Parameters
+        ----------
+        operators: list of openclean.operator.stream.fusion.FusableProcessor
+            Fused operators in order of their execution.
+        """
+        self.operators = operators
+
+    def open(self, schema: DatasetSchema) -> StreamFunctionHandler:
+        """Factory pattern for stream consumer. Returns a stream function
+        handler that applies the compiled row function for all fused operators.
+
+        Parameters
+        ----------
+        schema: list of string
+            List of column names in the data stream schema.
+
+        Returns
+        -------
+        openclean.operator.stream.consumer.StreamFunctionHandler
+        """
+        columns, steps = self.steps(schema)
+        rowfunc = compile_steps(steps)
+
+        def batchfunc(rowids: List[RowIndex], rows: List[DataRow]) -> RowBatch:
+            """Apply the compiled row function to all rows in a batch."""
+            result_ids, result_rows = list(), list()
+            for rowid, row in zip(rowids, rows):
+                values = rowfunc(row)
+                if values is not None:
+                    result_ids.append(rowid)
+                    result_rows.append(values)
+            return result_ids, result_rows
+
+        return StreamFunctionHandler(columns=columns, func=rowfunc, batchfunc=batchfunc)
+
+    def steps(self, schema: DatasetSchema) -> Tuple[DatasetSchema, List[RowStep]]:
+        """Get the output schema and the row steps for all fused operators.
+
+        Parameters
+        ----------
+        schema: list of string
+            List of column names in the data stream schema.
+
+        Returns
+        -------
+        tuple of list of string and list of openclean.operator.stream.fusion.RowStep
+        """
+        steps = list()
+        for op in self.operators:
+            schema, opsteps = op.fuse(schema)
+            steps.extend(opsteps)
+        return schema, steps
+
+
+# -- Helper functions ---------------------------------------------------------
+
+def compile_steps(steps: List[RowStep]) -> StreamFunction:
+    """Compile a sequence of row steps into a single row function. The row
+    function returns None for rejected rows.
+
+    Consecutive projections are combined into a single projection that is
+    only applied when the next step needs to access the projected row. Filters
+    that occur before any other step are evaluated on the input row directly.
+    All other steps modify a single copy of the input row in place.
+
+    Parameters
+    ----------
+    steps: list of openclean.operator.stream.fusion.RowStep
+        Sequence of row steps.
+
+    Returns
+    -------
+    callable
+    """
+    prefilters, copy, loadidxs, compiled, outidxs = arrange_steps(steps)
+    # Function that copies the input row. Rows are not copied if none of the
+    # steps modifies the row values.
+    if not copy:
+        load = None
+    elif loadidxs is not None:
+        load = lambda row: [row[i] for i in loadidxs]  # noqa: E731
+    else:
+        load = list
+
+    def rowfunc(row: DataRow) -> DataRow:
+        """Apply all steps to a single row."""
+        for f in prefilters:
+            if not f(row):
+                return None
+        if load is not None:
+            row = load(row)
+            for f in compiled:
+                if not f(row):
+                    return None
+        if outidxs is not None:
+            return [row[i] for i in outidxs]
+        return row
+
+    return rowfunc
+
+
+def arrange_steps(
+    steps: List[RowStep]
+) -> Tuple[List[CompiledStep], bool, Optional[List[int]], List[CompiledStep], Optional[List[int]]]:
+    """Arrange a sequence of row steps for execution by a fused row function.
+    Returns (i) the compiled filters that are evaluated on the input row, (ii)
+    a flag indicating whether the input row needs to be copied, (iii) the
+    projection that is applied when copying the input row, (iv) the compiled
+    steps that modify the copied row, and (v) the projection for the output
+    row. Projections are None if the row values are not re-arranged.
+
+    Parameters
+    ----------
+    steps: list of openclean.operator.stream.fusion.RowStep
+        Sequence of row steps.
+
+    Returns
+    -------
+    tuple
+    """
+    prefilters, compiled = list(), list()
+    # Projection that is applied when copying the input row (None for a plain
+    # copy) and the pending projection that has not been applied yet.
+    copy, load, projection = False, None, None
+    for step in steps:
+        if isinstance(step, Projection):
+            if projection is not None:
+                step = Projection(projection.then(step.colidxs))
+            projection = step
+        elif not copy and projection is None and isinstance(step, RowFilter):
+            prefilters.append(step.compile())
+        else:
+            if not copy:
+                copy, load = True, projection
+            elif projection is not None:
+                compiled.append(projection.compile())
+            projection = None
+            compiled.append(step.compile())
+    loadidxs = load.colidxs if load is not None else None
+    outidxs = projection.colidxs if projection is not None else None
+    return prefilters, copy, loadidxs, compiled, outidxs
+
+
+def fuse_operators(pipeline: List[StreamProcessor]) -> List[StreamProcessor]:
+    """Replace sequences of two or more adjacent fusable operators in a list of
+    stream processors with a fused processor.
+
+    Parameters
+    ----------
+    pipeline: list of openclean.operator.stream.processor.StreamProcessor
+        Operators in a data pipeline.
+
+    Returns
+    -------
+    list of openclean.operator.stream.processor.StreamProcessor
+    """
+    plan, group = list(), list()
+    for op in pipeline + [None]:
+        if isinstance(op, FusableProcessor):
+            group.append(op)
+            continue
+        if len(group) > 1:
+            plan.append(FusedProcessor(operators=group))
+        else:
+            plan.extend(group)
+        group = list()
+        if op is not None:
+            plan.append(op)
+    return plan
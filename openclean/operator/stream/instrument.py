@@ -0,0 +1,371 @@
+# This file is part of the Data Cleaning Library (openclean).
+#
+# Copyright (C) 2018-2021 New York University.
+#
+# openclean is released under the Revised BSD License. See file LICENSE for
+# full license details.
+
+"""Instrumented execution of data processing pipelines. When a pipeline is
+executed with a :class:`openclean.operator.stream.instrument.PipelineStats`
+object, the consumer for each operator in the pipeline plan is wrapped by a
+consumer that records the number of rows that the operator receives and
+returns, the time that is spent in the operator, and (optionally) the peak
+memory allocation while the operator is active.
+
+Consumers in a pipeline call their downstream consumer directly. The time
+that is measured for each wrapped consumer therefore includes the time that
+is spent in all downstream consumers. The time for each individual operator
+is derived from these measurements when the report is generated.
+
+Pipelines that are executed without a statistics object are not wrapped and
+therefore have no instrumentation overhead.
+"""
+
+from __future__ import annotations
+from typing import Any, Dict, List, Optional
+
+import pandas as pd
+import time
+import tracemalloc
+
+from openclean.data.stream.base import DataRow, RowBatch, RowIndex
+from openclean.operator.stream.consumer import StreamConsumer
+from openclean.operator.stream.fusion import FusedProcessor
+from openclean.operator.stream.processor import StreamProcessor
+
+
+class OperatorStats(object):
+    """Runtime statistics for a single operator in a data pipeline. Times and
+    the memory allocation are inclusive of all downstream operators.
+    """
+    def __init__(self, name: str):
+        """Initialize the operator name and the counters.
+
+        Parameters
+        ----------
+        name: string
+            Name of the operator.
+        """
+        self.name = name
+        self.rows_in = 0
+        self.rows_out = 0
+        self.calls = 0
+        self.wall_time = 0.0
+        self.cpu_time = 0.0
+        self.memory = 0
+
+
+class PipelineStats(object):
+    """Collector for the runtime statistics of all operators in a data
+    pipeline. Pass an instance of this class to the run or open method of a
+    data pipeline to execute the pipeline in instrumented mode.
+
+    If memory profiling is enabled, the peak memory allocation for each
+    operator is measured using `tracemalloc`. Tracing is started when the
+    first consumer is instrumented (if it is not already running) and stopped
+    when the pipeline consumer is closed. Memory tracing adds significant
+    overhead and therefore distorts the time measurements.
+    """
+    def __init__(self, memory: Optional[bool] = False):
+        """Initialize the memory profiling flag and the list of operator
+        statistics.
+
+        Parameters
+        ----------
+        memory: bool, default=False
+            Measure the peak memory allocation of each operator.
+
+        Raises
+        ------
+        ValueError
+        """
+        if memory and not hasattr(tracemalloc, 'reset_peak'):
+            raise ValueError('memory profiling requires Python 3.9 or higher')
+        self.memory = memory
+        self.operators = list()
+        # Stack of memory measurements for the active operators. Each entry is
+        # a list with the allocated memory when the operator was called and the
+        # peak allocation that was observed while the operator was active.
+        self._frames = list()
+        self._tracing = False
+
+    def instrument(self, op: StreamProcessor, consumer: StreamConsumer) -> InstrumentedConsumer:
+        """Wrap the consumer for the next operator in the pipeline plan.
+
+        Parameters
+        ----------
+        op: openclean.operator.stream.processor.StreamProcessor
+            Pipeline operator.
+        consumer: openclean.operator.stream.consumer.StreamConsumer
+            Stream consumer for the operator.
+
+        Returns
+        -------
+        openclean.operator.stream.instrument.InstrumentedConsumer
+        """
+        if self.memory and not self.operators and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._tracing = True
+        stats = OperatorStats(name=operator_name(op))
+        self.operators.append(stats)
+        return InstrumentedConsumer(consumer=consumer, stats=stats, pipeline=self)
+
+    def report(self) -> List[Dict[str, Any]]:
+        """Get the statistics for all operators in the pipeline plan. For
+        each operator the report contains the number of received and returned
+        rows, the number of calls, the time spent in the operator itself, and
+        the total time including all downstream operators. The number of rows
+        that an operator returns is the number of rows that are received by
+        the next operator in the pipeline.
+
+        Returns
+        -------
+        list of dict
+        """
+        report = list()
+        for i, op in enumerate(self.operators):
+            if i < len(self.operators) - 1:
+                downstream = self.operators[i + 1]
+                rows_out = downstream.rows_in
+                wall_time = op.wall_time - downstream.wall_time
+                cpu_time = op.cpu_time - downstream.cpu_time
+            else:
+                rows_out = op.rows_out
+                wall_time = op.wall_time
+                cpu_time = op.cpu_time
+            report.append({
+                'operator': op.name,
+                'rows_in': op.rows_in,
+                'rows_out': rows_out,
+                'calls': op.calls,
+                'wall_time': max(wall_time, 0.0),
+                'cpu_time': max(cpu_time, 0.0),
+                'total_wall_time': op.wall_time,
+                'total_cpu_time': op.cpu_time,
+                'peak_memory': op.memory if self.memory else None
+            })
+        return report
+
+    def reset(self):
+        """Clear the statistics for all operators. The pipeline calls this
+        method before the consumers for a new run are instrumented. A
+        statistics object that is used for multiple runs therefore reports
+        the statistics of the last run only.
+        """
+        self.operators = list()
+        self._frames = list()
+
+    def to_df(self) -> pd.DataFrame:
+        """Get the statistics report as a data frame with one row per operator
+        in the pipeline plan.
+
+        Returns
+        -------
+        pd.DataFrame
+        """
+        columns = [
+            'operator', 'rows_in', 'rows_out', 'calls', 'wall_time', 'cpu_time',
+            'total_wall_time', 'total_cpu_time', 'peak_memory'
+        ]
+        return pd.DataFrame(data=self.report(), columns=columns)
+
+    def _enter(self):
+        """Start a memory measurement for an operator that is being called."""
+        current, peak = tracemalloc.get_traced_memory()
+        # The peak is reset for the called operator. Record the peak that was
+        # observed so far for all operators that are active.
+        for frame in self._frames:
+            frame[1] = max(frame[1], peak)
+        tracemalloc.reset_peak()
+        self._frames.append([current, current])
+
+    def _exit(self, stats: OperatorStats):
+        """Finish the memory measurement for an operator that returned.
+
+        Parameters
+        ----------
+        stats: openclean.operator.stream.instrument.OperatorStats
+            Statistics for the returning operator.
+        """
+        _, peak = tracemalloc.get_traced_memory()
+        start, maxpeak = self._frames.pop()
+        stats.memory = max(stats.memory, max(maxpeak, peak) - start)
+
+    def _finish(self):
+        """Stop memory tracing if it was started for the pipeline."""
+        if self._tracing:
+            tracemalloc.stop()
+            self._tracing = False
+
+
+class InstrumentedConsumer(StreamConsumer):
+    """Wrapper for a stream consumer that records runtime statistics for all
+    calls to the wrapped consumer.
+    """
+    def __init__(
+        self, consumer: StreamConsumer, stats: OperatorStats,
+        pipeline: PipelineStats
+    ):
+        """Initialize the wrapped consumer and the statistics objects.
+
+        Parameters
+        ----------
+        consumer: openclean.operator.stream.consumer.StreamConsumer
+            Wrapped stream consumer.
+        stats: openclean.operator.stream.instrument.OperatorStats
+            Statistics for the wrapped consumer.
+        pipeline: openclean.operator.stream.instrument.PipelineStats
+            Statistics for the pipeline that contains the wrapped consumer.
+        """
+        self.consumer = consumer
+        self.stats = stats
+        self.pipeline = pipeline
+        self._memory = pipeline.memory
+
+    @property
+    def columns(self):
+        """Schema for the rows that are produced by the wrapped consumer."""
+        return self.consumer.columns
+
+    def checkpoint(self) -> Any:
+        """Get the state of the wrapped consumer.
+
+        Returns
+        -------
+        any
+        """
+        return self.consumer.checkpoint()
+
+    def close(self) -> Any:
+        """Close the wrapped consumer. If the result is a list of rows, the
+        rows are counted as rows that are returned by the operator. Memory
+        tracing is stopped when the first consumer in the pipeline is closed.
+
+        Returns
+        -------
+        any
+        """
+        start = self._start()
+        try:
+            result = self.consumer.close()
+        finally:
+            self._stop(start)
+        if isinstance(result, list):
+            self.stats.rows_out += len(result)
+        if self.stats is self.pipeline.operators[0]:
+            self.pipeline._finish()
+        return result
+
+    def consume(self, rowid: int, row: DataRow) -> Optional[DataRow]:
+        """Pass the row to the wrapped consumer.
+
+        Parameters
+        -----------
+        rowid: int
+            Unique row identifier
+        row: list
+            List of values in the row.
+
+        Returns
+        -------
+        list
+        """
+        self.stats.rows_in += 1
+        start = self._start()
+        try:
+            row = self.consumer.consume(rowid, row)
+        finally:
+            self._stop(start)
+        if row is not None:
+            self.stats.rows_out += 1
+        return row
+
+    def consume_batch(self, rowids: List[RowIndex], rows: List[DataRow]) -> RowBatch:
+        """Pass the batch of rows to the wrapped consumer.
+
+        Parameters
+        ----------
+        rowids: list
+            Unique identifier for each row in the batch.
+        rows: list of list
+            List of values for each row in the batch.
+
+        Returns
+        -------
+        tuple of list and list
+        """
+        self.stats.rows_in += len(rows)
+        start = self._start()
+        try:
+            rowids, rows = self.consumer.consume_batch(rowids, rows)
+        finally:
+            self._stop(start)
+        self.stats.rows_out += len(rows)
+        return rowids, rows
+
+    def restore(self, state: Any):
+        """Restore the state of the wrapped consumer.
+
+        Parameters
+        ----------
+        state: any
+            Consumer state that was returned by the checkpoint method.
+        """
+        self.consumer.restore(state)
+
+    def set_consumer(self, consumer: StreamConsumer) -> InstrumentedConsumer:
+        """Set the downstream consumer for the wrapped consumer.
+
+        Parameters
+        ----------
+        consumer: openclean.data.stream.base.StreamConsumer
+            Downstream consumer for processed rows.
+
+        Returns
+        -------
+        openclean.operator.stream.instrument.InstrumentedConsumer
+        """
+        self.consumer.set_consumer(consumer)
+        return self
+
+    def _start(self):
+        """Record the start of a call to the wrapped consumer."""
+        if self._memory:
+            self.pipeline._enter()
+        return time.perf_counter(), time.thread_time()
+
+    def _stop(self, start):
+        """Record the end of a call to the wrapped consumer.
+
+        Parameters
+        ----------
+        start: tuple of float and float
+            Wall clock and CPU time at the start of the call.
+        """
+        wall, cpu = start
+        stats = self.stats
+        stats.calls += 1
+        stats.wall_time += time.perf_counter() - wall
+        stats.cpu_time += time.thread_time() - cpu
+        if self._memory:
+            self.pipeline._exit(stats)
+
+
+# -- Helper functions ---------------------------------------------------------
+
+def operator_name(op: StreamProcessor) -> str:
+    """Get the name of a pipeline operator for the statistics report. The
+    name of a fused operator lists the names of the fused operators.
+
+    Parameters
+    ----------
+    op: openclean.operator.stream.processor.StreamProcessor
+        Pipeline operator.
+
+    Returns
+    -------
+    string
+    """
+    if isinstance(op, FusedProcessor):
+        return 'Fused({})'.format(', '.join(operator_name(o) for o in op.operators))
+    return type(op).__name__
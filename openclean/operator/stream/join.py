@@ -0,0 +1,289 @@
+# This file is part of the Data Cleaning Library (openclean).
+#
+# Copyright (C) 2018-2021 New York University.
+#
+# openclean is released under the Revised BSD License. See file LICENSE for
+# full license details.
+
+"""Hash join operator that enriches the rows in a data stream with values
+from a (smaller) reference table. The reference table is read once when the
+operator is created and kept in a hash table that maps key values to the
+values of the joined columns. Rows in the data stream are then probed
+against the hash table one at a time.
+
+The join is implemented as a row-local operator. Each row in the data stream
+is mapped to at most one output row. For inner and left joins the key values
+in the reference table therefore have to be unique (i.e., the reference
+table is used as a lookup table). Semi and anti joins only keep (or remove)
+the rows that have a matching key in the reference table. Rows with a
+missing key value (None) never match.
+
+The hash table is part of the operator. When a pipeline is executed in
+parallel the table is serialized once together with the pipeline and shared
+by all workers instead of being re-built by each worker.
+"""
+
+from operator import itemgetter
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple, Union
+
+import pandas as pd
+
+from refdata.dataset.base import DatasetHandle
+
+from openclean.data.schema import as_list, select_clause
+from openclean.data.stream.base import DataRow, Datasource, to_document
+from openclean.data.types import Columns, DatasetSchema
+from openclean.operator.stream.consumer import StreamFunctionHandler
+from openclean.operator.stream.fusion import ColumnInsert, FusableProcessor, FusedProcessor, RowFilter, RowStep
+
+
+"""Supported join types."""
+INNER = 'inner'
+LEFT = 'left'
+SEMI = 'semi'
+ANTI = 'anti'
+
+JOIN_TYPES = [INNER, LEFT, SEMI, ANTI]
+
+
+"""Type alias for the build side of a hash join."""
+JoinSource = Union[Datasource, DatasetHandle]
+
+
+class HashJoin(FusableProcessor):
+    """Stream processor that joins the rows in a data stream with the rows in
+    a reference table using a hash table for the reference table.
+    """
+    def __init__(
+        self, other: JoinSource, on: Columns, how: Optional[str] = INNER,
+        right_on: Optional[Columns] = None, columns: Optional[Columns] = None,
+        suffix: Optional[str] = '_right'
+    ):
+        """Initialize the join type and build the hash table for the given
+        reference table.
+
+        Parameters
+        ----------
+        other: pd.DataFrame, string, histore.document.base.Document, or
+                refdata.dataset.base.DatasetHandle
+            Reference table (build side of the join). The table is read once
+            when the operator is created.
+        on: int, string, or list(int or string)
+            Key column(s) in the data stream.
+        how: string, default='inner'
+            Join type. One of 'inner', 'left', 'semi', or 'anti'.
+        right_on: int, string, or list(int or string), default=None
+            Key column(s) in the reference table. By default, the key columns
+            of the data stream are used.
+        columns: int, string, or list(int or string), default=None
+            Columns from the reference table that are added to the rows in
+            the data stream. By default, all columns that are not key columns
+            are added. Ignored for semi and anti joins.
+        suffix: string, default='_right'
+            Suffix that is appended to the names of added columns that have
+            the same name as a column in the data stream.
+
+        Raises
+        ------
+        ValueError
+        """
+        if how not in JOIN_TYPES:
+            raise ValueError('unknown join type {}'.format(how))
+        self.on = on
+        self.how = how
+        self.suffix = suffix
+        right_on = right_on if right_on is not None else on
+        schema, rows = read_table(other)
+        _, keyidx = select_clause(schema, right_on)
+        if len(keyidx) != len(as_list(on)):
+            raise ValueError('number of key columns does not match')
+        if how in [SEMI, ANTI]:
+            self.names = list()
+            self.table = build_keys(rows=rows, keyidx=keyidx)
+        else:
+            if columns is None:
+                colidx = [i for i in range(len(schema)) if i not in keyidx]
+            else:
+                _, colidx = select_clause(schema, columns)
+            self.names = [schema[i] for i in colidx]
+            self.table = build_table(rows=rows, keyidx=keyidx, colidx=colidx)
+
+    def fuse(self, schema: DatasetSchema) -> Tuple[DatasetSchema, List[RowStep]]:
+        """Get the output schema and the row steps of the operator for rows in
+        the given input schema.
+
+        Parameters
+        ----------
+        schema: list of string
+            List of column names in the data stream schema.
+
+        Returns
+        -------
+        tuple of list of string and list of openclean.operator.stream.fusion.RowStep
+        """
+        _, keyidx = select_clause(schema, self.on)
+        keyfunc = itemgetter(*keyidx)
+        table = self.table
+        if self.how == SEMI:
+            return schema, [RowFilter(func=lambda row: keyfunc(row) in table)]
+        elif self.how == ANTI:
+            return schema, [RowFilter(func=lambda row: keyfunc(row) in table, negated=True)]
+        steps = list()
+        if self.how == INNER:
+            steps.append(RowFilter(func=lambda row: keyfunc(row) in table))
+            func = lambda row: table[keyfunc(row)]  # noqa: E731
+        else:
+            nulls = None if len(self.names) == 1 else [None] * len(self.names)
+            func = lambda row: table.get(keyfunc(row), nulls)  # noqa: E731
+        if self.names:
+            steps.append(ColumnInsert(pos=len(schema), func=func, count=len(self.names)))
+        return self.outschema(schema), steps
+
+    def open(self, schema: DatasetSchema) -> StreamFunctionHandler:
+        """Factory pattern for stream consumer. Returns a stream function
+        handler that probes the hash table for each row.
+
+        Parameters
+        ----------
+        schema: list of string
+            List of column names in the data stream schema.
+
+        Returns
+        -------
+        openclean.operator.stream.consumer.StreamFunctionHandler
+        """
+        return FusedProcessor(operators=[self]).open(schema)
+
+    def outschema(self, schema: DatasetSchema) -> DatasetSchema:
+        """Get the schema of the joined rows for a given input schema.
+
+        Parameters
+        ----------
+        schema: list of string
+            List of column names in the data stream schema.
+
+        Returns
+        -------
+        list of string
+        """
+        names = [n + self.suffix if n in schema else n for n in self.names]
+        return list(schema) + names
+
+
+# -- Helper functions ---------------------------------------------------------
+
+def build_keys(rows: Iterable[DataRow], keyidx: List[int]) -> Set[Any]:
+    """Get the set of key values for the rows in a reference table. Keys that
+    contain a missing value (None) are ignored.
+
+    Parameters
+    ----------
+    rows: iterable of list
+        Rows in the reference table.
+    keyidx: list of int
+        Index positions of the key columns.
+
+    Returns
+    -------
+    set
+    """
+    keyfunc = itemgetter(*keyidx)
+    return {key for key in map(keyfunc, rows) if not is_null(key)}
+
+
+def build_table(rows: Iterable[DataRow], keyidx: List[int], colidx: List[int]) -> Dict[Any, Any]:
+    """Build a hash table that maps the key values for the rows in a reference
+    table to the values of the joined columns. If only a single column is
+    joined the table contains the column value. Otherwise, the table contains
+    a list of values. Keys that contain a missing value (None) are ignored.
+
+    Raises a ValueError if the key values are not unique.
+
+    Parameters
+    ----------
+    rows: iterable of list
+        Rows in the reference table.
+    keyidx: list of int
+        Index positions of the key columns.
+    colidx: list of int
+        Index positions of the joined columns.
+
+    Returns
+    -------
+    dict
+
+    Raises
+    ------
+    ValueError
+    """
+    keyfunc = itemgetter(*keyidx)
+    if len(colidx) == 1:
+        valfunc = itemgetter(colidx[0])
+    else:
+        valfunc = lambda row: [row[i] for i in colidx]  # noqa: E731
+    table = dict()
+    for row in rows:
+        key = keyfunc(row)
+        if is_null(key):
+            continue
+        if key in table:
+            raise ValueError('duplicate key {} in reference table'.format(key))
+        table[key] = valfunc(row)
+    return table
+
+
+def is_null(key: Any) -> bool:
+    """Test if a (composite) key value contains a missing value.
+
+    Parameters
+    ----------
+    key: any
+        Single key value or tuple of key values.
+
+    Returns
+    -------
+    bool
+    """
+    if isinstance(key, tuple):
+        return any(v is None for v in key)
+    return key is None
+
+
+def read_table(source: JoinSource) -> Tuple[DatasetSchema, Iterable[DataRow]]:
+    """Get the schema and an iterable over the rows of a reference table.
+
+    Parameters
+    ----------
+    source: pd.DataFrame, string, histore.document.base.Document, or
+            refdata.dataset.base.DatasetHandle
+        Reference table.
+
+    Returns
+    -------
+    tuple of list of string and iterable of list
+    """
+    if isinstance(source, DatasetHandle):
+        source = source.df()
+    if isinstance(source, pd.DataFrame):
+        # Iterate over the values in the data frame directly. This avoids the
+        # overhead of the data frame document.
+        return list(source.columns), source.itertuples(index=False, name=None)
+    doc = to_document(source)
+    return doc.columns, iterrows(doc)
+
+
+def iterrows(doc: Any) -> Iterable[DataRow]:
+    """Generator for the rows in a document.
+
+    Parameters
+    ----------
+    doc: histore.document.base.Document
+        Document for a reference table.
+
+    Returns
+    -------
+    iterable of list
+    """
+    with doc.open() as reader:
+        for _, _, row in reader:
+            yield row
@@ -31,6 +31,15 @@ class BestMatches(StreamConsumer, StreamProcessor):
         self.include_vocab = include_vocab
         self.mapping = mapping
 
+    def checkpoint(self) -> Mapping:
+        """Get the mapping with the matches that have been collected so far.
+
+        Returns
+        -------
+        openclean.data.mapping.Mapping
+        """
+        return self.mapping
+
     def close(self) -> Mapping:
         """Return the collected mapping at the end of the stream.
 
@@ -91,3 +100,13 @@ class BestMatches(StreamConsumer, StreamProcessor):
             include_vocab=self.include_vocab,
             mapping=Mapping()
         )
+
+    def restore(self, state: Mapping):
+        """Restore the mapping with the collected matches.
+
+        Parameters
+        ----------
+        state: openclean.data.mapping.Mapping
+            Mapping that was returned by the checkpoint method.
+        """
+        self.mapping = state
@@ -0,0 +1,166 @@
+# This file is part of the Data Cleaning Library (openclean).
+#
+# Copyright (C) 2018-2021 New York University.
+#
+# openclean is released under the Revised BSD License. See file LICENSE for
+# full license details.
+
+"""Stream operator that collects the statistics that are required to prepare
+the consumers of evaluation functions in a data pipeline. Value functions like
+min-max scaling or majority voting need to see all values in a column before
+they can be applied to any of them. In a data pipeline, these functions are
+prepared in a separate pass over the data stream (see
+:meth:`openclean.pipeline.DataPipeline.prepare`). The pass only evaluates the
+producers of the unprepared functions and adds their results to the
+accumulators of the respective consumers.
+"""
+
+from typing import Any, List
+
+from openclean.data.stream.base import DataRow, RowBatch, RowIndex
+from openclean.data.types import DatasetSchema
+from openclean.function.eval.base import Eval
+from openclean.function.value.accumulator import Accumulator, merge_accumulators
+from openclean.operator.stream.consumer import StreamConsumer
+from openclean.operator.stream.processor import MergeableProcessor
+
+
+class PrepareFunctions(MergeableProcessor):
+    """Processor that accumulates the statistics for preparing the consumers
+    of a list of evaluation functions. The result is the list of accumulators
+    (one for each function).
+    """
+    def __init__(self, functions: List[Eval]):
+        """Initialize the list of evaluation functions. The producers of all
+        functions are expected to be prepared.
+
+        Parameters
+        ----------
+        functions: list of openclean.function.eval.base.Eval
+            Evaluation functions whose consumers need to be prepared.
+        """
+        self.functions = functions
+
+    def merge(self, results: List[List[Accumulator]], offsets: List[int]) -> List[Accumulator]:
+        """Merge the accumulators for the partitions of a data stream.
+
+        Parameters
+        ----------
+        results: list of list of openclean.function.value.accumulator.Accumulator
+            Accumulators for each partition of the data stream.
+        offsets: list of int
+            Position of the first row of each partition in the data stream.
+
+        Returns
+        -------
+        list of openclean.function.value.accumulator.Accumulator
+        """
+        return merge_accumulators(results)
+
+    def open(self, schema: DatasetSchema) -> StreamConsumer:
+        """Factory pattern for stream consumer. Returns an instance of the
+        stream consumer that adds the consumer inputs for each row to the
+        accumulators.
+
+        Parameters
+        ----------
+        schema: list of string
+            List of column names in the data stream schema.
+
+        Returns
+        -------
+        openclean.operator.stream.prepare.PrepareCollector
+        """
+        return PrepareCollector(
+            columns=schema,
+            functions=[f.prepare_input(schema) for f in self.functions],
+            accumulators=[f.consumer.accumulator() for f in self.functions]
+        )
+
+
+class PrepareCollector(StreamConsumer):
+    """Collector that adds the consumer inputs of evaluation functions for
+    each row in a data stream to the respective accumulator.
+    """
+    def __init__(self, columns: DatasetSchema, functions: List, accumulators: List[Accumulator]):
+        """Initialize the row schema, the stream functions that generate the
+        consumer inputs, and the accumulators.
+
+        Parameters
+        ----------
+        columns: list of string
+            Names of columns for the rows that the consumer will receive.
+        functions: list of callable
+            Stream functions that return the consumer input for a row.
+        accumulators: list of openclean.function.value.accumulator.Accumulator
+            Accumulator for each stream function.
+        """
+        super(PrepareCollector, self).__init__(columns=columns)
+        self.functions = functions
+        self.accumulators = accumulators
+
+    def checkpoint(self) -> List[Accumulator]:
+        """Get the accumulators as the consumer state.
+
+        Returns
+        -------
+        list of openclean.function.value.accumulator.Accumulator
+        """
+        return self.accumulators
+
+    def close(self) -> List[Accumulator]:
+        """Return the list of accumulators.
+
+        Returns
+        -------
+        list of openclean.function.value.accumulator.Accumulator
+        """
+        return self.accumulators
+
+    def consume(self, rowid: int, row: DataRow) -> DataRow:
+        """Add the consumer inputs for the given row to the accumulators.
+
+        Parameters
+        -----------
+        rowid: int
+            Unique row identifier
+        row: list
+            List of values in the row.
+
+        Returns
+        -------
+        list
+        """
+        for func, acc in zip(self.functions, self.accumulators):
+            acc.add(func(row))
+        return row
+
+    def consume_batch(self, rowids: List[RowIndex], rows: List[DataRow]) -> RowBatch:
+        """Add the consumer inputs for all rows in a batch to the accumulators.
+
+        Parameters
+        ----------
+        rowids: list
+            Unique identifier for each row in the batch.
+        rows: list of list
+            List of values for each row in the batch.
+
+        Returns
+        -------
+        tuple of list and list
+        """
+        for func, acc in zip(self.functions, self.accumulators):
+            add = acc.add
+            for row in rows:
+                add(func(row))
+        return rowids, rows
+
+    def restore(self, state: Any):
+        """Restore the accumulators from a checkpoint.
+
+        Parameters
+        ----------
+        state: list of openclean.function.value.accumulator.Accumulator
+            Accumulators that were returned by the checkpoint method.
+        """
+        self.accumulators = state
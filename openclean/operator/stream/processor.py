@@ -13,6 +13,7 @@ pipeline is executed.
 
 from __future__ import annotations
 from abc import ABCMeta, abstractmethod
+from typing import Any, List
 
 from openclean.data.types import DatasetSchema
 from openclean.operator.stream.consumer import StreamConsumer
@@ -42,3 +43,94 @@ class StreamProcessor(metaclass=ABCMeta):
         openclean.operator.stream.consumer.StreamConsumer
         """
         raise NotImplementedError()  # pragma: no cover
+
+    def eval_functions(self) -> List:
+        """Get the evaluation functions that the processor evaluates on the
+        rows in a data stream. Evaluation functions whose consumers need to be
+        prepared are prepared by the data pipeline in a separate pass over the
+        data stream before the processor is opened. The default is an empty
+        list.
+
+        Returns
+        -------
+        list of openclean.function.eval.base.EvalFunction
+        """
+        return list()
+
+    def resume(self, schema: DatasetSchema, state: Any) -> StreamConsumer:
+        """Create a stream consumer and restore its state from a checkpoint.
+
+        Parameters
+        ----------
+        schema: list of string
+            List of column names in the data stream schema.
+        state: any
+            Consumer state that was returned by the checkpoint method of the
+            consumer.
+
+        Returns
+        -------
+        openclean.operator.stream.consumer.StreamConsumer
+        """
+        consumer = self.open(schema=schema)
+        consumer.restore(state)
+        return consumer
+
+
+class MergeableProcessor(StreamProcessor):
+    """Stream processors whose results for disjoint partitions of a data
+    stream can be combined into the result for the full data stream. Only
+    mergeable processors can be used as the terminal operator of a pipeline
+    that is executed in parallel over partitions of the data source.
+    """
+    def for_partition(self, index: int) -> StreamProcessor:
+        """Get the processor that is used for the partition with the given
+        index. By default, the same processor is used for all partitions.
+        Processors that produce side-effects (e.g., output files) can use this
+        method to return a separate instance for each partition.
+
+        Parameters
+        ----------
+        index: int
+            Index position of the partition in the data source.
+
+        Returns
+        -------
+        openclean.operator.stream.processor.StreamProcessor
+        """
+        return self
+
+    def mergeable(self) -> bool:
+        """Test if the results for partitions of a data stream can be merged.
+        This is True by default. Processors that are composed of other
+        processors can use this method to verify that all components are
+        mergeable.
+
+        Returns
+        -------
+        bool
+        """
+        return True
+
+    @abstractmethod
+    def merge(self, results: List[Any], offsets: List[int]) -> Any:
+        """Merge the results for the individual partitions of a data stream.
+        The results are given in the order of the partitions in the data
+        source.
+
+        Row identifiers within each partition start at zero. The offsets
+        contain the position of the first row of each partition in the full
+        data stream for consumers that return row identifiers.
+
+        Parameters
+        ----------
+        results: list
+            Consumer results for each partition of the data stream.
+        offsets: list of int
+            Position of the first row of each partition in the data stream.
+
+        Returns
+        -------
+        any
+        """
+        raise NotImplementedError()  # pragma: no cover
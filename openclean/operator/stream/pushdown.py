@@ -0,0 +1,153 @@
+# This file is part of the Data Cleaning Library (openclean).
+#
+# Copyright (C) 2018-2021 New York University.
+#
+# openclean is released under the Revised BSD License. See file LICENSE for
+# full license details.
+
+"""Push projections and simple filter predicates at the beginning of a data
+pipeline down into the reader for a CSV file. Columns that are not selected
+are never copied into a data row and rows that do not satisfy the filter
+predicates are dropped before a data row is created.
+
+Filter predicates can be pushed down if they compare the value of a single
+column with a constant value (e.g., `Col('A') == 'x'`) or if they check the
+value of a single column for domain inclusion (`IsIn` and `IsNotIn`).
+"""
+
+from typing import Callable, List, Optional, Tuple
+
+from openclean.data.schema import column_ref
+from openclean.data.stream.base import Datasource
+from openclean.data.stream.csv import CSVFile, CSVScan
+from openclean.data.stream.prefetch import Prefetch
+from openclean.data.types import ColumnRef, Value
+from openclean.function.eval.base import BinaryOperator, Col, Const, EvalFunction
+from openclean.function.eval.base import Eq, Geq, Gt, Leq, Lt, Neq
+from openclean.function.eval.domain import IsIn, IsNotIn
+from openclean.operator.stream.processor import StreamProcessor
+from openclean.operator.transform.filter import Filter
+from openclean.operator.transform.rename import Rename
+from openclean.operator.transform.select import Select
+
+
+"""Binary comparison operators for predicates that can be pushed down."""
+COMPARISONS = (Eq, Geq, Gt, Leq, Lt, Neq)
+
+
+def pushdown(
+    source: Datasource, pipeline: List[StreamProcessor]
+) -> Tuple[Datasource, List[StreamProcessor]]:
+    """Push leading select, rename, and filter operators of a data pipeline
+    down into the data source. Returns the modified data source and the list
+    of remaining pipeline operators. The data source and pipeline are returned
+    unchanged if the source is not a CSV file or if none of the operators can
+    be pushed down.
+
+    The last operator in the pipeline is never pushed down. For prefetched
+    data sources the operators are pushed down into the wrapped source.
+
+    Parameters
+    ----------
+    source: openclean.data.stream.base.Datasource
+        Data source for the pipeline.
+    pipeline: list of openclean.operator.stream.processor.StreamProcessor
+        Operators in the data pipeline.
+
+    Returns
+    -------
+    tuple of openclean.data.stream.base.Datasource and list of
+    openclean.operator.stream.processor.StreamProcessor
+    """
+    if isinstance(source, Prefetch):
+        scan, pipeline = pushdown(source=source.source, pipeline=pipeline)
+        return (source.wrap(scan) if scan is not source.source else source), pipeline
+    elif not isinstance(source, CSVFile):
+        return source, pipeline
+    # Keep track of the schema for the rows at the current position in the
+    # pipeline and the index positions of the respective columns in the file.
+    schema = source.columns
+    colidxs = list(range(len(schema)))
+    predicates = list()
+    pushed = 0
+    for op in pipeline[:-1]:
+        if isinstance(op, Select):
+            schema, projection = op.select(schema)
+            colidxs = [colidxs[i] for i in projection]
+        elif isinstance(op, Rename):
+            schema = op.rename(schema)
+        elif isinstance(op, Filter):
+            pred = value_predicate(op.predicate, negated=op.negated)
+            if pred is None:
+                break
+            column, func = pred
+            _, colidx = column_ref(schema=schema, column=column)
+            predicates.append((colidxs[colidx], func))
+        else:
+            break
+        pushed += 1
+    if pushed == 0:
+        return source, pipeline
+    # Do not project columns if the projection includes all columns of the
+    # CSV file in their original order.
+    if colidxs == list(range(len(source.columns))):
+        colidxs = None
+    scan = CSVScan(file=source, columns=schema, colidxs=colidxs, predicates=predicates)
+    return scan, pipeline[pushed:]
+
+
+def value_predicate(
+    predicate: EvalFunction, negated: Optional[bool] = False
+) -> Optional[Tuple[ColumnRef, Callable[[Value], bool]]]:
+    """Get a predicate on the values of a single column for a filter predicate.
+    Returns None if the filter predicate cannot be evaluated on a single cell
+    value.
+
+    Parameters
+    ----------
+    predicate: openclean.function.eval.base.EvalFunction
+        Filter predicate.
+    negated: bool, default=False
+        Negate the predicate value.
+
+    Returns
+    -------
+    tuple of int or string and callable
+    """
+    pred = None
+    if isinstance(predicate, COMPARISONS):
+        pred = comparison(predicate)
+    elif isinstance(predicate, (IsIn, IsNotIn)):
+        producer = predicate.producers[0]
+        if len(predicate.producers) == 1 and isinstance(producer, Col) and predicate.args is None:
+            pred = producer.column, predicate.consumer.eval
+    if pred is None or not negated:
+        return pred
+    column, func = pred
+    return column, lambda value: not func(value)
+
+
+# -- Helper functions ---------------------------------------------------------
+
+def comparison(predicate: BinaryOperator) -> Optional[Tuple[ColumnRef, Callable[[Value], bool]]]:
+    """Get a predicate on the values of a single column for a comparison of a
+    column with a constant value. Returns None if the predicate does not
+    compare a column with a constant value.
+
+    Parameters
+    ----------
+    predicate: openclean.function.eval.base.BinaryOperator
+        Binary comparison operator.
+
+    Returns
+    -------
+    tuple of int or string and callable
+    """
+    lhs, rhs, op = predicate.lhs, predicate.rhs, predicate.op
+    if isinstance(lhs, Col) and isinstance(rhs, Const):
+        const = rhs.value
+        return lhs.column, lambda value: op(value, const)
+    elif isinstance(lhs, Const) and isinstance(rhs, Col):
+        const = lhs.value
+        return rhs.column, lambda value: op(const, value)
+    return None
@@ -7,21 +7,56 @@
 
 """Implementation of stream operators that collect a random sampe of rows from
 a data stream.
+
+Uniform samples are collected using the skip-based reservoir sampling
+algorithm (Algorithm L). After the reservoir is filled, the number of rows
+that are skipped before the next row is selected is drawn from a geometric
+distribution, i.e., random numbers are only generated for rows that are
+added to the sample. See:
+
+Li K.-H.
+Reservoir-Sampling Algorithms of Time Complexity O(n(1 + log(N/n))).
+ACM Trans. Math. Softw., 20(4):481–493, 1994.
+
+Weighted samples use the A-ExpJ algorithm (reservoir sampling with
+exponential jumps). The probability of a row being selected is proportional
+to its weight. See:
+
+Efraimidis P. S., Spirakis P. G.
+Weighted random sampling with a reservoir.
+Information Processing Letters, 97(5):181–185, 2006.
+
+Reservoirs for disjoint partitions of a data stream can be merged into a
+random sample for the full stream.
 """
 
+from __future__ import annotations
 from random import Random
-from typing import Any, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
-from openclean.data.stream.base import DataRow
-from openclean.data.types import DatasetSchema
+import heapq
+import math
+
+from openclean.data.schema import column_ref
+from openclean.data.stream.base import DataRow, RowBatch, RowIndex
+from openclean.data.types import ColumnRef, DatasetSchema, Value
 from openclean.operator.stream.consumer import ProducingConsumer, StreamConsumer
-from openclean.operator.stream.processor import StreamProcessor
+from openclean.operator.stream.processor import MergeableProcessor, StreamProcessor
 
 
-class Sample(StreamProcessor):
+class Sample(MergeableProcessor):
     """Processor that defines a random sampling operator in a data stream.
+
+    If a weight column is given, rows are selected with a probability that
+    is proportional to their weight. If a stratification column is given, a
+    separate sample of size n is collected for each distinct value in that
+    column.
     """
-    def __init__(self, n: int, random_state: Optional[int] = None):
+    def __init__(
+        self, n: int, random_state: Optional[int] = None,
+        weights: Optional[ColumnRef] = None, stratify: Optional[ColumnRef] = None,
+        partition: Optional[int] = None
+    ):
         """Initialize the sample size and the optional seed for the random
         number generator.
 
@@ -31,9 +66,71 @@ class Sample(StreamProcessor):
         random_state: int, default=None
             Seed value for the random number generator (for reproducibility
             purposes).
+        weights: int or string, default=None
+            Column containing the (numeric) sampling weight for each row.
+            Rows with non-positive weights are never selected.
+        stratify: int or string, default=None
+            Column whose values define the strata for stratified sampling.
+        partition: int, default=None
+            Index position of the data stream partition if the processor is
+            used in a parallel pipeline run.
         """
         self.n = n
         self.random_state = random_state
+        self.weights = weights
+        self.stratify = stratify
+        self.partition = partition
+
+    def for_partition(self, index: int) -> StreamProcessor:
+        """Get the sample processor for a partition of the data stream. The
+        consumer for the partition returns its reservoirs (instead of the
+        sampled rows) so that they can be merged. Each partition uses a
+        different seed for the random number generator.
+
+        Parameters
+        ----------
+        index: int
+            Index position of the partition in the data source.
+
+        Returns
+        -------
+        openclean.operator.stream.sample.Sample
+        """
+        return Sample(
+            n=self.n,
+            random_state=self.random_state + index if self.random_state is not None else None,
+            weights=self.weights,
+            stratify=self.stratify,
+            partition=index
+        )
+
+    def merge(self, results: List[Dict[Value, Reservoir]], offsets: List[int]) -> List[Tuple[int, DataRow]]:
+        """Merge the reservoirs for all partitions of the data stream into a
+        single random sample. Row identifiers are adjusted using the position
+        of the first row in the respective partition.
+
+        Parameters
+        ----------
+        results: list of dict
+            Reservoirs for each stratum in each partition of the data stream.
+        offsets: list of int
+            Position of the first row of each partition in the data stream.
+
+        Returns
+        -------
+        list of tuple of int and list
+        """
+        rand = Random()
+        if self.random_state is not None:
+            rand.seed(self.random_state)
+        strata = dict()
+        for samples, offset in zip(results, offsets):
+            for key, res in samples.items():
+                strata.setdefault(key, list()).append(res.shift(offset))
+        rows = list()
+        for reservoirs in strata.values():
+            rows.extend(reservoirs[0].merge(reservoirs, rand=rand).rows)
+        return rows
 
     def open(self, schema: DatasetSchema) -> StreamConsumer:
         """Factory pattern for stream consumer. Returns an instance of the
@@ -48,13 +145,22 @@ class Sample(StreamProcessor):
         -------
         openclean.operator.stream.consumer.StreamConsumer
         """
-        return SampleCollector(columns=schema, n=self.n, random_state=self.random_state)
+        weights = column_ref(schema, self.weights)[1] if self.weights is not None else None
+        stratify = column_ref(schema, self.stratify)[1] if self.stratify is not None else None
+        return SampleCollector(
+            columns=schema,
+            n=self.n,
+            random_state=self.random_state,
+            weights=weights,
+            stratify=stratify,
+            partitioned=self.partition is not None
+        )
 
 
 class SampleCollector(ProducingConsumer):
     """Collect a random sample of rows from the data stream and pass them to
     a downstream consumer. Implements random sampling without replacement using
-    the Reservoir Sampling algorithm. See:
+    reservoir sampling. See:
 
     Alon N., Matias Y., and Szegedy M.
     The space complexity of approximating the frequency moments.
@@ -69,12 +175,13 @@ class SampleCollector(ProducingConsumer):
 
     for details.
 
-    Maintains a row buffer with n rows. Pushes the final row set to the
-    downstream consumer at the end of the stream.
+    Maintains a reservoir with n rows for each stratum. Pushes the final row
+    set to the downstream consumer at the end of the stream.
     """
     def __init__(
         self, columns: DatasetSchema, n: int, random_state: Optional[int] = None,
-        consumer: Optional[StreamConsumer] = None
+        consumer: Optional[StreamConsumer] = None, weights: Optional[int] = None,
+        stratify: Optional[int] = None, partitioned: Optional[bool] = False
     ):
         """Initialize the row schema, sample size and the internal row buffer.
         Provides the option to seed the random number generator for
@@ -90,17 +197,55 @@ class SampleCollector(ProducingConsumer):
             Names of columns for the rows that the consumer will receive.
         consumer: openclean.data.stream.base.StreamConsumer, default=None
             Downstream consumer for processed rows.
+        weights: int, default=None
+            Index position of the column with the sampling weights.
+        stratify: int, default=None
+            Index position of the column that defines the strata.
+        partitioned: bool, default=False
+            Return the reservoirs instead of the sampled rows (for merging
+            the results of a parallel pipeline run).
         """
         super(SampleCollector, self).__init__(columns=columns, consumer=consumer)
         self.size = n
+        self.weights = weights
+        self.stratify = stratify
+        self.partitioned = partitioned
         # Initialize the random number generator.
         self.rand = Random()
         if random_state is not None:
             self.rand.seed(random_state)
-        # Initialize the row buffer for the selected rows, (row-id, row)-pairs.
-        self.rows = list()
-        # conter for the total number of rows received.
-        self.count = 0
+        # Reservoirs for the sampled (row-id, row)-pairs in each stratum. If
+        # the sample is not stratified all rows are in the stratum None.
+        self.samples = dict()
+
+    def _reservoir(self, key: Value) -> Reservoir:
+        """Get the reservoir for the given stratum. Creates a new reservoir if
+        the stratum has not been seen before.
+
+        Parameters
+        ----------
+        key: scalar
+            Stratum identifier.
+
+        Returns
+        -------
+        openclean.operator.stream.sample.Reservoir
+        """
+        res = self.samples.get(key)
+        if res is None:
+            res = Reservoir(n=self.size) if self.weights is None else WeightedReservoir(n=self.size)
+            self.samples[key] = res
+        return res
+
+    def checkpoint(self) -> Tuple[Dict[Value, Reservoir], Tuple]:
+        """Get the current reservoirs and the state of the random number
+        generator.
+
+        Returns
+        -------
+        tuple of dict and tuple
+        """
+        return self.samples, self.rand.getstate()
 
     def close(self) -> Any:
         """Pass the selected sample to the connected downstream consumer.
@@ -113,9 +258,14 @@ class SampleCollector(ProducingConsumer):
         -------
         any
         """
+        if self.partitioned:
+            return self.samples
+        rows = list()
+        for res in self.samples.values():
+            rows.extend(res.rows)
         if self.consumer is not None:
             result = list()
-            for rowid, row in self.rows:
+            for rowid, row in rows:
                 try:
                     row = self.consumer.consume(rowid=rowid, row=row)
                     if row is not None:
@@ -125,7 +275,7 @@ class SampleCollector(ProducingConsumer):
             consumer_result = self.consumer.close()
             return result if consumer_result is None else consumer_result
         else:
-            return self.rows
+            return rows
 
     def consume(self, rowid: int, row: DataRow):
         """Randomly add the given (rowid, row)-pair to the internal buffer.
@@ -139,10 +289,30 @@ class SampleCollector(ProducingConsumer):
         """
         self.handle(rowid=rowid, row=row)
 
+    def consume_batch(self, rowids: List[RowIndex], rows: List[DataRow]) -> RowBatch:
+        """Add the rows in the given batch to the sample. For uniform samples
+        without strata the rows that are skipped are never looked at.
+
+        Parameters
+        ----------
+        rowids: list
+            Unique identifier for each row in the batch.
+        rows: list of list
+            List of values for each row in the batch.
+
+        Returns
+        -------
+        tuple of list and list
+        """
+        if self.weights is None and self.stratify is None:
+            self._reservoir(None).add_batch(rowids=rowids, rows=rows, rand=self.rand)
+        else:
+            for rowid, row in zip(rowids, rows):
+                self.handle(rowid=rowid, row=row)
+        return [], []
+
     def handle(self, rowid: int, row: DataRow):
-        """Add the given row to the buffer if the maximum buffer size has not
-        been reached yet or the row is randomly selected for inclusion in the
-        sample.
+        """Add the given row to the reservoir for its stratum.
 
         Parameters
         -----------
@@ -155,13 +325,298 @@ class SampleCollector(ProducingConsumer):
         -------
         list
         """
+        res = self._reservoir(row[self.stratify] if self.stratify is not None else None)
+        if self.weights is None:
+            res.add(rowid=rowid, row=row, rand=self.rand)
+        else:
+            res.add(rowid=rowid, row=row, weight=float(row[self.weights]), rand=self.rand)
+
+    def restore(self, state: Tuple[Dict[Value, Reservoir], Tuple]):
+        """Restore the reservoirs and the state of the random number generator.
+
+        Parameters
+        ----------
+        state: tuple of dict and tuple
+            Sample state that was returned by the checkpoint method.
+        """
+        self.samples, randstate = state
+        self.rand.setstate(randstate)
+
+
+# -- Reservoirs ---------------------------------------------------------------
+
+class Reservoir(object):
+    """Uniform random sample of up to n rows from a data stream (Algorithm L).
+    Maintains the index position of the next row that will be added to the
+    sample once the reservoir is full.
+    """
+    def __init__(self, n: int):
+        """Initialize the sample size and the empty reservoir.
+
+        Parameters
+        ----------
+        n: int
+            Size of the collected random sample.
+        """
+        self.size = n
+        self.rows = list()
+        # Number of rows that were seen by the reservoir.
+        self.count = 0
+        # Position of the next row that is added to the full reservoir and
+        # the current value of the random variable W in Algorithm L.
+        self._next = None
+        self._w = None
+
+    def add(self, rowid: RowIndex, row: DataRow, rand: Random):
+        """Add the given row to the reservoir if the reservoir is not full or
+        the row is the next row that was selected for replacement.
+
+        Parameters
+        ----------
+        rowid: int
+            Unique row identifier
+        row: list
+            List of values in the row.
+        rand: random.Random
+            Random number generator.
+        """
         self.count += 1
         if self.count <= self.size:
             self.rows.append((rowid, row))
-        else:
-            # Include the element with probability n/(t+1), i.e,, size/count.
-            p = self.size / self.count
-            if self.rand.random() <= p:
-                # Randomly select element for replacement.
-                index = self.rand.randrange(self.size)
-                self.rows[index] = (rowid, row)
+            if self.count == self.size:
+                self._w = math.exp(math.log(uniform(rand)) / self.size)
+                self._skip(rand)
+        elif self.count == self._next:
+            self.rows[rand.randrange(self.size)] = (rowid, row)
+            self._w *= math.exp(math.log(uniform(rand)) / self.size)
+            self._skip(rand)
+
+    def add_batch(self, rowids: List[RowIndex], rows: List[DataRow], rand: Random):
+        """Add the rows in the given batch. Jumps over the rows that are not
+        selected for the sample.
+
+        Parameters
+        ----------
+        rowids: list
+            Unique identifier for each row in the batch.
+        rows: list of list
+            List of values for each row in the batch.
+        rand: random.Random
+            Random number generator.
+        """
+        pos, batchsize = 0, len(rows)
+        while pos < batchsize:
+            if self.count >= self.size:
+                if self.size == 0:
+                    self.count += batchsize - pos
+                    return
+                # Number of rows that are skipped before the next selected
+                # row.
+                gap = self._next - self.count - 1
+                if gap >= batchsize - pos:
+                    self.count += batchsize - pos
+                    return
+                self.count += gap
+                pos += gap
+            self.add(rowid=rowids[pos], row=rows[pos], rand=rand)
+            pos += 1
+
+    def merge(self, reservoirs: List[Reservoir], rand: Random) -> Reservoir:
+        """Merge reservoirs for disjoint partitions of a data stream. Rows are
+        drawn without replacement from the partition reservoirs where each
+        partition is selected with a probability that is proportional to the
+        number of its rows that have not been drawn yet.
+
+        Parameters
+        ----------
+        reservoirs: list of openclean.operator.stream.sample.Reservoir
+            Reservoirs for the partitions of the data stream.
+        rand: random.Random
+            Random number generator.
+
+        Returns
+        -------
+        openclean.operator.stream.sample.Reservoir
+        """
+        pools = [list(res.rows) for res in reservoirs]
+        counts = [res.count for res in reservoirs]
+        total = sum(counts)
+        result = Reservoir(n=self.size)
+        for _ in range(min(self.size, sum(len(p) for p in pools))):
+            i, r = 0, rand.randrange(total)
+            while r >= counts[i]:
+                r -= counts[i]
+                i += 1
+            pool = pools[i]
+            j = rand.randrange(len(pool))
+            pool[j], pool[-1] = pool[-1], pool[j]
+            result.rows.append(pool.pop())
+            counts[i] -= 1
+            total -= 1
+        result.count = sum(res.count for res in reservoirs)
+        if result.size > 0 and result.count >= result.size:
+            # Initialize the skip state so that more rows can be added to the
+            # merged reservoir.
+            result._w = math.exp(math.log(uniform(rand)) / result.size)
+            result._skip(rand)
+        return result
+
+    def shift(self, offset: int) -> Reservoir:
+        """Add the given offset to the row identifiers of the rows in the
+        reservoir.
+
+        Parameters
+        ----------
+        offset: int
+            Position of the first row of the partition in the data stream.
+
+        Returns
+        -------
+        openclean.operator.stream.sample.Reservoir
+        """
+        self.rows = [(rowid + offset, row) for rowid, row in self.rows]
+        return self
+
+    def _skip(self, rand: Random):
+        """Draw the position of the next row that is added to the full
+        reservoir.
+
+        Parameters
+        ----------
+        rand: random.Random
+            Random number generator.
+        """
+        gap = 0
+        if self._w < 1:
+            gap = math.floor(math.log(uniform(rand)) / math.log1p(-self._w))
+        self._next = self.count + gap + 1
+
+
+class WeightedReservoir(object):
+    """Weighted random sample of up to n rows from a data stream (A-ExpJ).
+    Each row is assigned the key log(u) / w for a uniform random number u and
+    the row weight w. The reservoir keeps the rows with the largest keys in a
+    min-heap.
+    """
+    def __init__(self, n: int):
+        """Initialize the sample size and the empty reservoir.
+
+        Parameters
+        ----------
+        n: int
+            Size of the collected random sample.
+        """
+        self.size = n
+        # Heap of (key, position, rowid, row)-tuples. The position of a row
+        # in the data stream breaks ties between keys.
+        self.heap = list()
+        self.count = 0
+        # Remaining weight that is skipped before the next row is selected.
+        self._jump = None
+
+    def add(self, rowid: RowIndex, row: DataRow, weight: float, rand: Random):
+        """Add the given row to the reservoir if the reservoir is not full or
+        the accumulated weight of skipped rows exceeds the current jump.
+
+        Parameters
+        ----------
+        rowid: int
+            Unique row identifier
+        row: list
+            List of values in the row.
+        weight: float
+            Sampling weight for the row.
+        rand: random.Random
+            Random number generator.
+        """
+        self.count += 1
+        if weight <= 0 or self.size == 0:
+            return
+        if len(self.heap) < self.size:
+            key = math.log(uniform(rand)) / weight
+            heapq.heappush(self.heap, (key, self.count, rowid, row))
+            if len(self.heap) == self.size:
+                self._jump = math.log(uniform(rand)) / self.heap[0][0]
+            return
+        self._jump -= weight
+        if self._jump <= 0:
+            # The key of the selected row is drawn from the range of keys
+            # that are larger than the current minimum.
+            t = math.exp(self.heap[0][0] * weight)
+            key = math.log(t + (1 - t) * uniform(rand)) / weight
+            heapq.heapreplace(self.heap, (key, self.count, rowid, row))
+            self._jump = math.log(uniform(rand)) / self.heap[0][0]
+
+    def merge(self, reservoirs: List[WeightedReservoir], rand: Random) -> WeightedReservoir:
+        """Merge reservoirs for disjoint partitions of a data stream by
+        keeping the rows with the n largest keys.
+
+        Parameters
+        ----------
+        reservoirs: list of openclean.operator.stream.sample.WeightedReservoir
+            Reservoirs for the partitions of the data stream.
+        rand: random.Random
+            Random number generator.
+
+        Returns
+        -------
+        openclean.operator.stream.sample.WeightedReservoir
+        """
+        result = WeightedReservoir(n=self.size)
+        entries = list()
+        for res in reservoirs:
+            # Positions are made relative to the merged data stream.
+            for key, pos, rowid, row in res.heap:
+                entries.append((key, result.count + pos, rowid, row))
+            result.count += res.count
+        result.heap = heapq.nlargest(self.size, entries)
+        heapq.heapify(result.heap)
+        if result.heap and len(result.heap) == result.size:
+            result._jump = math.log(uniform(rand)) / result.heap[0][0]
+        return result
+
+    @property
+    def rows(self) -> List[Tuple[RowIndex, DataRow]]:
+        """Get the sampled rows in the order of the data stream.
+
+        Returns
+        -------
+        list of tuple of int and list
+        """
+        return [(rowid, row) for _, _, rowid, row in sorted(self.heap, key=lambda e: e[1])]
+
+    def shift(self, offset: int) -> WeightedReservoir:
+        """Add the given offset to the row identifiers of the rows in the
+        reservoir.
+
+        Parameters
+        ----------
+        offset: int
+            Position of the first row of the partition in the data stream.
+
+        Returns
+        -------
+        openclean.operator.stream.sample.WeightedReservoir
+        """
+        self.heap = [(key, pos, rowid + offset, row) for key, pos, rowid, row in self.heap]
+        return self
+
+
+# -- Helper functions ---------------------------------------------------------
+
+def uniform(rand: Random) -> float:
+    """Draw a random number from the open interval (0, 1).
+
+    Parameters
+    ----------
+    rand: random.Random
+        Random number generator.
+
+    Returns
+    -------
+    float
+    """
+    u = rand.random()
+    while u == 0:
+        u = rand.random()
+    return u
@@ -0,0 +1,687 @@
+# This file is part of the Data Cleaning Library (openclean).
+#
+# Copyright (C) 2018-2021 New York University.
+#
+# openclean is released under the Revised BSD License. See file LICENSE for
+# full license details.
+
+"""Collectors that summarize the values in a data stream using sketches with
+bounded memory. In contrast to the :class:`openclean.operator.stream.collector.Distinct`
+collector, the memory that is used by these collectors does not depend on the
+number of distinct values in the data stream. The results are approximate.
+
+Sketches for disjoint partitions of a data stream can be merged. The
+collectors can therefore be used as terminal operators of pipelines that are
+executed in parallel.
+
+- HyperLogLog: Estimate the number of distinct values. See:
+  Flajolet P., Fusy E., Gandouet O., and Meunier F.
+  HyperLogLog: the analysis of a near-optimal cardinality estimation algorithm.
+  In AofA: Analysis of Algorithms, 2007.
+
+- FrequentItems: Maintain counts for the most frequent values (heavy hitters)
+  using the Misra-Gries summary (which is equivalent to the SpaceSaving
+  algorithm). Merging follows: Agarwal P., Cormode G., Huang Z., Phillips J.,
+  Wei Z., and Yi K. Mergeable summaries. In PODS 2012.
+
+- ScalableBloomFilter: Approximate set membership for an unknown number of
+  values with a bounded false-positive rate. See:
+  Almeida P. S., Baquero C., Preguica N., and Hutchison D.
+  Scalable Bloom Filters. Information Processing Letters, 2007.
+"""
+
+from __future__ import annotations
+from collections import Counter
+from typing import Iterable, List, Optional, Tuple
+
+import hashlib
+import math
+
+from openclean.data.schema import as_list, select_clause
+from openclean.data.stream.base import DataRow, RowBatch, RowIndex
+from openclean.data.types import Columns, DatasetSchema, Value
+from openclean.operator.stream.consumer import StreamConsumer
+from openclean.operator.stream.processor import MergeableProcessor
+
+
+"""Default number of index bits for HyperLogLog sketches. The sketch uses
+2^precision registers with a relative standard error of 1.04 / sqrt(2^precision)
+(about 0.8% for the default precision).
+"""
+PRECISION = 14
+
+"""Default number of counters per requested value for frequent item sketches."""
+CAPACITY_FACTOR = 10
+
+"""Default number of values for the first filter in a scalable Bloom filter."""
+BLOOM_CAPACITY = 100000
+
+"""Default false-positive rate for Bloom filters."""
+BLOOM_ERROR = 0.001
+
+
+# -- Sketches -----------------------------------------------------------------
+
+class HyperLogLog(object):
+    """HyperLogLog sketch for estimating the number of distinct values in a
+    data stream. Values are hashed using a hash function that is independent
+    of the Python process (in contrast to the built-in hash function). Sketches
+    that are created in different worker processes can therefore be merged.
+    """
+    def __init__(self, precision: Optional[int] = PRECISION):
+        """Initialize the registers of the sketch.
+
+        Parameters
+        ----------
+        precision: int, default=14
+            Number of bits that are used to select the register for a value.
+
+        Raises
+        ------
+        ValueError
+        """
+        if precision < 4 or precision > 18:
+            raise ValueError('invalid precision {}'.format(precision))
+        self.precision = precision
+        self.registers = bytearray(1 << precision)
+
+    def add(self, value: Value):
+        """Add a value to the sketch.
+
+        Parameters
+        ----------
+        value: scalar or tuple
+            Value (or value combination) in the data stream.
+        """
+        self.update([value])
+
+    def count(self) -> int:
+        """Get the estimated number of distinct values that were added to the
+        sketch.
+
+        Returns
+        -------
+        int
+        """
+        m = len(self.registers)
+        alpha = 0.7213 / (1 + 1.079 / m)
+        estimate = alpha * m * m / sum(2.0 ** -r for r in self.registers)
+        # Use linear counting for small cardinalities.
+        zeros = self.registers.count(0)
+        if estimate <= 2.5 * m and zeros > 0:
+            estimate = m * math.log(m / zeros)
+        return int(round(estimate))
+
+    def merge(self, sketch: HyperLogLog) -> HyperLogLog:
+        """Merge the registers of the given sketch into this sketch. Returns
+        a reference to this sketch.
+
+        Parameters
+        ----------
+        sketch: openclean.operator.stream.sketch.HyperLogLog
+            Sketch for a disjoint part of the data stream.
+
+        Returns
+        -------
+        openclean.operator.stream.sketch.HyperLogLog
+
+        Raises
+        ------
+        ValueError
+        """
+        if sketch.precision != self.precision:
+            raise ValueError('cannot merge sketches with different precision')
+        self.registers = bytearray(map(max, self.registers, sketch.registers))
+        return self
+
+    def update(self, values: Iterable[Value]):
+        """Add a list of values to the sketch.
+
+        Parameters
+        ----------
+        values: iterable
+            Values (or value combinations) in the data stream.
+        """
+        registers = self.registers
+        shift = 64 - self.precision
+        mask = (1 << shift) - 1
+        for value in values:
+            x = valuehash(value)
+            idx = x >> shift
+            rank = shift - (x & mask).bit_length() + 1
+            if rank > registers[idx]:
+                registers[idx] = rank
+
+
+class FrequentItems(object):
+    """Misra-Gries summary for the most frequent values in a data stream. The
+    summary keeps at most the given number of counters. If the number of
+    counters exceeds twice the capacity, the counters are reduced by the count
+    of the first value that is outside of the capacity and all counters that
+    become zero are removed.
+
+    The counts in the summary are lower bounds. The true frequency of each
+    value exceeds the count by at most the total reduction that is maintained
+    as the error of the summary. The error is bounded by n / (capacity + 1) for
+    a stream of n values.
+    """
+    def __init__(self, capacity: int):
+        """Initialize the (empty) counters.
+
+        Parameters
+        ----------
+        capacity: int
+            Number of counters that are kept after each reduction.
+
+        Raises
+        ------
+        ValueError
+        """
+        if capacity < 1:
+            raise ValueError('invalid capacity {}'.format(capacity))
+        self.capacity = capacity
+        self.counts = Counter()
+        self.error = 0
+
+    def add(self, value: Value):
+        """Add a value to the summary.
+
+        Parameters
+        ----------
+        value: scalar or tuple
+            Value (or value combination) in the data stream.
+        """
+        self.counts[value] += 1
+        if len(self.counts) > 2 * self.capacity:
+            self._reduce()
+
+    def merge(self, sketch: FrequentItems) -> FrequentItems:
+        """Merge the counters of the given summary into this summary. Returns
+        a reference to this summary.
+
+        Parameters
+        ----------
+        sketch: openclean.operator.stream.sketch.FrequentItems
+            Summary for a disjoint part of the data stream.
+
+        Returns
+        -------
+        openclean.operator.stream.sketch.FrequentItems
+        """
+        self.counts.update(sketch.counts)
+        self.error += sketch.error
+        self._reduce()
+        return self
+
+    def most_common(self, k: Optional[int] = None) -> List[Tuple[Value, int]]:
+        """Get the k most frequent values together with their (lower bound)
+        counts.
+
+        Parameters
+        ----------
+        k: int, default=None
+            Number of returned values. Returns all values in the summary if
+            None.
+
+        Returns
+        -------
+        list of tuple
+        """
+        return self.counts.most_common(k)
+
+    def update(self, values: Iterable[Value]):
+        """Add a list of values to the summary.
+
+        Parameters
+        ----------
+        values: iterable
+            Values (or value combinations) in the data stream.
+        """
+        self.counts.update(values)
+        if len(self.counts) > 2 * self.capacity:
+            self._reduce()
+
+    def _reduce(self):
+        """Reduce the number of counters to at most the capacity of the
+        summary.
+        """
+        if len(self.counts) <= self.capacity:
+            return
+        ranked = self.counts.most_common()
+        delta = ranked[self.capacity][1]
+        self.counts = Counter({v: c - delta for v, c in ranked[:self.capacity] if c > delta})
+        self.error += delta
+
+
+class BloomFilter(object):
+    """Bloom filter for a fixed number of values. The number of bits and
+    the number of hash functions are chosen such that the false-positive
+    rate does not exceed the given error rate as long as at most capacity
+    values are added. Bit positions are derived from a single 128-bit hash
+    of each value using enhanced double hashing (Dillinger and Manolios,
+    Bloom Filters in Probabilistic Verification, FMCAD 2004).
+    """
+    def __init__(self, capacity: int, error: Optional[float] = BLOOM_ERROR):
+        """Initialize the bit array for the filter.
+
+        Parameters
+        ----------
+        capacity: int
+            Maximum number of values in the filter.
+        error: float, default=0.001
+            False-positive rate.
+
+        Raises
+        ------
+        ValueError
+        """
+        if capacity < 1:
+            raise ValueError('invalid capacity {}'.format(capacity))
+        if error <= 0 or error >= 1:
+            raise ValueError('invalid error rate {}'.format(error))
+        self.capacity = capacity
+        self.error = error
+        self.size = max(8, int(math.ceil(-capacity * math.log(error) / (math.log(2) ** 2))))
+        self.hashes = max(1, int(round(self.size / capacity * math.log(2))))
+        self.bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+
+    def __contains__(self, value: Value) -> bool:
+        """Test if the value may have been added to the filter.
+
+        Parameters
+        ----------
+        value: scalar or tuple
+            Value (or value combination) in the data stream.
+
+        Returns
+        -------
+        bool
+        """
+        bits = self.bits
+        return all(bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(value))
+
+    def add(self, value: Value) -> bool:
+        """Add a value to the filter. Returns True if the value may have been
+        added before (i.e., if all of the bits for the value were set).
+
+        Parameters
+        ----------
+        value: scalar or tuple
+            Value (or value combination) in the data stream.
+
+        Returns
+        -------
+        bool
+        """
+        bits = self.bits
+        found = True
+        for pos in self._positions(value):
+            mask = 1 << (pos & 7)
+            if not bits[pos >> 3] & mask:
+                bits[pos >> 3] |= mask
+                found = False
+        if not found:
+            self.count += 1
+        return found
+
+    def _positions(self, value: Value) -> List[int]:
+        """Get the bit positions for a value.
+
+        Parameters
+        ----------
+        value: scalar or tuple
+            Value (or value combination) in the data stream.
+
+        Returns
+        -------
+        list of int
+        """
+        x = int.from_bytes(valuedigest(value), 'big')
+        size = self.size
+        h1, h2 = (x >> 64) % size, (x & 0xFFFFFFFFFFFFFFFF) % size
+        positions = list()
+        for i in range(self.hashes):
+            positions.append(h1)
+            h1 = (h1 + h2) % size
+            h2 = (h2 + i + 1) % size
+        return positions
+
+
+class ScalableBloomFilter(object):
+    """Bloom filter for an unknown number of values. The filter is a list of
+    Bloom filters with increasing capacity and decreasing error rates. A new
+    filter is added when the last filter is full. The overall false-positive
+    rate is bounded by the given error rate.
+    """
+    def __init__(
+        self, capacity: Optional[int] = BLOOM_CAPACITY, error: Optional[float] = BLOOM_ERROR,
+        growth: Optional[int] = 2, ratio: Optional[float] = 0.5
+    ):
+        """Initialize the parameters for the sequence of filters.
+
+        Parameters
+        ----------
+        capacity: int, default=100000
+            Capacity of the first filter.
+        error: float, default=0.001
+            Bound for the false-positive rate of the scalable filter.
+        growth: int, default=2
+            Factor by which the capacity increases for each new filter.
+        ratio: float, default=0.5
+            Factor by which the error rate decreases for each new filter.
+
+        Raises
+        ------
+        ValueError
+        """
+        if error <= 0 or error >= 1:
+            raise ValueError('invalid error rate {}'.format(error))
+        if growth < 1 or ratio <= 0 or ratio >= 1:
+            raise ValueError('invalid growth parameters')
+        self.capacity = capacity
+        self.error = error
+        self.growth = growth
+        self.ratio = ratio
+        self.filters = [BloomFilter(capacity=capacity, error=error * (1 - ratio))]
+
+    def __contains__(self, value: Value) -> bool:
+        """Test if the value may have been added to the filter.
+
+        Parameters
+        ----------
+        value: scalar or tuple
+            Value (or value combination) in the data stream.
+
+        Returns
+        -------
+        bool
+        """
+        return any(value in f for f in self.filters)
+
+    def __len__(self) -> int:
+        """Get the number of values that were added to the filter (excluding
+        values that were reported as possibly added before).
+
+        Returns
+        -------
+        int
+        """
+        return sum(f.count for f in self.filters)
+
+    def add(self, value: Value) -> bool:
+        """Add a value to the filter. Returns True if the value may have been
+        added before.
+
+        Parameters
+        ----------
+        value: scalar or tuple
+            Value (or value combination) in the data stream.
+
+        Returns
+        -------
+        bool
+        """
+        for f in self.filters[:-1]:
+            if value in f:
+                return True
+        last = self.filters[-1]
+        if last.count >= last.capacity:
+            if value in last:
+                return True
+            last = BloomFilter(
+                capacity=last.capacity * self.growth,
+                error=last.error * self.ratio
+            )
+            self.filters.append(last)
+        return last.add(value)
+
+
+# -- Collectors ---------------------------------------------------------------
+
+class SketchCollector(StreamConsumer, MergeableProcessor):
+    """Base class for collectors that add the values (or value combinations)
+    of the processed rows to a sketch. Closing the consumer returns the
+    sketch. Subclasses implement the open method to create the sketch.
+    """
+    def __init__(self, columns: Optional[Columns] = None, sketch: Optional[object] = None):
+        """Initialize the column selection and the sketch.
+
+        Parameters
+        ----------
+        columns: int, str, or list of int or string, default=None
+            References to the column(s) whose values are summarized. The
+            columns are given as a list of index positions if the operator is
+            instantiated as a consumer.
+        sketch: openclean.operator.stream.sketch.HyperLogLog or
+                openclean.operator.stream.sketch.FrequentItems, default=None
+            Sketch for the summarized values.
+        """
+        self.columns = columns
+        self.sketch = sketch
+
+    def checkpoint(self) -> object:
+        """Get the sketch for the values that were processed so far.
+
+        Returns
+        -------
+        object
+        """
+        return self.sketch
+
+    def close(self) -> object:
+        """Closing the consumer returns the sketch.
+
+        Returns
+        -------
+        object
+        """
+        return self.sketch
+
+    def consume(self, rowid: int, row: DataRow):
+        """Add the value (combination) of the given row to the sketch.
+
+        Parameters
+        -----------
+        rowid: int
+            Unique row identifier
+        row: list
+            List of values in the row.
+        """
+        if len(self.columns) == 1:
+            self.sketch.add(row[self.columns[0]])
+        else:
+            self.sketch.add(tuple([row[i] for i in self.columns]))
+
+    def consume_batch(self, rowids: List[RowIndex], rows: List[DataRow]) -> RowBatch:
+        """Add the value combinations for a batch of rows to the sketch.
+
+        Parameters
+        ----------
+        rowids: list
+            Unique identifier for each row in the batch.
+        rows: list of list
+            List of values for each row in the batch.
+
+        Returns
+        -------
+        tuple of list and list
+        """
+        if len(self.columns) == 1:
+            colidx = self.columns[0]
+            self.sketch.update([row[colidx] for row in rows])
+        else:
+            columns = self.columns
+            self.sketch.update([tuple([row[i] for i in columns]) for row in rows])
+        return [], []
+
+    def merge(self, results: List[object], offsets: List[int]) -> object:
+        """Merge the sketches for all partitions of the data stream.
+
+        Parameters
+        ----------
+        results: list
+            Sketches for each partition of the data stream.
+        offsets: list of int
+            Position of the first row of each partition in the data stream.
+
+        Returns
+        -------
+        object
+        """
+        sketch = results[0]
+        for s in results[1:]:
+            sketch = sketch.merge(s)
+        return sketch
+
+    def restore(self, state: object):
+        """Restore the sketch.
+
+        Parameters
+        ----------
+        state: object
+            Sketch that was returned by the checkpoint method.
+        """
+        self.sketch = state
+
+    def _colidx(self, schema: DatasetSchema) -> List[int]:
+        """Get the index positions of the summarized columns in the given
+        schema.
+
+        Parameters
+        ----------
+        schema: list of string
+            List of column names in the data stream schema.
+
+        Returns
+        -------
+        list of int
+        """
+        columns = self.columns if self.columns else schema
+        _, colidx = select_clause(schema, columns=as_list(columns))
+        return colidx
+
+
+class ApproxDistinct(SketchCollector):
+    """Collector that estimates the number of distinct values (or value
+    combinations) in the processed rows using a HyperLogLog sketch.
+    """
+    def __init__(
+        self, columns: Optional[Columns] = None, precision: Optional[int] = PRECISION,
+        sketch: Optional[HyperLogLog] = None
+    ):
+        """Initialize the column selection and the sketch precision.
+
+        Parameters
+        ----------
+        columns: int, str, or list of int or string, default=None
+            References to the column(s) whose distinct values are counted.
+        precision: int, default=14
+            Number of index bits for the HyperLogLog sketch.
+        sketch: openclean.operator.stream.sketch.HyperLogLog, default=None
+            Sketch for the consumer.
+        """
+        super(ApproxDistinct, self).__init__(columns=columns, sketch=sketch)
+        self.precision = precision
+
+    def open(self, schema: DatasetSchema) -> StreamConsumer:
+        """Factory pattern for stream consumer. Returns an instance of the
+        stream consumer for the distinct count estimator.
+
+        Parameters
+        ----------
+        schema: list of string
+            List of column names in the data stream schema.
+
+        Returns
+        -------
+        openclean.operator.stream.consumer.StreamConsumer
+        """
+        return ApproxDistinct(
+            columns=self._colidx(schema),
+            precision=self.precision,
+            sketch=HyperLogLog(precision=self.precision)
+        )
+
+
+class TopValues(SketchCollector):
+    """Collector that maintains the most frequent values (or value
+    combinations) in the processed rows using a Misra-Gries summary.
+    """
+    def __init__(
+        self, columns: Optional[Columns] = None, k: Optional[int] = 10,
+        capacity: Optional[int] = None, sketch: Optional[FrequentItems] = None
+    ):
+        """Initialize the column selection and the summary capacity.
+
+        Parameters
+        ----------
+        columns: int, str, or list of int or string, default=None
+            References to the column(s) whose values are counted.
+        k: int, default=10
+            Number of most frequent values that are requested.
+        capacity: int, default=None
+            Number of counters in the summary. By default, ten times the
+            number of requested values.
+        sketch: openclean.operator.stream.sketch.FrequentItems, default=None
+            Summary for the consumer.
+        """
+        super(TopValues, self).__init__(columns=columns, sketch=sketch)
+        self.k = k
+        self.capacity = capacity if capacity is not None else CAPACITY_FACTOR * k
+
+    def open(self, schema: DatasetSchema) -> StreamConsumer:
+        """Factory pattern for stream consumer. Returns an instance of the
+        stream consumer for the frequent values summary.
+
+        Parameters
+        ----------
+        schema: list of string
+            List of column names in the data stream schema.
+
+        Returns
+        -------
+        openclean.operator.stream.consumer.StreamConsumer
+        """
+        return TopValues(
+            columns=self._colidx(schema),
+            k=self.k,
+            capacity=self.capacity,
+            sketch=FrequentItems(capacity=self.capacity)
+        )
+
+
+# -- Helper functions ---------------------------------------------------------
+
+def valuedigest(value: Value) -> bytes:
+    """Get a 128-bit digest for a value. Like :func:`valuehash`, the digest
+    is computed from the string representation of the value.
+
+    Parameters
+    ----------
+    value: scalar or tuple
+        Value (or value combination) in the data stream.
+
+    Returns
+    -------
+    bytes
+    """
+    return hashlib.blake2b(repr(value).encode('utf-8'), digest_size=16).digest()
+
+
+def valuehash(value: Value) -> int:
+    """Get a 64-bit hash for a value. The hash is computed from the string
+    representation of the value. Values of different types (e.g., 1 and '1')
+    therefore have different hashes.
+
+    Parameters
+    ----------
+    value: scalar or tuple
+        Value (or value combination) in the data stream.
+
+    Returns
+    -------
+    int
+    """
+    digest = hashlib.blake2b(repr(value).encode('utf-8'), digest_size=8).digest()
+    return int.from_bytes(digest, 'big')
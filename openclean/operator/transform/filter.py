@@ -7,21 +7,22 @@
 
 """Functions and classes that implement the filter operators in openclean."""
 
-from typing import Optional
+from typing import List, Optional, Tuple
 
 import pandas as pd
 
-from openclean.data.stream.base import DataRow
+from openclean.data.stream.base import DataRow, RowBatch, RowIndex
 from openclean.data.types import DatasetSchema
 from openclean.function.eval.base import EvalFunction
+from openclean.function.eval.compiler import compile_function
 from openclean.operator.base import DataFrameTransformer
 from openclean.operator.stream.consumer import StreamFunctionHandler
-from openclean.operator.stream.processor import StreamProcessor
+from openclean.operator.stream.fusion import FusableProcessor, RowFilter, RowStep
 
 
 # -- Functions ----------------------------------------------------------------
 
-def delete(df: pd.DataFrame, predicate: EvalFunction) -> pd.DataFrame:
+def delete(df: pd.DataFrame, predicate: EvalFunction, threads: Optional[int] = None) -> pd.DataFrame:
     """Delete rows in a data frame. The delete operator evaluates a given
     predicate on all rows in a data frame. It returns a new data frame where
     those rows that satisfied the predicate are deleted.
@@ -34,16 +35,21 @@ def delete(df: pd.DataFrame, predicate: EvalFunction) -> pd.DataFrame:
         Evaluation function that is expected to return a Boolean value when
         evaluated on a data frame row. All rows in the input data frame that
         satisfy the predicate will be deleted.
+    threads: int, default=None
+        Number of parallel threads to use for evaluating the predicate on
+        chunks of the data frame. If None the value from the environment
+        variable 'OPENCLEAN_THREADS' is used as the default.
 
     Returns
     -------
     pd.DataFrame
     """
-    return filter(df=df, predicate=predicate, negated=True)
+    return filter(df=df, predicate=predicate, negated=True, threads=threads)
 
 
 def filter(
-    df: pd.DataFrame, predicate: EvalFunction, negated: Optional[bool] = False
+    df: pd.DataFrame, predicate: EvalFunction, negated: Optional[bool] = False,
+    threads: Optional[int] = None
 ) -> pd.DataFrame:
     """Filter function for data frames. Returns a data frame that only contains
     the rows of the input data frame for which the given predicate evaluates
@@ -59,6 +65,10 @@ def filter(
         that satisfy the predicate will be included in the result.
     negated: bool, default=False
         Negate the predicate value to get an inverted result.
+    threads: int, default=None
+        Number of parallel threads to use for evaluating the predicate on
+        chunks of the data frame. If None the value from the environment
+        variable 'OPENCLEAN_THREADS' is used as the default.
 
     Returns
     -------
@@ -68,17 +78,20 @@ def filter(
     ------
     ValueError
     """
-    return Filter(predicate=predicate, negated=negated).transform(df)
+    return Filter(predicate=predicate, negated=negated, threads=threads).transform(df)
 
 
 # -- Operators ----------------------------------------------------------------
 
-class Filter(StreamProcessor, DataFrameTransformer):
+class Filter(FusableProcessor, DataFrameTransformer):
     """Data frame transformer that evaluates a Boolean predicate on the rows of
     a data frame. The transformed output contains only those rows for which the
     predicate evaluated to True (or Flase if the negated flag is True).
     """
-    def __init__(self, predicate: EvalFunction, negated: Optional[bool] = False):
+    def __init__(
+        self, predicate: EvalFunction, negated: Optional[bool] = False,
+        threads: Optional[int] = None
+    ):
         """Initialize the predicate that is evaluated.
 
         Parameters
@@ -87,9 +100,14 @@ class Filter(StreamProcessor, DataFrameTransformer):
             Evaluation function that is evaluated on a given data frame.
         negated: bool, default=False
             Negate the predicate value to get an inverted result.
+        threads: int, default=None
+            Number of parallel threads to use for evaluating the predicate on
+            chunks of a data frame. If None the value from the environment
+            variable 'OPENCLEAN_THREADS' is used as the default.
         """
         self.predicate = predicate
         self.negated = negated
+        self.threads = threads
 
     def open(self, schema: DatasetSchema) -> StreamFunctionHandler:
         """Factory pattern for stream consumer. Returns an instance of a
@@ -106,7 +124,7 @@ class Filter(StreamProcessor, DataFrameTransformer):
         openclean.operator.stream.consumer.StreamFunctionHandler
         """
         # Get the stream function for the associated predicate.
-        func = self.predicate.prepare(columns=schema)
+        func = compile_function(self.predicate.prepare(columns=schema))
         # The predicate function is expected to return a Boolean value. For the
         # stream consumer we need to wrap it into a function that only returns
         # rows or None if the predicate is not satisfied.
@@ -118,7 +136,42 @@ class Filter(StreamProcessor, DataFrameTransformer):
                 return row
             return None
 
-        return StreamFunctionHandler(columns=schema, func=streamfunc)
+        negated = self.negated
+
+        def batchfunc(rowids: List[RowIndex], rows: List[DataRow]) -> RowBatch:
+            """Return rowids and rows that satisfy the predicate."""
+            smap = [not func(row) if negated else func(row) for row in rows]
+            return (
+                [rowid for rowid, sat in zip(rowids, smap) if sat],
+                [row for row, sat in zip(rows, smap) if sat]
+            )
+
+        return StreamFunctionHandler(columns=schema, func=streamfunc, batchfunc=batchfunc)
+
+    def eval_functions(self) -> List[EvalFunction]:
+        """Get the filter predicate.
+
+        Returns
+        -------
+        list of openclean.function.eval.base.EvalFunction
+        """
+        return [self.predicate]
+
+    def fuse(self, schema: DatasetSchema) -> Tuple[DatasetSchema, List[RowStep]]:
+        """Get the output schema and the row steps of the operator for rows in
+        the given input schema.
+
+        Parameters
+        ----------
+        schema: list of string
+            List of column names in the data stream schema.
+
+        Returns
+        -------
+        tuple of list of string and list of openclean.operator.stream.fusion.RowStep
+        """
+        func = compile_function(self.predicate.prepare(columns=schema))
+        return schema, [RowFilter(func=func, negated=self.negated)]
 
     def transform(self, df: pd.DataFrame) -> pd.DataFrame:
         """Return a data frame that contains only those rows from the given
@@ -133,7 +186,13 @@ class Filter(StreamProcessor, DataFrameTransformer):
         -------
         pd.DataFrame
         """
-        smap = self.predicate.eval(df)
+        # Use the vectorized predicate result if possible.
+        smap = self.predicate.vectorize(df)
+        if smap is None:
+            smap = self.predicate.apply(df, threads=self.threads)
         if self.negated:
-            smap = [not v for v in smap]
+            if isinstance(smap, pd.Series) and smap.dtype == bool:
+                smap = ~smap
+            else:
+                smap = [not v for v in smap]
         return df[smap]
@@ -13,13 +13,14 @@ from typing import Callable, List, Optional, Tuple, Union
 
 import pandas as pd
 
-from openclean.data.stream.base import DataRow
+from openclean.data.stream.base import DataRow, RowBatch, RowIndex, StreamFunction
 from openclean.data.types import Scalar, DatasetSchema
 from openclean.function.eval.base import Const, EvalFunction
-from openclean.function.eval.base import evaluate, to_const_eval, to_eval
+from openclean.function.eval.base import to_const_eval, to_eval
+from openclean.function.eval.compiler import compile_function
 from openclean.operator.base import DataFrameTransformer
 from openclean.operator.stream.consumer import StreamFunctionHandler
-from openclean.operator.stream.processor import StreamProcessor
+from openclean.operator.stream.fusion import ColumnInsert, FusableProcessor, RowStep
 import numpy as np
 
 
@@ -27,7 +28,7 @@ import numpy as np
 
 def inscol(
     df: pd.DataFrame, names: Union[str, List[str]], pos: Optional[int] = None,
-    values: Optional[Union[Scalar, EvalFunction]] = None
+    values: Optional[Union[Scalar, EvalFunction]] = None, threads: Optional[int] = None
 ) -> pd.DataFrame:
     """Insert function for data frame columns. Returns a modified data frame
     where columns have been inserted at a given position. Exactly one column is
@@ -55,12 +56,16 @@ def inscol(
         Single value, tuple of values, or evaluation function that is used to
         generate the values for the inserted column(s). If no default is
         specified all columns will contain None.
+    threads: int, default=None
+        Number of parallel threads to use for evaluating the value functions on
+        chunks of the data frame. If None the value from the environment
+        variable 'OPENCLEAN_THREADS' is used as the default.
 
     Returns
     -------
     pd.DataFrame
     """
-    return InsCol(names=names, pos=pos, values=values).transform(df)
+    return InsCol(names=names, pos=pos, values=values, threads=threads).transform(df)
 
 
 def insrow(df, pos=None, values=None):
@@ -87,13 +92,14 @@ def insrow(df, pos=None, values=None):
 
 # -- Operators ----------------------------------------------------------------
 
-class InsCol(StreamProcessor, DataFrameTransformer):
+class InsCol(FusableProcessor, DataFrameTransformer):
     """Data frame transformer that inserts columns into a data frame. Values
     for the new column(s) are generated using a given value generator function.
     """
     def __init__(
         self, names: Union[str, List[str]], pos: Optional[int] = None,
-        values: Optional[Union[Callable, EvalFunction, List, Scalar, Tuple]] = None
+        values: Optional[Union[Callable, EvalFunction, List, Scalar, Tuple]] = None,
+        threads: Optional[int] = None
     ):
         """Initialize the list of column names, the insert position and the
         function that is used to generate values for the inserted column(s).
@@ -113,6 +119,10 @@ class InsCol(StreamProcessor, DataFrameTransformer):
             frame row as the only argument and returns a (list of) value(s)
             matching the number of columns inserted or an evaluation function
             that returns a matchin number of values.
+        threads: int, default=None
+            Number of parallel threads to use for evaluating the value functions on
+            chunks of a data frame. If None the value from the environment
+            variable 'OPENCLEAN_THREADS' is used as the default.
         """
         # Ensure that names is a list
         self.names = names if isinstance(names, list) else [names]
@@ -128,6 +138,7 @@ class InsCol(StreamProcessor, DataFrameTransformer):
             else:
                 values = [Const(None)]
         self.values = values
+        self.threads = threads
 
     def inspos(self, schema: DatasetSchema) -> int:
         """Get the insert position for the new column.
@@ -169,50 +180,105 @@ class InsCol(StreamProcessor, DataFrameTransformer):
         columns = list(schema)
         columns = columns[:inspos] + self.names + columns[inspos:]
 
+        # Prepare the value generator.
+        func = self.valuefunc(schema)
         if len(self.names) == 1:
-            # Prepare the value generator.
-            func = self.values[0].prepare(schema)
 
             def unaryfunc(row: DataRow) -> DataRow:
                 """Insert column in a given data stream row."""
                 values = list(row)
                 return values[:inspos] + [func(row)] + values[inspos:]
 
+            def batchfunc(rowids: List[RowIndex], rows: List[DataRow]) -> RowBatch:
+                """Insert column in all rows of a batch."""
+                result = list()
+                for row in rows:
+                    values = list(row)
+                    values.insert(inspos, func(row))
+                    result.append(values)
+                return rowids, result
+
             streamfunc = unaryfunc
 
         else:
-            # Prepare the value generator.
-            funcs = [f.prepare(schema) for f in self.values]
-            col_count = len(self.names)
 
             def ternaryfunc(row: DataRow) -> DataRow:
                 """Insert column values in a given data stream row."""
-                # Create list of values for inserted columns. The number of
-                # columns that we insert does not have to match the number of
-                # evaluation functions that generate the values (i.e., we may
-                # have less functions than values). We have to ensure to unpack
-                # tuples or lists of values that are genrated by the evaluation
-                # functions (fix for issue #64).
-                insvals = []
-                for f in funcs:
-                    val = f(row)
-                    if isinstance(val, list):
-                        insvals.extend(val)
-                    elif isinstance(val, tuple):
-                        insvals.extend(list(val))
-                    else:
-                        insvals.append(val)
-                # Ensure that the list of insert values matches the number of
-                # inserted columns.
                 values = list(row)
-                if len(insvals) != col_count:
-                    msg = 'expected {} values instead of {}'
-                    raise ValueError(msg.format(col_count, insvals))
-                return values[:inspos] + insvals + values[inspos:]
+                return values[:inspos] + func(row) + values[inspos:]
 
             streamfunc = ternaryfunc
 
-        return StreamFunctionHandler(columns=columns, func=streamfunc)
+            def batchfunc(rowids: List[RowIndex], rows: List[DataRow]) -> RowBatch:
+                """Insert column values in all rows of a batch."""
+                return rowids, [ternaryfunc(row) for row in rows]
+
+        return StreamFunctionHandler(columns=columns, func=streamfunc, batchfunc=batchfunc)
+
+    def eval_functions(self) -> List[EvalFunction]:
+        """Get the functions that generate the inserted values.
+
+        Returns
+        -------
+        list of openclean.function.eval.base.EvalFunction
+        """
+        return self.values
+
+    def fuse(self, schema: DatasetSchema) -> Tuple[DatasetSchema, List[RowStep]]:
+        """Get the output schema and the row steps of the operator for rows in
+        the given input schema.
+
+        Parameters
+        ----------
+        schema: list of string
+            List of column names in the data stream schema.
+
+        Returns
+        -------
+        tuple of list of string and list of openclean.operator.stream.fusion.RowStep
+        """
+        inspos = self.inspos(schema)
+        columns = list(schema)
+        columns = columns[:inspos] + self.names + columns[inspos:]
+        step = ColumnInsert(pos=inspos, func=self.valuefunc(schema), count=len(self.names))
+        return columns, [step]
+
+    def valuefunc(self, schema: DatasetSchema) -> StreamFunction:
+        """Get the prepared function that generates the inserted value(s) for
+        a data stream row. If more than one column is inserted, the function
+        returns a list of values.
+
+        Parameters
+        ----------
+        schema: list of string
+            List of column names in the data stream schema.
+
+        Returns
+        -------
+        callable
+        """
+        if len(self.names) == 1:
+            return compile_function(self.values[0].prepare(schema))
+        funcs = [compile_function(f.prepare(schema)) for f in self.values]
+        col_count = len(self.names)
+
+        def insvalues(row: DataRow) -> List:
+            """Generate list of values for the inserted columns."""
+            # Create list of values for inserted columns. The number of
+            # columns that we insert does not have to match the number of
+            # evaluation functions that generate the values (i.e., we may
+            # have less functions than values). We have to ensure to unpack
+            # tuples or lists of values that are genrated by the evaluation
+            # functions (fix for issue #64).
+            insvals = unpack([f(row) for f in funcs])
+            # Ensure that the list of insert values matches the number of
+            # inserted columns.
+            if len(insvals) != col_count:
+                msg = 'expected {} values instead of {}'
+                raise ValueError(msg.format(col_count, insvals))
+            return insvals
+
+        return insvalues
 
     def transform(self, df):
         """Modify rows in the given data frame. Returns a modified data frame
@@ -236,7 +302,13 @@ class InsCol(StreamProcessor, DataFrameTransformer):
         inspos = self.inspos(df.columns)
         # Evaluate the values function(s) to get the default values for the
         # inserted columns.
-        defaults = evaluate(df, self.values)
+        defaults = [f.apply(df, threads=self.threads) for f in self.values]
+        if len(self.values) == 1:
+            defaults = defaults[0]
+        else:
+            # Unpack tuples or lists of values that are generated by the
+            # individual evaluation functions (see issue #64).
+            defaults = [tuple(unpack(values)) for values in zip(*defaults)]
         # if default is a list of tuples, transpose it
         if all(isinstance(item, tuple) for item in defaults):
             for item in defaults:
@@ -250,7 +322,7 @@ class InsCol(StreamProcessor, DataFrameTransformer):
 
         # Create a modified data frame where rows are modified as numpy arrays
         # this is the an optimum way to do it
-        data = np.insert(df.to_numpy(copy=True), inspos, defaults, axis=1)
+        data = np.insert(df.to_numpy(dtype=object, copy=True), inspos, defaults, axis=1)
         # Insert the column names into the data frame schema.
         columns = list(df.columns)
         columns = columns[:inspos] + self.names + columns[inspos:]
@@ -351,3 +423,27 @@ class InsRow(DataFrameTransformer):
             data.append(list(df.iloc[i]))
             index.append(df.index[i])
         return pd.DataFrame(data=data, index=index, columns=df.columns, dtype=object)
+
+
+# -- Helper functions ---------------------------------------------------------
+
+def unpack(values: List) -> List:
+    """Unpack lists or tuples of values that are generated by the evaluation
+    functions for inserted columns into a single list of values.
+
+    Parameters
+    ----------
+    values: list
+        List of results of the individual evaluation functions.
+
+    Returns
+    -------
+    list
+    """
+    result = list()
+    for val in values:
+        if isinstance(val, (list, tuple)):
+            result.extend(val)
+        else:
+            result.append(val)
+    return result
@@ -11,11 +11,11 @@ use in streaming settings. The data frame transformer implementation is included
 for completeness.
 """
 
-from typing import Optional
+from typing import List, Optional
 
 import pandas as pd
 
-from openclean.data.stream.base import DataRow
+from openclean.data.stream.base import DataRow, RowBatch, RowIndex
 from openclean.data.types import DatasetSchema
 from openclean.operator.base import DataFrameTransformer
 from openclean.operator.stream.consumer import StreamConsumer, ProducingConsumer
@@ -120,6 +120,43 @@ class LimitConsumer(ProducingConsumer):
         self.limit = limit
         self.count = 0
 
+    def checkpoint(self) -> int:
+        """Get the number of rows that have been passed on to the downstream
+        consumer.
+
+        Returns
+        -------
+        int
+        """
+        return self.count
+
+    def consume_batch(self, rowids: List[RowIndex], rows: List[DataRow]) -> RowBatch:
+        """Pass the rows in the batch on to the downstream consumer until the
+        row limit is reached. Raises a StopIteration error after all rows up
+        to the limit have been passed on if the batch contains more rows than
+        are allowed by the remaining row limit.
+
+        Parameters
+        ----------
+        rowids: list
+            Unique identifier for each row in the batch.
+        rows: list of list
+            List of values for each row in the batch.
+
+        Returns
+        -------
+        tuple of list and list
+        """
+        remaining = self.limit - self.count
+        if len(rows) > remaining:
+            rowids, rows = rowids[:remaining], rows[:remaining]
+        self.count += len(rows)
+        if rows and self.consumer is not None:
+            self.consumer.consume_batch(rowids, rows)
+        if self.count >= self.limit:
+            raise StopIteration()
+        return rowids, rows
+
     def handle(self, rowid: int, row: DataRow) -> DataRow:
         """Pass the row on to the downstream consumer if the row limit has not
         been reached yet. Otherwise, a StopIteration error is raised.
@@ -140,3 +177,14 @@ class LimitConsumer(ProducingConsumer):
             return row
         else:
             raise StopIteration()
+
+    def restore(self, state: int):
+        """Restore the number of rows that have been passed on to the
+        downstream consumer.
+
+        Parameters
+        ----------
+        state: int
+            Row count that was returned by the checkpoint method.
+        """
+        self.count = state
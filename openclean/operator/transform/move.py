@@ -7,16 +7,16 @@
 
 """Data frame transformation operator for sorting by data frame columns."""
 
-from typing import List, Union
+from typing import List, Tuple, Union
 
 import pandas as pd
 
 from openclean.data.schema import as_list, select_clause
-from openclean.data.stream.base import DataRow
+from openclean.data.stream.base import DataRow, RowBatch, RowIndex
 from openclean.data.types import Columns, DatasetSchema
 from openclean.operator.base import DataFrameTransformer
 from openclean.operator.stream.consumer import StreamFunctionHandler
-from openclean.operator.stream.processor import StreamProcessor
+from openclean.operator.stream.fusion import FusableProcessor, Projection, RowStep
 
 
 # -- Functions ----------------------------------------------------------------
@@ -69,7 +69,7 @@ def move_rows(df: pd.DataFrame, rowids: Union[int, List[int]], pos: int):
 
 # -- Operators ----------------------------------------------------------------
 
-class MoveCols(StreamProcessor, DataFrameTransformer):
+class MoveCols(FusableProcessor, DataFrameTransformer):
     """Operator to move one or more columns to a specified index position."""
     def __init__(self, columns: Columns, pos: int):
         """Initialize the list of columns that are being moved and their new
@@ -106,7 +106,27 @@ class MoveCols(StreamProcessor, DataFrameTransformer):
             """Reorder columns in a given data stream row."""
             return [row[i] for i in colorder]
 
-        return StreamFunctionHandler(columns=colnames, func=streamfunc)
+        def batchfunc(rowids: List[RowIndex], rows: List[DataRow]) -> RowBatch:
+            """Reorder columns in all rows of a batch."""
+            return rowids, [[row[i] for i in colorder] for row in rows]
+
+        return StreamFunctionHandler(columns=colnames, func=streamfunc, batchfunc=batchfunc)
+
+    def fuse(self, schema: DatasetSchema) -> Tuple[DatasetSchema, List[RowStep]]:
+        """Get the output schema and the row steps of the operator for rows in
+        the given input schema.
+
+        Parameters
+        ----------
+        schema: list of string
+            List of column names in the data stream schema.
+
+        Returns
+        -------
+        tuple of list of string and list of openclean.operator.stream.fusion.RowStep
+        """
+        colorder = self.reorder(schema)
+        return [schema[i] for i in colorder], [Projection(colorder)]
 
     def reorder(self, schema: DatasetSchema) -> List[int]:
         """Get a the order of columns in the modified data schema. The new
@@ -9,12 +9,14 @@
 openclean.
 """
 
+from typing import List, Tuple
+
 from openclean.data.types import Column, Columns, DatasetSchema
 from openclean.data.schema import as_list
 from openclean.operator.base import DataFrameTransformer
-from openclean.util.core import scalar_pass_through
+from openclean.util.core import scalar_pass_through, tenary_pass_through
 from openclean.operator.stream.consumer import StreamFunctionHandler
-from openclean.operator.stream.processor import StreamProcessor
+from openclean.operator.stream.fusion import FusableProcessor, RowStep
 
 
 # -- Functions ----------------------------------------------------------------
@@ -47,7 +49,7 @@ def rename(df, columns, names):
 
 # -- Operators ----------------------------------------------------------------
 
-class Rename(StreamProcessor, DataFrameTransformer):
+class Rename(FusableProcessor, DataFrameTransformer):
     """Data frame transformer that renames a selected list of columns in a data
     frame. The output is a data frame that contains all rows and columns from
     an input data frame but with thoses columns that are listed in the given
@@ -94,7 +96,27 @@ class Rename(StreamProcessor, DataFrameTransformer):
         """
         # Get schema with renamed columns.
         columns = self.rename(schema)
-        return StreamFunctionHandler(columns=columns, func=scalar_pass_through)
+        return StreamFunctionHandler(
+            columns=columns,
+            func=scalar_pass_through,
+            batchfunc=tenary_pass_through
+        )
+
+    def fuse(self, schema: DatasetSchema) -> Tuple[DatasetSchema, List[RowStep]]:
+        """Get the output schema and the row steps of the operator for rows in
+        the given input schema.
+
+        Parameters
+        ----------
+        schema: list of string
+            List of column names in the data stream schema.
+
+        Returns
+        -------
+        tuple of list of string and list of openclean.operator.stream.fusion.RowStep
+        """
+        # Renaming columns does not modify any of the rows.
+        return self.rename(schema), []
 
     def rename(self, schema: DatasetSchema) -> DatasetSchema:
         """Create a modified dataset schema with renamed columns.
@@ -9,16 +9,16 @@
 openclean.
 """
 
-from typing import Optional
+from typing import List, Optional, Tuple
 
 import pandas as pd
 
-from openclean.data.stream.base import DataRow
+from openclean.data.stream.base import DataRow, RowBatch, RowIndex
 from openclean.data.types import Column, DatasetSchema
 from openclean.data.schema import as_list, select_clause
 from openclean.operator.base import Columns, DataFrameTransformer, Names
 from openclean.operator.stream.consumer import StreamFunctionHandler
-from openclean.operator.stream.processor import StreamProcessor
+from openclean.operator.stream.fusion import FusableProcessor, Projection, RowStep
 
 
 # -- Functions ----------------------------------------------------------------
@@ -54,7 +54,7 @@ def select(
 
 # -- Operators ----------------------------------------------------------------
 
-class Select(StreamProcessor, DataFrameTransformer):
+class Select(FusableProcessor, DataFrameTransformer):
     """Data frame transformer that selects a list of columns from a data frame.
     The output is a data frame that contains all rows from an input data frame
     but only those columns that are included in a given select clause.
@@ -100,6 +100,47 @@ class Select(StreamProcessor, DataFrameTransformer):
         -------
         openclean.operator.stream.consumer.StreamFunctionHandler
         """
+        columns, colidxs = self.select(schema)
+
+        def streamfunc(row: DataRow) -> DataRow:
+            """Include only columns in the select clause."""
+            return [row[i] for i in colidxs]
+
+        def batchfunc(rowids: List[RowIndex], rows: List[DataRow]) -> RowBatch:
+            """Include only columns in the select clause for all rows."""
+            return rowids, [[row[i] for i in colidxs] for row in rows]
+
+        return StreamFunctionHandler(columns=columns, func=streamfunc, batchfunc=batchfunc)
+
+    def fuse(self, schema: DatasetSchema) -> Tuple[DatasetSchema, List[RowStep]]:
+        """Get the output schema and the row steps of the operator for rows in
+        the given input schema.
+
+        Parameters
+        ----------
+        schema: list of string
+            List of column names in the data stream schema.
+
+        Returns
+        -------
+        tuple of list of string and list of openclean.operator.stream.fusion.RowStep
+        """
+        columns, colidxs = self.select(schema)
+        return columns, [Projection(colidxs)]
+
+    def select(self, schema: DatasetSchema) -> Tuple[DatasetSchema, List[int]]:
+        """Get the schema for the selected columns and their index positions
+        in the given input schema.
+
+        Parameters
+        ----------
+        schema: list of string
+            Dataset input schema.
+
+        Returns
+        -------
+        tuple of list of string and list of int
+        """
         # Get the names and index positions for the selected columns.
         colnames, colidxs = select_clause(schema=schema, columns=self.columns)
         # Adjust column indices.
@@ -108,12 +149,7 @@ class Select(StreamProcessor, DataFrameTransformer):
             col = colnames[colidx]
             colid = col.colid if isinstance(col, Column) else colidx
             columns.append(Column(colid=colid, name=col, colidx=colidx))
-
-        def streamfunc(row: DataRow) -> DataRow:
-            """Include only columns in the select clause."""
-            return [row[i] for i in colidxs]
-
-        return StreamFunctionHandler(columns=columns, func=streamfunc)
+        return columns, colidxs
 
     def transform(self, df: pd.DataFrame) -> pd.DataFrame:
         """Return a data frame that contains all rows but only those columns
@@ -8,7 +8,11 @@
 """Data frame transformation operator for sorting by data frame columns."""
 
 from openclean.data.schema import as_list, select_clause
+from openclean.data.types import DatasetSchema
 from openclean.operator.base import DataFrameTransformer
+from openclean.operator.stream.consumer import StreamConsumer
+from openclean.operator.stream.external import ExternalSort, MAX_ROWS
+from openclean.operator.stream.processor import StreamProcessor
 
 
 # -- Functions ----------------------------------------------------------------
@@ -41,11 +45,14 @@ def order_by(df, columns, reversed=None):
 
 # -- Operators ----------------------------------------------------------------
 
-class Sort(DataFrameTransformer):
+class Sort(StreamProcessor, DataFrameTransformer):
     """Sort operator for data frames. Allows to sort a data frame by one or
     more columns. For each column, the sort order can be specified separately.
+
+    In a data stream, rows are sorted using an external merge sort that
+    buffers at most the given number of rows in main memory.
     """
-    def __init__(self, columns, reversed=None):
+    def __init__(self, columns, reversed=None, max_rows=MAX_ROWS, tmpdir=None):
         """Initialize the list of sort columns and their respective sort order.
         Raises a ValueError if the two lists are incompatible.
 
@@ -57,6 +64,11 @@ class Sort(DataFrameTransformer):
             Allows to specify for each sort column if sort order is reversed.
             If given, the length of this list has to match the length of the
             columns list.
+        max_rows: int, default=1000000
+            Maximum number of rows that are buffered in main memory when
+            sorting a data stream.
+        tmpdir: string, default=None
+            Parent directory for temporary files when sorting a data stream.
         """
         self.columns = as_list(columns)
         # Ensure that th reversed list matches the number of elements in the
@@ -69,6 +81,30 @@ class Sort(DataFrameTransformer):
             self.reversed = reversed
         else:
             self.reversed = [False] * len(self.columns)
+        self.max_rows = max_rows
+        self.tmpdir = tmpdir
+
+    def open(self, schema: DatasetSchema) -> StreamConsumer:
+        """Factory pattern for stream consumer. Returns an instance of the
+        external sort consumer for the sort columns.
+
+        Parameters
+        ----------
+        schema: list of string
+            List of column names in the data stream schema.
+
+        Returns
+        -------
+        openclean.operator.stream.external.ExternalSort
+        """
+        _, colidx = select_clause(schema, columns=self.columns)
+        return ExternalSort(
+            columns=schema,
+            colidx=colidx,
+            reversed=self.reversed,
+            max_rows=self.max_rows,
+            tmpdir=self.tmpdir
+        )
 
     def transform(self, df):
         """Return a data frame that contains all rows but only those columns
@@ -9,19 +9,20 @@
 frame.
 """
 
-from typing import Callable, Dict, Union
+from typing import Callable, Dict, List, Optional, Tuple, Union
 
 import pandas as pd
 
-from openclean.data.stream.base import DataRow
+from openclean.data.stream.base import DataRow, RowBatch, RowIndex
 from openclean.data.schema import select_clause
 from openclean.data.types import ColumnRef, Columns, Scalar, DatasetSchema
 from openclean.function.eval.base import Const, EvalFunction, Eval
+from openclean.function.eval.compiler import compile_function
 from openclean.function.eval.domain import Lookup
 from openclean.function.value.base import ValueFunction
 from openclean.operator.base import DataFrameTransformer
 from openclean.operator.stream.consumer import StreamFunctionHandler
-from openclean.operator.stream.processor import StreamProcessor
+from openclean.operator.stream.fusion import ColumnUpdate, FusableProcessor, RowStep
 
 """Type alias for update function specifications."""
 UpdateFunction = Union[Callable, Dict, EvalFunction, Scalar, ValueFunction]
@@ -29,7 +30,9 @@ UpdateFunction = Union[Callable, Dict, EvalFunction, Scalar, ValueFunction]
 
 # -- Functions ----------------------------------------------------------------
 
-def update(df: pd.DataFrame, columns: Columns, func: UpdateFunction) -> pd.DataFrame:
+def update(
+    df: pd.DataFrame, columns: Columns, func: UpdateFunction, threads: Optional[int] = None
+) -> pd.DataFrame:
     """Update function for data frames. Returns a modified data frame where
     values in the specified columns have been modified using the given update
     function.
@@ -53,12 +56,16 @@ def update(df: pd.DataFrame, columns: Columns, func: UpdateFunction) -> pd.DataF
             or openclean.function.eval.base.EvalFunction
         Specification of the (resulting) evaluation function that is used to
         generate the updated values for each row in the data frame.
+    threads: int, default=None
+        Number of parallel threads to use for evaluating the update function on
+        chunks of the data frame. If None the value from the environment
+        variable 'OPENCLEAN_THREADS' is used as the default.
 
     Returns
     -------
     pd.DataFrame
     """
-    return Update(columns=columns, func=func).transform(df)
+    return Update(columns=columns, func=func, threads=threads).transform(df)
 
 
 def swap(df: pd.DataFrame, col1: ColumnRef, col2: ColumnRef) -> pd.DataFrame:
@@ -100,13 +107,13 @@ def swap(df: pd.DataFrame, col1: ColumnRef, col2: ColumnRef) -> pd.DataFrame:
 
 # -- Operators ----------------------------------------------------------------
 
-class Update(StreamProcessor, DataFrameTransformer):
+class Update(FusableProcessor, DataFrameTransformer):
     """Data frame transformer that updates values in data frame column(s) using
     a given update function. The function is executed for each row and the
     resulting values replace the original cell values in the row for all listed
     columns (in their order of appearance in the columns list).
     """
-    def __init__(self, columns: Columns, func: UpdateFunction):
+    def __init__(self, columns: Columns, func: UpdateFunction, threads: Optional[int] = None):
         """Initialize the list of updated columns and the update function.
 
         Parameters
@@ -117,6 +124,10 @@ class Update(StreamProcessor, DataFrameTransformer):
             or openclean.function.eval.base.EvalFunction
             Specification of the (resulting) evaluation function that is used to
             generate the updated values for each row in the data frame.
+        threads: int, default=None
+            Number of parallel threads to use for evaluating the update function on
+            chunks of a data frame. If None the value from the environment
+            variable 'OPENCLEAN_THREADS' is used as the default.
 
         Raises
         ------
@@ -125,6 +136,7 @@ class Update(StreamProcessor, DataFrameTransformer):
         # Ensure that columns is a list
         self.columns = columns
         self.func = get_update_function(func=func, columns=self.columns)
+        self.threads = threads
 
     def open(self, schema: DatasetSchema) -> StreamFunctionHandler:
         """Factory pattern for stream consumer. Returns an instance of a
@@ -142,7 +154,7 @@ class Update(StreamProcessor, DataFrameTransformer):
         # Get the index positions for the updated column(s).
         _, colidxs = select_clause(schema=schema, columns=self.columns)
         # Get the stream function that updates the values in data stream rows.
-        func = self.func.prepare(columns=schema)
+        func = compile_function(self.func.prepare(columns=schema))
 
         def updfunc(row: DataRow) -> DataRow:
             """Update columns in a data stream row using func."""
@@ -158,7 +170,51 @@ class Update(StreamProcessor, DataFrameTransformer):
                     values[col] = val[i]
             return values
 
-        return StreamFunctionHandler(columns=schema, func=updfunc)
+        if len(colidxs) == 1:
+            colidx = colidxs[0]
+
+            def batchfunc(rowids: List[RowIndex], rows: List[DataRow]) -> RowBatch:
+                """Update a single column in all rows of a batch."""
+                result = list()
+                for row in rows:
+                    values = list(row)
+                    values[colidx] = func(row)
+                    result.append(values)
+                return rowids, result
+
+        else:
+
+            def batchfunc(rowids: List[RowIndex], rows: List[DataRow]) -> RowBatch:
+                """Update multiple columns in all rows of a batch."""
+                return rowids, [updfunc(row) for row in rows]
+
+        return StreamFunctionHandler(columns=schema, func=updfunc, batchfunc=batchfunc)
+
+    def eval_functions(self) -> List[EvalFunction]:
+        """Get the update function.
+
+        Returns
+        -------
+        list of openclean.function.eval.base.EvalFunction
+        """
+        return [self.func]
+
+    def fuse(self, schema: DatasetSchema) -> Tuple[DatasetSchema, List[RowStep]]:
+        """Get the output schema and the row steps of the operator for rows in
+        the given input schema.
+
+        Parameters
+        ----------
+        schema: list of string
+            List of column names in the data stream schema.
+
+        Returns
+        -------
+        tuple of list of string and list of openclean.operator.stream.fusion.RowStep
+        """
+        _, colidxs = select_clause(schema=schema, columns=self.columns)
+        func = compile_function(self.func.prepare(columns=schema))
+        return schema, [ColumnUpdate(colidxs=colidxs, func=func)]
 
     def transform(self, df: pd.DataFrame) -> pd.DataFrame:
         """Modify rows in the given data frame. Returns a modified data frame
@@ -178,7 +234,15 @@ class Update(StreamProcessor, DataFrameTransformer):
         _, colidxs = select_clause(schema=df.columns, columns=self.columns)
         # Evaluate the update function to get the modified values for the
         # updated columns.
-        updates = self.func.eval(df)
+        updates = self.func.vectorize(df) if len(colidxs) == 1 else None
+        if updates is None:
+            updates = self.func.apply(df, threads=self.threads)
+        data = df.to_numpy(dtype=object, copy=True)
+        # Vectorized evaluation functions return a data series of values for
+        # a single updated column.
+        if isinstance(updates, pd.Series) and len(colidxs) == 1:
+            data[:, colidxs[0]] = updates.to_numpy(dtype=object)
+            return pd.DataFrame(data=data, index=df.index, columns=df.columns, dtype=object)
         # Create a modified data frame where rows are modified by the update
         # function.
         if all(isinstance(item, tuple) for item in updates):
@@ -192,8 +256,6 @@ class Update(StreamProcessor, DataFrameTransformer):
         # if single column updates, convert the updates list to a list of lists (vector) for numpy
         else:
             updates = list(map(list, zip(updates)))
-
-        data = df.to_numpy(copy=True)
         data[:, colidxs] = updates
         return pd.DataFrame(data=data, index=df.index, columns=df.columns, dtype=object)
 
@@ -9,23 +9,43 @@
 
 from __future__ import annotations
 from collections import Counter
-from typing import Callable, Dict, List, Optional, Tuple, Type, Union
+from copy import deepcopy
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple, Type, Union
 
+import dill
+import itertools
+import multiprocessing as mp
+import os
 import pandas as pd
 
 from openclean.data.mapping import Mapping
 from openclean.data.schema import as_list, select_clause
 from openclean.data.stream.base import DataRow, Datasource, DefaultDocument, DocumentIterator, RowIndex, to_document
-from openclean.data.stream.csv import CSVFile
-from openclean.data.stream.df import DataFrameStream
-from openclean.data.types import Columns, Scalar, DatasetSchema, Value
+from openclean.data.stream.binary import BinaryFile, is_binary
+from openclean.data.stream.csv import CSVFile, partition
+from openclean.data.stream.df import DataFrameStream, rowindex_readorder
+from openclean.data.stream.prefetch import Prefetch
+from openclean.data.types import ColumnRef, Columns, Scalar, DatasetSchema, Value
 from openclean.cluster.base import Cluster, Clusterer
 from openclean.function.eval.base import EvalFunction
 from openclean.function.matching.base import StringMatcher
-from openclean.operator.stream.collector import DataFrame, Distinct, RowCount, Write
+from openclean.function.value.base import ValueFunction
+from openclean.operator.base import DataFrameTransformer
+from openclean.operator.stream.aggregate import AggSpec, GroupAggregate
+from openclean.operator.stream.cache import ResultCache
+from openclean.operator.stream.collector import DataFrame, Distinct, RowCount, Tee, Write, WriteBinary
 from openclean.operator.stream.consumer import StreamConsumer
+from openclean.operator.stream.dedup import Dedup
+from openclean.operator.stream.external import ExternalDistinct, MAX_ENTRIES, MAX_ROWS
+from openclean.operator.stream.frame import CHUNKSIZE, FrameProcessor
+from openclean.operator.stream.fusion import fuse_operators
+from openclean.operator.stream.instrument import PipelineStats
+from openclean.operator.stream.join import HashJoin, JoinSource
+from openclean.operator.stream.pushdown import pushdown
+from openclean.operator.stream.sketch import ApproxDistinct, BLOOM_CAPACITY, PRECISION, TopValues
 from openclean.operator.stream.matching import BestMatches
-from openclean.operator.stream.processor import StreamProcessor
+from openclean.operator.stream.prepare import PrepareFunctions
+from openclean.operator.stream.processor import MergeableProcessor, StreamProcessor
 from openclean.operator.stream.sample import Sample
 from openclean.operator.transform.filter import Filter
 from openclean.operator.transform.insert import InsCol
@@ -33,12 +53,43 @@ from openclean.operator.transform.limit import Limit
 from openclean.operator.transform.move import MoveCols
 from openclean.operator.transform.rename import Rename
 from openclean.operator.transform.select import Select
+from openclean.operator.transform.sort import Sort
 from openclean.operator.transform.update import Update, UpdateFunction
 from openclean.profiling.dataset import ColumnProfiler, ProfileOperator
 from openclean.profiling.datatype.convert import DatatypeConverter
 from openclean.profiling.datatype.operator import Typecast
 
 
+"""Default number of rows that are passed between the consumers of a pipeline
+as a single batch.
+"""
+BATCHSIZE = 1000
+
+"""Terminal operators whose results are cached by pipelines with a result
+cache.
+"""
+CACHEABLE = (ApproxDistinct, BestMatches, Clusterer, Distinct, ProfileOperator, RowCount, TopValues)
+
+"""Default number of rows that are processed between two checkpoints of a
+pipeline run.
+"""
+CHECKPOINT_INTERVAL = 100000
+
+"""Execution engines for data pipelines. The pandas engine runs leading
+operators of the pipeline as data frame transformations over the full data
+source. The stream engine processes the data source row by row.
+"""
+ENGINE_PANDAS = 'pandas'
+ENGINE_STREAM = 'stream'
+ENGINES = [ENGINE_PANDAS, ENGINE_STREAM]
+
+"""Operators that are executed as data frame transformations by the pandas
+engine. The data frame transformations produce the same rows as the stream
+consumers of the operators.
+"""
+VECTORIZED = (Filter, InsCol, Limit, MoveCols, Rename, Select, Update)
+
+
 class DataPipeline(DefaultDocument):
     """The data pipeline allows to iterate over the rows that are the result of
     streaming an input data set through a pipeline of stream operators.
@@ -47,10 +98,16 @@ class DataPipeline(DefaultDocument):
     """
     def __init__(
         self, source: Datasource, columns: Optional[DatasetSchema] = None,
-        pipeline: Optional[StreamProcessor] = None
+        pipeline: Optional[StreamProcessor] = None, cache: Optional[ResultCache] = None,
+        engine: Optional[str] = None
     ):
         """Initialize the data stream reader, schema information for the
-        streamed rows, and the optional pipeline operators.
+        streamed rows, the optional pipeline operators, the optional cache
+        for results of terminal operators, and the execution engine.
+
+        By default, pipelines over pandas data frames are executed using the
+        pandas engine and all other pipelines are executed using the stream
+        engine.
 
         Parameters
         ----------
@@ -61,8 +118,17 @@ class DataPipeline(DefaultDocument):
         pipeline: list of openclean.data.stream.processor.StreamProcessor,
                 default=None
             List of operators in the pipeline fpr this stream processor.
-
+        cache: openclean.operator.stream.cache.ResultCache, default=None
+            Cache for the results of terminal operators.
+        engine: string, default=None
+            Execution engine for pipeline runs ('pandas' or 'stream').
+
+        Raises
+        ------
+        ValueError
         """
+        if engine is not None and engine not in ENGINES:
+            raise ValueError('unknown engine {}'.format(engine))
         # Ensure that the source document is an instance of the class
         # histore.document.base.Document.
         self.source = to_document(source)
@@ -70,6 +136,8 @@ class DataPipeline(DefaultDocument):
             columns=columns if columns is not None else source.columns
         )
         self.pipeline = pipeline if pipeline is not None else list()
+        self.cache = cache
+        self.engine = engine
 
     def __enter__(self):
         """Enter method for the context manager."""
@@ -102,9 +170,33 @@ class DataPipeline(DefaultDocument):
         return DataPipeline(
             source=self.source,
             columns=columns if columns is not None else self.columns,
-            pipeline=self.pipeline + [op]
+            pipeline=self.pipeline + [op],
+            cache=self.cache,
+            engine=self.engine
         )
 
+    def approx_distinct_count(
+        self, columns: Optional[Columns] = None, precision: Optional[int] = PRECISION
+    ) -> int:
+        """Estimate the number of distinct values (or value combinations) in
+        the data stream using a HyperLogLog sketch. In contrast to
+        :meth:`distinct`, the memory that is required does not depend on the
+        number of distinct values.
+
+        Parameters
+        ----------
+        columns: int, str, or list of int or string, default=None
+            References to the column(s) for which distinct values are counted.
+        precision: int, default=14
+            Number of index bits for the sketch. The relative standard error
+            of the estimate is 1.04 / sqrt(2^precision).
+
+        Returns
+        -------
+        int
+        """
+        return self.stream(ApproxDistinct(columns=columns, precision=precision)).count()
+
     def close(self):
         """Close the associated document."""
         self.source.close()
@@ -152,20 +244,63 @@ class DataPipeline(DefaultDocument):
         # to the pipeline to remove rows from the stream.
         return self.append(Filter(predicate=predicate, negated=True))
 
-    def distinct(self, columns: Optional[Columns] = None) -> Counter:
+    def dedup(
+        self, columns: Optional[Columns] = None, key: Optional[Union[Callable, ValueFunction]] = None,
+        error: Optional[float] = None, capacity: Optional[int] = BLOOM_CAPACITY
+    ) -> DataPipeline:
+        """Remove duplicate rows from the data stream. Only the first row for
+        each distinct combination of values in the given columns is kept. If
+        a key function is given (e.g., a fingerprint key generator), rows are
+        duplicates if their values have the same keys.
+
+        Duplicates are detected exactly by default. If a false-positive rate
+        is given, keys are kept in a scalable Bloom filter instead. This
+        bounds the memory requirements but unique rows are dropped with a
+        probability that does not exceed the false-positive rate.
+
+        Parameters
+        ----------
+        columns: int, string, or list(int or string), default=None
+            Columns that are used to detect duplicates. By default, all
+            columns are used.
+        key: callable or openclean.function.value.base.ValueFunction, default=None
+            Function that is applied to each value in the key columns.
+        error: float, default=None
+            False-positive rate for approximate duplicate detection.
+        capacity: int, default=100000
+            Capacity of the first filter in the scalable Bloom filter.
+
+        Returns
+        -------
+        openclean.pipeline.DataPipeline
+        """
+        return self.append(Dedup(columns=columns, key=key, error=error, capacity=capacity))
+
+    def distinct(
+        self, columns: Optional[Columns] = None, max_entries: Optional[int] = None
+    ) -> Counter:
         """Get counts for all distinct values over all columns in the
         associated data stream. Allows the user to specify the list of columns
         for which they want to count values.
 
+        If a memory budget is given, the counts are spilled to temporary files
+        on disk whenever the number of distinct values in main memory exceeds
+        the budget.
+
         Parameters
         ----------
         columns: int, str, or list of int or string, default=None
             References to the column(s) for which unique values are counted.
+        max_entries: int, default=None
+            Maximum number of distinct values that are kept in main memory
+            while the data stream is processed.
 
         Returns
         -------
         collections.Counter
         """
+        if max_entries is not None:
+            return self.stream(ExternalDistinct(columns=columns, max_entries=max_entries))
         return self.stream(Distinct(columns=columns))
 
     def distinct_values(self, columns: Optional[Columns] = None) -> List[Value]:
@@ -210,6 +345,22 @@ class DataPipeline(DefaultDocument):
         # Append a limit operator to the returned dataset if a limit is given.
         return ds if limit is None else ds.limit(count=limit)
 
+    def groupby(self, keys: Columns) -> GroupedPipeline:
+        """Group the rows in the data stream by one or more key columns. The
+        returned object is used to compute aggregates for each group, e.g.,
+        ds.groupby('borough').agg({'city': ['nunique', 'majority']}).
+
+        Parameters
+        ----------
+        keys: int, string, or list of int or string
+            References to the group key column(s).
+
+        Returns
+        -------
+        openclean.pipeline.GroupedPipeline
+        """
+        return GroupedPipeline(pipeline=self, keys=keys)
+
     def head(self, count: Optional[int] = 10) -> pd.DataFrame:
         """Return the first n rows in the data stream as a pandas data frame.
         This is a short-cut for using a pipeline of .limit() and .to_df().
@@ -225,21 +376,111 @@ class DataPipeline(DefaultDocument):
         """
         return self.limit(count=count).to_df()
 
+    def iter_distinct(
+        self, columns: Optional[Columns] = None, max_entries: Optional[int] = MAX_ENTRIES
+    ) -> Iterator[Tuple[Value, int]]:
+        """Get an iterator over the (value, count)-pairs for all distinct
+        values in the data stream. The counts are spilled to temporary files
+        on disk whenever the number of distinct values in main memory exceeds
+        the given budget. The iterator aggregates the spilled counts one
+        partition at a time. The full result therefore never has to fit into
+        main memory.
+
+        Parameters
+        ----------
+        columns: int, str, or list of int or string, default=None
+            References to the column(s) for which unique values are counted.
+        max_entries: int, default=1000000
+            Maximum number of distinct values that are kept in main memory.
+
+        Returns
+        -------
+        iterator of tuple
+        """
+        return self.append(ExternalDistinct(columns=columns, max_entries=max_entries, iterate=True)).run()
+
+    def iter_frames(
+        self, chunksize: Optional[int] = CHUNKSIZE, batchsize: Optional[int] = BATCHSIZE
+    ) -> Iterator[pd.DataFrame]:
+        """Iterate over the rows in the data pipeline as a sequence of pandas
+        data frames. Each data frame contains at most the given number of rows.
+        Only the rows for the next data frame are held in main memory.
+
+        Parameters
+        ----------
+        chunksize: int, default=10000
+            Maximum number of rows in each data frame.
+        batchsize: int, default=1000
+            Number of rows that are passed to the pipeline at once.
+
+        Returns
+        -------
+        iterator of pd.DataFrame
+
+        Raises
+        ------
+        ValueError
+        """
+        if chunksize < 1:
+            raise ValueError('invalid chunk size {}'.format(chunksize))
+        batchsize = batchsize if batchsize is not None and batchsize > 0 else 1
+        # Append a data frame collector to the pipeline. The rows that were
+        # collected are removed from the collector whenever a chunk is full.
+        ds = self.prepare().optimize().append(DataFrame())
+        consumers = ds._open_consumers()
+        collector = consumers[-1]
+
+        def chunks(final: bool) -> Iterator[pd.DataFrame]:
+            while len(collector.data) >= chunksize or (final and collector.data):
+                df = pd.DataFrame(
+                    data=collector.data[:chunksize],
+                    index=collector.index[:chunksize],
+                    columns=collector.columns,
+                    dtype=collector.dtypes
+                )
+                collector.data = collector.data[chunksize:]
+                collector.index = collector.index[chunksize:]
+                yield df
+
+        with ds.source.open() as reader:
+            rowids, rows = list(), list()
+            try:
+                for _, rowid, row in reader:
+                    rowids.append(rowid)
+                    rows.append(row)
+                    if len(rows) == batchsize:
+                        consumers[0].consume_batch(rowids, rows)
+                        rowids, rows = list(), list()
+                        yield from chunks(final=False)
+                if rows:
+                    consumers[0].consume_batch(rowids, rows)
+            except StopIteration:
+                pass
+        # Closing the pipeline may pass additional rows to the collector (e.g.,
+        # for a random sample).
+        consumers[0].close()
+        yield from chunks(final=True)
+
     def iterrows(self):
         """Simulate the iterrows() function of a pandas DataFrame as it is used
         in openclean. Returns an iterator that yields pairs of row identifier
         and value list for each row in the streamed data frame.
         """
         if self.pipeline:
-            consumer = self._open_pipeline()
-            for rowid, row in self.source.iterrows():
+            ds = self.prepare().optimize()
+            consumer = ds._open_pipeline()
+            for rowid, row in ds.source.iterrows():
                 try:
                     row = consumer.consume(rowid, row)
                     if row is not None:
                         yield rowid, row
                 except StopIteration:
                     break
-            consumer.close()
+            # Blocking operators (e.g., sample or sort) return their rows when
+            # the consumer is closed.
+            rows = consumer.close()
+            if rows is not None:
+                yield from rows
         else:
             for rowid, row in self.source.iterrows():
                 yield rowid, row
@@ -272,6 +513,48 @@ class DataPipeline(DefaultDocument):
 
         return self.append(op=op, columns=columns)
 
+    def join(
+        self, other: JoinSource, on: Columns, how: Optional[str] = 'inner',
+        right_on: Optional[Columns] = None, columns: Optional[Columns] = None
+    ) -> DataPipeline:
+        """Join the rows in the data stream with the rows in a reference
+        table. The reference table (e.g., a data frame, a CSV file, another
+        data pipeline, or a dataset from the reference data repository) is
+        read once into a hash table that is probed for each row in the data
+        stream.
+
+        Inner and left joins add the values of the joined columns to each
+        row. They require unique key values in the reference table. Semi and
+        anti joins keep the rows with (or without) a matching key.
+
+        Parameters
+        ----------
+        other: pd.DataFrame, string, histore.document.base.Document, or
+                refdata.dataset.base.DatasetHandle
+            Reference table.
+        on: int, string, or list(int or string)
+            Key column(s) in the data stream.
+        how: string, default='inner'
+            Join type. One of 'inner', 'left', 'semi', or 'anti'.
+        right_on: int, string, or list(int or string), default=None
+            Key column(s) in the reference table. By default, the key columns
+            of the data stream are used.
+        columns: int, string, or list(int or string), default=None
+            Columns from the reference table that are added to the rows in
+            the data stream. By default, all columns that are not key columns
+            are added.
+
+        Returns
+        -------
+        openclean.pipeline.DataPipeline
+
+        Raises
+        ------
+        ValueError
+        """
+        op = HashJoin(other=other, on=on, how=how, right_on=right_on, columns=columns)
+        return self.append(op=op, columns=op.outschema(self.columns))
+
     def limit(self, count: int) -> DataPipeline:
         """Return a data stream for the data frame that will yield at most
         the first n rows passed to it from an associated producer.
@@ -336,48 +619,148 @@ class DataPipeline(DefaultDocument):
         sortcols = [self.columns[i] for i in colorder]
         return self.append(op=op, columns=sortcols)
 
-    def open(self) -> DataPipeline:
-        """Return reference to self when the pipeline is opened.
+    def open(self, stats: Optional[PipelineStats] = None) -> PipelineIterator:
+        """Get an iterator over the rows in the data pipeline.
+
+        If a statistics object is given, runtime statistics for all pipeline
+        operators are recorded in the object while iterating over the rows.
+
+        Parameters
+        ----------
+        stats: openclean.operator.stream.instrument.PipelineStats, default=None
+            Collector for runtime statistics of the pipeline operators.
 
         Returns
         -------
-        openclean.pipeline.DataPipeline
+        openclean.pipeline.PipelineIterator
         """
         # Create the consumer if the pipeline has at least one operator.
         consumer = None
+        ds = self
         if self.pipeline:
-            consumer = self._open_pipeline()
+            ds = self.prepare().optimize()
+            consumer = ds._open_pipeline(stats=stats)
         # Stream all rows to the pipeline consumer.
-        return PipelineIterator(stream=self.source.open(), consumer=consumer)
+        return PipelineIterator(stream=ds.source.open(), consumer=consumer)
 
-    def _open_pipeline(self) -> StreamConsumer:
+    def _open_pipeline(self, stats: Optional[PipelineStats] = None) -> StreamConsumer:
         """Create stream consumer for all pipeline operators.
 
         Connect the created operators to ensure that rows are passed through the
         pipeline. Returns a reference to the consumer for the first operator.
 
+        Parameters
+        ----------
+        stats: openclean.operator.stream.instrument.PipelineStats, default=None
+            Collector for runtime statistics of the pipeline operators.
+
         Returns
         -------
         openclean.operator.stream.consumer.StreamConsumer
         """
-        # Create a stream consumer for the first operator in the pipeline. This
-        # consumer is the one that will receive all dataset rows first.
-        pipeline = self.pipeline[0].open(schema=self.source.columns)
-        # Create consumer for downstream operators and connect the consumer
-        # with each other. This assumes that all operaotrs (except the last
-        # one) yield consumer that are also producer.
-        producer = pipeline
-        for op in self.pipeline[1:]:
-            consumer = op.open(producer.columns)
-            producer.set_consumer(consumer)
-            producer = consumer
-        return pipeline
-
-    def persist(self, filename: Optional[str] = None) -> DataPipeline:
+        return self._open_consumers(stats=stats)[0]
+
+    def _open_consumers(
+        self, states: Optional[List[Any]] = None, stats: Optional[PipelineStats] = None
+    ) -> List[StreamConsumer]:
+        """Create stream consumers for all operators in the pipeline plan and
+        connect them with each other. Returns the list of created consumers.
+
+        If a list of consumer states is given, the state of each consumer is
+        restored from the respective checkpoint state. If a statistics object
+        is given, each consumer is wrapped by a consumer that records runtime
+        statistics for the operator.
+
+        Parameters
+        ----------
+        states: list, default=None
+            Checkpoint states for the consumers of all operators in the plan.
+        stats: openclean.operator.stream.instrument.PipelineStats, default=None
+            Collector for runtime statistics of the pipeline operators.
+
+        Returns
+        -------
+        list of openclean.operator.stream.consumer.StreamConsumer
+        """
+        # Adjacent row-local operators are fused into a single operator.
+        plan = self.plan()
+        # Statistics are collected for the new run only.
+        if stats is not None:
+            stats.reset()
+        # Create consumer for all operators and connect the consumer with each
+        # other. This assumes that all operaotrs (except the last one) yield
+        # consumer that are also producer. The consumer for the first operator
+        # is the one that will receive all dataset rows first.
+        consumers = list()
+        for i, op in enumerate(plan):
+            schema = consumers[-1].columns if consumers else self.source.columns
+            if states is not None:
+                consumer = op.resume(schema=schema, state=states[i])
+            else:
+                consumer = op.open(schema=schema)
+            if stats is not None:
+                consumer = stats.instrument(op=op, consumer=consumer)
+            if consumers:
+                consumers[-1].set_consumer(consumer)
+            consumers.append(consumer)
+        return consumers
+
+    def optimize(self) -> DataPipeline:
+        """Get an equivalent data pipeline where leading projections and simple
+        filter predicates are pushed down into the data source. Pushdown is
+        only supported for CSV files. Rows in the data source of the returned
+        pipeline only contain the selected columns and rows that do not
+        satisfy the pushed-down predicates are never created.
+
+        Returns
+        -------
+        openclean.pipeline.DataPipeline
+        """
+        source, pipeline = pushdown(source=self.source, pipeline=self.pipeline)
+        if source is self.source:
+            return self
+        return DataPipeline(source=source, columns=self.columns, pipeline=pipeline, engine=self.engine)
+
+    def order_by(
+        self, columns: Columns, reversed: Optional[Union[bool, List[bool]]] = None,
+        max_rows: Optional[int] = MAX_ROWS
+    ) -> DataPipeline:
+        """Sort the rows in the data stream by one or more columns. Rows are
+        sorted using an external merge sort that buffers at most the given
+        number of rows in main memory. Sorted runs are written to temporary
+        files and merged when the end of the stream is reached. The sort is
+        stable.
+
+        Parameters
+        ----------
+        columns: int, string, or list(int or string)
+            Single column or list of column index positions or column names.
+        reversed: bool or list(bool), default=None
+            Allows to specify for each sort column if sort order is reversed.
+            If given, the length of this list has to match the length of the
+            columns list.
+        max_rows: int, default=1000000
+            Maximum number of rows that are buffered in main memory.
+
+        Returns
+        -------
+        openclean.pipeline.DataPipeline
+        """
+        return self.append(Sort(columns=columns, reversed=reversed, max_rows=max_rows))
+
+    def persist(
+        self, filename: Optional[str] = None, binary: Optional[bool] = False,
+        compressed: Optional[bool] = False
+    ) -> DataPipeline:
         """Persist the results of the current stream for future processing.
         The data can either be written to disk or persitet in a in-memory
         data frame (depending on whether a filename is specified).
 
+        Data on disk is either written as a CSV file or in a binary format (see
+        :mod:`openclean.data.stream.binary`). The binary format maintains the
+        row identifiers and the types of all values in the data stream and is
+        considerably faster to read.
+
         The persist operator is currently not lazzily evaluated.
 
         Parameters
@@ -385,12 +768,25 @@ class DataPipeline(DefaultDocument):
         filename: string, default=None
             Path to file on disk for storing the pipeline result. If None, the
             data is persistet in-memory as a pandas data frame.
+        binary: bool, default=False
+            Write the pipeline result in binary format.
+        compressed: bool, default=False
+            Compress the chunks of the binary file. Compression is only
+            supported for the binary format.
 
         Returns
         -------
         openclean.pipeline.DataPipeline
+
+        Raises
+        ------
+        ValueError
         """
-        if filename is not None:
+        if compressed and not binary:
+            raise ValueError('compression is only supported for binary files')
+        if filename is not None and binary:
+            self.stream(WriteBinary(filename=filename, compressed=compressed))
+        elif filename is not None:
             # Write current pipeline result to disk and return a stream to the
             # data file.
             self.write(filename)
@@ -401,6 +797,108 @@ class DataPipeline(DefaultDocument):
             filename = self.to_df()
         return stream(filename)
 
+    def plan(self) -> List[StreamProcessor]:
+        """Get the list of operators that are used to process the rows in the
+        data stream. Sequences of adjacent row-local operators (i.e., select,
+        rename, move, update, insert, and filter) are replaced by a single
+        :class:`openclean.operator.stream.fusion.FusedProcessor` that applies
+        one compiled row function to each row.
+
+        Returns
+        -------
+        list of openclean.operator.stream.processor.StreamProcessor
+        """
+        return fuse_operators(self.pipeline)
+
+    def prefetch(self, depth: Optional[int] = 4, batchsize: Optional[int] = 1000) -> DataPipeline:
+        """Get a copy of the pipeline where rows of the data source are read in
+        a background thread. The reader thread adds batches of rows to a
+        bounded queue. This allows to overlap reading (and decompressing) the
+        input file with processing rows in the pipeline operators.
+
+        Parameters
+        ----------
+        depth: int, default=4
+            Maximum number of row batches in the queue.
+        batchsize: int, default=1000
+            Number of rows in each batch.
+
+        Returns
+        -------
+        openclean.pipeline.DataPipeline
+        """
+        return DataPipeline(
+            source=Prefetch(source=self.source, depth=depth, batchsize=batchsize),
+            columns=self.columns,
+            pipeline=self.pipeline,
+            cache=self.cache,
+            engine=self.engine
+        )
+
+    def prepare(self, parallel: Optional[int] = None, batchsize: Optional[int] = BATCHSIZE) -> DataPipeline:
+        """Get an equivalent data pipeline where the consumers of all
+        evaluation functions are prepared. Returns the pipeline itself if none
+        of the consumers needs to be prepared.
+
+        Value functions that need to be prepared (e.g., min-max scaling or
+        aggregates like the column maximum) are prepared in a separate pass
+        over the data stream. The pass streams the rows through the operators
+        that precede the operator with the unprepared function and adds the
+        consumer inputs to the accumulator of the value function (see
+        :class:`openclean.operator.stream.prepare.PrepareFunctions`). Nested
+        unprepared functions require one pass for each level of nesting.
+
+        Operators with unprepared functions are copied. The operators of this
+        pipeline are not modified.
+
+        Parameters
+        ----------
+        parallel: int, default=None
+            Number of parallel worker processes for the preparation passes.
+        batchsize: int, default=1000
+            Number of rows that are passed to the pipeline consumer at once.
+
+        Returns
+        -------
+        openclean.pipeline.DataPipeline
+        """
+        pipeline = None
+        for pos, op in enumerate(self.pipeline):
+            if not any(func.unprepared() for func in op.eval_functions()):
+                continue
+            if pipeline is None:
+                pipeline = list(self.pipeline)
+            op = deepcopy(op)
+            pipeline[pos] = op
+            while True:
+                # Prepare all functions whose producers are prepared in a
+                # single pass. Functions that occur more than once in the
+                # operator are only prepared once.
+                ready = dict()
+                for func in op.eval_functions():
+                    for f in func.unprepared():
+                        if not any(p.unprepared() for p in f.producers):
+                            ready[id(f)] = f
+                if not ready:
+                    break
+                functions = list(ready.values())
+                accumulators = DataPipeline(
+                    source=self.source,
+                    pipeline=pipeline[:pos] + [PrepareFunctions(functions=functions)],
+                    engine=self.engine
+                ).run(parallel=parallel, batchsize=batchsize)
+                for f, acc in zip(functions, accumulators):
+                    f.prepare_accumulated(acc)
+        if pipeline is None:
+            return self
+        return DataPipeline(
+            source=self.source,
+            columns=self.columns,
+            pipeline=pipeline,
+            cache=self.cache,
+            engine=self.engine
+        )
+
     def profile(
         self, profilers: Optional[ColumnProfiler] = None,
         default_profiler: Optional[Type] = None
@@ -456,7 +954,11 @@ class DataPipeline(DefaultDocument):
         op = Rename(columns=columns, names=names)
         return self.append(op=op, columns=op.rename(self.columns))
 
-    def run(self):
+    def run(
+        self, parallel: Optional[int] = None, batchsize: Optional[int] = BATCHSIZE,
+        checkpoint: Optional[str] = None, interval: Optional[int] = CHECKPOINT_INTERVAL,
+        resume: Optional[bool] = False, stats: Optional[PipelineStats] = None
+    ):
         """Stream all rows from the associated data file to the data pipeline
         that is associated with this processor. If an optional operator is
         given, that operator will be appended to the current pipeline before
@@ -465,39 +967,353 @@ class DataPipeline(DefaultDocument):
         The returned value is the result that is returned when the consumer is
         generated for the pipeline is closed after processing the data stream.
 
+        If the number of parallel workers is greater than one, the data source
+        is split into partitions that are processed by independent consumers
+        in separate worker processes. The partition results are then combined
+        by the last operator in the pipeline. Parallel execution is only
+        supported for uncompressed CSV files and for pipelines where the last
+        operator is a :class:`openclean.operator.stream.processor.MergeableProcessor`.
+
+        Rows are read from the data source and passed on to the consumer in
+        batches of the given size. Consumers that do not implement batch
+        processing receive the rows in each batch one at a time.
+
+        If the path to a checkpoint file is given, the number of rows that
+        have been read from the data source and the state of all pipeline
+        consumers are written to the file after every `interval` rows. If the
+        resume flag is True and the checkpoint file exists, the run continues
+        after the rows that were processed when the last checkpoint was
+        written. The checkpoint file is removed after the run completed
+        successfully. Checkpoints are not supported for parallel runs.
+
+        If a statistics object is given, the number of rows, the time, and
+        (optionally) the peak memory allocation for each operator in the
+        pipeline plan are recorded in the object (see
+        :class:`openclean.operator.stream.instrument.PipelineStats`). Runtime
+        statistics are not supported for parallel runs.
+
+        Pipelines that use the pandas engine (the default for pipelines over
+        data frames) execute leading operators that have an equivalent data
+        frame transformation (e.g., filter, update, insert, and select) on
+        the full data frame. The remaining operators are applied to the rows
+        of the transformed data frame. Checkpoints, statistics, and parallel
+        runs always use the stream engine.
+
+        Value functions that need to be prepared over the full data stream
+        (e.g., normalizers or aggregates) are prepared before the run in
+        separate passes over the data stream (see :meth:`prepare`). These
+        passes are not recorded in checkpoints or statistics.
+
+        Parameters
+        ----------
+        parallel: int, default=None
+            Number of parallel worker processes.
+        batchsize: int, default=1000
+            Number of rows that are passed to the pipeline consumer at once.
+        checkpoint: string, default=None
+            Path to the checkpoint file for the run.
+        interval: int, default=100000
+            Number of rows that are processed between two checkpoints.
+        resume: bool, default=False
+            Resume the run from the checkpoint file (if it exists).
+        stats: openclean.operator.stream.instrument.PipelineStats, default=None
+            Collector for runtime statistics of the pipeline operators.
+
         Returns
         -------
         any
+
+        Raises
+        ------
+        ValueError
         """
         # We only need to iterate over the data stream if the pipeline has at
         # least one operator. Otherwise the instantiated pipeline does not have
         # any consumer that could generate a result.
         if not self.pipeline:
             return None
-        # Create a stream consumer for the first operator in the pipeline. This
+        if checkpoint is None and resume:
+            raise ValueError('cannot resume run without checkpoint file')
+        if parallel is not None and parallel > 1:
+            if checkpoint is not None or stats is not None:
+                raise ValueError('checkpoints and statistics not supported for parallel runs')
+        # Prepare the consumers of evaluation functions in separate passes
+        # over the data stream if necessary.
+        ds = self.prepare(parallel=parallel, batchsize=batchsize)
+        if ds is not self:
+            return ds.run(
+                parallel=parallel,
+                batchsize=batchsize,
+                checkpoint=checkpoint,
+                interval=interval,
+                resume=resume,
+                stats=stats
+            )
+        if parallel is not None and parallel > 1:
+            return self._run_parallel(workers=parallel, batchsize=batchsize)
+        if checkpoint is not None:
+            return self._run_checkpointed(
+                checkpoint=checkpoint,
+                interval=interval,
+                resume=resume,
+                batchsize=batchsize,
+                stats=stats
+            )
+        if stats is None and self._is_vectorized():
+            return self._run_frame(batchsize=batchsize)
+        # Push leading operators down into the data source and create a stream
+        # consumer for the first remaining operator in the pipeline. This
         # consumer is the one that will receive all dataset rows first.
-        consumer = self._open_pipeline()
+        ds = self.optimize()
+        consumer = ds._open_pipeline(stats=stats)
         # Stream all rows to the pipeline consumer. The returned result is the
         # result that is returned when the consumer is closed by the reader.
-        with self.source.open() as stream:
-            for _, rowid, row in stream:
-                try:
-                    consumer.consume(rowid=rowid, row=row)
-                except StopIteration:
-                    break
+        with ds.source.open() as stream:
+            consume_stream(stream=stream, consumer=consumer, batchsize=batchsize)
         return consumer.close()
 
-    def sample(self, n: int, random_state: Optional[int] = None) -> DataPipeline:
+    def _is_vectorized(self) -> bool:
+        """Test if the pipeline is run using the pandas engine. This is the
+        case if the engine is set to 'pandas' explicitly or if the data source
+        is a data frame and no engine was specified.
+
+        Returns
+        -------
+        bool
+        """
+        if self.engine is None:
+            return isinstance(self.source, DataFrameStream)
+        return self.engine == ENGINE_PANDAS
+
+    def _run_frame(self, batchsize: int) -> Any:
+        """Run the pipeline using the pandas engine. Leading operators that are
+        data frame transformers are applied to the data frame for the data
+        source. The remaining operators are run over the rows of the resulting
+        data frame using the stream engine.
+
+        Parameters
+        ----------
+        batchsize: int
+            Number of rows that are passed to the pipeline consumer at once.
+
+        Returns
+        -------
+        any
+        """
+        df = self.source.to_df()
+        # Rows in a data frame stream are read in the order of their index.
+        # Negative index values are treated as new rows by the stream. Data
+        # frames with such values are not vectorized.
+        if pd.api.types.is_integer_dtype(df.index) and (df.index < 0).any():
+            return self.with_engine(ENGINE_STREAM).run(batchsize=batchsize)
+        readorder = self.source.readorder if isinstance(self.source, DataFrameStream) else None
+        if readorder is not None:
+            df = df.iloc[readorder]
+        elif not df.index.is_monotonic_increasing:
+            df = df.iloc[rowindex_readorder(df)]
+        # Rows in the stream engine contain None for missing values. Columns
+        # with missing values are converted to objects where missing values
+        # are None, so that functions see the same values on both engines.
+        df = missing_as_none(df)
+        pos = 0
+        # Transformations are not applied to empty data frames to avoid that
+        # empty predicate results select columns instead of rows.
+        while pos < len(self.pipeline) and isinstance(self.pipeline[pos], VECTORIZED) and not df.empty:
+            op = self.pipeline[pos]
+            # Opening the operator validates its arguments and functions in
+            # the same way as the stream engine does.
+            op.open(schema=list(df.columns))
+            df = op.transform(df)
+            pos += 1
+        pipeline = self.pipeline[pos:]
+        is_frame = len(pipeline) == 1 and type(pipeline[0]) is DataFrame and pipeline[0].columns is None
+        if is_frame and not df.empty:
+            # Cell values in the data frame that is created by the stream
+            # collector are objects where missing values are None. Empty
+            # results are created by the stream collector.
+            df = df.astype(object)
+            return df.where(df.notna(), None)
+        elif len(pipeline) == 1 and type(pipeline[0]) is RowCount:
+            return len(df.index)
+        # Use the row order of the transformed data frame for the remaining
+        # operators.
+        source = DataFrameStream(df=df, readorder=list(range(len(df.index))))
+        ds = DataPipeline(source=source, pipeline=pipeline, engine=ENGINE_STREAM)
+        return ds.run(batchsize=batchsize)
+
+    def run_many(
+        self, sinks: Dict[str, StreamProcessor], parallel: Optional[int] = None,
+        batchsize: Optional[int] = BATCHSIZE, checkpoint: Optional[str] = None,
+        interval: Optional[int] = CHECKPOINT_INTERVAL, resume: Optional[bool] = False,
+        stats: Optional[PipelineStats] = None
+    ) -> Dict[str, Any]:
+        """Stream all rows from the data source to multiple terminal operators
+        in a single pass. Returns a dictionary with the result of each of the
+        given operators.
+
+        Parameters
+        ----------
+        sinks: dict of openclean.operator.stream.processor.StreamProcessor
+            Terminal stream operators that receive the pipeline rows.
+        parallel: int, default=None
+            Number of parallel worker processes.
+        batchsize: int, default=1000
+            Number of rows that are passed to the pipeline consumer at once.
+        checkpoint: string, default=None
+            Path to the checkpoint file for the run.
+        interval: int, default=100000
+            Number of rows that are processed between two checkpoints.
+        resume: bool, default=False
+            Resume the run from the checkpoint file (if it exists).
+        stats: openclean.operator.stream.instrument.PipelineStats, default=None
+            Collector for runtime statistics of the pipeline operators.
+
+        Returns
+        -------
+        dict
+        """
+        return self.append(Tee(sinks=sinks)).run(
+            parallel=parallel,
+            batchsize=batchsize,
+            checkpoint=checkpoint,
+            interval=interval,
+            resume=resume,
+            stats=stats
+        )
+
+    def _run_checkpointed(
+        self, checkpoint: str, interval: int, resume: bool, batchsize: int,
+        stats: Optional[PipelineStats] = None
+    ) -> Any:
+        """Run the pipeline and write the state of the run to a checkpoint
+        file periodically.
+
+        The position in the data source is recorded as the number of rows that
+        have been read. When resuming a run, these rows are read and skipped.
+
+        Parameters
+        ----------
+        checkpoint: string
+            Path to the checkpoint file for the run.
+        interval: int
+            Number of rows that are processed between two checkpoints.
+        resume: bool
+            Resume the run from the checkpoint file (if it exists).
+        batchsize: int
+            Number of rows that are passed to the pipeline consumer at once.
+        stats: openclean.operator.stream.instrument.PipelineStats, default=None
+            Collector for runtime statistics of the pipeline operators.
+
+        Returns
+        -------
+        any
+
+        Raises
+        ------
+        NotImplementedError
+        ValueError
+        """
+        if interval < 1:
+            raise ValueError('invalid checkpoint interval {}'.format(interval))
+        ds = self.optimize()
+        offset, states = 0, None
+        if resume and os.path.isfile(checkpoint):
+            offset, states = load_checkpoint(checkpoint)
+        consumers = ds._open_consumers(states=states, stats=stats)
+        # Write the initial checkpoint. This raises an error before any rows
+        # are processed if one of the consumers does not support checkpoints.
+        save_checkpoint(checkpoint, rowcount=offset, consumers=consumers)
+        last = offset
+
+        def on_batch(rowcount: int):
+            """Write a checkpoint after every interval rows."""
+            nonlocal last
+            if offset + rowcount - last >= interval:
+                last = offset + rowcount
+                save_checkpoint(checkpoint, rowcount=last, consumers=consumers)
+
+        with ds.source.open() as stream:
+            consume_stream(
+                stream=itertools.islice(stream, offset, None),
+                consumer=consumers[0],
+                batchsize=batchsize,
+                callback=on_batch
+            )
+        result = consumers[0].close()
+        os.remove(checkpoint)
+        return result
+
+    def _run_parallel(self, workers: int, batchsize: int) -> Any:
+        """Run the pipeline in parallel over partitions of the data source.
+
+        Each partition is processed by an independently opened consumer in a
+        separate worker process. The pipeline operators are serialized using
+        dill to support evaluation functions that are defined as lambdas.
+
+        Parameters
+        ----------
+        workers: int
+            Number of parallel worker processes.
+        batchsize: int
+            Number of rows that are passed to the pipeline consumer at once.
+
+        Returns
+        -------
+        any
+
+        Raises
+        ------
+        ValueError
+        """
+        # Partitions are read by the worker processes directly.
+        source = self.source.source if isinstance(self.source, Prefetch) else self.source
+        if not isinstance(source, CSVFile):
+            raise ValueError('parallel execution requires a CSV file source')
+        # Operators that depend on the global order of rows cannot be applied
+        # independently to each partition.
+        for op in self.pipeline[:-1]:
+            if isinstance(op, (Dedup, Limit, Sample, Sort)):
+                raise ValueError('cannot run {} in parallel'.format(type(op).__name__))
+        op = self.pipeline[-1]
+        if not isinstance(op, MergeableProcessor) or not op.mergeable():
+            raise ValueError('cannot merge results for {}'.format(type(op).__name__))
+        partitions = partition(source, n=workers)
+        payload = dill.dumps(self.pipeline)
+        args = [(payload, i, p, batchsize) for i, p in enumerate(partitions)]
+        with mp.Pool(processes=min(workers, len(partitions))) as pool:
+            results = pool.map(run_partition, args)
+        # Compute the position of the first row in each partition from the
+        # number of rows that were read by the workers.
+        offsets, rowcount = list(), 0
+        for rows, _ in results:
+            offsets.append(rowcount)
+            rowcount += rows
+        return op.merge(results=[r for _, r in results], offsets=offsets)
+
+    def sample(
+        self, n: int, random_state: Optional[int] = None,
+        weights: Optional[ColumnRef] = None, stratify: Optional[ColumnRef] = None
+    ) -> DataPipeline:
         """Add operator for a random sample generator to the data stream.
 
+        If the sample is the last operator in the pipeline, the pipeline can
+        be run in parallel. The samples for the partitions of the data source
+        are then merged into a random sample for the full data stream.
+
         ----------
         n: int
             Size of the collected random sample.
         random_state: int, default=None
             Seed value for the random number generator (for reproducibility
             purposes).
+        weights: int or string, default=None
+            Column with the sampling weight for each row. Rows are selected
+            with a probability that is proportional to their weight.
+        stratify: int or string, default=None
+            Column whose values define the strata for stratified sampling. A
+            sample of size n is collected for each stratum.
         """
-        return self.append(Sample(n=n, random_state=random_state))
+        return self.append(Sample(n=n, random_state=random_state, weights=weights, stratify=stratify))
 
     def select(
         self, columns: Optional[Columns] = None, names: Optional[DatasetSchema] = None
@@ -535,7 +1351,7 @@ class DataPipeline(DefaultDocument):
             ds = ds.append(op=op, columns=names)
         return ds
 
-    def stream(self, op: StreamProcessor):
+    def stream(self, op: StreamProcessor, workers: Optional[int] = None):
         """Stream all rows from the associated data file to the data pipeline
         that is associated with this processor. The given operator is appended
         to the current pipeline before execution.
@@ -543,17 +1359,55 @@ class DataPipeline(DefaultDocument):
         The returned value is the result that is returned when the consumer is
         generated for the pipeline is closed after processing the data stream.
 
+        If the pipeline has a result cache, the results of operators that
+        compute distinct values, row counts, profiles, clusters, matches, or
+        sketches are cached. These results are returned from the cache if the
+        pipeline is run again on the unmodified data source.
+
         Parameters
         -----------
         op: openclean.operator.stream.processor.StreamProcessor
             Stream operator that is appended to the current pipeline
             for execution.
+        workers: int, default=None
+            Number of parallel worker processes (see :meth:`run`).
 
         Returns
         -------
         any
         """
-        return self.append(op).run()
+        if self.cache is None or not isinstance(op, CACHEABLE):
+            return self.append(op).run(parallel=workers)
+        # Results are not cached for pipelines with random samples that are
+        # not reproducible.
+        for p in self.pipeline:
+            if isinstance(p, Sample) and p.random_state is None:
+                return self.append(op).run(parallel=workers)
+        key = self.cache.key(source=self.source, operators=self.pipeline + [op])
+        if key is None:
+            return self.append(op).run(parallel=workers)
+        found, result = self.cache.get(key)
+        if not found:
+            result = self.append(op).run(parallel=workers)
+            self.cache.put(key, result)
+        return result
+
+    def tee(self, **sinks: StreamProcessor) -> Dict[str, Any]:
+        """Short-cut to run multiple terminal operators in a single pass over
+        the data stream. The operators are given as keyword arguments. The
+        result is a dictionary that contains the result of each operator under
+        the respective keyword, e.g., ds.tee(rows=RowCount(), cols=Distinct('A')).
+
+        Parameters
+        ----------
+        sinks: dict of openclean.operator.stream.processor.StreamProcessor
+            Terminal stream operators that receive the pipeline rows.
+
+        Returns
+        -------
+        dict
+        """
+        return self.run_many(sinks=sinks)
 
     def to_df(self) -> pd.DataFrame:
         """Collect all rows in the stream that are yielded by the associated
@@ -564,6 +1418,58 @@ class DataPipeline(DefaultDocument):
         """
         return self.stream(DataFrame())
 
+    def top_values(
+        self, columns: Optional[Columns] = None, k: Optional[int] = 10,
+        capacity: Optional[int] = None
+    ) -> List[Tuple[Value, int]]:
+        """Get the k most frequent values (or value combinations) in the data
+        stream together with their approximate counts. Values are counted
+        using a summary with a bounded number of counters. The returned counts
+        are lower bounds of the true frequencies.
+
+        Parameters
+        ----------
+        columns: int, str, or list of int or string, default=None
+            References to the column(s) for which values are counted.
+        k: int, default=10
+            Number of returned values.
+        capacity: int, default=None
+            Number of counters in the summary. By default, ten times the
+            number of returned values.
+
+        Returns
+        -------
+        list of tuple
+        """
+        return self.stream(TopValues(columns=columns, k=k, capacity=capacity)).most_common(k)
+
+    def transform(
+        self, op: DataFrameTransformer, chunksize: Optional[int] = CHUNKSIZE,
+        columns: Optional[DatasetSchema] = None
+    ) -> DataPipeline:
+        """Execute a row-local data frame transformer (e.g., an update, filter,
+        or column insert operator) on chunks of rows in the data stream. Rows
+        are converted into data frames of at most the given size that are
+        transformed by the operator.
+
+        Parameters
+        ----------
+        op: openclean.operator.base.DataFrameTransformer
+            Row-local data frame transformer.
+        chunksize: int, default=10000
+            Maximum number of rows in each transformed data frame.
+        columns: list of string, default=None
+            Schema of the data frames that are returned by the transformer.
+            Only needs to be given for transformers that modify the schema and
+            that are not stream processors.
+
+        Returns
+        -------
+        openclean.pipeline.DataPipeline
+        """
+        op = FrameProcessor(transformer=op, chunksize=chunksize, columns=columns)
+        return self.append(op=op, columns=op.outschema(self.columns))
+
     def typecast(
         self, converter: Optional[DatatypeConverter] = None
     ) -> DataPipeline:
@@ -627,6 +1533,56 @@ class DataPipeline(DefaultDocument):
         """
         return self.filter(predicate=predicate, limit=limit)
 
+    def with_cache(self, cache: Optional[ResultCache] = None) -> DataPipeline:
+        """Get a data pipeline that caches the results of terminal operators
+        (i.e., distinct, count, profile, cluster, and match). All pipelines
+        that are derived from the returned pipeline share the same cache.
+
+        Parameters
+        ----------
+        cache: openclean.operator.stream.cache.ResultCache, default=None
+            Result cache. By default, results are cached in main memory.
+
+        Returns
+        -------
+        openclean.pipeline.DataPipeline
+        """
+        return DataPipeline(
+            source=self.source,
+            columns=self.columns,
+            pipeline=self.pipeline,
+            cache=cache if cache is not None else ResultCache(),
+            engine=self.engine
+        )
+
+    def with_engine(self, engine: str) -> DataPipeline:
+        """Get a copy of the data pipeline that is run using the given engine.
+        The pandas engine loads the data source into a data frame (if it is
+        not a data frame already) and executes leading operators as data
+        frame transformations. The stream engine processes all rows one at a
+        time (or in batches).
+
+        Parameters
+        ----------
+        engine: string
+            Execution engine ('pandas' or 'stream').
+
+        Returns
+        -------
+        openclean.pipeline.DataPipeline
+
+        Raises
+        ------
+        ValueError
+        """
+        return DataPipeline(
+            source=self.source,
+            columns=self.columns,
+            pipeline=self.pipeline,
+            cache=self.cache,
+            engine=engine
+        )
+
     def write(
         self, filename: str, delim: Optional[str] = None,
         compressed: Optional[bool] = None, none_as: Optional[str] = None,
@@ -659,6 +1615,55 @@ class DataPipeline(DefaultDocument):
         return self.stream(Write(file=file))
 
 
+class GroupedPipeline(object):
+    """Data pipeline with a group key for computing aggregates over groups of
+    rows in a single pass over the data stream. Aggregates are computed
+    incrementally. The rows of each group are never materialized.
+    """
+    def __init__(self, pipeline: DataPipeline, keys: Columns):
+        """Initialize the data pipeline and the group key.
+
+        Parameters
+        ----------
+        pipeline: openclean.pipeline.DataPipeline
+            Data pipeline for the grouped rows.
+        keys: int, string, or list of int or string
+            References to the group key column(s).
+        """
+        self.pipeline = pipeline
+        self.keys = keys
+
+    def agg(
+        self, aggregates: AggSpec, max_groups: Optional[int] = MAX_ENTRIES,
+        workers: Optional[int] = None
+    ) -> pd.DataFrame:
+        """Compute aggregates for each group. Returns a data frame with one
+        row per group that is indexed by the group key.
+
+        The aggregates are given as a dictionary that maps column references
+        to one or more aggregate functions (count, sum, min, max, mean,
+        nunique, first, last, or majority). If more than one function is given
+        for a column, the name of each result column is the column name
+        followed by the function name.
+
+        Parameters
+        ----------
+        aggregates: dict
+            Mapping from column references to aggregate functions.
+        max_groups: int, default=1000000
+            Maximum number of groups that are kept in main memory. Groups are
+            spilled to temporary files on disk if the budget is exceeded.
+        workers: int, default=None
+            Number of parallel worker processes (see :meth:`DataPipeline.run`).
+
+        Returns
+        -------
+        pd.DataFrame
+        """
+        op = GroupAggregate(keys=self.keys, aggregates=aggregates, max_groups=max_groups)
+        return self.pipeline.stream(op, workers=workers)
+
+
 class PipelineIterator(DocumentIterator):
     """Iterator over rows in a data processing pipeline. Iterates over the rows
     in an input stream. Each row is processed by a stream consumer. If the
@@ -687,7 +1692,6 @@ class PipelineIterator(DocumentIterator):
         # Maintain reader for rows that may be returned by the consumer when
         # it is closed.
         self._rows = None
-        self._readindex = None
         # Counter for returned rows.
         self._rowcount = 0
 
@@ -712,13 +1716,10 @@ class PipelineIterator(DocumentIterator):
         """
         # If the row-buffer is not None return rows from the buffer.
         if self._rows is not None:
-            if self._readindex < len(self._rows):
-                pos = self._rowcount
-                self._rowcount += 1
-                rowidx, row = self._rows[self._readindex]
-                self._readindex += 1
-                return pos, rowidx, row
-            raise StopIteration()
+            rowidx, row = next(self._rows)
+            pos = self._rowcount
+            self._rowcount += 1
+            return pos, rowidx, row
         # Process rows in the input stream. Returns at the first row that is
         # processed by the consumer with a non-None result. The stream reader
         # will raise StopIteration when the end of the stream is reached. At
@@ -734,28 +1735,164 @@ class PipelineIterator(DocumentIterator):
             except StopIteration:
                 break
         # Close the consumer. If it returns a non-None result we assume that
-        # it is a list of rows (rowid, values) and continue to iterate over
-        # them.
+        # it is a list (or iterator) of rows (rowid, values) and continue to
+        # iterate over them.
         if self.consumer is not None:
-            self._rows = self.consumer.close()
-            if self._rows is not None:
-                pos = self._rowcount
-                self._rowcount += 1
-                self._readindex = 1
-                rowidx, row = self._rows[0]
-                return pos, rowidx, row
+            rows = self.consumer.close()
+            if rows is not None:
+                self._rows = iter(rows)
+                return self.next()
         raise StopIteration()
 
 
+# -- Parallel execution -------------------------------------------------------
+
+def run_partition(args: Tuple[bytes, int, Datasource, int]) -> Tuple[int, Any]:
+    """Process a single partition of a data source in a worker process.
+    Returns the number of rows that were read from the partition together with
+    the result of the pipeline consumer.
+
+    Parameters
+    ----------
+    args: tuple of bytes, int, openclean.data.stream.base.Datasource, and int
+        Serialized list of pipeline operators, index position of the partition,
+        the data source for the partition, and the batch size.
+
+    Returns
+    -------
+    tuple of int and any
+    """
+    payload, index, source, batchsize = args
+    pipeline = dill.loads(payload)
+    pipeline[-1] = pipeline[-1].for_partition(index)
+    consumer = DataPipeline(source=source, pipeline=pipeline)._open_pipeline()
+    with source.open() as stream:
+        rows = consume_stream(stream=stream, consumer=consumer, batchsize=batchsize)
+    return rows, consumer.close()
+
+
+# -- Helper functions ---------------------------------------------------------
+
+def consume_stream(
+    stream: DocumentIterator, consumer: StreamConsumer,
+    batchsize: Optional[int] = BATCHSIZE,
+    callback: Optional[Callable[[int], None]] = None
+) -> int:
+    """Pass all rows from a document iterator to a stream consumer in batches
+    of the given size. Stops reading rows when the consumer raises a
+    StopIteration error. Returns the number of rows that were read from the
+    stream.
+
+    Parameters
+    ----------
+    stream: openclean.data.stream.base.DocumentIterator
+        Iterator over the rows in the input document.
+    consumer: openclean.operator.stream.consumer.StreamConsumer
+        Consumer for rows in the data stream.
+    batchsize: int, default=1000
+        Number of rows that are passed to the consumer at once.
+    callback: callable, default=None
+        Function that is called with the number of rows that have been read
+        after each batch was consumed.
+
+    Returns
+    -------
+    int
+    """
+    batchsize = batchsize if batchsize is not None and batchsize > 0 else 1
+    rowcount = 0
+    rowids, rows = list(), list()
+    try:
+        for _, rowid, row in stream:
+            rowcount += 1
+            rowids.append(rowid)
+            rows.append(row)
+            if len(rows) == batchsize:
+                consumer.consume_batch(rowids, rows)
+                rowids, rows = list(), list()
+                if callback is not None:
+                    callback(rowcount)
+        if rows:
+            consumer.consume_batch(rowids, rows)
+    except StopIteration:
+        pass
+    return rowcount
+
+
+def load_checkpoint(filename: str) -> Tuple[int, List[Any]]:
+    """Read the number of processed rows and the consumer states from a
+    checkpoint file.
+
+    Parameters
+    ----------
+    filename: string
+        Path to the checkpoint file.
+
+    Returns
+    -------
+    tuple of int and list
+    """
+    with open(filename, 'rb') as f:
+        return dill.load(f)
+
+
+def missing_as_none(df: pd.DataFrame) -> pd.DataFrame:
+    """Convert all columns in a data frame that contain missing values (e.g.,
+    NaN) to object columns where missing values are None. Columns without
+    missing values are not modified.
+
+    Parameters
+    ----------
+    df: pd.DataFrame
+        Data frame for the data source of a pipeline.
+
+    Returns
+    -------
+    pd.DataFrame
+    """
+    missing = df.isna().any()
+    if not missing.any():
+        return df
+    columns = list()
+    for (_, values), has_missing in zip(df.items(), missing):
+        if has_missing:
+            values = values.astype(object).where(values.notna(), None)
+        columns.append(values)
+    return pd.concat(columns, axis=1)
+
+
+def save_checkpoint(filename: str, rowcount: int, consumers: List[StreamConsumer]):
+    """Write the number of processed rows and the states of the given stream
+    consumers to a checkpoint file. The file is replaced atomically to ensure
+    that a valid checkpoint remains if the run fails while writing the file.
+
+    Parameters
+    ----------
+    filename: string
+        Path to the checkpoint file.
+    rowcount: int
+        Number of rows that have been read from the data source.
+    consumers: list of openclean.operator.stream.consumer.StreamConsumer
+        Consumers for the operators in the pipeline plan.
+    """
+    states = [c.checkpoint() for c in consumers]
+    tmpfile = '{}.tmp'.format(filename)
+    with open(tmpfile, 'wb') as f:
+        dill.dump((rowcount, states), f)
+    os.replace(tmpfile, filename)
+
+
 # -- Open file or data frame as pipeline --------------------------------------
 
 def stream(
     filename: Union[str, pd.DataFrame], header: Optional[DatasetSchema] = None,
     delim: Optional[str] = None, compressed: Optional[bool] = None,
-    none_is: Optional[str] = None, encoding: Optional[str] = None
+    none_is: Optional[str] = None, encoding: Optional[str] = None,
+    engine: Optional[str] = None
 ) -> DataPipeline:
     """Read a CSV file as a data stream. This is a helper method that is
-    intended to read and filter large CSV files.
+    intended to read and filter large CSV files. Binary files that were
+    written by the persist operator are detected automatically.
 
     Parameters
     ----------
@@ -775,6 +1912,10 @@ def stream(
         by None.
     encoding: string, default=None
         The csv file encoding e.g. utf-8, utf16 etc
+    engine: string, default=None
+        Execution engine for pipeline runs ('pandas' or 'stream'). By default,
+        the pandas engine is used for data frames and the stream engine is
+        used for files.
 
     Returns
     -------
@@ -782,6 +1923,8 @@ def stream(
     """
     if isinstance(filename, pd.DataFrame):
         file = DataFrameStream(df=filename)
+    elif is_binary(filename):
+        file = BinaryFile(filename)
     else:
         file = CSVFile(
             filename=filename,
@@ -791,4 +1934,4 @@ def stream(
             none_is=none_is,
             encoding=encoding
         )
-    return DataPipeline(source=file)
+    return DataPipeline(source=file, engine=engine)
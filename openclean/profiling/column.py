@@ -13,6 +13,7 @@ profiler is able to collect additiona information (e.g., top-k values) that
 the stream profiler cannot collect.
 """
 
+from __future__ import annotations
 from collections import Counter, defaultdict
 from typing import Optional
 
@@ -100,6 +101,41 @@ class ColumnProfile(dict):
             datatypes['distinct'][type_label] += 1
         return value
 
+    def merge(self, other: ColumnProfile) -> ColumnProfile:
+        """Merge the statistics of a profile for a disjoint set of values from
+        the same column into this profile. Only statistics that are collected
+        by the stream profiler (i.e., value counts, datatypes and min/max
+        values) can be merged.
+
+        Raises a ValueError if either profile contains statistics over the
+        distinct values in the column.
+
+        Parameters
+        ----------
+        other: openclean.profiling.column.ColumnProfile
+            Profile for a disjoint set of values from the profiled column.
+
+        Returns
+        -------
+        openclean.profiling.column.ColumnProfile
+        """
+        if 'distinctValueCount' in self or 'distinctValueCount' in other:
+            raise ValueError('cannot merge distinct value statistics')
+        self['totalValueCount'] += other['totalValueCount']
+        self['emptyValueCount'] += other['emptyValueCount']
+        for key, counts in other['datatypes'].items():
+            self['datatypes'][key].update(counts)
+        minmax = self['minmaxValues']
+        for type_label, values in other['minmaxValues'].items():
+            if type_label not in minmax:
+                minmax[type_label] = MinMaxCollector(
+                    minmax=(values.minimum, values.maximum)
+                )
+            else:
+                minmax[type_label].consume(values.minimum)
+                minmax[type_label].consume(values.maximum)
+        return self
+
     def distinct(self, top_k: Optional[int] = None) -> Counter:
         """Get Counter object containing the list most frequent values and their
         counts that was generated by the profiler.
@@ -11,7 +11,7 @@ profiling results.
 
 from __future__ import annotations
 from abc import ABCMeta, abstractmethod
-from typing import Dict, List, Optional, Tuple, Type, Union
+from typing import Any, Dict, List, Optional, Tuple, Type, Union
 
 import pandas as pd
 
@@ -19,7 +19,7 @@ from openclean.data.schema import select_clause
 from openclean.data.stream.df import DataFrameStream
 from openclean.data.types import Columns, ColumnRef, DatasetSchema
 from openclean.operator.stream.consumer import StreamConsumer
-from openclean.operator.stream.processor import StreamProcessor
+from openclean.operator.stream.processor import MergeableProcessor
 from openclean.profiling.base import DataProfiler
 from openclean.profiling.column import (
     DefaultColumnProfiler, DefaultStreamProfiler
@@ -273,6 +273,16 @@ class ProfileConsumer(StreamConsumer):
         for _, _, profiler in self.profilers:
             profiler.open()
 
+    def checkpoint(self) -> List[Tuple[int, str, DataProfiler]]:
+        """Get the list of column profilers. The profilers maintain the
+        profiling results for the rows that have been consumed so far.
+
+        Returns
+        -------
+        list
+        """
+        return self.profilers
+
     def close(self) -> List[Dict]:
         """Return a list containing the results from each of the profilers.
 
@@ -298,8 +308,19 @@ class ProfileConsumer(StreamConsumer):
         for colidx, _, profiler in self.profilers:
             profiler.consume(value=row[colidx], count=1)
 
+    def restore(self, state: List[Tuple[int, str, DataProfiler]]):
+        """Replace the column profilers with the profilers from a checkpoint.
+
+        Parameters
+        ----------
+        state: list
+            List of column profilers that was returned by the checkpoint
+            method.
+        """
+        self.profilers = state
+
 
-class ProfileOperator(StreamProcessor):
+class ProfileOperator(MergeableProcessor):
     def __init__(
         self, profilers: Optional[ColumnProfiler] = None,
         default_profiler: Optional[Type] = None
@@ -326,6 +347,34 @@ class ProfileOperator(StreamProcessor):
             default_profiler = DefaultStreamProfiler
         self.default_profiler = default_profiler
 
+    def merge(self, results: List[DatasetProfile], offsets: List[int]) -> DatasetProfile:
+        """Merge the profiling results for all partitions of a data stream.
+        Results are merged column by column. Only results of stream profilers
+        that do not maintain the set of distinct values can be merged.
+
+        Parameters
+        ----------
+        results: list of openclean.profiling.dataset.DatasetProfile
+            Profiling results for each partition of the data stream.
+        offsets: list of int
+            Position of the first row of each partition in the data stream.
+
+        Returns
+        -------
+        openclean.profiling.dataset.DatasetProfile
+
+        Raises
+        ------
+        ValueError
+        """
+        profile = DatasetProfile()
+        for i, name in enumerate(results[0].columns):
+            stats = results[0][i]['stats']
+            for p in results[1:]:
+                stats = merge_stats(stats, p[i]['stats'])
+            profile.add(name=name, stats=stats)
+        return profile
+
     def open(self, schema: DatasetSchema) -> StreamConsumer:
         """Factory pattern for stream profiling consumers. Creates an instance
         of a stream profiler for each column that was selected for profiling.
@@ -368,6 +417,30 @@ class ProfileOperator(StreamProcessor):
         return ProfileConsumer(profilers=consumers)
 
 
+def merge_stats(stats: Any, other: Any) -> Any:
+    """Merge two profiling results for disjoint parts of a column. Raises a
+    ValueError if the profiler results do not support merging.
+
+    Parameters
+    ----------
+    stats: any
+        Profiling result for the first part of the column.
+    other: any
+        Profiling result for the second part of the column.
+
+    Returns
+    -------
+    any
+
+    Raises
+    ------
+    ValueError
+    """
+    if not hasattr(stats, 'merge'):
+        raise ValueError('cannot merge profiler results of type {}'.format(type(stats)))
+    return stats.merge(other)
+
+
 def dataset_profile(
     df: pd.DataFrame, profilers: Optional[ColumnProfiler] = None,
     default_profiler: Optional[Type] = None
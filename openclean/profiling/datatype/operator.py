@@ -7,7 +7,7 @@
 
 """Datatype conversion consumer and processor for data pipelines."""
 
-from typing import Optional
+from typing import Any, Optional
 
 from openclean.data.types import DatasetSchema
 from openclean.data.stream.base import DataRow
@@ -43,6 +43,15 @@ class Typecast(ProducingConsumer, StreamProcessor):
             converter = DefaultConverter()
         self.converter = converter
 
+    def checkpoint(self) -> Any:
+        """The type cast consumer has no state.
+
+        Returns
+        -------
+        any
+        """
+        return None
+
     def handle(self, rowid: int, row: DataRow) -> DataRow:
         """Convert all values in the given row to a datatype that is defined by
         the associated converter.
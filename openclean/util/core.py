@@ -9,8 +9,11 @@
 
 from typing import Optional
 
+import time
 import uuid
 
+from openclean.util.order import ORDER_SAMPLESIZE, PredicateOrder
+
 
 def always_false(*args):
     """Predicate that always evaluates to False.
@@ -30,8 +33,15 @@ def always_false(*args):
 class eval_all(object):
     """Logic operator that evaluates a list of predicates and returns True only
     if all predicates return a defined result value.
+
+    The evaluation stops at the first predicate that does not return the
+    defined result value. Predicates are evaluated in an order that is
+    determined from their cost and the fraction of values that they reject
+    for the first `samplesize` values (see
+    :class:`openclean.util.order.PredicateOrder`). The collected statistics
+    are available via the `ordering` attribute.
     """
-    def __init__(self, predicates, truth_value=True):
+    def __init__(self, predicates, truth_value=True, samplesize=ORDER_SAMPLESIZE):
         """Initialize the list of predicates and the expected result value.
 
         Parameters
@@ -41,25 +51,73 @@ class eval_all(object):
         truth_value: scalar, default=True
             Expected result value for predicate evaluation to be considered
             satisfied.
+        samplesize: int, default=1000
+            Number of values for which statistics are collected before the
+            predicates are reordered. If zero, the predicates are evaluated
+            in their given order.
         """
         self.predicates = predicates
         self.truth_value = truth_value
+        self.ordering = PredicateOrder(count=len(predicates), samplesize=samplesize)
 
     def __call__(self, value):
         """Evaluate all predicates on the given value. Returns True only if all
         predicates evaluate to the defined result value.
 
+        If one of the predicates raises an error when evaluated in the
+        adaptive order, the value is evaluated again with the predicates in
+        their original order. Predicates may therefore depend on previous
+        predicates (e.g., type checks) to not be evaluated for certain values.
+
+        Parameters
+        ----------
+        value: scalar
+            Scalar value that is compared against the constant compare value.
+
+        Returns
+        -------
+        bool
+        """
+        ordering = self.ordering
+        sampling = ordering.sampling
+        order = ordering.sample_positions() if sampling else ordering.positions
+        try:
+            result = self._evaluate(value, order, record=sampling)
+        except Exception:
+            result = self._evaluate(value, range(len(self.predicates)))
+        if sampling:
+            ordering.update()
+        return result
+
+    def _evaluate(self, value, order, record=False):
+        """Evaluate the predicates in the given order. Stops at the first
+        predicate that does not return the defined result value. Records the
+        statistics for the evaluated predicates if the record flag is True.
+
         Parameters
         ----------
         value: scalar
             Scalar value that is compared against the constant compare value.
+        order: iterable of int
+            Index positions of the predicates in evaluation order.
+        record: bool, default=False
+            Record the statistics for the evaluated predicates.
 
         Returns
         -------
         bool
         """
-        for f in self.predicates:
-            if f.eval(value) != self.truth_value:
+        predicates, truth_value = self.predicates, self.truth_value
+        if not record:
+            for i in order:
+                if predicates[i].eval(value) != truth_value:
+                    return False
+            return True
+        for i in order:
+            start = time.perf_counter()
+            stop = predicates[i].eval(value) != truth_value
+            self.ordering.record(i, time=time.perf_counter() - start, stops=int(stop))
+            if stop:
                 return False
         return True
 
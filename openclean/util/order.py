@@ -0,0 +1,213 @@
+# This file is part of the Data Cleaning Library (openclean).
+#
+# Copyright (C) 2018-2021 New York University.
+#
+# openclean is released under the Revised BSD License. See file LICENSE for
+# full license details.
+
+"""Adaptive evaluation order for short-circuiting combinations of predicates
+(e.g., conjunctions and disjunctions). The evaluation of a conjunction stops
+at the first predicate that is not satisfied, and the evaluation of a
+disjunction stops at the first predicate that is satisfied. The expected cost
+of the evaluation depends on the order of the predicates.
+
+The evaluation order is determined from statistics that are collected for
+the first inputs (the sample). Evaluation stops at the first predicate that
+decides the outcome for inputs in the sample as well. The original order of
+the predicates is rotated for each sampled input (or batch of inputs) such
+that each predicate is evaluated first for an equal share of the sample. For
+each predicate we record the number of calls, the time spent evaluating the
+predicate, and the number of calls where the result decided the outcome of
+the combination (stops). After the sample, predicates are evaluated in
+increasing order of their cost per call divided by their stop rate. For
+independent predicates this order minimizes the expected cost of the
+evaluation, see:
+
+Hellerstein J. M., Stonebraker M.
+Predicate migration: Optimizing queries with expensive predicates.
+In Proc. ACM SIGMOD International Conference on Management of Data, 1993.
+
+Predicates are expected to be deterministic and free of side effects, since
+reordering may change whether a predicate is evaluated for a given input.
+Predicates that are only defined for inputs that were not decided by the
+predicates before them (e.g., a string function after a type check) may raise
+an error when evaluated in a different order. Combinations therefore evaluate
+an input again in the original order of the predicates in this case.
+"""
+
+from typing import Any, Dict, List, Optional
+
+
+"""Default number of inputs for which statistics are collected before the
+evaluation order is determined.
+"""
+ORDER_SAMPLESIZE = 1000
+
+
+class PredicateStats(object):
+    """Runtime statistics for a single predicate in a short-circuiting
+    combination of predicates.
+    """
+    def __init__(self):
+        """Initialize the counters."""
+        self.calls = 0
+        self.stops = 0
+        self.time = 0.
+
+    @property
+    def cost(self) -> float:
+        """Average time (in seconds) for evaluating the predicate.
+
+        Returns
+        -------
+        float
+        """
+        return self.time / self.calls if self.calls else 0.
+
+    def rank(self) -> float:
+        """Rank of the predicate in the evaluation order. Predicates with a
+        lower rank are evaluated first. Predicates that never decided the
+        outcome are evaluated last.
+
+        Returns
+        -------
+        float
+        """
+        if self.stops == 0:
+            return float('inf')
+        return self.cost / self.stop_rate
+
+    @property
+    def stop_rate(self) -> float:
+        """Fraction of calls where the predicate result decided the outcome of
+        the combination (e.g., the fraction of calls where the predicate was
+        not satisfied for a conjunction).
+
+        Returns
+        -------
+        float
+        """
+        return self.stops / self.calls if self.calls else 0.
+
+
+class PredicateOrder(object):
+    """Collect runtime statistics for a list of predicates and determine the
+    evaluation order of the predicates once statistics for the given number
+    of inputs have been collected.
+    """
+    def __init__(self, count: int, samplesize: Optional[int] = ORDER_SAMPLESIZE):
+        """Initialize the statistics for the given number of predicates.
+
+        Parameters
+        ----------
+        count: int
+            Number of predicates.
+        samplesize: int, default=1000
+            Number of inputs for which statistics are collected. If the value
+            is zero, the predicates are evaluated in their original order.
+        """
+        self.stats = [PredicateStats() for _ in range(count)]
+        self.samplesize = samplesize
+        self.samples = 0
+        # Number of sampled inputs (or batches of inputs). Used to rotate
+        # the order of the predicates for the sample.
+        self.rounds = 0
+        self.positions = list(range(count))
+        # Collecting statistics is only required if there is more than one
+        # predicate.
+        self.sampling = samplesize > 0 and count > 1
+
+    def arrange(self, items: List[Any]) -> List[Any]:
+        """Arrange the given list of items (e.g., the predicates) in the
+        evaluation order.
+
+        Parameters
+        ----------
+        items: list
+            List of items in the original order of the predicates.
+
+        Returns
+        -------
+        list
+        """
+        return [items[i] for i in self.positions]
+
+    def record(self, index: int, time: float, stops: int, calls: Optional[int] = 1):
+        """Record the statistics for evaluating a predicate on one or more
+        inputs.
+
+        Parameters
+        ----------
+        index: int
+            Index of the predicate in the original order.
+        time: float
+            Evaluation time in seconds.
+        stops: int
+            Number of inputs for which the predicate result decided the
+            outcome of the combination.
+        calls: int, default=1
+            Number of inputs.
+        """
+        s = self.stats[index]
+        s.calls += calls
+        s.stops += stops
+        s.time += time
+
+    @property
+    def remaining(self) -> int:
+        """Number of inputs that remain to be sampled.
+
+        Returns
+        -------
+        int
+        """
+        return max(self.samplesize - self.samples, 0) if self.sampling else 0
+
+    def report(self) -> List[Dict]:
+        """Get the collected statistics for all predicates in their original
+        order. Each entry contains the number of calls and stops, the total
+        and average evaluation time, the stop rate, and the position of the
+        predicate in the evaluation order.
+
+        Returns
+        -------
+        list of dict
+        """
+        result = list()
+        for i, s in enumerate(self.stats):
+            result.append({
+                'calls': s.calls,
+                'stops': s.stops,
+                'time': s.time,
+                'cost': s.cost,
+                'stop_rate': s.stop_rate,
+                'position': self.positions.index(i)
+            })
+        return result
+
+    def sample_positions(self) -> List[int]:
+        """Get the evaluation order for the next sampled input (or batch of
+        inputs). The original order of the predicates is rotated by the number
+        of previous calls to the update method.
+
+        Returns
+        -------
+        list of int
+        """
+        k = self.rounds % len(self.positions)
+        return self.positions[k:] + self.positions[:k]
+
+    def update(self, count: Optional[int] = 1):
+        """Increment the number of sampled inputs. Determines the evaluation
+        order when the sample is complete.
+
+        Parameters
+        ----------
+        count: int, default=1
+            Number of inputs for which all predicates were evaluated.
+        """
+        self.samples += count
+        self.rounds += 1
+        if self.sampling and self.samples >= self.samplesize:
+            self.sampling = False
+            self.positions = sorted(self.positions, key=lambda i: self.stats[i].rank())
@@ -0,0 +1,69 @@
+# This file is part of the Data Cleaning Library (openclean).
+#
+# Copyright (C) 2018-2021 New York University.
+#
+# openclean is released under the Revised BSD License. See file LICENSE for
+# full license details.
+
+"""Unit tests for reading and writing binary data stream files."""
+
+from datetime import datetime
+
+import os
+import pytest
+
+from openclean.data.stream.binary import BinaryFile, BinaryWriter, is_binary
+
+
+@pytest.mark.parametrize('compressed', [False, True])
+@pytest.mark.parametrize('memory_map', [False, True])
+def test_read_write_binary_file(compressed, memory_map, tmpdir):
+    """Test writing and reading rows in a binary file."""
+    filename = os.path.join(tmpdir, 'data.bin')
+    rows = [[i, 'v{}'.format(i), i / 2, datetime(2021, 1, 1 + i % 28), None] for i in range(25)]
+    with BinaryWriter(filename, columns=['A', 'B', 'C', 'D', 'E'], compressed=compressed, chunksize=10) as writer:
+        writer.write(100, rows[0])
+        writer.write_batch(list(range(101, 125)), rows[1:])
+    assert is_binary(filename)
+    file = BinaryFile(filename, memory_map=memory_map)
+    assert file.columns == ['A', 'B', 'C', 'D', 'E']
+    assert len(file.chunks) == 3
+    assert file.rowcount() == 25
+    with file.open() as reader:
+        result = list(reader)
+    assert [pos for pos, _, _ in result] == list(range(25))
+    assert [rowid for _, rowid, _ in result] == list(range(100, 125))
+    assert [row for _, _, row in result] == rows
+    df = file.to_df()
+    assert list(df.index) == list(range(100, 125))
+    assert df.iloc[3]['D'] == datetime(2021, 1, 4)
+
+
+def test_empty_binary_file(tmpdir):
+    """Test writing and reading a binary file without rows."""
+    filename = os.path.join(tmpdir, 'data.bin')
+    BinaryWriter(filename, columns=['A']).close()
+    file = BinaryFile(filename)
+    assert file.columns == ['A']
+    with file.open() as reader:
+        assert list(reader) == []
+
+
+def test_invalid_binary_file(tmpdir):
+    """Test error cases for binary files."""
+    filename = os.path.join(tmpdir, 'data.csv')
+    with open(filename, 'w') as f:
+        f.write('A,B\n1,2\n')
+    assert not is_binary(filename)
+    assert not is_binary(os.path.join(tmpdir, 'unknown.bin'))
+    with pytest.raises(ValueError):
+        BinaryFile(filename)
+    # Incomplete file without footer.
+    filename = os.path.join(tmpdir, 'data.bin')
+    writer = BinaryWriter(filename, columns=['A'])
+    writer.write(0, [1])
+    writer.file.close()
+    with pytest.raises(ValueError):
+        BinaryFile(filename)
+    with pytest.raises(ValueError):
+        BinaryWriter(filename, columns=['A'], chunksize=0)
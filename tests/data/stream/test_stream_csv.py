@@ -10,7 +10,7 @@
 import os
 import pytest
 
-from openclean.data.stream.csv import CSVFile
+from openclean.data.stream.csv import CSVFile, CSVScan, partition
 
 
 """Input files for testing."""
@@ -88,3 +88,44 @@ def test_none_converter(tmpdir):
     with open(tmpfile, 'r') as f:
         lines = [line.strip() for line in f]
     assert lines == ['A,B', '1,-', '-,1', '-,-']
+
+
+def test_scan_csv_file(tmpdir):
+    """Test scanning a CSV file with projected columns and value predicates."""
+    tmpfile = os.path.join(tmpdir, 'myfile.csv')
+    with open(tmpfile, 'w') as f:
+        f.write('A,B,C\n')
+        f.write('1,n,x\n')
+        f.write('n,1,y\n')
+        f.write('2,2,x\n')
+    file = CSVFile(tmpfile, none_is='n')
+    scan = CSVScan(file=file, columns=['C', 'A'], colidxs=[2, 0], predicates=[(2, lambda v: v == 'x')])
+    with scan.open() as f:
+        rows = [r for r in f]
+    assert rows == [(0, 0, ['x', '1']), (2, 2, ['x', '2'])]
+    scan = CSVScan(file=file, columns=['A', 'B', 'C'], predicates=[(0, lambda v: v is None)])
+    assert [r for _, r in scan.iterrows()] == [[None, '1', 'y']]
+
+
+@pytest.mark.parametrize('n', [1, 2, 3, 7, 50])
+def test_partition_csv_file(n, tmpdir):
+    """Test splitting a CSV file with quoted line breaks into partitions."""
+    tmpfile = os.path.join(tmpdir, 'myfile.csv')
+    rows = [['A', 'B']] + [[str(i), 'x\n"{}"'.format(i) if i % 3 else 'y'] for i in range(20)]
+    with CSVFile(tmpfile, header=rows[0]).writer() as writer:
+        for row in rows:
+            writer.write(row)
+    file = CSVFile(tmpfile)
+    partitions = partition(file, n=n)
+    assert 1 <= len(partitions) <= n
+    result = list()
+    for p in partitions:
+        assert p.columns == ['A', 'B']
+        result.extend([row for _, row in p.iterrows()])
+    assert result == rows[1:]
+
+
+def test_partition_compressed_file():
+    """Test error when partitioning a compressed CSV file."""
+    with pytest.raises(ValueError):
+        partition(CSVFile(ICT_FILE), n=2)
@@ -0,0 +1,96 @@
+# This file is part of the Data Cleaning Library (openclean).
+#
+# Copyright (C) 2018-2021 New York University.
+#
+# openclean is released under the Revised BSD License. See file LICENSE for
+# full license details.
+
+"""Unit tests for reading data sources in a background thread."""
+
+import os
+import pytest
+
+from histore.document.base import DefaultDocument, DocumentIterator
+
+from openclean.data.stream.csv import CSVFile, CSVScan
+from openclean.data.stream.prefetch import Prefetch
+from openclean.function.eval.base import Col
+from openclean.operator.stream.collector import RowCount
+from openclean.pipeline import stream
+
+
+DIR = os.path.join(os.path.dirname(os.path.realpath(__file__)), '../../.files')
+NYC311_FILE = os.path.join(DIR, '311-descriptor.csv')
+
+
+class FailingIterator(DocumentIterator):
+    """Iterator that raises an error after the first row."""
+    def __init__(self):
+        self.count = 0
+
+    def close(self):
+        pass
+
+    def next(self):
+        self.count += 1
+        if self.count > 1:
+            raise ValueError('read error')
+        return 0, 0, ['A']
+
+
+class FailingDocument(DefaultDocument):
+    """Document for the failing iterator."""
+    def __init__(self):
+        super(FailingDocument, self).__init__(columns=['A'])
+
+    def close(self):
+        pass
+
+    def open(self):
+        return FailingIterator()
+
+
+@pytest.mark.parametrize('depth,batchsize', [(1, 1), (2, 7), (4, 1000)])
+def test_prefetch_rows(depth, batchsize):
+    """Test reading all rows of a CSV file in a background thread."""
+    file = CSVFile(NYC311_FILE)
+    with file.open() as f:
+        expected = [r for r in f]
+    with Prefetch(file, depth=depth, batchsize=batchsize).open() as f:
+        rows = [r for r in f]
+    assert rows == expected
+
+
+def test_prefetch_cancel():
+    """Test closing the iterator before all rows have been read."""
+    f = Prefetch(CSVFile(NYC311_FILE), depth=1, batchsize=1).open()
+    assert f.next()[0] == 0
+    thread = f._thread
+    f.close()
+    assert not thread.is_alive()
+    # Closing the iterator a second time has no effect.
+    f.close()
+
+
+def test_prefetch_errors():
+    """Test errors for invalid arguments and errors that are raised by the
+    reader thread.
+    """
+    with pytest.raises(ValueError):
+        Prefetch(CSVFile(NYC311_FILE), depth=0)
+    with pytest.raises(ValueError):
+        Prefetch(CSVFile(NYC311_FILE), batchsize=0)
+    with Prefetch(FailingDocument()).open() as f:
+        with pytest.raises(ValueError):
+            [r for r in f]
+
+
+def test_prefetch_pipeline():
+    """Test pipelines that read the data source in a background thread."""
+    ds = stream(NYC311_FILE).filter(Col('borough') == 'BROOKLYN')
+    pf = ds.prefetch(depth=2, batchsize=10)
+    assert isinstance(pf.append(RowCount()).optimize().source.source, CSVScan)
+    assert pf.count() == ds.count()
+    assert pf.limit(5).count() == 5
+    assert pf.run_many({'count': RowCount()}, parallel=2) == {'count': ds.count()}
+    assert [r for _, r in pf.limit(3).iterrows()] == [r for _, r in ds.limit(3).iterrows()]
@@ -12,6 +12,7 @@ import pytest
 
 from openclean.function.eval.aggregate import Avg, Count, Max, Min, Sum
 from openclean.function.eval.base import Col
+from openclean.pipeline import stream
 
 
 @pytest.fixture
@@ -38,3 +39,17 @@ def test_nested_aggregate(dataset):
     """Test aggregate values from a nested evaluation function."""
     assert Count(Col('A') > Col('B')).eval(dataset) == [0] * dataset.shape[0]
     assert Count(Col('A') < Col('B')).eval(dataset) == [3] * dataset.shape[0]
+
+
+@pytest.mark.parametrize(
+    'op,result',
+    [(Avg, 3), (Max, 4), (Min, 2), (Sum, 9)]
+)
+def test_stream_aggregate(dataset, op, result):
+    """Compute aggregates over a data stream in a separate preparation pass."""
+    ds = stream(dataset).with_engine('stream')
+    df = ds.insert('C', values=op('B')).to_df()
+    assert list(df['C']) == [result] * dataset.shape[0]
+    # Aggregates over multiple columns and over an empty stream.
+    assert ds.insert('C', values=Avg(['A', 'B'])).to_df()['C'].tolist() == [2.5] * 3
+    assert ds.filter(Col('A') > 3).insert('C', values=Max('B')).count() == 0
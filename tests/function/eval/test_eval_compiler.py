@@ -0,0 +1,104 @@
+# This file is part of the Data Cleaning Library (openclean).
+#
+# Copyright (C) 2018-2021 New York University.
+#
+# openclean is released under the Revised BSD License. See file LICENSE for
+# full license details.
+
+"""Unit tests for the compiler of prepared evaluation functions."""
+
+from enum import Enum, IntEnum
+
+import pytest
+
+from openclean.function.eval.base import Col, Cols, Const, Eval
+from openclean.function.eval.compiler import compile_function
+from openclean.function.eval.logic import And, Not
+from openclean.function.eval.random import Rand
+from openclean.function.eval.text import Lower
+
+
+class Code(str, Enum):
+    """String enumeration whose representation is not a valid literal."""
+    X = 'X'
+
+
+class Offset(IntEnum):
+    """Integer enumeration whose representation is not a valid literal."""
+    X = 3
+
+
+SCHEMA = ['A', 'B', 'C']
+ROWS = [[1, 2, 'X'], [10, 5, 'y'], [3, 0, 'Z']]
+
+
+class Counter(object):
+    """Consumer that counts the number of calls."""
+    def __init__(self, func):
+        self.func = func
+        self.calls = 0
+
+    def __call__(self, *args, **kwargs):
+        self.calls += 1
+        return self.func(*args, **kwargs)
+
+
+@pytest.mark.parametrize(
+    'func',
+    [
+        (Col('A') + Col('B')) > Const(10),
+        (Col('A') * 2 - Col('B')) / 4,
+        Col('A') // 2 == Col('B'),
+        And(Col('A') > 2, Not(Col('B') == 0), samplesize=0),
+        Lower('C') == 'x',
+        Eval(['A', 'B'], lambda a, b: a - b),
+        Eval(['A', 'C'], lambda t: len(t), is_unary=True),
+        Eval('A', lambda x, offset: x + offset, args={'offset': 3}),
+        Eval(Cols(['A', 'B']), lambda t: sum(t)),
+        Col('A') + float('inf'),
+        Col('A') + Const(Offset.X),
+        Col('C') == Const(Code.X)
+    ]
+)
+def test_compiled_function_results(func):
+    """Test that compiled functions return the same results as the prepared
+    expression tree.
+    """
+    prepared = func.prepare(SCHEMA)
+    compiled = compile_function(prepared)
+    assert compiled is not prepared
+    for row in ROWS:
+        assert compiled(row) == prepared(row)
+
+
+def test_compiled_function_code():
+    """Test the generated code for inlined columns, constants, and operators."""
+    f = compile_function(((Col('A') + Col('B')) > Const(10)).prepare(SCHEMA))
+    assert 'return ((row[0] + row[1]) > 10)' in f.source
+
+
+def test_compiled_function_subexpressions():
+    """Test that common subexpressions are evaluated once."""
+    func = Counter(lambda x: x * 2)
+    expr = Eval('A', func) + Eval('A', func) * Eval('B', func)
+    f = compile_function(expr.prepare(SCHEMA))
+    assert f([1, 2, 'X']) == 10
+    assert func.calls == 2
+    # Keyword arguments are part of the subexpression.
+    func = Counter(lambda x, offset: x + offset)
+    expr = Eval('A', func, args={'offset': 1}) - Eval('A', func, args={'offset': 1})
+    expr = expr + Eval('A', func, args={'offset': 2})
+    f = compile_function(expr.prepare(SCHEMA))
+    assert f([1, 2, 'X']) == 3
+    assert func.calls == 2
+    # Stream functions that are not part of the expression tree are not
+    # considered for common subexpressions.
+    r = Rand(seed=42)
+    f = compile_function((r - r).prepare(SCHEMA))
+    assert f([1, 2, 'X']) != 0
+
+
+def test_compile_leaf_function():
+    """Leaf functions are not compiled."""
+    f = Col('A').prepare(SCHEMA)
+    assert compile_function(f) is f
@@ -10,7 +10,7 @@
 import pandas as pd
 import pytest
 
-from openclean.function.eval.base import Col
+from openclean.function.eval.base import Col, Eval
 from openclean.function.eval.logic import And, Not, Or
 
 
@@ -56,3 +56,60 @@ def test_predicate_logic_or(dataset):
     f = op.prepare(dataset.columns)
     result = [f(t) for t in dataset.itertuples(index=False, name=None)]
     assert result == [True, False, True, True]
+
+
+@pytest.mark.parametrize('op,stop_value', [(And, False), (Or, True)])
+def test_predicate_logic_adaptive_order(op, stop_value):
+    """Test that logic operators return the same results before and after the
+    predicates are reordered, and that the predicate that never decides the
+    result is evaluated last.
+    """
+    df = pd.DataFrame(
+        data=[[i, i % 3] for i in range(20)],
+        columns=['A', 'B']
+    )
+    # The first predicate never decides the result of the operator. The
+    # result is determined by the second predicate.
+    never = (lambda x: x < 100) if not stop_value else (lambda x: x > 100)
+    expected = [(b == 0) != stop_value for b in df['B']]
+    # Non-vectorized evaluation on a data frame in two chunks.
+    f = op(Eval('A', never), Eval('B', lambda x: (x == 0) != stop_value), samplesize=8)
+    assert f.eval(df.iloc[:5]) + f.eval(df.iloc[5:]) == expected
+    assert f.ordering.positions == [1, 0]
+    # The order is determined for the last data frame. Short-circuiting
+    # during the sample skips the first predicate for some rows.
+    report = f.ordering.report()
+    assert report[1]['calls'] == 8
+    assert report[0]['calls'] < 8
+    # Evaluation on data stream rows.
+    f = op(Eval('A', never), Eval('B', lambda x: (x == 0) != stop_value), samplesize=8)
+    func = f.prepare(df.columns)
+    rows = list(df.itertuples(index=False, name=None))
+    assert [func(row) for row in rows] == expected
+    assert f.ordering.positions == [1, 0]
+    report = f.ordering.report()
+    assert report[0]['stops'] == 0
+    assert report[1]['calls'] == 8
+    assert report[0]['calls'] < 8
+    # Each data stream uses a new order.
+    func = f.prepare(df.columns)
+    assert f.ordering.sampling
+    assert f.ordering.samples == 0
+    assert [func(row) for row in rows] == expected
+
+
+@pytest.mark.parametrize('samplesize', [1, 2, 1000])
+def test_predicate_logic_guard(samplesize):
+    """Test that predicates are not evaluated on rows for which the result was
+    decided by a previous predicate, also while statistics are collected.
+    """
+    df = pd.DataFrame(data=[['a'], [1], ['b'], [None], ['ab']], columns=['A'])
+    op = And(
+        Eval('A', lambda x: isinstance(x, str)),
+        Eval('A', lambda x: x.startswith('a')),
+        samplesize=samplesize
+    )
+    expected = [True, False, False, False, True]
+    assert op.eval(df) == expected
+    f = op.prepare(df.columns)
+    assert [f(row) for row in df.itertuples(index=False, name=None)] == expected
@@ -0,0 +1,127 @@
+# This file is part of the Data Cleaning Library (openclean).
+#
+# Copyright (C) 2018-2021 New York University.
+#
+# openclean is released under the Revised BSD License. See file LICENSE for
+# full license details.
+
+"""Unit tests for memoized evaluation of consumers."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from openclean.function.eval.base import Eval
+from openclean.function.eval.memo import MemoizedFunction, dictionary_encode, memoized_map
+
+
+class Counter(object):
+    """Consumer that counts the number of calls."""
+    def __init__(self, func):
+        self.func = func
+        self.calls = 0
+
+    def __call__(self, *args):
+        self.calls += 1
+        return self.func(*args)
+
+
+@pytest.fixture
+def dataset():
+    """Data frame with repeated street names."""
+    return pd.DataFrame(
+        data=[['Main St', 1], ['Broadway', 2], ['Main St', 1], ['Main St', 2]] * 5,
+        columns=['Street', 'Number']
+    )
+
+
+def test_dictionary_encode():
+    """Test dictionary encoding of values of different types."""
+    codes, uniques = dictionary_encode(['a', 'b', 'a', None, 'b', None])
+    assert list(codes) == [0, 1, 0, 2, 1, 2]
+    assert uniques == ['a', 'b', None]
+    # Values of different types are not merged.
+    codes, uniques = dictionary_encode([1, 1.0, True, 1])
+    assert list(codes) == [0, 1, 2, 0]
+    assert [type(v) for v in uniques] == [int, float, bool]
+    # None and NaN are different values.
+    codes, uniques = dictionary_encode(pd.Series([1.5, None, np.nan, 'a'], index=[3, 2, 1, 0]))
+    assert len(uniques) == 4
+    # Unhashable values.
+    assert dictionary_encode([[1], [2]]) is None
+
+
+def test_memoized_frame_eval(dataset):
+    """Test memoized evaluation of consumers on data frames."""
+    func = Counter(str.upper)
+    result = Eval('Street', func, memoize=True).eval(dataset)
+    assert result == ['MAIN ST', 'BROADWAY', 'MAIN ST', 'MAIN ST'] * 5
+    assert func.calls == 2
+    # Ternary consumer.
+    func = Counter(lambda s, n: '{} {}'.format(n, s))
+    result = Eval(['Street', 'Number'], func, memoize=True).eval(dataset)
+    assert result == ['1 Main St', '2 Broadway', '1 Main St', '2 Main St'] * 5
+    assert func.calls == 3
+    # Unary consumer for multiple columns.
+    func = Counter(lambda t: len(t))
+    result = Eval(['Street', 'Number'], func, is_unary=True, memoize=True).eval(dataset)
+    assert result == [2] * 20
+    assert func.calls == 3
+    # Memoization is disabled by default.
+    func = Counter(str.upper)
+    Eval('Street', func).eval(dataset)
+    assert func.calls == 20
+
+
+def test_memoized_frame_eval_adaptive():
+    """Test adaptive memoization based on the number of repeated values."""
+    df = pd.DataFrame(data=[[i % 10] for i in range(100)], columns=['A'])
+    func = Counter(lambda x: x + 1)
+    assert Eval('A', func, memoize=None).eval(df) == [(i % 10) + 1 for i in range(100)]
+    assert func.calls == 10
+    df = pd.DataFrame(data=[[i] for i in range(100)], columns=['A'])
+    func = Counter(lambda x: x + 1)
+    assert Eval('A', func, memoize=None).eval(df) == [i + 1 for i in range(100)]
+    assert func.calls == 100
+    assert memoized_map(func, [list(range(100))], adaptive=True) is None
+
+
+def test_memoized_stream_eval(dataset):
+    """Test memoization of consumers for data streams."""
+    func = Counter(str.upper)
+    f = Eval('Street', func, memoize=True).prepare(dataset.columns)
+    result = [f(row) for row in dataset.itertuples(index=False, name=None)]
+    assert result == ['MAIN ST', 'BROADWAY', 'MAIN ST', 'MAIN ST'] * 5
+    assert func.calls == 2
+    func = Counter(lambda t: t[0])
+    f = Eval(['Street', 'Number'], func, is_unary=True, memoize=True).prepare(dataset.columns)
+    result = [f(row) for row in dataset.itertuples(index=False, name=None)]
+    assert result == ['Main St', 'Broadway', 'Main St', 'Main St'] * 5
+    assert func.calls == 3
+
+
+def test_memoized_function_cache():
+    """Test the bounded cache and the adaptive mode for memoized functions."""
+    func = Counter(lambda x: x)
+    f = MemoizedFunction(func, maxsize=2)
+    for v in [1, 2, 1, 3, 1, 2]:
+        assert f(v) == v
+    assert func.calls == 4
+    # Unhashable values are not cached.
+    assert f([1]) == [1]
+    assert f([1]) == [1]
+    assert func.calls == 6
+    # Values of different types.
+    assert isinstance(f(1), int)
+    assert isinstance(f(1.0), float)
+    assert isinstance(f(True), bool)
+    # The cache is turned off in adaptive mode if values are not repeated.
+    f = MemoizedFunction(func, maxsize=100, adaptive=True)
+    for v in range(300):
+        f(v)
+    assert not f.active
+    # The hit rate is observed after the cache has been filled.
+    f = MemoizedFunction(func, maxsize=100, adaptive=True)
+    for v in range(300):
+        f(v % 80)
+    assert f.active
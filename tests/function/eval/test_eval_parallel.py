@@ -0,0 +1,82 @@
+# This file is part of the Data Cleaning Library (openclean).
+#
+# Copyright (C) 2018-2021 New York University.
+#
+# openclean is released under the Revised BSD License. See file LICENSE for
+# full license details.
+
+"""Unit tests for the parallel evaluation of evaluation functions on chunks
+of a data frame.
+"""
+
+import pandas as pd
+import pytest
+
+from openclean.config import ENV_THREADS
+from openclean.function.eval.aggregate import Avg, Max
+from openclean.function.eval.base import Col, Eval
+from openclean.function.value.normalize import MinMaxScale
+from openclean.operator.transform.filter import filter
+from openclean.operator.transform.insert import inscol
+from openclean.operator.transform.update import update
+
+
+@pytest.fixture
+def dataset():
+    """Data frame with 3000 rows and a non-default index."""
+    data = [[i % 7, 'v{}'.format(i % 13), i] for i in range(3000)]
+    return pd.DataFrame(data=data, columns=['A', 'B', 'C'], index=range(3000, 0, -1))
+
+
+@pytest.mark.parametrize(
+    'func',
+    [
+        Col('A'),
+        Col('A') + Col('C'),
+        Eval('B', lambda v: v.upper()),
+        Eval(['A', 'B'], lambda a, b: '{}{}'.format(b, a)),
+        Eval('C', MinMaxScale()),
+        Col('C') > Avg(Eval('C', MinMaxScale())),
+        Col('C') == Max('C')
+    ]
+)
+def test_parallel_eval(dataset, func):
+    """Test that parallel evaluation returns the same results as the
+    evaluation in a single process. Consumers that need to be prepared are
+    prepared over the full data frame.
+    """
+    unprepared = len(func.unprepared())
+    expected = func.eval(dataset)
+    result = func.apply(dataset, threads=3)
+    if isinstance(expected, pd.Series):
+        pd.testing.assert_series_equal(result, expected)
+    else:
+        assert result == expected
+    # The evaluated function is not modified by the preparation.
+    assert len(func.unprepared()) == unprepared
+
+
+def test_parallel_eval_small_frame(dataset):
+    """Data frames that are too small to be split are evaluated in the main
+    process.
+    """
+    df = dataset.head(10)
+    func = Eval('B', lambda v: v.upper())
+    assert func.apply(df, threads=4) == func.eval(df)
+
+
+def test_parallel_operators(dataset, monkeypatch):
+    """Test filter, update, and insert operators with parallel evaluation."""
+    predicate = Eval('B', lambda v: v.endswith('1'))
+    expected = filter(dataset, predicate, threads=1)
+    pd.testing.assert_frame_equal(filter(dataset, predicate, threads=2), expected)
+    func = Eval('B', lambda v: v.upper())
+    expected = update(dataset, 'B', func, threads=1)
+    pd.testing.assert_frame_equal(update(dataset, 'B', func, threads=2), expected)
+    values = [Col('A'), Eval('C', MinMaxScale())]
+    expected = inscol(dataset, ['D', 'E'], values=values, threads=1)
+    pd.testing.assert_frame_equal(inscol(dataset, ['D', 'E'], values=values, threads=2), expected)
+    # Number of threads from the environment.
+    monkeypatch.setenv(ENV_THREADS, '2')
+    expected = update(dataset, 'C', MinMaxScale(), threads=1)
+    pd.testing.assert_frame_equal(update(dataset, 'C', MinMaxScale()), expected)
@@ -0,0 +1,121 @@
+# This file is part of the Data Cleaning Library (openclean).
+#
+# Copyright (C) 2018-2021 New York University.
+#
+# openclean is released under the Revised BSD License. See file LICENSE for
+# full license details.
+
+"""Unit tests for the vectorized evaluation of evaluation functions."""
+
+import pandas as pd
+import pytest
+
+from openclean.function.eval.base import Col, Divide, Eval
+from openclean.function.eval.datatype import Float, Int, Str
+from openclean.function.eval.domain import IsIn, IsNotIn
+from openclean.function.eval.logic import And, Not, Or
+from openclean.function.eval.text import Length, Lower, StartsWith, Upper
+from openclean.operator.transform.filter import filter
+from openclean.operator.transform.update import update
+
+
+@pytest.fixture
+def dataset():
+    """Simple dataset with the name and age of four people."""
+    return pd.DataFrame(
+        data=[
+            ['Alice', 45],
+            ['Bob', 23],
+            ['Claudia', 25],
+            ['Dave', 56]
+        ],
+        columns=['Name', 'Age']
+    )
+
+
+@pytest.mark.parametrize(
+    'func,result',
+    [
+        (Col('Age') + 1.5, [46.5, 24.5, 26.5, 57.5]),
+        (Col('Age') * 0.5, [22.5, 11.5, 12.5, 28.0]),
+        (Col('Age') / 2.0, [22.5, 11.5, 12.5, 28.0]),
+        ((Col('Age') + 1.5) > 30, [True, False, False, True]),
+        (Col('Name') == 'Bob', [False, True, False, False]),
+        (And(Col('Name') > 'Bob', Col('Age') > 30), [False, False, False, True]),
+        (Or(Col('Name') == 'Bob', Col('Age') > 50), [False, True, False, True]),
+        (Not(Col('Age') > 30), [False, True, True, False]),
+        (IsIn('Name', ['alice', 'bob'], ignore_case=True), [True, True, False, False]),
+        (IsNotIn('Name', {'Alice', 'Bob'}), [False, False, True, True]),
+        (Lower('Name'), ['alice', 'bob', 'claudia', 'dave']),
+        (Upper('Name'), ['ALICE', 'BOB', 'CLAUDIA', 'DAVE']),
+        (Length('Name'), [5, 3, 7, 4]),
+        (StartsWith('Name', 'C'), [False, False, True, False]),
+        (Float('Age'), [45.0, 23.0, 25.0, 56.0]),
+        (Int(Float('Age')), [45, 23, 25, 56]),
+        (Str('Age'), ['45', '23', '25', '56'])
+    ]
+)
+def test_vectorized_eval(func, result, dataset):
+    """Test vectorized evaluation results and their consistency with the
+    evaluation on individual values.
+    """
+    values = func.vectorize(dataset)
+    assert isinstance(values, pd.Series)
+    assert values.tolist() == result
+    assert list(func.eval(dataset)) == result
+    f = func.prepare(dataset.columns)
+    assert [f(row) for row in dataset.itertuples(index=False, name=None)] == result
+
+
+def test_vectorized_eval_fallback(dataset):
+    """Test that functions fall back to evaluation on individual values for
+    arbitrary callables and unsupported data types.
+    """
+    # Arbitrary callables are not vectorized.
+    func = Eval('Age', lambda x: x + 1)
+    assert func.vectorize(dataset) is None
+    assert func.eval(dataset) == [46, 24, 26, 57]
+    # Vectorization depends on all producers being vectorized.
+    func = Col('Age') + Eval('Age', lambda x: x)
+    assert func.vectorize(dataset) is None
+    assert func.eval(dataset) == [90, 46, 50, 112]
+    # String functions on columns with mixed value types.
+    df = pd.DataFrame(data=[['A'], [1], ['c']], columns=['Value'])
+    assert Upper('Value', as_string=True).vectorize(df) is None
+    assert Upper('Value', as_string=True).eval(df) == ['A', '1', 'C']
+    # Constant operands on both sides.
+    func = Eval('Age', lambda x: 1) + 1
+    assert func.vectorize(dataset) is None
+
+
+def test_vectorized_arithmetic_fallback():
+    """Test that arithmetic operators that may return different results on
+    data series than on individual values are not vectorized.
+    """
+    df = pd.DataFrame(data=[[10**10, 0.0], [3, 2.0]], columns=['A', 'B'])
+    # Integer overflow.
+    func = Col('A') * 10**9 > 0
+    assert func.vectorize(df) is None
+    assert list(func.eval(df)) == [True, True]
+    assert filter(df, func).shape == (2, 2)
+    # Division by zero raises an error like the evaluation on data streams.
+    for func in [Col('B') / 0, Divide(1.0, Col('B')), Col('A') // Col('B')]:
+        assert func.vectorize(df) is None
+        with pytest.raises(ZeroDivisionError):
+            func.eval(df)
+    assert (Col('A') / Col('B')).vectorize(df.iloc[1:]).tolist() == [1.5]
+    # Pow is not vectorized.
+    assert (Col('B') ** 2.0).vectorize(df) is None
+
+
+def test_vectorized_filter_and_update(dataset):
+    """Test filter and update operators with vectorized functions."""
+    df = filter(dataset, predicate=Col('Age') > 30)
+    assert list(df['Name']) == ['Alice', 'Dave']
+    df = filter(dataset, predicate=Col('Age') > 30, negated=True)
+    assert list(df['Name']) == ['Bob', 'Claudia']
+    df = update(dataset, 'Name', Upper('Name'))
+    assert list(df['Name']) == ['ALICE', 'BOB', 'CLAUDIA', 'DAVE']
+    assert list(df['Age']) == [45, 23, 25, 56]
+    df = update(dataset, 'Age', Col('Age') + 1)
+    assert list(df['Age']) == [46, 24, 26, 57]
@@ -0,0 +1,67 @@
+# This file is part of the Data Cleaning Library (openclean).
+#
+# Copyright (C) 2018-2021 New York University.
+#
+# openclean is released under the Revised BSD License. See file LICENSE for
+# full license details.
+
+"""Unit tests for preparing value functions using mergeable accumulators."""
+
+import pytest
+
+from openclean.embedding.feature.frequency import NormalizedFrequency
+from openclean.function.value.base import CallableWrapper
+from openclean.function.value.normalize import DivideByTotal, MaxAbsScale, MinMaxScale
+from openclean.function.value.vote import MajorityVote
+
+
+VALUES = [3, -1, 4, 1, 5, 9, 2, 6, 5, 3, 5]
+
+
+def accumulate(func, values):
+    """Prepare the function using accumulators for two partitions of the
+    given list of values.
+    """
+    acc = func.accumulator()
+    for v in values[:4]:
+        acc.add(v)
+    other = func.accumulator()
+    for v in values[4:]:
+        other.add(v)
+    acc.merge(other)
+    return func.prepare_accumulated(acc)
+
+
+@pytest.mark.parametrize(
+    'func',
+    [DivideByTotal(), MaxAbsScale(), MinMaxScale(), NormalizedFrequency()]
+)
+def test_prepare_accumulated_normalizer(func):
+    """Test that normalizers prepared from accumulated statistics are equal to
+    normalizers that are prepared from the full list of values.
+    """
+    f = accumulate(func, VALUES)
+    g = func.prepare(VALUES)
+    assert [f.eval(v) for v in VALUES] == [g.eval(v) for v in VALUES]
+
+
+def test_prepare_accumulated_default():
+    """Test preparing a function using the default list accumulator."""
+    f = accumulate(CallableWrapper(func=lambda x: x), VALUES)
+    assert f.eval(1) == 1
+
+
+def test_prepare_accumulated_vote():
+    """Test majority vote using accumulated frequency counts."""
+    assert accumulate(MajorityVote(), VALUES).eval(0) == 5
+    assert accumulate(MajorityVote(), ['a', 'b', 'a']).eval(0) == 'a'
+
+
+def test_prepare_accumulated_empty():
+    """Test preparing normalizers for an empty stream of values. The result
+    is the same as for preparing the normalizers with an empty list.
+    """
+    f = MinMaxScale().prepare_accumulated(MinMaxScale().accumulator())
+    assert f.eval(1) == MinMaxScale().prepare([]).eval(1)
+    with pytest.raises(ValueError):
+        MaxAbsScale().prepare_accumulated(MaxAbsScale().accumulator())
@@ -0,0 +1,75 @@
+# This file is part of the Data Cleaning Library (openclean).
+#
+# Copyright (C) 2018-2021 New York University.
+#
+# openclean is released under the Revised BSD License. See file LICENSE for
+# full license details.
+
+"""Unit tests for the result cache of terminal pipeline operators."""
+
+import os
+import pandas as pd
+import pytest
+
+from openclean.data.stream.csv import CSVFile
+from openclean.data.stream.df import DataFrameStream
+from openclean.operator.stream.cache import ResultCache, fingerprint
+from openclean.operator.stream.collector import Distinct, RowCount
+
+
+def test_cache_eviction(tmpdir):
+    """Test LRU eviction from main memory and from the cache directory."""
+    cache = ResultCache(memory_size=2000)
+    cache.put('A', 'a' * 800)
+    cache.put('B', 'b' * 800)
+    assert cache.get('A') == (True, 'a' * 800)
+    # Adding a third result evicts the least recently used result 'B'.
+    cache.put('C', 'c' * 800)
+    assert cache.get('B') == (False, None)
+    assert cache.get('A')[0]
+    assert cache.get('C')[0]
+    # Results that exceed the budget are not cached.
+    cache.put('D', 'd' * 3000)
+    assert cache.get('D') == (False, None)
+    # Results in the cache directory.
+    basedir = os.path.join(tmpdir, 'cache')
+    cache = ResultCache(basedir=basedir, memory_size=0, disk_size=2000)
+    cache.put('A', 'a' * 800)
+    cache.put('B', 'b' * 800)
+    assert cache.get('A') == (True, 'a' * 800)
+    cache.put('C', 'c' * 800)
+    assert sorted(os.listdir(basedir)) == ['A.pkl', 'C.pkl']
+    # Results are read from disk by a new cache instance.
+    cache = ResultCache(basedir=basedir)
+    assert cache.get('C') == (True, 'c' * 800)
+    cache.clear()
+    assert os.listdir(basedir) == []
+    assert cache.get('C') == (False, None)
+    # Invalid size budgets.
+    with pytest.raises(ValueError):
+        ResultCache(memory_size=-1)
+    with pytest.raises(ValueError):
+        ResultCache(disk_size=-1)
+
+
+def test_cache_keys(tmpdir):
+    """Test result keys for different data sources and operators."""
+    filename = os.path.join(tmpdir, 'data.csv')
+    with open(filename, 'w') as f:
+        f.write('A,B\n1,2\n')
+    file = CSVFile(filename)
+    cache = ResultCache()
+    key = cache.key(source=file, operators=[RowCount()])
+    assert key == cache.key(source=CSVFile(filename), operators=[RowCount()])
+    assert key != cache.key(source=file, operators=[Distinct('A')])
+    # Modifying the file changes the key.
+    with open(filename, 'w') as f:
+        f.write('A,B\n1,2\n3,4\n')
+    assert key != cache.key(source=file, operators=[RowCount()])
+    # Keys based on file content.
+    fp = fingerprint(file, content_hash=True)
+    os.utime(filename, ns=(0, 0))
+    assert fp == fingerprint(file, content_hash=True)
+    # Data frames are not cached.
+    df = DataFrameStream(pd.DataFrame(data=[[1, 2]], columns=['A', 'B']))
+    assert cache.key(source=df, operators=[RowCount()]) is None
@@ -0,0 +1,75 @@
+# This file is part of the Data Cleaning Library (openclean).
+#
+# Copyright (C) 2018-2021 New York University.
+#
+# openclean is released under the Revised BSD License. See file LICENSE for
+# full license details.
+
+"""Unit tests for the external distinct consumer for data streams."""
+
+from collections import Counter
+
+import os
+import pickle
+import pytest
+
+from openclean.operator.stream.external import ExternalDistinct
+
+
+ROWS = [[i % 13, i % 5] for i in range(100)]
+
+
+@pytest.mark.parametrize('iterate', [False, True])
+def test_external_distinct_spill(iterate, tmpdir):
+    """Test counting distinct values that are spilled to disk."""
+    expected = Counter([tuple(row) for row in ROWS])
+    op = ExternalDistinct(max_entries=10, partitions=4, tmpdir=str(tmpdir), iterate=iterate)
+    consumer = op.open(['A', 'B'])
+    for rowid, row in enumerate(ROWS[:50]):
+        consumer.consume(rowid, row)
+    consumer.consume_batch(list(range(50, 100)), ROWS[50:])
+    assert len(os.listdir(tmpdir)) == 1
+    result = consumer.close()
+    assert Counter(dict(result)) == expected
+    assert len(os.listdir(tmpdir)) == 0
+
+
+def test_external_distinct_checkpoint(tmpdir):
+    """Test restoring an external distinct consumer from a checkpoint."""
+    op = ExternalDistinct(columns='A', max_entries=5, tmpdir=str(tmpdir))
+    consumer = op.open(['A', 'B'])
+    consumer.consume_batch(list(range(50)), ROWS[:50])
+    state = pickle.loads(pickle.dumps(consumer.checkpoint()))
+    # Rows that are consumed after the checkpoint are ignored on resume.
+    consumer.consume_batch(list(range(50, 100)), ROWS[50:])
+    consumer.checkpoint()
+    consumer = op.resume(['A', 'B'], state)
+    consumer.consume_batch(list(range(50, 100)), ROWS[50:])
+    assert consumer.close() == Counter([row[0] for row in ROWS])
+
+
+def test_external_distinct_in_memory():
+    """Test counting distinct values that fit into main memory."""
+    consumer = ExternalDistinct(columns='B').open(['A', 'B'])
+    consumer.consume_batch(list(range(100)), ROWS)
+    assert consumer.close() == Counter([row[1] for row in ROWS])
+    with pytest.raises(ValueError):
+        ExternalDistinct(max_entries=0)
+    with pytest.raises(ValueError):
+        ExternalDistinct(partitions=0)
+
+
+@pytest.mark.parametrize('iterate', [False, True])
+def test_external_distinct_spill_equal_keys(iterate, tmpdir):
+    """Test that values which are equal but of different types (e.g., 1, 1.0,
+    and True) are counted as one value when they are spilled to disk.
+    """
+    values = [1, 2, 3, 4, 1.0, 5, 6, 7, 8, 9, True, (1, 'a'), (1.0, 'a')]
+    op = ExternalDistinct(columns='A', max_entries=2, partitions=4, tmpdir=str(tmpdir), iterate=iterate)
+    consumer = op.open(['A'])
+    for rowid, value in enumerate(values):
+        consumer.consume(rowid, [value])
+    result = list(dict(consumer.close()).items()) if not iterate else list(consumer.close())
+    assert len(result) == len(set(k for k, _ in result))
+    assert Counter(dict(result)) == Counter(values)
+    assert dict(result)[1] == 3
@@ -7,10 +7,12 @@
 
 """Unit tests for the Sample consumer for data streams."""
 
+from random import Random
+
 import pytest
 
 from openclean.operator.stream.collector import RowCount
-from openclean.operator.stream.sample import SampleCollector
+from openclean.operator.stream.sample import Reservoir, SampleCollector
 
 
 @pytest.mark.parametrize('rows,size', [(0, 0), (5, 10), (10, 10), (100, 10)])
@@ -20,3 +22,48 @@ def test_random_sample_generator(rows, size):
     for i in range(rows):
         consumer.consume(i, [])
     assert consumer.close() == min(rows, size)
+
+
+@pytest.mark.parametrize('batchsize', [1, 7, 100])
+def test_sample_batches(batchsize):
+    """Test that samples collected from batches of rows are identical to
+    samples that are collected one row at a time.
+    """
+    expected = SampleCollector(columns=['A'], n=10, random_state=42)
+    for i in range(1000):
+        expected.consume(i, [i])
+    consumer = SampleCollector(columns=['A'], n=10, random_state=42)
+    for start in range(0, 1000, batchsize):
+        rowids = list(range(start, min(start + batchsize, 1000)))
+        consumer.consume_batch(rowids, [[i] for i in rowids])
+    assert consumer.close() == expected.close()
+
+
+def test_sample_merge():
+    """Test merging reservoirs for partitions of a data stream."""
+    rand = Random(42)
+    reservoirs = list()
+    for size in [0, 5, 100, 1000]:
+        res = Reservoir(n=10)
+        for i in range(size):
+            res.add(rowid=i, row=[size], rand=rand)
+        reservoirs.append(res)
+    merged = reservoirs[0].merge(reservoirs, rand=rand)
+    assert merged.count == 1105
+    assert len(merged.rows) == 10
+    # Merging small partitions keeps all rows.
+    merged = reservoirs[0].merge(reservoirs[:2], rand=rand)
+    assert sorted(merged.rows) == [(i, [5]) for i in range(5)]
+
+
+def test_weighted_sample():
+    """Test collecting a weighted random sample."""
+    consumer = SampleCollector(columns=['A', 'W'], n=5, random_state=42, weights=1)
+    for i in range(1000):
+        consumer.consume(i, [i, 1 if i % 100 == 0 else 0])
+    rows = consumer.close()
+    # Rows with zero weight are never sampled.
+    assert len(rows) == 5
+    assert all(row[0] % 100 == 0 for _, row in rows)
+    # Rows are returned in stream order.
+    assert [rowid for rowid, _ in rows] == sorted(rowid for rowid, _ in rows)
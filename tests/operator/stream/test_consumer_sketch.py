@@ -0,0 +1,94 @@
+# This file is part of the Data Cleaning Library (openclean).
+#
+# Copyright (C) 2018-2021 New York University.
+#
+# openclean is released under the Revised BSD License. See file LICENSE for
+# full license details.
+
+"""Unit tests for the sketch-based collectors for data streams."""
+
+from collections import Counter
+
+import pytest
+
+from openclean.operator.stream.sketch import (
+    ApproxDistinct, BloomFilter, FrequentItems, HyperLogLog, ScalableBloomFilter, TopValues
+)
+
+
+def test_bloom_filter():
+    """Test adding values to fixed-size and scalable Bloom filters."""
+    bf = BloomFilter(capacity=1000, error=0.01)
+    assert sum(bf.add(i) for i in range(1000)) < 20
+    assert all(i in bf for i in range(1000))
+    assert sum(i in bf for i in range(1000, 11000)) < 200
+    sbf = ScalableBloomFilter(capacity=100, error=0.01)
+    assert sum(sbf.add(i) for i in range(5000)) < 50
+    assert len(sbf.filters) > 1
+    assert all(sbf.add(i) for i in range(5000))
+    assert sum(i in sbf for i in range(5000, 15000)) < 200
+    with pytest.raises(ValueError):
+        BloomFilter(capacity=0)
+    with pytest.raises(ValueError):
+        ScalableBloomFilter(error=1)
+
+
+def test_frequent_items_error_bound():
+    """Test the error bound for counts in a frequent items summary."""
+    values = [i % 7 for i in range(1000)] + list(range(100, 3100))
+    summary = FrequentItems(capacity=20)
+    for v in values:
+        summary.add(v)
+    counts = Counter(values)
+    assert summary.error <= len(values) / 21
+    for value, count in summary.most_common(7):
+        assert value in range(7)
+        assert count <= counts[value] <= count + summary.error
+    # Merge summaries for two halves of the stream.
+    s1, s2 = FrequentItems(capacity=20), FrequentItems(capacity=20)
+    s1.update(values[::2])
+    s2.update(values[1::2])
+    merged = s1.merge(s2)
+    assert merged.error <= len(values) / 21
+    assert {v for v, _ in merged.most_common(7)} == set(range(7))
+    with pytest.raises(ValueError):
+        FrequentItems(capacity=0)
+
+
+def test_hyperloglog_estimate():
+    """Test distinct count estimates for HyperLogLog sketches."""
+    sketch = HyperLogLog()
+    assert sketch.count() == 0
+    sketch.update(['A', 'B', 'A', 1, '1', None])
+    assert sketch.count() == 5
+    sketch = HyperLogLog(precision=12)
+    sketch.update(range(50000))
+    assert abs(sketch.count() - 50000) < 50000 * 0.05
+    # Merging sketches for overlapping value sets.
+    s1, s2 = HyperLogLog(precision=12), HyperLogLog(precision=12)
+    s1.update(range(0, 30000))
+    s2.update(range(20000, 50000))
+    assert s1.merge(s2).registers == sketch.registers
+    with pytest.raises(ValueError):
+        s1.merge(HyperLogLog(precision=10))
+    with pytest.raises(ValueError):
+        HyperLogLog(precision=2)
+
+
+def test_sketch_consumers():
+    """Test the approximate distinct count and top values consumers."""
+    rows = [['A', 1], ['A', 2], ['B', 1], ['B', 1], ['B', 1]]
+    consumer = ApproxDistinct('A').open(['A', 'B'])
+    for rowid, row in enumerate(rows):
+        consumer.consume(rowid, row)
+    assert consumer.close().count() == 2
+    consumer = ApproxDistinct().open(['A', 'B'])
+    consumer.consume_batch(list(range(len(rows))), rows)
+    assert consumer.close().count() == 3
+    consumer = TopValues(k=1).open(['A', 'B'])
+    consumer.consume_batch(list(range(len(rows))), rows)
+    assert consumer.close().most_common(1) == [(('B', 1), 3)]
+    consumer = TopValues(columns='B', k=2).open(['A', 'B'])
+    for rowid, row in enumerate(rows):
+        consumer.consume(rowid, row)
+    assert consumer.close().most_common(1) == [(1, 4)]
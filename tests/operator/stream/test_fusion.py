@@ -0,0 +1,67 @@
+# This file is part of the Data Cleaning Library (openclean).
+#
+# Copyright (C) 2018-2021 New York University.
+#
+# openclean is released under the Revised BSD License. See file LICENSE for
+# full license details.
+
+"""Unit tests for fusing row-local operators in data pipelines."""
+
+from openclean.function.eval.base import Col
+from openclean.operator.stream.collector import RowCount
+from openclean.operator.stream.fusion import (
+    ColumnInsert, ColumnUpdate, FusedProcessor, Projection, RowFilter, compile_steps, fuse_operators
+)
+from openclean.operator.transform.filter import Filter
+from openclean.operator.transform.insert import InsCol
+from openclean.operator.transform.limit import Limit
+from openclean.operator.transform.select import Select
+from openclean.operator.transform.update import Update
+
+
+def test_compile_row_steps():
+    """Test row functions for different sequences of row steps."""
+    # Filters and projections only do not modify the input row.
+    row = [1, 2, 3]
+    rowfunc = compile_steps([RowFilter(lambda r: r[0] == 1), Projection([2, 0])])
+    assert rowfunc(row) == [3, 1]
+    assert rowfunc([0, 2, 3]) is None
+    assert compile_steps([RowFilter(lambda r: r[0] == 1)])(row) is row
+    # Modify a copy of the input row.
+    rowfunc = compile_steps([
+        Projection([2, 1, 0]),
+        Projection([0, 2]),
+        ColumnUpdate([0], lambda r: r[0] * 10),
+        RowFilter(lambda r: r[0] > 10, negated=True),
+        ColumnInsert(1, lambda r: r[0] + r[1]),
+        ColumnInsert(0, lambda r: ['x', 'y'], count=2),
+        Projection([4, 0])
+    ])
+    assert rowfunc(row) is None
+    assert rowfunc([1, 2, 1]) == [1, 'x']
+    assert row == [1, 2, 3]
+    # Multi-column update.
+    rowfunc = compile_steps([ColumnUpdate([1, 0], lambda r: (r[0], r[1]))])
+    assert rowfunc(row) == [2, 1, 3]
+
+
+def test_fuse_operators():
+    """Test grouping adjacent fusable operators."""
+    select = Select(['A', 'B'])
+    update = Update('A', str.lower)
+    filter = Filter(Col('B') > 1)
+    insert = InsCol('C', values=1)
+    plan = fuse_operators([select, update, Limit(10), filter, insert, RowCount()])
+    assert len(plan) == 4
+    assert isinstance(plan[0], FusedProcessor)
+    assert plan[0].operators == [select, update]
+    assert isinstance(plan[1], Limit)
+    assert plan[2].operators == [filter, insert]
+    assert isinstance(plan[3], RowCount)
+    # Single operators are not fused.
+    plan = fuse_operators([Limit(10), select, RowCount()])
+    assert plan[1] == select
+    # Fused consumer schema.
+    columns, steps = FusedProcessor([select, update, insert]).steps(['B', 'A', 'D'])
+    assert columns == ['A', 'B', 'C']
+    assert [type(s) for s in steps] == [Projection, ColumnUpdate, ColumnInsert]
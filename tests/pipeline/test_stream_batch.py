@@ -0,0 +1,70 @@
+# This file is part of the Data Cleaning Library (openclean).
+#
+# Copyright (C) 2018-2021 New York University.
+#
+# openclean is released under the Revised BSD License. See file LICENSE for
+# full license details.
+
+"""Unit tests for passing batches of rows between the consumers in data
+processing pipelines.
+"""
+
+import os
+import pandas as pd
+import pytest
+
+from openclean.function.eval.base import Col
+from openclean.operator.stream.collector import DataFrame, Distinct, RowCount
+from openclean.operator.stream.consumer import StreamConsumer
+from openclean.pipeline import stream
+
+
+DIR = os.path.join(os.path.dirname(os.path.realpath(__file__)), '../.files')
+NYC311_FILE = os.path.join(DIR, '311-descriptor.csv')
+
+
+class RowList(StreamConsumer):
+    """Consumer that only implements row-at-a-time processing."""
+    def __init__(self):
+        super(RowList, self).__init__(columns=[])
+        self.rows = list()
+
+    def close(self):
+        return self.rows
+
+    def consume(self, rowid, row):
+        self.rows.append((rowid, row))
+
+
+@pytest.mark.parametrize('batchsize', [1, 7, 1000, None])
+def test_batch_pipeline_results(batchsize):
+    """Test that pipeline results do not depend on the batch size."""
+    ds = stream(NYC311_FILE)\
+        .filter(Col('borough') != 'BROOKLYN')\
+        .update('descriptor', str.upper)\
+        .select(['descriptor', 'borough'])\
+        .rename('borough', 'boro')
+    df = ds.to_df()
+    assert ds.append(RowCount()).run(batchsize=batchsize) == df.shape[0]
+    assert ds.append(Distinct('boro')).run(batchsize=batchsize) == ds.distinct('boro')
+    pd.testing.assert_frame_equal(ds.append(DataFrame()).run(batchsize=batchsize), df)
+
+
+@pytest.mark.parametrize('limit', [0, 5, 7, 8, 20])
+def test_batch_limit(limit, ds):
+    """Test limit operator with limits at and across batch boundaries."""
+    df = ds.limit(limit).append(DataFrame()).run(batchsize=4)
+    assert df.shape == (min(limit, 10), 3)
+    pd.testing.assert_frame_equal(df, ds.to_df().head(limit), check_index_type=False)
+
+
+def test_row_consumer_adapter():
+    """Test the default batch adapter for consumers that only implement the
+    consume method.
+    """
+    consumer = RowList()
+    rowids, rows = consumer.consume_batch([1, 2], [['a'], ['b']])
+    assert consumer.close() == [(1, ['a']), (2, ['b'])]
+    # Rows for which the consumer returns None are not included in the result.
+    assert rowids == []
+    assert rows == []
@@ -0,0 +1,53 @@
+# This file is part of the Data Cleaning Library (openclean).
+#
+# Copyright (C) 2018-2021 New York University.
+#
+# openclean is released under the Revised BSD License. See file LICENSE for
+# full license details.
+
+"""Unit tests for caching the results of terminal operators in data
+pipelines.
+"""
+
+import os
+import shutil
+
+from openclean.function.eval.base import Col
+from openclean.operator.stream.cache import ResultCache
+from openclean.pipeline import stream
+
+
+DIR = os.path.join(os.path.dirname(os.path.realpath(__file__)), '../.files')
+NYC311_FILE = os.path.join(DIR, '311-descriptor.csv')
+
+
+def test_cached_pipeline_results(tmpdir):
+    """Test caching results for repeated runs on an unmodified file."""
+    filename = os.path.join(tmpdir, 'data.csv')
+    shutil.copyfile(NYC311_FILE, filename)
+    cache = ResultCache()
+    ds = stream(filename).with_cache(cache)
+    boroughs = ds.distinct('borough')
+    assert len(cache._entries) == 1
+    # Modifying the returned result does not modify the cached result.
+    boroughs['X'] = 1
+    assert ds.distinct('borough') == stream(filename).distinct('borough')
+    assert len(cache._entries) == 1
+    # Derived pipelines share the cache.
+    brooklyn = ds.filter(Col('borough') == 'BROOKLYN')
+    count = brooklyn.count()
+    assert len(cache._entries) == 2
+    assert brooklyn.count() == count
+    profile = ds.select('city').profile()
+    assert ds.select('city').profile().stats().equals(profile.stats())
+    assert len(cache._entries) == 3
+    # Samples without random state and operators that write files are not
+    # cached.
+    ds.sample(10).count()
+    ds.sample(10, random_state=42).count()
+    ds.head()
+    assert len(cache._entries) == 4
+    # Results are recomputed after the file is modified.
+    with open(filename, 'a') as f:
+        f.write('TEST,BROOKLYN,TEST,TEST\n')
+    assert brooklyn.count() == count + 1
@@ -0,0 +1,135 @@
+# This file is part of the Data Cleaning Library (openclean).
+#
+# Copyright (C) 2018-2021 New York University.
+#
+# openclean is released under the Revised BSD License. See file LICENSE for
+# full license details.
+
+"""Unit tests for checkpointing and resuming data pipeline runs."""
+
+import os
+import pytest
+
+from openclean.data.stream.csv import CSVFile
+from openclean.function.eval.base import Col, Eval
+from openclean.operator.stream.collector import Distinct, RowCount, Write
+from openclean.operator.stream.consumer import ProducingConsumer
+from openclean.operator.stream.processor import StreamProcessor
+from openclean.operator.stream.sample import Sample
+from openclean.pipeline import stream
+from openclean.profiling.dataset import ProfileOperator
+
+
+DIR = os.path.join(os.path.dirname(os.path.realpath(__file__)), '../.files')
+NYC311_FILE = os.path.join(DIR, '311-descriptor.csv')
+
+
+class FailAfter(object):
+    """Value function that raises an error after a given number of calls."""
+    def __init__(self, n):
+        self.n = n
+        self.count = 0
+
+    def __call__(self, value):
+        self.count += 1
+        if self.n is not None and self.count > self.n:
+            raise RuntimeError('failed after {} rows'.format(self.n))
+        return value.upper()
+
+
+def run_with_failure(sinks, checkpoint, tmpdir):
+    """Run a pipeline that fails after 120 rows. Then resume the run from the
+    last checkpoint. Returns the results of the resumed run.
+    """
+    def pipeline(func):
+        return stream(NYC311_FILE)\
+            .filter(Col('borough') != 'BROOKLYN')\
+            .update('city', Eval('city', func))
+
+    with pytest.raises(RuntimeError):
+        pipeline(FailAfter(120)).run_many(sinks=sinks(), checkpoint=checkpoint, interval=50, batchsize=10)
+    assert os.path.isfile(checkpoint)
+    result = pipeline(FailAfter(None)).run_many(
+        sinks=sinks(),
+        checkpoint=checkpoint,
+        interval=50,
+        batchsize=10,
+        resume=True
+    )
+    assert not os.path.isfile(checkpoint)
+    expected = pipeline(FailAfter(None)).run_many(sinks=sinks())
+    return result, expected
+
+
+class Counter(ProducingConsumer, StreamProcessor):
+    """Producing consumer that numbers the rows in a data stream."""
+    def __init__(self, columns=None):
+        super(Counter, self).__init__(columns=columns, consumer=None)
+        self.count = 0
+
+    def handle(self, rowid, row):
+        self.count += 1
+        return row + [self.count]
+
+    def open(self, schema):
+        return Counter(columns=schema)
+
+
+def test_checkpoint_collectors(tmpdir):
+    """Test resuming a run with different collectors from a checkpoint."""
+    def sinks():
+        return {
+            'count': RowCount(),
+            'cities': Distinct('city'),
+            'profile': ProfileOperator(),
+            'sample': Sample(n=10, random_state=42)
+        }
+
+    checkpoint = os.path.join(tmpdir, 'run.ckpt')
+    result, expected = run_with_failure(sinks, checkpoint, tmpdir)
+    assert result['count'] == expected['count']
+    assert result['cities'] == expected['cities']
+    assert result['profile'].stats().equals(expected['profile'].stats())
+    assert result['sample'] == expected['sample']
+
+
+def test_checkpoint_write(tmpdir):
+    """Test resuming a run that writes an output file."""
+    outfile = os.path.join(tmpdir, 'out.csv')
+    checkpoint = os.path.join(tmpdir, 'run.ckpt')
+
+    def sinks():
+        return {'write': Write(file=CSVFile(outfile))}
+
+    run_with_failure(sinks, checkpoint, tmpdir)
+    expected = stream(NYC311_FILE)\
+        .filter(Col('borough') != 'BROOKLYN')\
+        .update('city', str.upper)\
+        .to_df()
+    df = stream(outfile).to_df()
+    assert list(df.columns) == list(expected.columns)
+    assert df.values.tolist() == expected.values.tolist()
+
+
+def test_checkpoint_errors(tmpdir):
+    """Test error cases for checkpointed pipeline runs."""
+    checkpoint = os.path.join(tmpdir, 'run.ckpt')
+    ds = stream(NYC311_FILE).append(RowCount())
+    with pytest.raises(ValueError):
+        ds.run(resume=True)
+    with pytest.raises(ValueError):
+        ds.run(parallel=2, checkpoint=checkpoint)
+    with pytest.raises(ValueError):
+        ds.run(checkpoint=checkpoint, interval=0)
+    # Compressed output files do not support checkpoints.
+    outfile = os.path.join(tmpdir, 'out.csv.gz')
+    ds = stream(NYC311_FILE).append(Write(file=CSVFile(outfile, compressed=True)))
+    with pytest.raises(NotImplementedError):
+        ds.run(checkpoint=checkpoint)
+    # Producing consumers that do not implement checkpoints.
+    ds = stream(NYC311_FILE).append(Counter()).append(RowCount())
+    with pytest.raises(NotImplementedError):
+        ds.run(checkpoint=checkpoint)
+    # Stateless producing consumers.
+    ds = stream(NYC311_FILE).typecast().append(RowCount())
+    assert ds.run(checkpoint=checkpoint) == stream(NYC311_FILE).count()
@@ -0,0 +1,53 @@
+# This file is part of the Data Cleaning Library (openclean).
+#
+# Copyright (C) 2018-2021 New York University.
+#
+# openclean is released under the Revised BSD License. See file LICENSE for
+# full license details.
+
+"""Unit tests for removing duplicate rows in data processing pipelines."""
+
+import os
+import pytest
+
+from openclean.function.value.key.fingerprint import Fingerprint
+from openclean.function.value.normalize.text import TextNormalizer
+from openclean.operator.stream.collector import Distinct
+from openclean.pipeline import stream
+
+
+DIR = os.path.join(os.path.dirname(os.path.realpath(__file__)), '../.files')
+NYC311_FILE = os.path.join(DIR, '311-descriptor.csv')
+
+
+@pytest.mark.parametrize('error', [None, 0.001])
+@pytest.mark.parametrize('columns', [None, 'borough', ['borough', 'city']])
+def test_dedup_rows(columns, error):
+    """Test removing duplicate rows in exact and approximate mode."""
+    df = stream(NYC311_FILE).to_df()
+    expected = df.drop_duplicates(subset=columns)
+    ds = stream(NYC311_FILE).dedup(columns=columns, error=error, capacity=10)
+    result = ds.to_df()
+    assert result.index.tolist() == expected.index.tolist()
+    assert result.values.tolist() == expected.values.tolist()
+    # Rows are removed when iterating over the pipeline one row at a time.
+    assert [rowid for rowid, _ in ds.iterrows()] == expected.index.tolist()
+
+
+def test_dedup_with_key_function():
+    """Test removing rows with duplicate keys."""
+    df = stream(NYC311_FILE).dedup('descriptor', key=Fingerprint()).to_df()
+    keys = [Fingerprint().eval(v) for v in df['descriptor']]
+    assert len(keys) == len(set(keys))
+    normalize = TextNormalizer()
+    df = stream(NYC311_FILE).dedup('city', key=lambda v: normalize(v)).to_df()
+    assert len(df) == len(set(normalize(v) for v in df['city']))
+
+
+def test_dedup_errors():
+    """Test errors for invalid dedup arguments and parallel pipelines."""
+    ds = stream(NYC311_FILE)
+    with pytest.raises(ValueError):
+        ds.dedup(error=0)
+    with pytest.raises(ValueError):
+        ds.dedup('city').stream(Distinct('city'), workers=2)
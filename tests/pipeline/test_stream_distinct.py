@@ -22,3 +22,10 @@ def test_count_distinct_values(ds):
     values = ds.distinct_values(columns='A')
     assert len(values) == 1
     assert 'A' in values
+
+
+def test_count_distinct_external(ds, tmpdir):
+    """Test distinct counts that are spilled to disk."""
+    assert ds.distinct('B', max_entries=3) == ds.distinct('B')
+    assert ds.distinct(['A', 'C'], max_entries=2) == ds.distinct(['A', 'C'])
+    assert Counter(dict(ds.iter_distinct('B', max_entries=4))) == ds.distinct('B')
@@ -0,0 +1,82 @@
+# This file is part of the Data Cleaning Library (openclean).
+#
+# Copyright (C) 2018-2021 New York University.
+#
+# openclean is released under the Revised BSD License. See file LICENSE for
+# full license details.
+
+"""Unit tests for running data pipelines with the pandas engine."""
+
+import os
+import pandas as pd
+import pytest
+
+from openclean.function.eval.base import Col, Eval
+from openclean.function.eval.datatype import IsNaN
+from openclean.function.eval.null import IsEmpty
+from openclean.pipeline import stream
+
+
+DIR = os.path.join(os.path.dirname(os.path.realpath(__file__)), '../.files')
+NYC311_FILE = os.path.join(DIR, '311-descriptor.csv')
+
+
+@pytest.fixture
+def df():
+    """Data frame with missing values and an index that is not sorted."""
+    return pd.DataFrame(
+        data=[['A', 1, 0.5], ['B', 2, None], [None, 3, 1.5], ['A', 4, 2.5]],
+        columns=['A', 'B', 'C'],
+        index=[3, 1, 0, 2]
+    )
+
+
+@pytest.mark.parametrize(
+    'pipeline',
+    [
+        lambda ds: ds,
+        lambda ds: ds.filter(Col('B') > 1).update('A', lambda x: str(x).lower()),
+        lambda ds: ds.insert('D', pos=1, values=Col('B') + 1).select(['D', 'A']),
+        lambda ds: ds.update('B', str).rename('B', 'E').move('E', 0).limit(2),
+        lambda ds: ds.filter(Col('B') > 10).update('A', str.lower),
+        lambda ds: ds.update('B', lambda x: x * 2).sample(n=2, random_state=42),
+        lambda ds: ds.filter(IsNaN('C')),
+        lambda ds: ds.filter(IsEmpty('C')).update('A', lambda x: x is None),
+        lambda ds: ds.filter(Col('B') > 1).update('C', lambda x: x is None),
+        lambda ds: ds.insert('D', values=Eval('C', lambda x: x is not None and x > 1))
+    ]
+)
+def test_engine_results(pipeline, df):
+    """Test that the pandas engine and the stream engine produce the same
+    results.
+    """
+    expected = pipeline(stream(df, engine='stream'))
+    result = pipeline(stream(df))
+    pd.testing.assert_frame_equal(result.to_df(), expected.to_df())
+    assert result.count() == expected.count()
+    assert result.distinct() == expected.distinct()
+
+
+@pytest.mark.parametrize(
+    'pipeline',
+    [
+        lambda ds: ds.filter(Col('C') > 1),
+        lambda ds: ds.update('C', Col('C') + 1)
+    ]
+)
+def test_engine_errors_for_missing_values(pipeline, df):
+    """Test that both engines raise an error for operators that are not
+    defined for missing values.
+    """
+    for engine in ['stream', 'pandas']:
+        with pytest.raises(TypeError):
+            pipeline(stream(df, engine=engine)).to_df()
+
+
+def test_engine_for_file():
+    """Test running a pipeline over a CSV file with the pandas engine."""
+    ds = stream(NYC311_FILE).filter(Col('borough') == 'BROOKLYN')
+    assert ds.with_engine('pandas').count() == ds.count()
+    assert ds.with_engine('pandas').distinct('descriptor') == ds.distinct('descriptor')
+    with pytest.raises(ValueError):
+        stream(NYC311_FILE, engine='unknown')
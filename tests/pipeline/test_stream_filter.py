@@ -24,8 +24,16 @@ def test_filter_rows_from_stream(ds):
 
 def test_filter_from_stream_with_prepare(ds):
     """Test filtering rows with a evaluation function that needs to be
-    prepared. A value function that needs to be prepared will raise a
-    runtime error.
+    prepared. The function is prepared in a separate pass over the data
+    stream.
     """
+    assert ds.filter(Col('A') == Max('B')).count() == 0
+    df = ds.filter(Col('C') == Max('B')).to_df()
+    assert list(df['B']) == [0]
+    # Prepare over the output of a preceding operator using the stream engine.
+    ds = ds.with_engine('stream').filter(Col('B') < 5)
+    df = ds.filter(Col('C') < Max('C')).to_df()
+    assert list(df['C']) == [8, 7, 6, 5]
+    # Direct preparation of the function raises an error.
     with pytest.raises(RuntimeError):
-        ds.filter(Col('A') == Max('B')).count()
+        Max('B').prepare(['A', 'B', 'C'])
@@ -0,0 +1,67 @@
+# This file is part of the Data Cleaning Library (openclean).
+#
+# Copyright (C) 2018-2021 New York University.
+#
+# openclean is released under the Revised BSD License. See file LICENSE for
+# full license details.
+
+"""Unit tests for chunked data frame iteration and chunked execution of data
+frame transformers in data pipelines.
+"""
+
+import os
+import pandas as pd
+import pytest
+
+from openclean.data.stream.csv import CSVFile
+from openclean.function.eval.base import Col
+from openclean.operator.transform.filter import Filter
+from openclean.operator.transform.insert import InsCol
+from openclean.operator.transform.update import Update
+from openclean.pipeline import stream
+
+
+DIR = os.path.join(os.path.dirname(os.path.realpath(__file__)), '../.files')
+NYC311_FILE = os.path.join(DIR, '311-descriptor.csv')
+
+
+def test_iter_frames():
+    """Test iterating over pipeline rows in chunks of data frames."""
+    ds = stream(NYC311_FILE).update('city', str.upper)
+    expected = ds.to_df()
+    frames = list(ds.iter_frames(chunksize=40, batchsize=15))
+    assert all(len(df) <= 40 for df in frames)
+    assert all(len(df) == 40 for df in frames[:-1])
+    df = pd.concat(frames)
+    assert list(df.columns) == list(expected.columns)
+    assert list(df.index) == list(expected.index)
+    assert df.values.tolist() == expected.values.tolist()
+    # Pipelines with a row limit and a random sample.
+    frames = list(stream(NYC311_FILE).limit(25).iter_frames(chunksize=10))
+    assert [len(df) for df in frames] == [10, 10, 5]
+    frames = list(stream(NYC311_FILE).sample(15, random_state=42).iter_frames(chunksize=10))
+    assert [len(df) for df in frames] == [10, 5]
+    with pytest.raises(ValueError):
+        list(stream(NYC311_FILE).iter_frames(chunksize=0))
+
+
+@pytest.mark.parametrize('chunksize', [1, 7, 100000])
+def test_transform_chunks(chunksize):
+    """Test executing data frame transformers on chunks of pipeline rows."""
+    predicate = Col('borough') == 'BROOKLYN'
+    df = CSVFile(NYC311_FILE).to_df()
+    expected = InsCol('loc', pos=0, values=Col('city') + Col('borough'))\
+        .transform(Filter(predicate).transform(Update('city', str.lower).transform(df)))
+    ds = stream(NYC311_FILE)\
+        .transform(Update('city', str.lower), chunksize=chunksize)\
+        .transform(Filter(predicate), chunksize=chunksize)\
+        .transform(InsCol('loc', pos=0, values=Col('city') + Col('borough')), chunksize=chunksize)
+    assert ds.columns == list(expected.columns)
+    result = ds.to_df()
+    assert list(result.columns) == list(expected.columns)
+    assert list(result.index) == list(expected.index)
+    assert result.values.tolist() == expected.values.tolist()
+    # Iterate over the transformed rows without a downstream consumer.
+    rows = [row for _, row in ds.iterrows()]
+    assert rows == expected.values.tolist()
+    assert ds.limit(3).count() == 3
@@ -0,0 +1,45 @@
+# This file is part of the Data Cleaning Library (openclean).
+#
+# Copyright (C) 2018-2021 New York University.
+#
+# openclean is released under the Revised BSD License. See file LICENSE for
+# full license details.
+
+"""Unit tests for fused operators in data processing pipelines."""
+
+import pandas as pd
+
+from openclean.function.eval.base import Col
+from openclean.operator.stream.fusion import FusedProcessor
+
+
+def test_fused_pipeline(ds):
+    """Test results for a pipeline with fused operators."""
+    pipeline = ds\
+        .select(['C', 'B'])\
+        .update('B', lambda x: x * 2)\
+        .filter(Col('C') > 2)\
+        .update('C', lambda x: x + 1)\
+        .insert('D', values=Col('B') + Col('C'))\
+        .move('D', 0)\
+        .rename('B', 'E')
+    plan = pipeline.plan()
+    assert len(plan) == 1
+    assert isinstance(plan[0], FusedProcessor)
+    assert len(plan[0].operators) == len(pipeline.pipeline)
+    df = pipeline.to_df()
+    assert list(df.columns) == ['D', 'C', 'E']
+    expected = pd.DataFrame(
+        data=[[10 - i + 2 * i, 10 - i, 2 * i] for i in range(7)],
+        columns=['D', 'C', 'E'],
+        dtype=object
+    )
+    assert df.values.tolist() == expected.values.tolist()
+    assert list(df.index) == list(range(7))
+    # Iterate over rows in the fused pipeline.
+    assert [row for _, row in pipeline.iterrows()] == expected.values.tolist()
+    # Fusion stops at operators that are not row-local.
+    pipeline = ds.select('B').limit(5).update('B', str).insert('C', values=1)
+    plan = pipeline.plan()
+    assert len(plan) == 3
+    assert pipeline.to_df().values.tolist() == [[str(i), 1] for i in range(5)]
@@ -0,0 +1,92 @@
+# This file is part of the Data Cleaning Library (openclean).
+#
+# Copyright (C) 2018-2021 New York University.
+#
+# openclean is released under the Revised BSD License. See file LICENSE for
+# full license details.
+
+"""Unit tests for grouping and aggregating rows in data processing
+pipelines.
+"""
+
+import os
+import pandas as pd
+import pytest
+
+from openclean.function.eval.base import Eval
+from openclean.operator.stream.aggregate import GroupAggregate
+from openclean.pipeline import stream
+
+
+DIR = os.path.join(os.path.dirname(os.path.realpath(__file__)), '../.files')
+NYC311_FILE = os.path.join(DIR, '311-descriptor.csv')
+
+
+AGGREGATES = {
+    'city': ['count', 'nunique', 'first', 'last', 'majority', 'min', 'max'],
+    'street': 'count'
+}
+
+
+def expected_groups(keys):
+    """Compute the expected aggregates for the NYC 311 file using pandas."""
+    df = stream(NYC311_FILE).to_df()
+    groups = df.groupby(keys, sort=False)
+    result = pd.DataFrame({
+        'city_count': groups['city'].count(),
+        'city_nunique': groups['city'].nunique(),
+        'city_first': groups['city'].first(),
+        'city_last': groups['city'].last(),
+        'city_majority': groups['city'].agg(lambda x: x.value_counts(sort=False).idxmax()),
+        'city_min': groups['city'].min(),
+        'city_max': groups['city'].max(),
+        'street': groups['street'].count()
+    })
+    return result.sort_index()
+
+
+@pytest.mark.parametrize('max_groups', [2, 1000])
+@pytest.mark.parametrize('keys', ['borough', ['borough', 'descriptor']])
+def test_groupby_aggregates(keys, max_groups):
+    """Test computing aggregates for groups of rows with and without spilling
+    groups to disk.
+    """
+    df = stream(NYC311_FILE).groupby(keys).agg(AGGREGATES, max_groups=max_groups)
+    expected = expected_groups(keys)
+    assert list(df.columns) == list(expected.columns)
+    df = df.sort_index()
+    assert list(df.index) == list(expected.index)
+    assert df.values.tolist() == expected.values.tolist()
+
+
+def test_groupby_numeric(ds):
+    """Test numeric aggregates and parallel groupby."""
+    df = ds.groupby('A').agg({'B': ['sum', 'mean'], 'C': 'max'})
+    assert df.loc['A'].tolist() == [45, 4.5, 9]
+    ds = ds.update('A', lambda x: None).insert('D', values=Eval('B', lambda b: b % 3))
+    df = ds.groupby(['D']).agg({'A': ['count', 'first', 'majority', 'mean'], 'C': 'min'})
+    assert df.loc[0].tolist() == [0, None, None, None, 0]
+    assert df.loc[1].tolist() == [0, None, None, None, 2]
+    # Parallel execution.
+    df = stream(NYC311_FILE).groupby('borough').agg(AGGREGATES, workers=3).sort_index()
+    expected = expected_groups('borough')
+    assert df.values.tolist() == expected.values.tolist()
+    with pytest.raises(ValueError):
+        ds.groupby('A').agg({'B': 'median'})
+    with pytest.raises(ValueError):
+        ds.groupby('A').agg({})
+
+
+@pytest.mark.parametrize('max_groups', [2, 1000])
+def test_groupby_equal_keys(max_groups, tmpdir):
+    """Test that keys which are equal but of different types (e.g., 1, 1.0,
+    and True) form a single group when groups are spilled to disk.
+    """
+    values = [1, 2, 3, 4, 1.0, 5, 6, 7, 8, 9, True]
+    op = GroupAggregate(keys='A', aggregates={'B': ['count', 'sum']}, max_groups=max_groups, tmpdir=str(tmpdir))
+    consumer = op.open(['A', 'B'])
+    for rowid, value in enumerate(values):
+        consumer.consume(rowid, [value, rowid])
+    df = consumer.close()
+    assert len(df) == 9
+    assert df.loc[1].tolist() == [3, 14]
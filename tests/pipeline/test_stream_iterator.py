@@ -33,14 +33,14 @@ def test_modified_sample_stream(ds):
         .limit(1)
     with stream.open() as reader:
         rows = [row for row in reader]
-    assert rows == [(0, 9, [9, 9])]
+    assert rows == [(0, 8, [9, 8])]
 
 
 def test_sample_stream(ds):
     """Test iterating over a sample from the stream."""
     with ds.sample(n=3, random_state=42).open() as reader:
         rows = [row for row in reader]
-    assert rows == [(0, 5, ['A', 5, 4]), (1, 9, ['A', 9, 0]), (2, 2, ['A', 2, 7])]
+    assert rows == [(0, 8, ['A', 8, 1]), (1, 4, ['A', 4, 5]), (2, 2, ['A', 2, 7])]
 
 
 def test_stream_without_operators(ds):
@@ -0,0 +1,98 @@
+# This file is part of the Data Cleaning Library (openclean).
+#
+# Copyright (C) 2018-2021 New York University.
+#
+# openclean is released under the Revised BSD License. See file LICENSE for
+# full license details.
+
+"""Unit tests for joining the rows in data processing pipelines with a
+reference table.
+"""
+
+import os
+import pandas as pd
+import pytest
+
+from openclean.operator.stream.collector import Distinct
+from openclean.pipeline import stream
+
+
+DIR = os.path.join(os.path.dirname(os.path.realpath(__file__)), '../.files')
+NYC311_FILE = os.path.join(DIR, '311-descriptor.csv')
+
+
+"""Reference table with an abbreviation for three of the five boroughs."""
+BOROUGHS = pd.DataFrame(
+    data=[['BRONX', 'BX', 'x'], ['BROOKLYN', 'BK', 'y'], ['MANHATTAN', 'MN', 'z'], [None, 'NA', 'n']],
+    columns=['borough', 'code', 'city']
+)
+
+
+@pytest.mark.parametrize('how', ['inner', 'left', 'semi', 'anti'])
+def test_join_types(how):
+    """Test the different join types against the result of a pandas merge."""
+    df = stream(NYC311_FILE).to_df()
+    codes = BOROUGHS.dropna()
+    if how == 'semi':
+        expected = df[df['borough'].isin(codes['borough'])]
+    elif how == 'anti':
+        expected = df[~df['borough'].isin(codes['borough'])]
+    else:
+        # Use a left merge to maintain the row order for inner joins.
+        expected = df.merge(codes, on='borough', how='left', suffixes=('', '_right'))
+        if how == 'inner':
+            expected = expected[expected['code'].notna()]
+        expected = expected.astype(object).where(expected.notna(), None)
+    result = stream(NYC311_FILE).join(BOROUGHS, on='borough', how=how).to_df()
+    assert list(result.columns) == list(expected.columns)
+    assert result.values.tolist() == expected.values.tolist()
+
+
+def test_join_build_sides(tmpdir):
+    """Test joining with reference tables from different sources."""
+    filename = os.path.join(tmpdir, 'boroughs.csv')
+    BOROUGHS.dropna().to_csv(filename, index=False)
+    expected = stream(NYC311_FILE).join(BOROUGHS, on='borough', columns='code').to_df()
+    assert list(expected.columns) == ['descriptor', 'borough', 'city', 'street', 'code']
+    for other in [filename, stream(filename).select(['code', 'borough'])]:
+        df = stream(NYC311_FILE).join(other, on='borough', columns='code').to_df()
+        assert df.values.tolist() == expected.values.tolist()
+
+
+def test_join_errors():
+    """Test errors for invalid join arguments and duplicate keys."""
+    ds = stream(NYC311_FILE)
+    with pytest.raises(ValueError):
+        ds.join(BOROUGHS, on='borough', how='outer')
+    with pytest.raises(ValueError):
+        ds.join(BOROUGHS, on=['borough', 'city'], right_on='borough')
+    dups = pd.DataFrame(data=[['BRONX', 1], ['BRONX', 2]], columns=['borough', 'id'])
+    with pytest.raises(ValueError):
+        ds.join(dups, on='borough')
+    # Duplicate keys are allowed for semi joins.
+    count = ds.distinct('borough')['BRONX']
+    assert ds.join(dups, on='borough', how='semi').distinct('borough') == {'BRONX': count}
+
+
+def test_join_multi_column_keys():
+    """Test joining on multiple key columns with different names."""
+    ref = pd.DataFrame(
+        data=[['BROOKLYN', 'BROOKLYN', 1], ['MANHATTAN', 'NEW YORK', 2], ['MANHATTAN', 'BROOKLYN', 3]],
+        columns=['B', 'C', 'id']
+    )
+    ds = stream(NYC311_FILE).join(ref, on=['borough', 'city'], right_on=['B', 'C'], how='left')
+    assert ds.columns == ['descriptor', 'borough', 'city', 'street', 'id']
+    df = ds.to_df()
+    for _, row in df.iterrows():
+        if row['borough'] == 'BROOKLYN' and row['city'] == 'BROOKLYN':
+            assert row['id'] == 1
+        elif row['borough'] == 'MANHATTAN' and row['city'] == 'NEW YORK':
+            assert row['id'] == 2
+        else:
+            assert row['id'] is None
+
+
+def test_parallel_join():
+    """Test joining with a reference table in a parallel pipeline."""
+    ds = stream(NYC311_FILE).join(BOROUGHS, on='borough', columns='code')
+    assert ds.stream(Distinct('code'), workers=3) == ds.distinct('code')
@@ -0,0 +1,81 @@
+# This file is part of the Data Cleaning Library (openclean).
+#
+# Copyright (C) 2018-2021 New York University.
+#
+# openclean is released under the Revised BSD License. See file LICENSE for
+# full license details.
+
+"""Unit tests for running data processing pipelines in parallel over
+partitions of a CSV file.
+"""
+
+import os
+import pandas as pd
+import pytest
+
+from openclean.data.stream.csv import CSVFile
+from openclean.function.eval.base import Col
+from openclean.operator.stream.collector import DataFrame, Distinct, RowCount, Write
+from openclean.pipeline import stream
+from openclean.profiling.dataset import ProfileOperator
+
+
+DIR = os.path.join(os.path.dirname(os.path.realpath(__file__)), '../.files')
+NYC311_FILE = os.path.join(DIR, '311-descriptor.csv')
+
+
+def test_parallel_collectors(tmpdir):
+    """Test results of terminal collectors in parallel pipelines."""
+    ds = stream(NYC311_FILE).filter(Col('borough') != 'BROOKLYN')
+    assert ds.stream(RowCount(), workers=3) == ds.count()
+    assert ds.stream(Distinct('borough'), workers=3) == ds.distinct('borough')
+    df = ds.stream(DataFrame(), workers=3)
+    pd.testing.assert_frame_equal(df, ds.to_df())
+    assert ds.stream(ProfileOperator(), workers=3) == ds.profile()
+    # Write partitions to a single output file.
+    filename = os.path.join(tmpdir, 'out.csv')
+    ds.stream(Write(file=CSVFile(filename)), workers=4)
+    pd.testing.assert_frame_equal(stream(filename).to_df(), ds.to_df().reset_index(drop=True))
+
+
+def test_parallel_errors(ds):
+    """Test errors for pipelines that cannot be executed in parallel."""
+    # Data frame source.
+    with pytest.raises(ValueError):
+        ds.stream(RowCount(), workers=2)
+    # Limit operator and non-mergeable consumer.
+    ds = stream(NYC311_FILE)
+    with pytest.raises(ValueError):
+        ds.limit(10).stream(RowCount(), workers=2)
+    with pytest.raises(ValueError):
+        ds.sample(10).stream(RowCount(), workers=2)
+
+
+def test_parallel_sample():
+    """Test merging random samples for partitions of a data stream."""
+    ds = stream(NYC311_FILE)
+    df = ds.to_df()
+    rows = ds.sample(n=25, random_state=42).run(parallel=3)
+    assert len(rows) == 25
+    assert len(set(rowid for rowid, _ in rows)) == 25
+    for rowid, row in rows:
+        assert list(df.loc[rowid]) == row
+    # Stratified samples.
+    rows = ds.sample(n=2, stratify='borough', random_state=42).run(parallel=3)
+    assert len(rows) == 2 * len(ds.distinct('borough'))
+
+
+def test_parallel_crlf_in_quotes(tmpdir):
+    """Test that parallel and serial runs return the same values for a CSV
+    file with line breaks inside quoted cell values.
+    """
+    filename = os.path.join(tmpdir, 'crlf.csv')
+    with open(filename, 'wb') as f:
+        f.write(b'A,B\r\n')
+        for i in range(100):
+            f.write('{},"x\r\ny{}"\r\n'.format(i, i % 7).encode('utf-8'))
+    ds = stream(filename)
+    expected = ds.distinct('B')
+    assert 'x\ny0' in expected
+    assert ds.stream(Distinct('B'), workers=3) == expected
+    assert ds.stream(DataFrame(), workers=3).values.tolist() == ds.to_df().values.tolist()
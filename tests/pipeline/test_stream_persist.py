@@ -8,8 +8,10 @@
 """Unit tests for the data pipeline persist operators."""
 
 import os
+import pytest
 
 from openclean.function.eval.base import Col
+from openclean.pipeline import stream
 
 
 def test_persist_stream_in_file(ds, tmpdir):
@@ -18,6 +20,9 @@ def test_persist_stream_in_file(ds, tmpdir):
     ds = ds.filter(Col('B') >= 5).persist(filename=filename)
     assert ds.pipeline == []
     assert ds.count() == 5
+    # Compression is only supported for binary files.
+    with pytest.raises(ValueError):
+        ds.persist(filename=os.path.join(tmpdir, 'data.csv.gz'), compressed=True)
 
 
 def test_persist_stream_in_memory(ds):
@@ -25,3 +30,20 @@ def test_persist_stream_in_memory(ds):
     ds = ds.filter(Col('B') >= 5).persist()
     assert ds.pipeline == []
     assert ds.count() == 5
+
+
+@pytest.mark.parametrize('compressed', [False, True])
+def test_persist_stream_in_binary_file(compressed, ds, tmpdir):
+    """Test persisting a data stream on disk in binary format."""
+    filename = os.path.join(tmpdir, 'data.bin')
+    ds = ds.filter(Col('B') >= 5)\
+        .update('C', lambda v: float(v))\
+        .persist(filename=filename, binary=True, compressed=compressed)
+    assert ds.pipeline == []
+    assert ds.count() == 5
+    df = ds.to_df()
+    assert list(df.index) == [5, 6, 7, 8, 9]
+    assert list(df['B']) == [5, 6, 7, 8, 9]
+    assert list(df['C']) == [4.0, 3.0, 2.0, 1.0, 0.0]
+    # Binary files are detected when opening a stream.
+    assert stream(filename).count() == 5
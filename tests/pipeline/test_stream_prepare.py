@@ -0,0 +1,70 @@
+# This file is part of the Data Cleaning Library (openclean).
+#
+# Copyright (C) 2018-2021 New York University.
+#
+# openclean is released under the Revised BSD License. See file LICENSE for
+# full license details.
+
+"""Unit tests for preparing value functions in data processing pipelines."""
+
+import os
+import pandas as pd
+
+from openclean.function.eval.aggregate import Avg, Count, Max
+from openclean.function.eval.base import Col, Eval
+from openclean.function.value.normalize import MinMaxScale
+from openclean.function.value.vote import MajorityVote
+from openclean.operator.stream.collector import RowCount
+from openclean.pipeline import stream
+
+
+DIR = os.path.join(os.path.dirname(os.path.realpath(__file__)), '../.files')
+NYC311_FILE = os.path.join(DIR, '311-descriptor.csv')
+
+
+def test_prepare_nested_functions(ds):
+    """Test preparing nested functions that require multiple passes."""
+    ds = ds.with_engine('stream')
+    scaled = Eval('B', MinMaxScale())
+    df = ds.filter(scaled > Avg(scaled)).to_df()
+    assert list(df['B']) == [5, 6, 7, 8, 9]
+
+
+def test_prepare_pipeline_copy(ds):
+    """Test that preparing a pipeline does not modify the original operators."""
+    pipeline = ds.update('B', MinMaxScale())
+    prepared = pipeline.prepare()
+    assert prepared is not pipeline
+    assert prepared.prepare() is prepared
+    assert pipeline.pipeline[0].func.unprepared()
+    assert not prepared.pipeline[0].func.unprepared()
+    # Pipelines without unprepared functions are not copied.
+    pipeline = ds.filter(Col('B') > 1)
+    assert pipeline.prepare() is pipeline
+
+
+def test_prepare_stream_functions(ds):
+    """Test streaming pipelines with value functions that need to be prepared.
+    The results are the same as for the pandas engine.
+    """
+    for engine in ['pandas', 'stream']:
+        pipeline = ds.with_engine(engine)
+        df = pipeline.update('B', MinMaxScale()).to_df()
+        assert list(df['B']) == [v / 9 for v in range(10)]
+        df = pipeline.insert('D', values=Count('A', 'A')).update('A', MajorityVote()).to_df()
+        assert list(df['D']) == [10] * 10
+        assert list(df['A']) == ['A'] * 10
+        assert pipeline.filter(Col('B') == Max('C')).count() == 1
+        rows = list(pipeline.filter(Col('B') < Avg('C')).iterrows())
+        assert [row[1] for _, row in rows] == [0, 1, 2, 3, 4]
+
+
+def test_prepare_parallel():
+    """Test preparing value functions in a parallel pipeline."""
+    ds = stream(NYC311_FILE).filter(Col('borough') == Eval('borough', MajorityVote()))
+    df = ds.to_df()
+    assert len(df.index) > 0
+    assert df['borough'].nunique() == 1
+    assert ds.stream(RowCount(), workers=3) == len(df.index)
+    expected = pd.read_csv(NYC311_FILE, dtype=str)['borough'].value_counts()
+    assert len(df.index) == expected.max()
@@ -0,0 +1,78 @@
+# This file is part of the Data Cleaning Library (openclean).
+#
+# Copyright (C) 2018-2021 New York University.
+#
+# openclean is released under the Revised BSD License. See file LICENSE for
+# full license details.
+
+"""Unit tests for pushing pipeline operators down into the CSV reader."""
+
+import os
+import pandas as pd
+import pytest
+
+from openclean.data.stream.csv import CSVScan
+from openclean.function.eval.base import Col, Eval
+from openclean.function.eval.domain import IsIn, IsNotIn
+from openclean.pipeline import stream
+
+
+DIR = os.path.join(os.path.dirname(os.path.realpath(__file__)), '../.files')
+NYC311_FILE = os.path.join(DIR, '311-descriptor.csv')
+
+
+@pytest.mark.parametrize(
+    'predicate',
+    [
+        Col('borough') == 'BROOKLYN',
+        'BRONX' == Col('borough'),
+        IsIn('borough', ['QUEENS', 'BRONX']),
+        IsNotIn('borough', ['QUEENS', 'BRONX'])
+    ]
+)
+def test_pushdown_pipeline(predicate):
+    """Test results of pipelines with projections and predicates that are
+    pushed down into the CSV file reader.
+    """
+    ds = stream(NYC311_FILE)\
+        .select(['street', 'borough', 'city'])\
+        .filter(predicate)\
+        .select(['borough', 'street'], names=['boro', 'street'])\
+        .update('street', str.lower)
+    optimized = ds.optimize()
+    assert isinstance(optimized.source, CSVScan)
+    assert optimized.source.colidxs == [1, 3]
+    assert len(optimized.source.predicates) == 1
+    assert len(optimized.pipeline) == 1
+    # Compare with the pipeline results for a data frame.
+    df = pd.read_csv(NYC311_FILE, dtype=str, keep_default_na=False)
+    expected = stream(df)\
+        .select(['street', 'borough', 'city'])\
+        .filter(predicate)\
+        .select(['borough', 'street'], names=['boro', 'street'])\
+        .update('street', str.lower)\
+        .to_df()
+    assert expected.shape[0] > 0
+    pd.testing.assert_frame_equal(ds.to_df(), expected)
+    assert [r for _, r in ds.iterrows()] == expected.values.tolist()
+    with ds.open() as f:
+        assert [r for _, _, r in f] == expected.values.tolist()
+
+
+def test_pushdown_stop():
+    """Test that only leading operators are pushed down."""
+    ds = stream(NYC311_FILE)\
+        .filter(Col('borough') == 'BROOKLYN')\
+        .filter(Eval('city', str.lower) == 'brooklyn')\
+        .select('street')
+    optimized = ds.optimize()
+    assert optimized.source.colidxs is None
+    assert len(optimized.pipeline) == 2
+    df = pd.read_csv(NYC311_FILE, dtype=str, keep_default_na=False)
+    expected = df[(df['borough'] == 'BROOKLYN') & (df['city'].str.lower() == 'brooklyn')]
+    assert ds.to_df()['street'].tolist() == expected['street'].tolist()
+    # The last operator and data frame sources are never pushed down.
+    ds = stream(NYC311_FILE).select('street')
+    assert ds.optimize() is ds
+    ds = stream(pd.read_csv(NYC311_FILE)).select('street').filter(Col('street') == 'A')
+    assert ds.optimize() is ds
@@ -7,10 +7,25 @@
 
 """Unit tests for the sample operator in data processing pipelines."""
 
+import pandas as pd
 import pytest
 
+from openclean.pipeline import stream
+
 
 @pytest.mark.parametrize('size', [0, 3, 5, 7, 10, 20])
 def test_sample_rows_in_stream(size, ds):
     """Test counting the number of rows in a stream sample."""
     assert ds.sample(n=size).count() == min(size, 10)
+
+
+def test_stratified_sample():
+    """Test stratified and weighted samples in a data stream."""
+    df = pd.DataFrame(data=[[i % 3, i, 9 - i] for i in range(10)], columns=['A', 'B', 'C'])
+    ds = stream(df)
+    rows = ds.sample(n=2, stratify='A', random_state=42).run()
+    assert len(rows) == 6
+    assert sorted(row[0] for _, row in rows) == [0, 0, 1, 1, 2, 2]
+    rows = ds.sample(n=3, weights='C', random_state=42).run()
+    assert len(rows) == 3
+    assert 9 not in [row[1] for _, row in rows]
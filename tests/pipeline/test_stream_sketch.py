@@ -0,0 +1,42 @@
+# This file is part of the Data Cleaning Library (openclean).
+#
+# Copyright (C) 2018-2021 New York University.
+#
+# openclean is released under the Revised BSD License. See file LICENSE for
+# full license details.
+
+"""Unit tests for approximate distinct counts and most frequent values in
+data pipelines.
+"""
+
+import os
+
+from openclean.operator.stream.sketch import ApproxDistinct, TopValues
+from openclean.pipeline import stream
+
+
+DIR = os.path.join(os.path.dirname(os.path.realpath(__file__)), '../.files')
+NYC311_FILE = os.path.join(DIR, '311-descriptor.csv')
+
+
+def test_approx_distinct_count():
+    """Test estimating the number of distinct values in a data stream."""
+    ds = stream(NYC311_FILE)
+    assert ds.approx_distinct_count('city') == len(ds.distinct('city'))
+    assert ds.approx_distinct_count(['borough', 'city']) == len(ds.distinct(['borough', 'city']))
+    # Sketches for partitions are merged in parallel pipelines.
+    sketch = ds.stream(ApproxDistinct('city'), workers=3)
+    assert sketch.count() == ds.approx_distinct_count('city')
+
+
+def test_top_values():
+    """Test getting the most frequent values in a data stream."""
+    ds = stream(NYC311_FILE)
+    counts = ds.distinct('borough')
+    assert ds.top_values('borough', k=3) == counts.most_common(3)
+    top = ds.top_values('city', k=2, capacity=5)
+    assert len(top) == 2
+    for value, count in top:
+        assert count <= ds.distinct('city')[value]
+    summary = ds.stream(TopValues('borough', k=3), workers=3)
+    assert summary.most_common(3) == counts.most_common(3)
@@ -0,0 +1,55 @@
+# This file is part of the Data Cleaning Library (openclean).
+#
+# Copyright (C) 2018-2021 New York University.
+#
+# openclean is released under the Revised BSD License. See file LICENSE for
+# full license details.
+
+"""Unit tests for sorting rows in data processing pipelines."""
+
+import os
+import pytest
+
+from openclean.operator.stream.collector import RowCount
+from openclean.pipeline import stream
+
+
+DIR = os.path.join(os.path.dirname(os.path.realpath(__file__)), '../.files')
+NYC311_FILE = os.path.join(DIR, '311-descriptor.csv')
+
+
+@pytest.mark.parametrize('max_rows', [7, 100000])
+@pytest.mark.parametrize(
+    'columns,reversed',
+    [('city', None), (['borough', 'city'], [True, False]), ('street', True)]
+)
+def test_order_by(columns, reversed, max_rows):
+    """Test sorting a data stream with and without spilling runs to disk."""
+    ds = stream(NYC311_FILE)
+    expected = ds.to_df().sort_values(
+        by=columns,
+        ascending=[not r for r in reversed] if isinstance(reversed, list) else reversed is not True,
+        kind='mergesort'
+    )
+    df = ds.order_by(columns, reversed=reversed, max_rows=max_rows).to_df()
+    assert df.values.tolist() == expected.values.tolist()
+    assert list(df.index) == list(expected.index)
+    # The sort is stable, i.e., rows with equal keys keep their input order.
+    keys = df[columns].values.tolist()
+    for i in range(1, len(df)):
+        if keys[i] == keys[i - 1]:
+            assert df.index[i] > df.index[i - 1]
+
+
+def test_order_by_iterator(ds):
+    """Test iterating over sorted rows."""
+    rows = [row for _, row in ds.order_by('C', max_rows=3).iterrows()]
+    assert [row[2] for row in rows] == list(range(10))
+    with ds.order_by('B', reversed=True, max_rows=4).update('A', str.lower).open() as it:
+        rows = [row for _, _, row in it]
+    assert rows == [['a', i, 9 - i] for i in range(9, -1, -1)]
+    ds = ds.order_by('C', max_rows=2).limit(4)
+    assert ds.count() == 4
+    assert [row[2] for _, row in ds.iterrows()] == [0, 1, 2, 3]
+    with pytest.raises(ValueError):
+        stream(NYC311_FILE).order_by('city').stream(RowCount(), workers=2)
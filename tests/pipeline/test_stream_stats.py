@@ -0,0 +1,90 @@
+# This file is part of the Data Cleaning Library (openclean).
+#
+# Copyright (C) 2018-2021 New York University.
+#
+# openclean is released under the Revised BSD License. See file LICENSE for
+# full license details.
+
+"""Unit tests for recording runtime statistics of data pipeline operators."""
+
+import os
+import pytest
+import sys
+
+from openclean.function.eval.base import Col
+from openclean.operator.stream.collector import Distinct
+from openclean.operator.stream.instrument import PipelineStats
+from openclean.pipeline import stream
+
+
+DIR = os.path.join(os.path.dirname(os.path.realpath(__file__)), '../.files')
+NYC311_FILE = os.path.join(DIR, '311-descriptor.csv')
+
+
+def test_run_with_stats():
+    """Test recording statistics for a pipeline run."""
+    ds = stream(NYC311_FILE)\
+        .update('city', str.upper)\
+        .filter(Col('borough') == 'BROOKLYN')\
+        .sample(10, random_state=42)\
+        .append(Distinct('city'))
+    stats = PipelineStats()
+    result = ds.run(stats=stats)
+    assert result == ds.run()
+    df = stats.to_df()
+    assert list(df['operator']) == ['Fused(Update, Filter)', 'Sample', 'Distinct']
+    report = stats.report()
+    total = sum(1 for _ in stream(NYC311_FILE).iterrows())
+    brooklyn = stream(NYC311_FILE).where(Col('borough') == 'BROOKLYN').count()
+    assert report[0]['rows_in'] == total
+    assert report[0]['rows_out'] == brooklyn
+    assert report[1]['rows_in'] == brooklyn
+    assert report[1]['rows_out'] == 10
+    assert report[2]['rows_in'] == 10
+    assert report[2]['rows_out'] == 0
+    for op in report:
+        assert op['wall_time'] >= 0
+        assert op['total_wall_time'] >= op['wall_time']
+        assert op['peak_memory'] is None
+
+
+def test_reuse_stats():
+    """Test that a statistics object that is used for multiple runs reports
+    the statistics of the last run only.
+    """
+    ds = stream(NYC311_FILE)\
+        .filter(Col('borough') == 'BROOKLYN')\
+        .update('city', str.upper)\
+        .append(Distinct('city'))
+    stats = PipelineStats()
+    ds.run(stats=stats)
+    first = stats.report()
+    ds.run(stats=stats)
+    report = stats.report()
+    assert len(report) == len(first) == 2
+    for op1, op2 in zip(first, report):
+        assert op1['operator'] == op2['operator']
+        assert op1['rows_in'] == op2['rows_in']
+        assert op1['rows_out'] == op2['rows_out']
+        assert op1['calls'] == op2['calls']
+
+
+def test_iterator_with_stats():
+    """Test recording statistics while iterating over pipeline rows."""
+    ds = stream(NYC311_FILE).update('city', str.upper).limit(5)
+    stats = PipelineStats()
+    with ds.open(stats=stats) as it:
+        rows = [row for _, _, row in it]
+    assert len(rows) == 5
+    report = stats.report()
+    assert [op['operator'] for op in report] == ['Update', 'Limit']
+    assert report[1]['rows_out'] == 5
+
+
+@pytest.mark.skipif(sys.version_info < (3, 9), reason='requires Python 3.9')
+def test_memory_stats():
+    """Test recording the peak memory allocation for pipeline operators."""
+    stats = PipelineStats(memory=True)
+    stream(NYC311_FILE).select('city').append(Distinct()).run(stats=stats)
+    report = stats.report()
+    assert report[-1]['peak_memory'] > 0
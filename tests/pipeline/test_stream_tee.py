@@ -0,0 +1,56 @@
+# This file is part of the Data Cleaning Library (openclean).
+#
+# Copyright (C) 2018-2021 New York University.
+#
+# openclean is released under the Revised BSD License. See file LICENSE for
+# full license details.
+
+"""Unit tests for computing the results of multiple terminal operators in a
+single pass over a data stream.
+"""
+
+import os
+import pandas as pd
+import pytest
+
+from openclean.data.stream.csv import CSVFile
+from openclean.function.eval.base import Col
+from openclean.operator.stream.collector import Collector, DataFrame, Distinct, RowCount, Write
+from openclean.operator.transform.limit import Limit
+from openclean.pipeline import stream
+from openclean.profiling.dataset import ProfileOperator
+
+
+DIR = os.path.join(os.path.dirname(os.path.realpath(__file__)), '../.files')
+NYC311_FILE = os.path.join(DIR, '311-descriptor.csv')
+
+
+@pytest.mark.parametrize('parallel', [None, 3])
+def test_run_many(parallel, tmpdir):
+    """Test running multiple terminal operators in a single pass."""
+    ds = stream(NYC311_FILE).filter(Col('borough') != 'BROOKLYN')
+    filename = os.path.join(tmpdir, 'out.csv')
+    results = ds.run_many(
+        sinks={
+            'count': RowCount(),
+            'boroughs': Distinct('borough'),
+            'profile': ProfileOperator(),
+            'df': DataFrame(),
+            'write': Write(file=CSVFile(filename))
+        },
+        parallel=parallel
+    )
+    assert results['count'] == ds.count()
+    assert results['boroughs'] == ds.distinct('borough')
+    assert results['profile'] == ds.profile()
+    pd.testing.assert_frame_equal(results['df'], ds.to_df())
+    pd.testing.assert_frame_equal(stream(filename).to_df(), ds.to_df().reset_index(drop=True))
+
+
+def test_tee_with_limit(ds):
+    """Test single pass with a terminal pipeline that stops early."""
+    results = ds.tee(count=RowCount(), head=Limit(3), total=RowCount())
+    assert results == {'count': 10, 'head': None, 'total': 10}
+    # Non-mergeable operators cannot be used in parallel mode.
+    with pytest.raises(ValueError):
+        stream(NYC311_FILE).run_many({'rows': Collector(), 'count': RowCount()}, parallel=2)
@@ -0,0 +1,89 @@
+# This file is part of the Data Cleaning Library (openclean).
+#
+# Copyright (C) 2018-2021 New York University.
+#
+# openclean is released under the Revised BSD License. See file LICENSE for
+# full license details.
+
+"""Unit tests for the adaptive evaluation order of predicates."""
+
+from openclean.function.value.base import CallableWrapper
+from openclean.util.core import eval_all
+from openclean.util.order import PredicateOrder
+
+
+def test_eval_all_order():
+    """Test that eval_all returns the same results before and after the
+    predicates are reordered.
+    """
+    predicates = [
+        CallableWrapper(lambda x: x >= 0),
+        CallableWrapper(lambda x: x % 2 == 0)
+    ]
+    f = eval_all(predicates=predicates, samplesize=4)
+    results = [f(v) for v in range(10)]
+    assert results == [v % 2 == 0 for v in range(10)]
+    assert not f.ordering.sampling
+    # The predicate that is never violated is evaluated last.
+    assert f.ordering.positions == [1, 0]
+    report = f.ordering.report()
+    # The first predicate is only evaluated for the values that are not
+    # rejected by the second predicate.
+    assert [s['calls'] for s in report] == [2, 4]
+    assert [s['stops'] for s in report] == [0, 2]
+
+
+def test_eval_all_guard():
+    """Test that predicates are not evaluated for values that were rejected
+    by a previous predicate while statistics are collected.
+    """
+    predicates = [
+        CallableWrapper(lambda v: isinstance(v, str)),
+        CallableWrapper(lambda v: v.startswith('a'))
+    ]
+    f = eval_all(predicates=predicates, samplesize=4)
+    # The second value is evaluated with the second predicate first.
+    values = ['ab', None, 'a', 'b', 2, 'a', 3.5]
+    assert [f(v) for v in values] == [True, False, True, False, False, True, False]
+    # Values are evaluated in the original order if the adaptive order
+    # raises an error.
+    f.ordering.positions = [1, 0]
+    assert not f(1)
+    assert f('ab')
+
+
+def test_predicate_order():
+    """Test ordering predicates by their cost and stop rate."""
+    order = PredicateOrder(count=3, samplesize=10)
+    assert order.sampling
+    # Expensive predicate with high stop rate, cheap predicate with low stop
+    # rate, and cheap predicate with high stop rate.
+    order.record(0, time=1., stops=8, calls=8)
+    order.record(1, time=0.01, stops=1, calls=8)
+    order.record(2, time=0.01, stops=6, calls=8)
+    order.update(8)
+    assert order.remaining == 2
+    assert order.arrange(['A', 'B', 'C']) == ['A', 'B', 'C']
+    assert order.sample_positions() == [1, 2, 0]
+    order.record(0, time=0.25, stops=2, calls=2)
+    order.record(1, time=0.0025, stops=1, calls=2)
+    order.record(2, time=0.0025, stops=2, calls=2)
+    order.update(2)
+    assert not order.sampling
+    assert order.remaining == 0
+    assert order.arrange(['A', 'B', 'C']) == ['C', 'B', 'A']
+    report = order.report()
+    assert [s['position'] for s in report] == [2, 1, 0]
+    assert report[0]['calls'] == 10
+    assert report[0]['stops'] == 10
+    assert report[0]['cost'] == 0.125
+    assert report[1]['stop_rate'] == 0.2
+
+
+def test_predicate_order_without_sample():
+    """Test that the original order is kept if no statistics are collected."""
+    assert not PredicateOrder(count=3, samplesize=0).sampling
+    assert not PredicateOrder(count=1).sampling
+    order = PredicateOrder(count=2, samplesize=0)
+    assert order.remaining == 0
+    assert order.arrange([1, 2]) == [1, 2]